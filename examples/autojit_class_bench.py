@@ -0,0 +1,79 @@
+"""
+Benchmark of the construction of 10^6 instances of an @autojit class,
+against a plain Python class and a @jit class.
+
+Instantiating an @autojit class looks up the specialization for the types
+of the constructor arguments in the fast function cache, and instantiates
+it without further Python-level calls. Unbound method calls through the
+unspecialized class (A.method(obj)) delegate in the same way.
+"""
+from __future__ import print_function, division, absolute_import
+
+from timeit import repeat
+
+from numba import autojit, jit, void, double
+
+n = 1000000
+
+def timefunc(s, func, *args):
+    print(s.ljust(30), end=" ")
+    # Make sure the class is compiled before we start the benchmark
+    func(*args)
+    print('{:>8.2f} ms'.format(min(repeat(lambda: func(*args),
+                                          number=1, repeat=3)) * 1000))
+
+#------------------------------------------------------------------------
+# Classes
+#------------------------------------------------------------------------
+
+class Point(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def norm2(self):
+        return self.x * self.x + self.y * self.y
+
+@jit
+class JitPoint(object):
+    @void(double, double)
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    @double()
+    def norm2(self):
+        return self.x * self.x + self.y * self.y
+
+@autojit
+class AutojitPoint(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def norm2(self):
+        return self.x * self.x + self.y * self.y
+
+#------------------------------------------------------------------------
+# Benchmarks
+#------------------------------------------------------------------------
+
+def construct(cls, n):
+    for i in range(n):
+        cls(1.0, 2.0)
+
+def call_unbound(cls, n):
+    obj = cls(1.0, 2.0)
+    norm2 = cls.norm2
+    for i in range(n):
+        norm2(obj)
+
+def main():
+    for name, cls in [('class', Point),
+                      ('jit class', JitPoint),
+                      ('autojit class', AutojitPoint)]:
+        timefunc("construct %s" % name, construct, cls, n)
+        timefunc("unbound method %s" % name, call_unbound, cls, n)
+
+if __name__ == '__main__':
+    main()
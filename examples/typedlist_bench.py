@@ -0,0 +1,97 @@
+"""
+Benchmark of typedlist insert, pop(index), remove and slice assignment
+against list and array.array.
+
+The typedlist operations move the items with memmove, so they have the
+cost of the list and array.array versions instead of an element-by-element
+loop. The compiled loops call the typedlist methods natively.
+"""
+from __future__ import print_function, division, absolute_import
+
+from timeit import repeat
+import array
+
+import numba
+from numba import autojit, int_
+
+n = 10000
+
+def timefunc(s, func, *args):
+    print(s.ljust(30), end=" ")
+    # Make sure the function is compiled before we start the benchmark
+    func(*args)
+    print('{:>8.2f} ms'.format(min(repeat(lambda: func(*args),
+                                          number=1, repeat=3)) * 1000))
+
+#------------------------------------------------------------------------
+# Benchmarks
+#------------------------------------------------------------------------
+
+def insert_front(container, n):
+    for i in range(n):
+        container.insert(0, i)
+    return container
+
+def pop_front(container, n):
+    for i in range(n):
+        container.pop(0)
+    return container
+
+def remove_front(container, n):
+    for i in range(n):
+        container.remove(i)
+    return container
+
+def replace_slices(container, n):
+    for i in range(0, n, 10):
+        container[i:i + 5] = container[i + 5:i + 15]
+    return container
+
+@autojit
+def insert_front_compiled(n):
+    tlist = numba.typedlist(int_)
+    for i in range(n):
+        tlist.insert(0, i)
+    return tlist
+
+@autojit
+def pop_front_compiled(tlist, n):
+    for i in range(n):
+        tlist.pop_index(0)
+    return tlist
+
+@autojit
+def remove_front_compiled(tlist, n):
+    for i in range(n):
+        tlist.remove(i)
+    return tlist
+
+def pop_front_typedlist(container, n):
+    for i in range(n):
+        container.pop_index(0)
+    return container
+
+def main():
+    items = list(range(n))
+    containers = [
+        ('list', list),
+        ('array.array', lambda items: array.array('l', items)),
+        ('typedlist', lambda items: numba.typedlist(int_, items)),
+    ]
+
+    for name, make in containers:
+        pop = pop_front_typedlist if name == 'typedlist' else pop_front
+        timefunc("insert(0) %s" % name, lambda: insert_front(make([]), n))
+        timefunc("pop(0) %s" % name, lambda: pop(make(items), n))
+        timefunc("remove %s" % name, lambda: remove_front(make(items), n))
+        timefunc("slice assignment %s" % name,
+                 lambda: replace_slices(make(items), n))
+
+    timefunc("insert(0) typedlist compiled", insert_front_compiled, n)
+    timefunc("pop(0) typedlist compiled",
+             lambda: pop_front_compiled(numba.typedlist(int_, items), n))
+    timefunc("remove typedlist compiled",
+             lambda: remove_front_compiled(numba.typedlist(int_, items), n))
+
+if __name__ == '__main__':
+    main()
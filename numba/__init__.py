@@ -69,6 +69,10 @@ from numba.error import *
 
 from numba.containers.typedlist import typedlist
 from numba.containers.typedtuple import typedtuple
+from numba.containers.typeddict import typeddict
+from numba.containers.soa import soa
+from numba.containers.typedset import typedset
+from numba.containers.typedheap import typedheap
 from numba.typesystem.numpy_support import map_dtype
 from numba.type_inference.module_type_inference import (is_registered,
                                                         register,
@@ -83,9 +87,10 @@ from numba.decorators import *
 from numba import decorators
 from numba.intrinsic.numba_intrinsic import (declare_intrinsic,
                                              declare_instruction)
+from numba.stencils import stencil
 
 __all__ = typesystem.__all__ + decorators.__all__ + special.__all__
-__all__.extend(["numeric", "floating", "complextypes"])
+__all__.extend(["numeric", "floating", "complextypes", "stencil"])
 
 from numba import testing
 from numba.testing import test, nose_run
@@ -1,15 +1,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function, division, absolute_import
 import ast
+import copy
 
 from numba.templating import temp_name
-from numba import error, pipeline, nodes, ufunc_builder
+from numba import error, pipeline, nodes, ufunc_builder, tuning
 from numba.minivect import specializers, miniast, miniutils, minitypes
-from numba import utils, functions
+from numba import utils, functions, metadata
 from numba import typesystem
+from numba.typesystem import tbaa
 from numba import visitors
 
 from numba.support.numpy_support import slicenodes
+from numba.utility import reductions
 from numba.vectorize import basic
 
 import llvm.core
@@ -60,6 +63,156 @@ def get_py_ufunc(env, lhs, node):
     py_ufunc = ufunc_builder.compile_to_pyfunc(ufunc_ast)
     return py_ufunc, signature, ufunc_builder
 
+# ______________________________________________________________________
+# Fusion of consecutive array expression statements
+
+def unwrap_coercions(node):
+    while isinstance(node, nodes.CoercionNode):
+        node = node.node
+    return node
+
+def is_elementwise_expr(env, node):
+    "Whether the node is an array expression evaluated by a scalar kernel"
+    if not node.type.is_array:
+        return False
+    elif isinstance(node, (ast.BinOp, ast.UnaryOp)):
+        return True
+
+    return isinstance(node, ast.Call) and bool(
+        nodes.query(env, node, 'is_math') or nodes.query(env, node, 'is_where'))
+
+def elementwise_fields(node):
+    if isinstance(node, nodes.CoercionNode):
+        return ['node']
+    elif isinstance(node, ast.BinOp):
+        return ['left', 'right']
+    elif isinstance(node, ast.UnaryOp):
+        return ['operand']
+    else:
+        return ['args']
+
+def is_kernel_node(env, node):
+    "Whether the node becomes part of the scalar kernel (see UFuncConverter)"
+    return (isinstance(node, (nodes.CoercionNode, ast.UnaryOp)) or
+            is_elementwise_expr(env, node))
+
+def elementwise_operands(env, node):
+    "Return the operands that are passed into the scalar kernel of node"
+    if not is_kernel_node(env, node):
+        return [node]
+
+    operands = []
+    for field in elementwise_fields(node):
+        children = getattr(node, field)
+        if not isinstance(children, list):
+            children = [children]
+        for child in children:
+            operands.extend(elementwise_operands(env, child))
+
+    return operands
+
+def substitute_temps(env, node, temps):
+    """
+    Copy an element-wise expression, replacing references to fused
+    temporaries by their defining expression.
+    """
+    if isinstance(node, ast.Name) and node.variable in temps:
+        return substitute_temps(env, temps[node.variable], temps)
+    elif not is_kernel_node(env, node):
+        return node
+
+    metadata = env.translation.crnt.ast_metadata.get(node)
+    node = copy.copy(node)
+    if metadata:
+        nodes.annotate(env, node, **metadata)
+
+    for field in elementwise_fields(node):
+        value = getattr(node, field)
+        if isinstance(value, list):
+            value = [substitute_temps(env, child, temps) for child in value]
+        else:
+            value = substitute_temps(env, value, temps)
+        setattr(node, field, value)
+
+    return node
+
+def names(node):
+    return set(n.id for n in ast.walk(node) if isinstance(n, ast.Name))
+
+class FusionGroup(object):
+    """
+    A run of consecutive element-wise statements of the same dimensionality
+    that is evaluated by a single kernel:
+
+        t = a * b
+        c[:] = t + d
+        e[:] = t * 2
+
+    becomes
+
+        for i in range(shape[0]):
+            c[i] = kernel1(a[i], b[i], d[i])    # a[i] * b[i] + d[i]
+            e[i] = kernel2(a[i], b[i])          # a[i] * b[i] * 2
+
+    Temporaries like 't' that are only used as operands in the group are
+    not materialized. Statements with a data dependence on an earlier
+    statement of the group through a variable (e.g. 'a[1:] = ...' followed
+    by '... = a[:-1]') are not fused. Dependences through aliased arrays
+    are checked at runtime, see ArrayExpressionRewriteNative.fuse.
+    """
+
+    def __init__(self, env, ndim):
+        self.env = env
+        self.ndim = ndim
+        self.statements = []
+        self.reads = set()
+        self.writes = set()
+
+    def statement_reads(self, stmt, write):
+        return names(stmt.value) | (names(stmt.targets[0]) - set([write]))
+
+    def conflicts(self, stmt, write):
+        "Whether the statement depends on a statement in the group"
+        reads = self.statement_reads(stmt, write)
+        return bool(reads & self.writes or
+                    write is not None and write in (self.reads | self.writes))
+
+    def add(self, stmt, write):
+        self.statements.append(stmt)
+        self.reads |= self.statement_reads(stmt, write)
+        if write is not None:
+            self.writes.add(write)
+
+    def is_temp(self, stmt):
+        return isinstance(stmt.targets[0], ast.Name)
+
+    def split(self, stmts=None):
+        """
+        Split the group into groups where all temporaries can be kept in
+        registers. Returns a list of statement lists, where single
+        statements are not fused.
+        """
+        if stmts is None:
+            stmts = self.statements
+
+        for i, stmt in enumerate(stmts):
+            if (self.is_temp(stmt) and
+                    not self.is_register_temp(stmt, stmts[i+1:])):
+                return self.split(stmts[:i]) + [[stmt]] + self.split(stmts[i+1:])
+
+        return [stmts] if stmts else []
+
+    def is_register_temp(self, stmt, uses):
+        "Whether all uses of the temporary are operands in the statements"
+        operands = set()
+        for use in uses:
+            operands.update(id(op) for op in
+                                elementwise_operands(self.env, use.value))
+
+        references = stmt.targets[0].variable.cf_references
+        return bool(references) and all(id(ref) in operands
+                                        for ref in references)
+
 # ______________________________________________________________________
 
 class ArrayExpressionRewrite(visitors.NumbaTransformer):
@@ -124,7 +277,7 @@ class ArrayExpressionRewrite(visitors.NumbaTransformer):
         return node
 
     def visit_Call(self, node):
-        if self.query(node, 'is_math'):
+        if self.query(node, 'is_math') or self.query(node, 'is_where'):
             elementwise = node.type.is_array
             return self.visit_elementwise(elementwise, node)
 
@@ -177,6 +330,26 @@ class ArrayExpressionRewriteUfunc(ArrayExpressionRewrite):
 
 # ______________________________________________________________________
 
+def is_versionable(minikernel, operand_types):
+    """
+    Whether to build a contiguous version of the minivect function, which
+    requires all array operands to have the dimensionality of the function.
+    """
+    return all(type.ndim == minikernel.ndim and type.dtype.is_numeric
+                   for type in operand_types if type.is_array)
+
+def contig_function_type(minikernel):
+    "Function type of the contiguous version of a minivect function"
+    arg_types = []
+    for arg in minikernel.arguments + minikernel.scalar_arguments:
+        if arg.type.is_array:
+            arg_types.append(arg.data_pointer.type)
+        else:
+            arg_types.extend(variable.type for variable in arg.variables)
+
+    return minitypes.FunctionType(return_type=minikernel.type.return_type,
+                                  args=arg_types)
+
 class NumbaStaticArgsContext(utils.NumbaContext):
     "Use a static argument list: shape, data1, strides1, data2, strides2, ..."
 
@@ -198,6 +371,27 @@ class NumbaStaticArgsContext(utils.NumbaContext):
             return typesystem.object_.to_llvm(self)
         return NotImplementedError("to_llvm", type)
 
+    def noalias_arguments(self, specializer):
+        # Only the contiguous version is called on operands that were
+        # checked not to overlap, see build_versioned_call()
+        return specializer.is_contig_specializer
+
+    def tbaa_metadata(self, llvm_module, pointer):
+        if getattr(self, 'tbaa', None) is None:
+            self.tbaa = metadata.TBAAMetadata(llvm_module)
+
+        type = pointer.type
+        if not type.is_pointer:
+            return None
+        elif type.base_type in (minitypes.npy_intp, minitypes.Py_ssize_t):
+            # Shape and strides are never written through data pointers
+            return self.tbaa.get_metadata(tbaa.kernel_extents)
+        elif type.base_type.is_numeric:
+            # Elements, like DataPointerNode
+            return self.tbaa.get_metadata(type)
+
+        return None
+
 # ______________________________________________________________________
 
 class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
@@ -238,23 +432,11 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
         array = node
         return nodes.ArrayAttributeNode(attr, array)
 
-    def register_array_expression(self, node, lhs=None):
-        super(ArrayExpressionRewriteNative, self).register_array_expression(
-            node, lhs)
-
-        # llvm_module = llvm.core.Module.new(temp_name("array_expression_module"))
-        # llvm_module = self.env.llvm_context.module
-
-        lhs_type = lhs.type if lhs else node.type
-        is_expr = lhs is None
-
-        if node.type.is_array and lhs_type.ndim < node.type.ndim:
-            # TODO: this is valid in NumPy if the leading dimensions of the
-            # TODO: RHS have extent 1
-            raise error.NumbaError(
-                node, "Right hand side must have a "
-                      "dimensionality <= %d" % lhs_type.ndim)
-
+    def compile_scalar_kernel(self, lhs, node):
+        """
+        Compile the scalar kernel for an array expression. Returns the LLVM
+        kernel function, its signature and the operands of the expression.
+        """
         # Create ufunc scalar kernel
         ufunc_ast, signature, ufunc_builder = get_py_ufunc_ast(self.env, lhs, node)
 
@@ -272,9 +454,144 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
             wrap=False, link=False, nopython=True,
             #llvm_module=llvm_module, # pipeline_name='codegen',
         )
-        llvm_module = func_env.llvm_module
+        return func_env.lfunc, signature, ufunc_builder.operands
+
+    def build_minikernel(self, llvm_module, name, operands, calls):
+        """
+        Build a minivect kernel taking the given operands (array or scalar
+        nodes), which assigns to an array operand the result of calling
+        a scalar kernel for each element:
+
+            calls: [(kernel_name, signature, [lhs_idx, operand_idx, ...])]
+        """
+        context = NumbaStaticArgsContext()
+        context.llvm_module = llvm_module
+        # context.llvm_ee = self.env.llvm_context.execution_engine
+
+        b = context.astbuilder
+        variables = [b.variable(name_node.type, "op%d" % i)
+                     for i, name_node in enumerate(operands)]
+        miniargs = [b.funcarg(variable) for variable in variables]
+        stats = [miniutils.build_kernel_call(kernel_name, signature,
+                                             [miniargs[i] for i in indices], b)
+                     for kernel_name, signature, indices in calls]
+        body = stats[0] if len(stats) == 1 else b.stats(*stats)
+
+        minikernel = b.function_from_numpy(temp_name(name), body, miniargs)
+
+        operand_types = [operand.type for operand in operands]
+        if tuning.is_tunable(minikernel, operand_types):
+            # Select the tile size at runtime, see numba/tuning.py
+            outputs = sorted(set(indices[0] for _, _, indices in calls))
+            lminikernel = tuning.build_tuned_kernel(
+                context, llvm_module, minikernel, operand_types,
+                [kernel_name for kernel_name, _, _ in calls], outputs)
+        else:
+            lminikernel, = context.run_simple(minikernel,
+                                              specializers.StridedSpecializer)
+        # lminikernel.linkage = llvm.core.LINKAGE_LINKONCE_ODR
+
+        minikernel.contig_name = None
+        if is_versionable(minikernel, operand_types):
+            # Contiguous version with noalias operands, see
+            # build_versioned_call()
+            lcontig, = context.run_simple(minikernel,
+                                          specializers.ContigSpecializer)
+            minikernel.contig_name = lcontig.name
+            minikernel.contig_type = contig_function_type(minikernel)
+
+        assert lminikernel.module is llvm_module
+        return minikernel, lminikernel
+
+    def build_kernel_call(self, minikernel, lminikernel, shape, operands,
+                          signature=None):
+        """
+        Build a call to a minivect kernel. If a signature is given, the
+        kernel is contiguous and does not take strides.
+        """
+        args = [shape]
+        scalar_args = []
+        for operand in operands:
+            if operand.type.is_array:
+                data_p = self.array_attr(operand, 'data')
+                data_p = nodes.CoercionNode(data_p,
+                                            operand.type.dtype.pointer())
+                args.append(data_p)
+                if signature is None:
+                    if not isinstance(operand, nodes.CloneNode):
+                        operand = nodes.CloneNode(operand)
+                    args.append(self.array_attr(operand, 'strides'))
+            else:
+                scalar_args.append(operand)
+
+        args.extend(scalar_args)
+        return nodes.NativeCallNode(signature or minikernel.type, args,
+                                    lminikernel)
+
+    def build_versioned_call(self, minikernel, lminikernel, shape, operands,
+                             outputs, allow_identical):
+        """
+        Build a call to a (linked) minivect kernel. If the kernel has a
+        contiguous version, check at runtime whether the operands are
+        contiguous and whether the outputs overlap other operands:
+
+            if contiguous_noalias(shape, operands...):
+                contig_kernel(shape, data1, data2, ...)
+            else:
+                strided_kernel(shape, data1, strides1, data2, strides2, ...)
+
+        The contiguous version marks its operands noalias, which allows
+        LLVM to vectorize it. Returns a list of statements.
+        """
+        if minikernel.contig_name is None:
+            return [self.build_kernel_call(minikernel, lminikernel, shape,
+                                           operands)]
+
+        lcontig = lminikernel.module.get_function_named(
+            minikernel.contig_name)
+
+        # Evaluate shape and operands before the check
+        if not isinstance(shape, nodes.CloneableNode):
+            shape = nodes.CloneableNode(shape)
+        stmts = [ast.Expr(value=shape)]
+
+        clones = []
+        for operand in operands:
+            if isinstance(operand, nodes.CloneableNode):
+                stmts.append(ast.Expr(value=operand))
+                operand = operand.clone
+            clones.append(operand)
+
+        test = slicenodes.ContiguousNoAliasNode(shape.clone, clones, outputs,
+                                                allow_identical)
+        contig_call = self.build_kernel_call(minikernel, lcontig, shape.clone,
+                                             clones, minikernel.contig_type)
+        strided_call = self.build_kernel_call(minikernel, lminikernel,
+                                              shape.clone, clones)
+        stmts.append(nodes.build_if(test=test, body=[contig_call],
+                                    orelse=[strided_call]))
+        return stmts
+
+    def register_array_expression(self, node, lhs=None):
+        super(ArrayExpressionRewriteNative, self).register_array_expression(
+            node, lhs)
+
+        # llvm_module = llvm.core.Module.new(temp_name("array_expression_module"))
+        # llvm_module = self.env.llvm_context.module
+
+        lhs_type = lhs.type if lhs else node.type
+        is_expr = lhs is None
+
+        if node.type.is_array and lhs_type.ndim < node.type.ndim:
+            # TODO: this is valid in NumPy if the leading dimensions of the
+            # TODO: RHS have extent 1
+            raise error.NumbaError(
+                node, "Right hand side must have a "
+                      "dimensionality <= %d" % lhs_type.ndim)
+
+        lkernel, signature, operands = self.compile_scalar_kernel(lhs, node)
+        llvm_module = lkernel.module
 
-        operands = ufunc_builder.operands
         operands = [nodes.CloneableNode(operand) for operand in operands]
 
         if lhs is not None:
@@ -287,68 +604,361 @@ class ArrayExpressionRewriteNative(ArrayExpressionRewrite):
         shape = slicenodes.BroadcastNode(lhs_type, broadcast_operands)
         operands = [op.clone for op in operands]
 
-        if lhs is None and self.nopython:
-            raise error.NumbaError(
-                node, "Cannot allocate new memory in nopython context")
-        elif lhs is None:
+        if lhs is None:
+            # In nopython context this is allocated by the native array
+            # runtime, see LateSpecializer.visit_ArrayNewEmptyNode
             # TODO: determine best output order at runtime
             shape = shape.cloneable
+            storage = self.query(node, 'array_storage') or 'heap'
             lhs = nodes.ArrayNewEmptyNode(lhs_type, shape.clone,
-                                          lhs_type.is_f_contig).cloneable
+                                          lhs_type.is_f_contig,
+                                          storage=storage).cloneable
 
         # Build minivect wrapper kernel
-        context = NumbaStaticArgsContext()
-        context.llvm_module = llvm_module
-        # context.llvm_ee = self.env.llvm_context.execution_engine
-
-        b = context.astbuilder
-        variables = [b.variable(name_node.type, "op%d" % i)
-                     for i, name_node in enumerate([lhs] + operands)]
-        miniargs = [b.funcarg(variable) for variable in variables]
-        body = miniutils.build_kernel_call(func_env.lfunc.name, signature,
-                                           miniargs, b)
-
-        minikernel = b.function_from_numpy(
-            temp_name("array_expression"), body, miniargs)
-        lminikernel, = context.run_simple(minikernel,
-                                          specializers.StridedSpecializer)
-        # lminikernel.linkage = llvm.core.LINKAGE_LINKONCE_ODR
+        operands.insert(0, lhs)
+        calls = [(lkernel.name, signature, range(len(operands)))]
+        minikernel, lminikernel = self.build_minikernel(
+            llvm_module, "array_expression", operands, calls)
 
         # pipeline.run_env(self.env, func_env, pipeline_name='post_codegen')
         # llvm_module.verify()
-        del func_env
 
-        assert lminikernel.module is llvm_module
         # print("---------")
         # print(llvm_module)
         # print("~~~~~~~~~~~~")
         lminikernel = self.env.llvm_context.link(lminikernel)
 
         # Build call to minivect kernel
-        operands.insert(0, lhs)
-        args = [shape]
-        scalar_args = []
-        for operand in operands:
-            if operand.type.is_array:
-                data_p = self.array_attr(operand, 'data')
-                data_p = nodes.CoercionNode(data_p,
-                                            operand.type.dtype.pointer())
-                if not isinstance(operand, nodes.CloneNode):
-                    operand = nodes.CloneNode(operand)
-                strides_p = self.array_attr(operand, 'strides')
-                args.extend((data_p, strides_p))
-            else:
-                scalar_args.append(operand)
-
-        args.extend(scalar_args)
-        result = nodes.NativeCallNode(minikernel.type, args, lminikernel)
+        stmts = self.build_versioned_call(minikernel, lminikernel, shape,
+                                          operands, outputs=[0],
+                                          allow_identical=True)
 
         # Use native slicing in array expressions
-        slicenodes.mark_nopython(ast.Suite(body=result.args))
+        slicenodes.mark_nopython(ast.Suite(body=stmts))
 
         if not is_expr:
             # a[:] = b[:] * c[:]
-            return result
+            return stmts[0] if len(stmts) == 1 else ast.Suite(body=stmts)
 
         # b[:] * c[:], return new array as expression
-        return nodes.ExpressionNode(stmts=[result], expr=lhs.clone)
+        return nodes.ExpressionNode(stmts=stmts, expr=lhs.clone)
+
+    #------------------------------------------------------------------------
+    # Reductions
+    #------------------------------------------------------------------------
+
+    def visit_Call(self, node):
+        kind = self.query(node, 'reduction')
+        if kind is not None:
+            return self.register_reduction(node, kind)
+
+        return super(ArrayExpressionRewriteNative, self).visit_Call(node)
+
+    def is_fusable_reduction(self, node):
+        "Whether the argument of a reduction can be fused with it"
+        for child in ast.walk(node):
+            if (isinstance(child, ast.UnaryOp) and
+                    isinstance(child.op, ast.Not)):
+                return False
+
+        return is_elementwise_expr(self.env, unwrap_coercions(node))
+
+    def register_reduction(self, node, kind):
+        """
+        Rewrite np.sum/np.prod/np.amin/np.amax of an array to a native
+        reduction, evaluating an element-wise argument in the reduction
+        loop:
+
+            np.sum(a * b + c)  ->  sum_reduction(a, b, c)
+        """
+        arg = node.args[0]
+        ndim = arg.type.ndim
+        if self.is_fusable_reduction(arg):
+            self.nesting_level += 1
+            arg = self.visit(arg)
+            self.nesting_level -= 1
+            ufunc_ast, signature, ufunc_builder = get_py_ufunc_ast(
+                self.env, None, arg)
+            expr = ufunc_ast.body[0].value
+            operands = ufunc_builder.operands
+        else:
+            # Reduce the array (or evaluate the array expression first)
+            operands = [self.visit(arg)]
+            expr = ast.Name(id='op0', ctx=ast.Load())
+
+        argtypes = [operand.type for operand in operands]
+        lfunc = reductions.compile_reduction(
+            self.env, kind, expr, argtypes, ndim, node.type, self.nopython)
+        lfunc = self.llvm_module.get_or_insert_function(lfunc.type.pointee,
+                                                        lfunc.name)
+
+        result = nodes.NativeCallNode(node.type(*argtypes), operands, lfunc,
+                                      name=kind)
+
+        # Use native slicing in array expressions
+        slicenodes.mark_nopython(ast.Suite(body=result.args))
+
+        if not self.nopython:
+            # Empty arrays for np.amin/np.amax, or shape mismatches
+            result = nodes.PyErr_OccurredNode(result)
+
+        return result
+
+    #------------------------------------------------------------------------
+    # Fusion
+    #------------------------------------------------------------------------
+
+    def visit_ControlBlock(self, node):
+        self.setblock(node)
+        self.visitlist(node.phi_nodes)
+
+        body = []
+        for stmts in self.fusion_groups(node.body):
+            if len(stmts) == 1:
+                result = self.visit(stmts[0])
+                if result is not None:
+                    body.append(result)
+            else:
+                body.extend(self.fuse(stmts))
+
+        node.body = body
+        return node
+
+    def fusable(self, stmt):
+        """
+        Return (ndim, written variable name) if the statement is an
+        element-wise array statement that can be fused, or None:
+
+            a[...] = <array expression or scalar>
+            tmp = <element-wise array expression>
+        """
+        if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1):
+            return None
+
+        target, value = stmt.targets[0], stmt.value
+        if (isinstance(target, ast.Subscript) and target.type.is_array and
+                isinstance(target.value, ast.Name) and
+                is_elementwise_assignment(stmt) and
+                (not value.type.is_array or
+                 value.type.ndim <= target.type.ndim)):
+            return target.type.ndim, target.value.id
+
+        elif (isinstance(target, ast.Name) and target.variable.renameable and
+                  not (target.variable.is_cellvar or
+                       target.variable.is_freevar) and
+                  is_elementwise_expr(self.env, unwrap_coercions(value)) and
+                  value.type == target.variable.type):
+            return value.type.ndim, None
+
+        return None
+
+    def fusion_groups(self, body):
+        "Partition a list of statements in lists of statements to fuse"
+        result = []
+        group = None
+        for stmt in body:
+            fusable = self.fusable(stmt)
+            if fusable is None:
+                group = None
+                result.append([stmt])
+                continue
+
+            ndim, write = fusable
+            if (group is None or group.ndim != ndim or
+                    group.conflicts(stmt, write)):
+                group = FusionGroup(self.env, ndim)
+                result.append(group)
+
+            group.add(stmt, write)
+
+        groups = []
+        for group in result:
+            if isinstance(group, FusionGroup):
+                groups.extend(group.split())
+            else:
+                groups.append(group)
+
+        return groups
+
+    def fuse(self, stmts):
+        """
+        Evaluate a group of element-wise statements with one minivect
+        kernel. Fusion is valid only if the left hand sides have equal
+        shapes and do not partially overlap other operands (see
+        slicenodes.FusionGuardNode), otherwise we evaluate the statements
+        one by one, materializing the temporaries:
+
+            evaluate operands and left hand sides
+            if fusion_guard(lhs1, lhs2, ..., operands...):
+                fused_kernel(broadcast(lhs1, lhs2, ..., operands...), ...)
+            else:
+                tmp = kernel1(broadcast(operands1...), ...)
+                kernel2(broadcast(lhs2, tmp, operands2...), ...)
+        """
+        temps = {}
+        outputs = []
+        order = []
+        for stmt in stmts:
+            self.nesting_level = 1
+            if isinstance(stmt.targets[0], ast.Name):
+                value = self.visit(stmt.value)
+                temps[stmt.targets[0].variable] = value
+                order.append((stmt, None, value))
+            else:
+                target = self.visit(stmt.targets[0])
+                if isinstance(target, ast.Subscript):
+                    target = slicenodes.rewrite_slice(target, self.nopython)
+                value = self.visit(stmt.value)
+                order.append((stmt, len(outputs), value))
+                outputs.append((target, value))
+            self.nesting_level = 0
+
+        # Compile scalar kernels, substituting temporaries
+        operands = [nodes.CloneableNode(lhs) for lhs, value in outputs]
+        positions = {}
+        kernels = []
+        llvm_module = None
+        for i, (lhs, value) in enumerate(outputs):
+            value = substitute_temps(self.env, value, temps)
+            lkernel, signature, kernel_operands = self.compile_scalar_kernel(
+                lhs, value)
+
+            if llvm_module is None:
+                llvm_module = lkernel.module
+            else:
+                llvm_module.link_in(lkernel.module)
+
+            indices = [i]
+            for operand in kernel_operands:
+                if id(operand) not in positions:
+                    positions[id(operand)] = len(operands)
+                    operands.append(nodes.CloneableNode(operand))
+                indices.append(positions[id(operand)])
+
+            kernels.append((lkernel.name, signature, indices))
+
+        # Build the fused kernel and the kernels for the fallback
+        fused, lfused = self.build_minikernel(
+            llvm_module, "fused_array_expression", operands, kernels)
+
+        fallbacks = []
+        for stmt, output, value in order:
+            if output is None:
+                lhs = None
+            else:
+                lhs = outputs[output][0]
+
+            # Compile a copy, the fused kernels share the operands
+            lkernel, signature, kernel_operands = self.compile_scalar_kernel(
+                lhs, substitute_temps(self.env, value, {}))
+            llvm_module.link_in(lkernel.module)
+
+            # Operands not in the fused kernel load the materialized
+            # temporaries, and are evaluated in the fallback
+            fallback_operands = []
+            broadcast_operands = []
+            for operand in kernel_operands:
+                if id(operand) in positions:
+                    operand = operands[positions[id(operand)]]
+                    broadcast_operands.append(operand.clone)
+                else:
+                    operand = nodes.CloneableNode(operand)
+                    broadcast_operands.append(operand)
+                fallback_operands.append(operand)
+
+            if lhs is None:
+                lhs_type = stmt.targets[0].variable.type
+                shape = slicenodes.BroadcastNode(
+                    lhs_type, broadcast_operands).cloneable
+                storage = self.query(value, 'array_storage') or 'heap'
+                lhs = nodes.ArrayNewEmptyNode(lhs_type, shape.clone,
+                                              lhs_type.is_f_contig,
+                                              storage=storage).cloneable
+            else:
+                lhs = operands[output]
+                shape = slicenodes.BroadcastNode(
+                    lhs.type, [lhs.clone] + broadcast_operands)
+
+            calls = [(lkernel.name, signature,
+                      range(len(fallback_operands) + 1))]
+            minikernel, lminikernel = self.build_minikernel(
+                llvm_module, "array_expression", [lhs] + fallback_operands,
+                calls)
+            fallbacks.append((minikernel, lminikernel, shape, lhs,
+                              fallback_operands))
+
+        lfused = self.env.llvm_context.link(lfused)
+
+        # Evaluate operands once, then call the kernels
+        result = [ast.Expr(value=operand) for operand in operands]
+
+        lhs_type = outputs[0][0].type
+        clones = [operand.clone for operand in operands]
+        shape = slicenodes.BroadcastNode(lhs_type, clones)
+        # Statements of a fused kernel may read an output written by
+        # another statement, which must not be identical to its operands
+        fused_calls = self.build_versioned_call(
+            fused, lfused, shape, [operand.clone for operand in operands],
+            outputs=range(len(outputs)), allow_identical=len(kernels) == 1)
+
+        fallback_calls = []
+        for (stmt, output, value), fallback in zip(order, fallbacks):
+            minikernel, lminikernel, shape, lhs, fallback_operands = fallback
+            lminikernel = lfused.module.get_function_named(lminikernel.name)
+            if output is not None:
+                lhs = lhs.clone
+
+            calls = self.build_versioned_call(
+                minikernel, lminikernel, shape,
+                [lhs] + [operand.clone for operand in fallback_operands],
+                outputs=[0], allow_identical=True)
+
+            if output is None:
+                stmt.value = nodes.ExpressionNode(stmts=calls,
+                                                  expr=lhs.clone)
+                fallback_calls.append(stmt)
+            else:
+                fallback_calls.extend(calls)
+
+        test = slicenodes.FusionGuardNode(
+            [operand.clone for operand in operands], len(outputs),
+            self.fusion_exclusive(order, temps, positions))
+        result.append(nodes.build_if(test=test, body=fused_calls,
+                                     orelse=fallback_calls))
+
+        # Use native slicing in array expressions
+        slicenodes.mark_nopython(ast.Suite(body=result))
+        return result
+
+    def fusion_exclusive(self, order, temps, positions):
+        """
+        For each left hand side, return the positions of the operands it
+        must be disjoint from. The fused kernel evaluates a temporary where
+        it is used, so a left hand side must not be identical to an operand
+        of a temporary defined before and used after it:
+
+            t = a * 2
+            a[:] = 0
+            b[:] = t    # t must read 'a' before it is assigned to
+        """
+        exclusive = []
+        for i, (stmt, output, value) in enumerate(order):
+            if output is None:
+                continue
+
+            later = set()
+            for _, _, later_value in order[i+1:]:
+                later |= names(later_value)
+
+            result = set()
+            for temp_stmt, temp_output, temp_value in order[:i]:
+                if temp_output is None and temp_stmt.targets[0].id in later:
+                    value = substitute_temps(self.env, temp_value, temps)
+                    result.update(
+                        positions[id(operand)]
+                            for operand in elementwise_operands(self.env,
+                                                                value)
+                                if id(operand) in positions)
+            exclusive.append(result)
+
+        return exclusive
@@ -19,11 +19,16 @@ cellvars packs them into a heap-allocated structure, the closure scope.
 
 The closure scope is passed into 'inner' when called from within outer.
 
-The execution of 'def' creates a NumbaFunction, which has itself as the
- m_self attribute. So when 'inner' is invoked from Python, the numba
- wrapper function gets called with NumbaFunction object and the args
+If 'inner' escapes 'outer' (it is returned, stored, or used by another
+inner function), the execution of 'def' creates a NumbaFunction, which has
+ itself as the m_self attribute. So when 'inner' is invoked from Python, the
+ numba wrapper function gets called with NumbaFunction object and the args
  tuple. The closure scope is then set in NumbaFunction.func_closure.
 
+The NumbaFunction of a closure is cached: a new one is only created if the
+previous one is still referenced. Closures that do not escape need no
+NumbaFunction, and are only called natively.
+
 The closure scope is an extension type with the cellvars as attributes.
 Closure scopes are chained together, since multiple inner scopes may need
 to share a single outer scope. E.g.
@@ -246,6 +251,26 @@ def lookup_scope_attribute(cur_scope, var_name, ctx=None):
     raise error.InternalError(
             scope_type, "Unable to look up attribute", var_name)
 
+def find_escaping_closures(func_def, cellvars):
+    """
+    Find the closures of func_def that escape it. A closure escapes when it
+    is used other than by calling it in func_def, e.g. when it is returned
+    or called from another inner function (which makes it a cellvar).
+    """
+    called = set(id(node.func) for node in ast.walk(func_def)
+                     if isinstance(node, nodes.ClosureCallNode))
+
+    escaping = set(closure for closure in func_def.closures
+                               if closure.name in cellvars)
+    for node in ast.walk(func_def):
+        type = getattr(node, 'type', None)
+        if (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and
+                type is not None and type.is_closure and
+                id(node) not in called):
+            escaping.add(type.closure)
+
+    return escaping
+
 CLOSURE_SCOPE_ARG_NAME = '__numba_closure_scope'
 
 class ClosureTransformer(visitors.NumbaTransformer):
@@ -291,6 +316,14 @@ class ClosureTypeInferer(ClosureTransformer):
 
         logger.debug("Cellvars in function %s: %s", node.name, cellvars)
 
+        # Closures that don't escape are called natively, they don't need
+        # a NumbaFunction or a wrapper
+        escaping = find_escaping_closures(node, cellvars)
+        for closure in node.closures:
+            if closure not in escaping:
+                closure.need_numba_func = False
+                closure.func_env.need_closure_wrapper = False
+
         outer_scope = self.outer_scope
         if outer_scope:
             outer_scope_type = outer_scope.type
@@ -320,12 +353,21 @@ class ClosureTypeInferer(ClosureTransformer):
         scope_type = typesystem.ClosureScopeType(py_class, outer_scope_type)
         scope_type.unmangled_symtab = dict(fields)
 
+        # Scopes are compact, so they can be allocated without a __dict__
+        # for _numba_attrs
+        scope_type.is_compact = True
+        scope_type.compute_offsets(
+            extension_types.compact_layout_class(py_class))
+
         AttrTable = attributetable.AttributeTable
         scope_type.attribute_table = AttrTable.from_list(py_class=None,
                                                          attributes=fields)
 
+        classdict = {
+            '_numba_attrs': property(extension_types.get_attributes),
+        }
         ext_type = extension_types.create_new_extension_type(
-                type, func_name , (object,), {}, scope_type, None)
+                type, func_name , (object,), classdict, scope_type, None)
 
         # Instantiate closure scope
         logger.debug("Generate closure %s %s %s", node.name, scope_type,
@@ -436,11 +478,14 @@ class ClosureSpecializer(ClosureTransformer):
         After instantiation, assign the parent scope and all function
         arguments that belong in the scope to the scope.
         """
-        ctor = nodes.objconst(node.ext_type.__new__)
-        ext_type_arg = nodes.objconst(node.ext_type)
-        create_scope = nodes.ObjectCallNode(
-                    signature=node.scope_type(object_), func=ctor,
-                    args=[ext_type_arg])
+        # Allocate the scope natively instead of calling
+        # ext_type.__new__(ext_type)
+        new_scope_signature = node.scope_type(object_)
+        new_scope = nodes.ptrfromint(extension_types.new_closure_scope_pointer,
+                                     new_scope_signature.pointer())
+        create_scope = nodes.NativeFunctionCallNode(
+                    signature=new_scope_signature, function_node=new_scope,
+                    args=[nodes.objconst(node.ext_type)])
 
         create_scope = create_scope.cloneable
         scope = create_scope.clone
@@ -506,13 +551,6 @@ class ClosureSpecializer(ClosureTransformer):
 
         closure_scope = self.ast.cur_scope
 
-        if closure_scope is None:
-            closure_scope = nodes.NULL
-            scope_type = void.pointer()
-        else:
-            assert node.func_def.args.args[0].variable.type
-            scope_type = closure_scope.type
-
         self.env.translation.push_env(func_env)
         try:
             node.wrapper_func, node.wrapper_lfunc, methoddef = (
@@ -524,9 +562,27 @@ class ClosureSpecializer(ClosureTransformer):
         # assert methoddef in node.py_func.live_objects
         modname = self.module_name
         self.keep_alive(modname)
+        self.keep_alive(methoddef)
+
+        # Every execution of 'def' gives a new function, also without a
+        # closure scope
+        if closure_scope is None:
+            scope_type = void.pointer()
+            closure = nodes.NULL
+        else:
+            assert node.func_def.args.args[0].variable.type
+            scope_type = closure_scope.type
+            closure = closure_scope
+
+        # The memory of the last deallocated NumbaFunction of this 'def',
+        # which is reused for the next one. The functions keep the cache
+        # alive.
+        numbafunc_cache = numbawrapper.NumbaFunctionCache()
+        self.keep_alive(numbafunc_cache)
 
         # Create function signature with closure scope at runtime
         create_numbafunc_signature = node.type(
+            void.pointer(),     # PyObject **cache
             void.pointer(),     # PyMethodDef *ml
             object_,            # PyObject *module
             void.pointer(),     # PyObject *code
@@ -538,20 +594,21 @@ class ClosureSpecializer(ClosureTransformer):
 
         # Create function with closure scope at runtime
         create_numbafunc = nodes.ptrfromint(
-                        numbawrapper.NumbaFunction_NewEx_pointer,
+                        numbawrapper.NumbaFunction_NewCached_pointer,
                         create_numbafunc_signature.pointer())
 
         methoddef_p = ctypes.cast(ctypes.byref(methoddef),
                                   ctypes.c_void_p).value
 
         args = [
+            nodes.const(numbafunc_cache.address, void.pointer()),
             nodes.const(methoddef_p, void.pointer()),
             nodes.const(modname, object_),
             nodes.NULL,
-            closure_scope,
+            closure,
             nodes.const(node.lfunc_pointer, void.pointer()),
             nodes.const(node.type.signature, object_),
-            nodes.NULL, # nodes.const(node.py_func, object_),
+            nodes.const(numbafunc_cache, object_),
         ]
 
         func_call = nodes.NativeFunctionCallNode(
@@ -595,9 +652,9 @@ class ClosureSpecializer(ClosureTransformer):
         return cur_scope
 
     def visit_ClosureCallNode(self, node):
-        if node.closure_type.closure.need_closure_scope:
-            if (self.ast.cur_scope is None or
-                    self.ast.cur_scope.type != node.closure_type):
+        closure = node.closure_type.closure
+        if closure.need_closure_scope:
+            if closure not in self.ast.closures:
                 # Call to closure from outside outer function
                 # TODO: optimize calling a closure from an inner function, e.g.
                 # def outer():
@@ -606,7 +663,8 @@ class ClosureSpecializer(ClosureTransformer):
                 #     def inner2(): inner1()
                 cur_scope = self.retrieve_closure_from_numbafunc(node)
             else:
-                # Call to closure from within outer function
+                # Call to closure from within outer function, which passes
+                # the scope it was created with
                 cur_scope = self.ast.cur_scope
 
             # node.args[0] = cur_scope
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Detection of the instruction set extensions of the host CPU, used to
+configure the LLVM target machine.
+
+AVX, AVX2 and AVX-512 are enabled only if both the CPU and the operating
+system support them (the kernel hides the flags in /proc/cpuinfo if it
+does not save the extended register state), and if the LLVM we are linked
+against knows about them. Set NUMBA_CPU_FEATURES to override the detected
+feature string, e.g. NUMBA_CPU_FEATURES=-avx to disable AVX entirely.
+"""
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import subprocess
+
+import llvm
+
+# LLVM feature name -> (host flag names, minimum LLVM version)
+known_features = [
+    ('sse2',    (['sse2'],                 (3, 0))),
+    ('sse3',    (['pni', 'sse3'],          (3, 0))),
+    ('ssse3',   (['ssse3'],                (3, 0))),
+    ('sse4.1',  (['sse4_1', 'sse4.1'],     (3, 0))),
+    ('sse4.2',  (['sse4_2', 'sse4.2'],     (3, 0))),
+    ('avx',     (['avx', 'avx1.0'],        (3, 0))),
+    ('avx2',    (['avx2'],                 (3, 3))),
+    ('fma',     (['fma'],                  (3, 3))),
+    ('avx512f', (['avx512f'],              (3, 5))),
+]
+
+# Features that must be disabled explicitly if the host lacks them
+vector_features = ['avx', 'avx2', 'fma', 'avx512f']
+
+_host_flags = None
+
+#------------------------------------------------------------------------
+# Host Detection
+#------------------------------------------------------------------------
+
+def _linux_flags():
+    flags = set()
+    with open('/proc/cpuinfo') as f:
+        for line in f:
+            if line.startswith('flags'):
+                flags.update(line.split(':', 1)[1].split())
+                break
+    return flags
+
+def _darwin_flags():
+    output = subprocess.check_output(
+        ['sysctl', '-n', 'machdep.cpu.features', 'machdep.cpu.leaf7_features'])
+    return set(output.decode('ascii').lower().split())
+
+def _fallback_flags():
+    try:
+        from llvm.workaround.avx_support import detect_avx_support
+    except ImportError:
+        return set()
+
+    if detect_avx_support():
+        return set(['avx'])
+    return set()
+
+def host_flags():
+    "The set of feature flags of the host CPU, as reported by the OS"
+    global _host_flags
+
+    if _host_flags is None:
+        try:
+            if sys.platform.startswith('linux'):
+                _host_flags = _linux_flags()
+            elif sys.platform == 'darwin':
+                _host_flags = _darwin_flags()
+            else:
+                _host_flags = _fallback_flags()
+        except (OSError, IOError, subprocess.CalledProcessError):
+            _host_flags = _fallback_flags()
+
+    return _host_flags
+
+def host_features():
+    "The LLVM features (e.g. 'avx2') supported by the host and by LLVM"
+    flags = host_flags()
+    return [name for name, (host_names, version) in known_features
+                     if llvm.version >= version and flags.intersection(host_names)]
+
+def has_feature(name):
+    return name in host_features()
+
+#------------------------------------------------------------------------
+# Target Configuration
+#------------------------------------------------------------------------
+
+def feature_string(features):
+    """
+    Build an LLVM feature string that enables the given features and
+    disables the other vector extensions, e.g. '+avx,-avx2,-fma,-avx512f'
+    """
+    supported = [name for name, (_, version) in known_features
+                          if llvm.version >= version]
+    result = ["+" + name for name in features]
+    result.extend("-" + name for name in vector_features
+                      if name in supported and name not in features)
+    return ",".join(result)
+
+def llvm_features():
+    "The feature string for the target machine of the host"
+    if 'NUMBA_CPU_FEATURES' in os.environ:
+        return os.environ['NUMBA_CPU_FEATURES']
+    return feature_string(host_features())
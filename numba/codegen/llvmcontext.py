@@ -9,6 +9,7 @@ from numba import *
 from numba import nodes
 from numba.typesystem import is_obj, promote_to_native
 from numba.codegen.codeutils import llvm_alloca, if_badval
+from numba.codegen import cpufeatures
 from numba.codegen.debug import *
 
 
@@ -38,14 +39,7 @@ class LLVMContextManager(object):
         assert self.__singleton is None
         m = self.__module = lc.Module.new("numba_executable_module")
         # Create the TargetMachine
-        features = ''
-        # try:
-        #     from llvm.workaround.avx_support import detect_avx_support
-        #     if not detect_avx_support():
-        #         features = '-avx'
-        # except ImportError:
-        #     # Old llvm, disable AVX for all
-        features = '-avx'
+        features = cpufeatures.llvm_features()
         tm = self.__machine = le.TargetMachine.new(opt=cg, cm=le.CM_JITDEFAULT,
                                                    features=features)
         # Create the ExceutionEngine
@@ -18,6 +18,7 @@ from numba import nodes
 from numba import closures
 from numba import typesystem
 from numba import numbawrapper
+from numba import function_util
 
 from numba.functions import keep_alive
 from numba.symtab import Variable
@@ -146,6 +147,24 @@ def get_closure_scope(func_signature, func_obj):
     closure_scope = nodes.DereferenceNode(closure_field)
     return closure_scope
 
+def call_and_box_native_array(env, llvm_module, lfunc, func_signature, args):
+    """
+    Call a nopython function returning an array. The result may have been
+    allocated by the native array runtime, in which case it is turned into
+    a NumPy array here.
+    """
+    # Pretend the function returns a void *, we don't want the result to be
+    # refcounted as a Python object
+    signature = void.pointer()(*func_signature.args)
+    lfunc = lfunc.bitcast(signature.pointer().to_llvm(env.context))
+    func_call = nodes.NativeCallNode(signature, args, lfunc)
+
+    dtype = func_signature.return_type.dtype.get_dtype()
+    return function_util.utility_call(env.context, llvm_module,
+                                      "Numba_NativeArray_ToNumPy",
+                                      args=[func_call,
+                                            nodes.const(dtype, object_)])
+
 def build_wrapper_function_ast(env, wrapper_lfunc, llvm_module):
     """
     Build AST for LLVM function wrapper.
@@ -190,7 +209,11 @@ def build_wrapper_function_ast(env, wrapper_lfunc, llvm_module):
         closure_scope = get_closure_scope(func_signature, wrapper_lfunc.args[0])
         args.insert(0, closure_scope)
 
-    func_call = nodes.NativeCallNode(func_signature, args, lfunc)
+    if env.translation.nopython and func_signature.return_type.is_array:
+        func_call = call_and_box_native_array(env, llvm_module, lfunc,
+                                              func_signature, args)
+    else:
+        func_call = nodes.NativeCallNode(func_signature, args, lfunc)
 
     if not is_obj(func_signature.return_type):
         # Check for error using PyErr_Occurred()
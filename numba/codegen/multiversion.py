@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-versioning of exported functions by CPU feature level.
+
+Exported functions (see numba.pycc) can be compiled for several target
+levels, e.g. targets=['sse2', 'avx2', 'avx512']. The module is code
+generated once for every level with a target machine that has the features
+of that level, and the exported symbol becomes a dispatch stub that
+determines the level of the CPU with the cpuid instruction on its first
+call and caches the best version:
+
+    static ret (*name_version)(args);
+
+    ret name(args) {
+        if (name_version == NULL)
+            name_version = versions[best level <= numba_cpu_level()];
+        return name_version(args);
+    }
+
+The lowest requested level is the fallback of all functions, and is the
+module that holds the dispatch stubs, the Python wrappers and the global
+variables. The modules of the higher levels only define their renamed
+versions of the exported functions (name.avx2), everything else in them
+is internal or refers to the globals of the fallback module.
+"""
+from __future__ import print_function, division, absolute_import
+
+import llvm
+import llvm.core as lc
+import llvm.ee as le
+
+from numba import error
+from numba import llvm_types as lt
+from numba.codegen import cpufeatures
+
+# Target level -> LLVM features of the level, ordered from low to high
+target_levels = [
+    ('sse2',   ['sse2']),
+    ('sse4',   ['sse2', 'sse3', 'ssse3', 'sse4.1', 'sse4.2']),
+    ('avx',    ['sse2', 'sse3', 'ssse3', 'sse4.1', 'sse4.2', 'avx']),
+    ('avx2',   ['sse2', 'sse3', 'ssse3', 'sse4.1', 'sse4.2', 'avx', 'avx2',
+                'fma']),
+    ('avx512', ['sse2', 'sse3', 'ssse3', 'sse4.1', 'sse4.2', 'avx', 'avx2',
+                'fma', 'avx512f']),
+]
+
+level_names = [name for name, features in target_levels]
+level_features = dict(target_levels)
+
+cpu_level_name = "numba_cpu_level"
+
+#------------------------------------------------------------------------
+# Targets
+#------------------------------------------------------------------------
+
+def level(target):
+    return level_names.index(target)
+
+def check_targets(targets):
+    """
+    Verify a list of target levels and return them ordered from low to high.
+    """
+    if not targets:
+        raise error.NumbaError("Expected at least one target")
+
+    supported = [name for name, (_, version) in cpufeatures.known_features
+                          if llvm.version >= version]
+    for target in targets:
+        if target not in level_features:
+            raise error.NumbaError(
+                "Unknown target '%s', expected one of %s" % (
+                                        target, ", ".join(level_names)))
+
+        missing = set(level_features[target]) - set(supported)
+        if missing:
+            raise error.NumbaError(
+                "Target '%s' is not supported by LLVM %s" % (
+                            target, ".".join(map(str, llvm.version))))
+
+    return sorted(set(targets), key=level)
+
+def host_level():
+    "The highest level supported by the host, or -1"
+    features = cpufeatures.host_features()
+    result = -1
+    for i, (name, level_features) in enumerate(target_levels):
+        if all(feature in features for feature in level_features):
+            result = i
+    return result
+
+def select_target(targets):
+    """
+    Select the target that the dispatch stub would select on the host, or
+    None if the host supports none of the targets.
+    """
+    targets = check_targets(targets)
+    supported = [target for target in targets
+                            if level(target) <= host_level()]
+    if supported:
+        return supported[-1]
+    return None
+
+def target_machine(target):
+    "Target machine for the features of a target level"
+    features = cpufeatures.feature_string(level_features[target])
+    return le.TargetMachine.new(reloc=le.RELOC_PIC, features=features)
+
+def version_name(name, target):
+    return "%s.%s" % (name, target)
+
+#------------------------------------------------------------------------
+# CPU Detection
+#------------------------------------------------------------------------
+
+_int32 = lt._int32
+
+def _const(value):
+    return lc.Constant.int(_int32, value)
+
+def _cpuid(builder, leaf, subleaf=0):
+    "Emit cpuid and return (eax, ebx, ecx, edx)"
+    result_type = lc.Type.struct([_int32] * 4)
+    asm_type = lc.Type.function(result_type, [_int32, _int32])
+    cpuid = lc.InlineAsm.get(asm_type, "cpuid",
+                             "={ax},={bx},={cx},={dx},{ax},{cx}")
+    result = builder.call(cpuid, [_const(leaf), _const(subleaf)])
+    return [builder.extract_value(result, i) for i in range(4)]
+
+def _xgetbv(builder):
+    "Emit xgetbv for XCR0 and return the low 32 bits"
+    result_type = lc.Type.struct([_int32] * 2)
+    asm_type = lc.Type.function(result_type, [_int32])
+    xgetbv = lc.InlineAsm.get(asm_type, "xgetbv", "={ax},={dx},{cx}")
+    result = builder.call(xgetbv, [_const(0)])
+    return builder.extract_value(result, 0)
+
+def _has_bits(builder, value, mask):
+    masked = builder.and_(value, _const(mask))
+    return builder.icmp(lc.ICMP_EQ, masked, _const(mask))
+
+def is_x86_64():
+    return le.TargetMachine.new().triple.startswith("x86_64")
+
+def build_cpu_level(llvm_module):
+    """
+    Define 'int numba_cpu_level(void)', which returns the index of the
+    highest level in target_levels that the CPU and OS support.
+    """
+    ftype = lc.Type.function(_int32, [])
+    lfunc = llvm_module.get_or_insert_function(ftype, cpu_level_name)
+    if not lfunc.is_declaration:
+        return lfunc
+
+    lfunc.linkage = lc.LINKAGE_INTERNAL
+    builder = lc.Builder.new(lfunc.append_basic_block("entry"))
+
+    if not is_x86_64():
+        builder.ret(_const(-1))
+        return lfunc
+
+    max_leaf, _, _, _ = _cpuid(builder, 0)
+    _, _, ecx, edx = _cpuid(builder, 1)
+
+    sse2 = _has_bits(builder, edx, 1 << 26)
+    sse4 = builder.and_(sse2, _has_bits(builder, ecx, (1 << 19) | (1 << 20)))
+
+    # AVX needs OS support for saving the YMM registers (OSXSAVE and XCR0)
+    avx_bits = (1 << 27) | (1 << 28)
+    avx = builder.and_(sse4, _has_bits(builder, ecx, avx_bits))
+    bb_avx = lfunc.append_basic_block("avx")
+    bb_done = lfunc.append_basic_block("done")
+    bb_entry = builder.basic_block
+    builder.cbranch(avx, bb_avx, bb_done)
+
+    builder.position_at_end(bb_avx)
+    xcr0 = _xgetbv(builder)
+    avx_os = _has_bits(builder, xcr0, 0x6)
+    avx512_os = _has_bits(builder, xcr0, 0xe6)
+    has_leaf7 = builder.icmp(lc.ICMP_UGE, max_leaf, _const(7))
+    _, ebx7, _, _ = _cpuid(builder, 7)
+    ebx7 = builder.select(has_leaf7, ebx7, _const(0))
+    fma = _has_bits(builder, ecx, 1 << 12)
+    avx2 = builder.and_(avx_os, builder.and_(fma, _has_bits(builder,
+                                                            ebx7, 1 << 5)))
+    avx512 = builder.and_(avx2, builder.and_(
+                    avx512_os, _has_bits(builder, ebx7, 1 << 16)))
+    avx_level = builder.select(avx_os, _const(level('avx')), _const(
+                                                        level('sse4')))
+    avx_level = builder.select(avx2, _const(level('avx2')), avx_level)
+    avx_level = builder.select(avx512, _const(level('avx512')), avx_level)
+    bb_avx = builder.basic_block
+    builder.branch(bb_done)
+
+    builder.position_at_end(bb_done)
+    sse_level = builder.select(sse2, _const(level('sse2')), _const(-1))
+    sse_level = builder.select(sse4, _const(level('sse4')), sse_level)
+    result = builder.phi(_int32)
+    result.add_incoming(sse_level, bb_entry)
+    result.add_incoming(avx_level, bb_avx)
+    builder.ret(result)
+
+    return lfunc
+
+#------------------------------------------------------------------------
+# Dispatch
+#------------------------------------------------------------------------
+
+def build_dispatcher(llvm_module, name, ftype, targets):
+    """
+    Define the exported function 'name', which dispatches to the versions
+    of the function for the given targets (ordered from low to high).
+    """
+    cpu_level = build_cpu_level(llvm_module)
+
+    lfunc = llvm_module.add_function(ftype, name)
+    lfunc.linkage = lc.LINKAGE_EXTERNAL
+
+    versions = [llvm_module.get_or_insert_function(ftype,
+                                                   version_name(name, target))
+                    for target in targets]
+
+    fptr_type = lc.Type.pointer(ftype)
+    cache = llvm_module.add_global_variable(fptr_type, name + ".version")
+    cache.initializer = lc.Constant.null(fptr_type)
+    cache.linkage = lc.LINKAGE_INTERNAL
+
+    builder = lc.Builder.new(lfunc.append_basic_block("entry"))
+    bb_select = lfunc.append_basic_block("select")
+    bb_call = lfunc.append_basic_block("call")
+
+    fptr = builder.load(cache)
+    is_null = builder.icmp(lc.ICMP_EQ, builder.ptrtoint(fptr, lt._intp),
+                           lc.Constant.int(lt._intp, 0))
+    builder.cbranch(is_null, bb_select, bb_call)
+    bb_entry = builder.basic_block
+
+    # Select the version of the highest level supported by the CPU, the
+    # first version is the fallback
+    builder.position_at_end(bb_select)
+    cpu = builder.call(cpu_level, [])
+    selected = versions[0]
+    for target, version in zip(targets[1:], versions[1:]):
+        supported = builder.icmp(lc.ICMP_SGE, cpu, _const(level(target)))
+        selected = builder.select(supported, version, selected)
+    builder.store(selected, cache)
+    builder.branch(bb_call)
+
+    builder.position_at_end(bb_call)
+    phi = builder.phi(fptr_type)
+    phi.add_incoming(fptr, bb_entry)
+    phi.add_incoming(selected, bb_select)
+    result = builder.call(phi, lfunc.args)
+    if ftype.return_type.kind == lc.TYPE_VOID:
+        builder.ret_void()
+    else:
+        builder.ret(result)
+
+    return lfunc
+
+#------------------------------------------------------------------------
+# Versions
+#------------------------------------------------------------------------
+
+def rename_versions(llvm_module, names, target):
+    "Rename the given functions to their version for the target"
+    for name in names:
+        llvm_module.get_function_named(name).name = version_name(name,
+                                                                 target)
+
+def clone_for_target(llvm_module, names, target):
+    """
+    Clone a module for a higher target level, which defines the versions of
+    the given functions for the target. Other definitions are made internal
+    to the clone, and global variables refer to the fallback module.
+    """
+    clone = llvm_module.clone()
+    for lfunc in clone.functions:
+        if lfunc.is_declaration:
+            continue
+        elif lfunc.name in names:
+            lfunc.name = version_name(lfunc.name, target)
+        elif lfunc.linkage != lc.LINKAGE_PRIVATE:
+            lfunc.linkage = lc.LINKAGE_INTERNAL
+
+    for gv in clone.global_variables:
+        if (not gv.is_declaration and
+                gv.linkage not in (lc.LINKAGE_INTERNAL, lc.LINKAGE_PRIVATE)):
+            gv.linkage = lc.LINKAGE_AVAILABLE_EXTERNALLY
+
+    return clone
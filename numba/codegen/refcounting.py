@@ -5,11 +5,21 @@ import llvm.core
 from numba import *
 from numba.utility.cbuilder import refcounting
 
+# In nopython context the only objects are arrays, and only those allocated
+# by the native array runtime are refcounted (see nativearray.c)
+native_refcounters = {
+    refcounting.Py_INCREF:  "Numba_NativeArray_XIncref",
+    refcounting.Py_XINCREF: "Numba_NativeArray_XIncref",
+    refcounting.Py_DECREF:  "Numba_NativeArray_XDecref",
+    refcounting.Py_XDECREF: "Numba_NativeArray_XDecref",
+}
+
 class RefcountingMixin(object):
 
     def refcount(self, func, value):
         "Refcount a value with a refcounting function"
-        assert not self.nopython
+        if self.nopython:
+            return self.native_refcount(func, value)
 
         refcounter = self.context.cbuilder_library.declare(func, self.env,
                                                            self.llvm_module)
@@ -18,6 +28,15 @@ class RefcountingMixin(object):
         b = self.builder
         return b.call(refcounter, [b.bitcast(value, object_ltype)])
 
+    def native_refcount(self, func, value):
+        "Refcount a native array (no-op for arrays owned by Python)"
+        extfn = self.context.utility_library.get(native_refcounters[func])
+        refcounter = extfn.declare_lfunc(self.context, self.llvm_module)
+        object_ltype = object_.to_llvm(self.context)
+
+        b = self.builder
+        return b.call(refcounter, [b.bitcast(value, object_ltype)])
+
     def decref(self, value):
         "Py_DECREF a value"
         return self.refcount(refcounting.Py_DECREF, value)
@@ -50,7 +69,6 @@ class RefcountingMixin(object):
             * Generate code at cleanup path
             * Restore basic block
         """
-        assert not self.nopython
         bb = self.builder.basic_block
 
         self.builder.position_at_end(self.current_cleanup_bb)
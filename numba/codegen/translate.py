@@ -20,6 +20,7 @@ from numba.codegen import coerce, complexsupport, refcounting
 from numba.codegen.llvmcontext import LLVMContextManager
 
 from numba import visitors, nodes, llvm_types, utils, function_util
+from numba import optimize
 from numba.minivect import minitypes, llvm_codegen
 from numba import ndarray_helpers, error
 from numba.typesystem import is_obj
@@ -34,6 +35,7 @@ from llvm_cbuilder import shortnames as C
 
 
 _int32_zero = lc.Constant.int(_int32, 0)
+const_int = ndarray_helpers.const_int
 
 
 _compare_mapping_float = {'>':lc.FCMP_OGT,
@@ -585,7 +587,7 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
 
         if not var.renameable:
             # Stack allocated variable
-            var = self.builder.load(value)
+            value = self.builder.load(value)
 
         acc = self.pyarray_accessor(value, var.type.dtype)
 
@@ -593,8 +595,8 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
             var.preloaded_data = acc.data
 
         if var.preload_shape:
-            shape = nodes.get_strides(self.builder, self.tbaa,
-                                      acc.shape, var.type.ndim)
+            shape = nodes.get_shape(self.builder, self.tbaa,
+                                    acc.dimensions, var.type.ndim)
             var.preloaded_shape = tuple(shape)
 
         if var.preload_strides:
@@ -910,6 +912,10 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
     #------------------------------------------------------------------------
 
     def visit_Subscript(self, node):
+        extent = self._preloaded_extent(node)
+        if extent is not None:
+            return extent
+
         value_type = node.value.type
         if not (value_type.is_carray or value_type.is_string or
                     value_type.is_pointer):
@@ -929,6 +935,17 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
 
         return lptr
 
+    def _preloaded_extent(self, node):
+        "Return the pre-loaded value of array.shape[i], or None"
+        if not optimize.is_extent(node):
+            return None
+
+        variable = node.value.array.variable
+        if not variable.preload_shape or variable.preloaded_shape is None:
+            return None
+
+        return variable.preloaded_shape[optimize.constant_index(node.slice)]
+
     #------------------------------------------------------------------------
     # Binary Operations
     #------------------------------------------------------------------------
@@ -1032,6 +1049,13 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
                                         operand)
         elif isinstance(op, ast.UAdd) and operand_type.is_numeric:
             return operand
+        elif isinstance(op, ast.USub) and operand_type.is_vector:
+            if operand_type.base_type.is_float:
+                return self.builder.fsub(lc.Constant.null(operand_ltype),
+                                         operand)
+            return self.builder.sub(lc.Constant.null(operand_ltype), operand)
+        elif isinstance(op, ast.UAdd) and operand_type.is_vector:
+            return operand
         elif isinstance(op, ast.Invert) and operand_type.is_int:
             return self.builder.xor(lc.Constant.int(operand_ltype, -1), operand)
         raise error.NumbaError(node, "Unary operator %s" % node.op)
@@ -1123,9 +1147,13 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
         return result
 
     def _handle_numeric_binop(self, lhs, node, op, rhs):
-        llvm_method_name = self._binops[op][node.type.is_int]
-        if node.type.is_int:
-            llvm_method_name = llvm_method_name[node.type.signed]
+        type = node.type
+        if type.is_vector:
+            type = type.base_type
+
+        llvm_method_name = self._binops[op][type.is_int]
+        if type.is_int:
+            llvm_method_name = llvm_method_name[type.signed]
 
         meth = getattr(self.builder, llvm_method_name)
         if not lhs.type == rhs.type:
@@ -1147,6 +1175,8 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
             result = self._handle_numeric_binop(lhs, node, op, rhs)
         elif (node.type.is_int or node.type.is_float) and op == ast.Mod:
             return self._handle_mod(node, lhs, rhs)
+        elif node.type.is_vector and op in self._binops:
+            result = self._handle_numeric_binop(lhs, node, op, rhs)
         elif node.type.is_complex:
             result = self._handle_complex_binop(lhs, op, rhs)
         elif pointer_type:
@@ -1197,6 +1227,8 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
                 real = self.caster.cast(real, ldst_base_type, **flags)
             imag = llvm.core.Constant.real(ldst_base_type, 0.0)
             val = self._create_complex(real, imag)
+        elif dst_type.is_vector and not node_type.is_vector:
+            val = self._splat(node_type, dst_type, val)
         else:
             flags = {}
             add_cast_flag_unsigned(flags, node_type, dst_type)
@@ -1521,6 +1553,104 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
     # Arrays
     #------------------------------------------------------------------------
 
+    def declare_utility(self, name):
+        "Declare a C utility function (see numba/external/utility.py)"
+        extfn = self.context.utility_library.get(name)
+        return extfn.declare_lfunc(self.context, self.llvm_module)
+
+    def visit_ExtentsNode(self, node):
+        intp = npy_intp.to_llvm(self.context)
+        ltype = llvm.core.Type.array(intp, len(node.extents))
+        extents = self.llvm_alloca(ltype, "extents")
+
+        for i, extent in enumerate(node.extents):
+            lextent = self.visit(extent)
+            self.builder.store(lextent, self.builder.gep(
+                extents, [const_int(0), const_int(i)]))
+
+        return self.builder.gep(extents, [const_int(0), const_int(0)])
+
+    def visit_ArrayFillNode(self, node):
+        array = self.visit(node.array)
+        value = self.alloca(node.type.dtype, "fill_value")
+        self.builder.store(self.visit(node.fill), value)
+
+        itemsize = llvm.core.Constant.int(npy_intp.to_llvm(self.context),
+                                          node.type.dtype.itemsize)
+        b = self.builder
+        b.call(self.declare_utility("Numba_NativeArray_Fill"),
+               [b.bitcast(array, object_.to_llvm(self.context)),
+                b.bitcast(value, llvm_types._void_star),
+                itemsize])
+        return array
+
+    def visit_StackArrayNode(self, node):
+        """
+        Allocate a native array in the stack frame. The header, shape and
+        strides are set up once in the entry block. The array is never
+        freed by the runtime, since the stack frame holds a reference.
+        """
+        b = self.builder
+        dtype = node.type.dtype
+        intp = npy_intp.to_llvm(self.context)
+        ndim = len(node.extents)
+
+        size = 1
+        for extent in node.extents:
+            size *= extent
+
+        strides = []
+        stride = dtype.itemsize
+        dims = range(ndim) if node.is_fortran else reversed(range(ndim))
+        for dim in dims:
+            strides.insert(0 if not node.is_fortran else dim, stride)
+            stride *= max(node.extents[dim], 1)
+
+        ldata_type = llvm.core.Type.array(dtype.to_llvm(self.context), size)
+        lshape_type = llvm.core.Type.array(intp, ndim)
+        make_extents = lambda values: llvm.core.Constant.array(
+            intp, [llvm.core.Constant.int(intp, value) for value in values])
+
+        flags = ndarray_helpers.NPY_ALIGNED | ndarray_helpers.NPY_WRITEABLE
+        if ndim <= 1 or not node.is_fortran:
+            flags |= ndarray_helpers.NPY_C_CONTIGUOUS
+        if ndim <= 1 or node.is_fortran:
+            flags |= ndarray_helpers.NPY_F_CONTIGUOUS
+
+        # ob_refcnt = 1, everything else NULL
+        head_len = llvm_types._head_len
+        fields = [llvm.core.Constant.null(ltype)
+                      for ltype in llvm_types._numpy_struct.elements]
+        fields[head_len - 2] = llvm.core.Constant.int(
+            llvm_types._numpy_struct.elements[head_len - 2], 1)
+        fields[head_len + 1] = const_int(ndim)
+        fields[head_len + 6] = const_int(flags)
+
+        bb = b.basic_block
+        b.position_at_beginning(self.lfunc.get_entry_basic_block())
+
+        header = b.alloca(llvm_types._numpy_struct, "stack_array")
+        lshape = b.alloca(lshape_type, "stack_array_shape")
+        lstrides = b.alloca(lshape_type, "stack_array_strides")
+        data = b.alloca(ldata_type, "stack_array_data")
+
+        b.store(make_extents(node.extents), lshape)
+        b.store(make_extents(strides), lstrides)
+        b.store(llvm.core.Constant.struct(fields), header)
+
+        acc = ndarray_helpers.PyArrayAccessor(b, header)
+        acc.data = b.bitcast(data, llvm_types._void_star)
+        acc.dimensions = b.gep(lshape, [const_int(0), const_int(0)])
+        acc.strides = b.gep(lstrides, [const_int(0), const_int(0)])
+
+        b.position_at_end(bb)
+
+        if node.fill is not None:
+            lfill = self.visit(node.fill)
+            b.store(llvm.core.Constant.array(lfill.type, [lfill] * size), data)
+
+        return b.bitcast(header, node.type.to_llvm(self.context))
+
     def visit_DataPointerNode(self, node):
         assert node.node.type.is_array
         lvalue = self.visit(node.node)
@@ -1528,6 +1658,12 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
         lptr = node.subscript(self, self.tbaa, lvalue, lindices)
         return self._handle_ctx(node, lptr, node.type.pointer())
 
+    def visit_ElementPointerNode(self, node):
+        larray = self.visit(node.array)
+        lindices = self.visitlist(node.indices)
+        data_pointer = nodes.DataPointerNode(node.array, None, ast.Store())
+        return data_pointer.subscript(self, self.tbaa, larray, lindices)
+
     #def visit_Index(self, node):
     #    return self.visit(node.value)
 
@@ -1566,6 +1702,99 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
         # hurgh, no dispatch on superclasses?
         return self.visit_ArrayAttributeNode(node)
 
+    #------------------------------------------------------------------------
+    # SIMD Vectors
+    #------------------------------------------------------------------------
+
+    def _vector_index(self, lindex):
+        return self.caster.cast(lindex, _int32, unsigned=False)
+
+    def _splat(self, type, vector_type, val):
+        "Broadcast a scalar to all elements of a vector"
+        base_type = vector_type.base_type
+        if type != base_type:
+            flags = {}
+            add_cast_flag_unsigned(flags, type, base_type)
+            val = self.caster.cast(val, base_type.to_llvm(self.context),
+                                   **flags)
+
+        lvector_type = vector_type.to_llvm(self.context)
+        vector = self.builder.insert_element(lc.Constant.undef(lvector_type),
+                                             val, lc.Constant.int(_int32, 0))
+        mask = lc.Constant.null(lc.Type.vector(_int32, vector_type.size))
+        return self.builder.shuffle_vector(vector, vector, mask)
+
+    def _vector_pointer(self, node, vector_type):
+        "Pointer to the elements of a vector load or store"
+        lbase = self.visit(node.base)
+        lindices = self.visitlist(node.indices)
+        if node.base.type.is_array:
+            data_pointer = nodes.DataPointerNode(node.base, None, ast.Store())
+            lptr = data_pointer.subscript(self, self.tbaa, lbase, lindices)
+        else:
+            lptr = self.builder.gep(lbase, lindices)
+
+        lvector_type = vector_type.to_llvm(self.context)
+        return self.builder.bitcast(lptr, lc.Type.pointer(lvector_type))
+
+    def visit_VectorLoadNode(self, node):
+        lptr = self._vector_pointer(node, node.type)
+        # Vector accesses only need the alignment of the elements
+        return self.builder.load(lptr, align=node.type.base_type.itemsize)
+
+    def visit_VectorStoreNode(self, node):
+        lvalue = self.visit(node.value)
+        vector_type = node.value.type
+        lptr = self._vector_pointer(node, vector_type)
+        self.builder.store(lvalue, lptr, align=vector_type.base_type.itemsize)
+
+    def visit_VectorShuffleNode(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        mask = lc.Constant.vector([lc.Constant.int(_int32, i)
+                                       for i in node.mask])
+        return self.builder.shuffle_vector(left, right, mask)
+
+    def visit_VectorExtractNode(self, node):
+        vector = self.visit(node.vector)
+        index = self._vector_index(self.visit(node.index))
+        return self.builder.extract_element(vector, index)
+
+    def visit_VectorInsertNode(self, node):
+        vector = self.visit(node.vector)
+        index = self._vector_index(self.visit(node.index))
+        value = self.visit(node.value)
+        return self.builder.insert_element(vector, value, index)
+
+    def visit_VectorReduceNode(self, node):
+        vector = self.visit(node.vector)
+        type = node.vector.type
+        add = self._binops[ast.Add][type.base_type.is_int]
+        if type.base_type.is_int:
+            add = add[type.base_type.signed]
+        add = getattr(self.builder, add)
+
+        # Add the upper half to the lower half until one element is left
+        size = type.size
+        while size > 1 and size % 2 == 0:
+            size //= 2
+            mask = lc.Constant.vector([lc.Constant.int(_int32, size + i)
+                                           for i in range(size)])
+            upper = self.builder.shuffle_vector(vector, vector, mask)
+            mask = lc.Constant.vector([lc.Constant.int(_int32, i)
+                                           for i in range(size)])
+            lower = self.builder.shuffle_vector(vector, vector, mask)
+            vector = add(lower, upper)
+
+        result = self.builder.extract_element(vector,
+                                              lc.Constant.int(_int32, 0))
+        for i in range(1, size):
+            element = self.builder.extract_element(vector,
+                                                   lc.Constant.int(_int32, i))
+            result = add(result, element)
+
+        return result
+
     #------------------------------------------------------------------------
     # Array Slicing
     #------------------------------------------------------------------------
@@ -1716,6 +1945,113 @@ class LLVMCodeGenerator(visitors.NumbaVisitor,
 
         return shape
 
+    def visit_FusionGuardNode(self, node):
+        b = self.builder
+
+        def const(value):
+            return llvm.core.Constant.int(C.npy_intp, value)
+
+        # The data pointer, shape, strides and the span [lo, hi) of the
+        # memory of every array operand
+        views = {}
+        for i, op in enumerate(node.operands):
+            if not op.type.is_array:
+                continue
+
+            acc = ndarray_helpers.PyArrayAccessor(b, self.visit(op))
+            start = b.ptrtoint(acc.data, C.npy_intp)
+            lo, hi = start, b.add(start, const(op.type.dtype.itemsize))
+            shape, strides = [], []
+            for dim in range(op.type.ndim):
+                idx = [llvm.core.Constant.int(C.int, dim)]
+                extent = b.load(b.gep(acc.shape, idx))
+                stride = b.load(b.gep(acc.strides, idx))
+                offset = b.mul(b.sub(extent, const(1)), stride)
+                negative = b.icmp(llvm.core.ICMP_SLT, offset, const(0))
+                lo = b.add(lo, b.select(negative, offset, const(0)))
+                hi = b.add(hi, b.select(negative, const(0), offset))
+                shape.append(extent)
+                strides.append(stride)
+
+            views[i] = start, lo, hi, shape, strides
+
+        result = llvm.core.Constant.int(_int1, 1)
+
+        first_shape = views[0][3]
+        for i in range(1, node.noutputs):
+            for lhs, rhs in zip(first_shape, views[i][3]):
+                result = b.and_(result, b.icmp(llvm.core.ICMP_EQ, lhs, rhs))
+
+        for i in range(node.noutputs):
+            start, lo, hi, shape, strides = views[i]
+            for j, (other_start, other_lo, other_hi,
+                    other_shape, other_strides) in views.items():
+                if i == j:
+                    continue
+
+                ok = b.or_(b.icmp(llvm.core.ICMP_SLE, hi, other_lo),
+                           b.icmp(llvm.core.ICMP_SLE, other_hi, lo))
+                if (len(shape) == len(other_shape) and
+                        j not in node.exclusive[i]):
+                    identical = b.icmp(llvm.core.ICMP_EQ, start, other_start)
+                    for values in zip(shape + strides,
+                                      other_shape + other_strides):
+                        identical = b.and_(identical, b.icmp(
+                            llvm.core.ICMP_EQ, *values))
+                    ok = b.or_(ok, identical)
+
+                result = b.and_(result, ok)
+
+        return result
+
+    def visit_ContiguousNoAliasNode(self, node):
+        b = self.builder
+        shape = self.visit(node.shape)
+        extents = [b.load(b.gep(shape, [llvm.core.Constant.int(C.int, i)]))
+                       for i in range(node.ndim)]
+
+        def const(value):
+            return llvm.core.Constant.int(C.npy_intp, value)
+
+        result = llvm.core.Constant.int(_int1, 1)
+        spans = {}
+        for i, op in enumerate(node.operands):
+            if not op.type.is_array:
+                continue
+
+            acc = ndarray_helpers.PyArrayAccessor(b, self.visit(op))
+            nbytes = const(op.type.dtype.itemsize)
+            for dim in reversed(range(node.ndim)):
+                idx = [llvm.core.Constant.int(C.int, dim)]
+                extent = b.load(b.gep(acc.shape, idx))
+                stride = b.load(b.gep(acc.strides, idx))
+                # Strides of dimensions of extent 1 do not matter
+                contig = b.or_(b.icmp(llvm.core.ICMP_EQ, stride, nbytes),
+                               b.icmp(llvm.core.ICMP_EQ, extent, const(1)))
+                same = b.icmp(llvm.core.ICMP_EQ, extent, extents[dim])
+                result = b.and_(result, b.and_(contig, same))
+                nbytes = b.mul(nbytes, extent)
+
+            start = b.ptrtoint(acc.data, C.npy_intp)
+            spans[i] = start, b.add(start, nbytes)
+
+        for i in node.outputs:
+            start, end = spans[i]
+            for j, (other_start, other_end) in spans.items():
+                if i == j:
+                    continue
+                disjoint = b.or_(
+                    b.icmp(llvm.core.ICMP_SLE, end, other_start),
+                    b.icmp(llvm.core.ICMP_SLE, other_end, start))
+                if node.allow_identical:
+                    identical = b.and_(
+                        b.icmp(llvm.core.ICMP_EQ, start, other_start),
+                        b.icmp(llvm.core.ICMP_EQ, end, other_end))
+                    disjoint = b.or_(disjoint, identical)
+                result = b.and_(result, disjoint)
+
+        return result
+
     #------------------------------------------------------------------------
     # Pointer Nodes
     #------------------------------------------------------------------------
@@ -10,9 +10,74 @@ import numpy as np
 
 GROW = 2
 
+# Extension types of the compiled typed containers, whose items are
+# iterated natively in compiled loops (see specialize/loopimpl.py)
+container_types = set()
+
 def notimplemented(msg):
     raise NotImplementedError("'%s' method" % msg)
 
+#-----------------------------------------------------------------------
+# Bulk construction
+#-----------------------------------------------------------------------
+
+def length_hint(iterable, default=0):
+    "The length of an iterable if it is known, like operator.length_hint"
+    try:
+        return len(iterable)
+    except TypeError:
+        pass
+
+    hint = getattr(type(iterable), '__length_hint__', None)
+    if hint is not None:
+        try:
+            result = hint(iterable)
+        except TypeError:
+            return default
+        if result is not NotImplemented:
+            return int(result)
+    return default
+
+def is_bulk(iterable):
+    """
+    Whether the items of an iterable can be copied in bulk: 1D NumPy arrays,
+    typed containers and objects that support the buffer protocol
+    """
+    if isinstance(iterable, (bytes, type(u''))):
+        return False
+    elif isinstance(iterable, np.ndarray):
+        return iterable.ndim == 1
+    elif hasattr(iterable, 'to_array'):
+        return True
+
+    try:
+        view = memoryview(iterable)
+    except TypeError:
+        return False
+    return view.ndim == 1
+
+def as_array(iterable, dtype, copy=False):
+    """
+    The items of an iterable as an array of the given dtype, which is a
+    view of bulk iterables unless copy is set
+    """
+    if isinstance(iterable, np.ndarray):
+        items = iterable
+    elif hasattr(iterable, 'to_array'):
+        items = iterable.to_array()
+    elif is_bulk(iterable):
+        items = np.asarray(memoryview(iterable))
+    else:
+        items = list(iterable)
+
+    if copy:
+        return np.array(items, dtype=dtype)
+    return np.asarray(items, dtype=dtype)
+
+#-----------------------------------------------------------------------
+# Container methods
+#-----------------------------------------------------------------------
+
 def container_methods(item_type, notimplemented):
     # NOTE: numba will use the global 'notimplemented' function, not the
     # one passed in :(
@@ -35,22 +100,64 @@ def container_methods(item_type, notimplemented):
 
         self.buf[key] = value
 
+    dtype = item_type.get_dtype()
+    array_type = item_type[:]
+
+    @void(Py_ssize_t)
+    def _resize(self, capacity):
+        # Move the items to a new buffer instead of resizing in place, so
+        # that arrays from to_array() keep a valid (old) buffer
+        size = self.size
+        buf = np.empty(capacity, dtype=dtype)
+        buf[:size] = self.buf[:size]
+        self.buf = buf
+
+    @void(Py_ssize_t)
+    def _reserve(self, n):
+        "Make room for n more items"
+        needed = self.size + n
+        capacity = self.buf.shape[0]
+        if needed > capacity:
+            capacity = capacity * GROW
+            if capacity < needed:
+                capacity = needed
+            self._resize(capacity)
+
     @void(item_type)
     def append(self, value):
         size = self.size
         if size >= self.buf.shape[0]:
             # NOTE: initial bufsize must be greater than zero
-            self.buf.resize(int(size * GROW), refcheck=False)
+            self._reserve(1)
 
         self.buf[size] = value
         self.size = size + 1
 
     @void(object_)
     def extend(self, iterable):
-        # TODO: something fast for common cases (e.g. typedlist,
-        #                                        np.ndarray, etc)
-        for obj in iterable:
-            self.append(obj)
+        if is_bulk(iterable):
+            self._extend_array(as_array(iterable, dtype))
+        else:
+            self._reserve(length_hint(iterable))
+            for obj in iterable:
+                self.append(obj)
+
+    @void(item_type[:])
+    def _extend_array(self, items):
+        "Append the items of an array with a single resize and copy"
+        n = items.shape[0]
+        self._reserve(n)
+        size = self.size
+        self.buf[size:size + n] = items
+        self.size = size + n
+
+    @array_type()
+    def to_array(self):
+        """
+        The items as an array, without copying. The array is a view of
+        the current buffer, which is replaced when the container grows.
+        """
+        return self.buf[:self.size]
 
     @Py_ssize_t(item_type)
     def index(self, value):
@@ -2,7 +2,13 @@ from functools import partial
 
 from numba.containers import typedlist
 from numba.containers import typedtuple
+from numba.containers import typeddict
+from numba.containers import soa
+from numba.containers import typedset
+from numba.containers import typedheap
 from numba.containers import orderedcontainer
+from numba import nodes
+from numba.typesystem import get_type, object_
 from numba.type_inference.module_type_inference import register_inferer
 
 #-----------------------------------------------------------------------
@@ -24,3 +30,67 @@ def infer_ttuple(type_node, iterable_node):
         typedtuple.compile_typedtuple, type_node, iterable_node)
 
 register_inferer(typedtuple, 'typedtuple', infer_ttuple, pass_in_types=False)
+
+#-----------------------------------------------------------------------
+# Register type function for typeddict construction
+#-----------------------------------------------------------------------
+
+def infer_tdict(key_type_node, value_type_node, keys_node, values_node):
+    key_type = get_type(key_type_node)
+    value_type = get_type(value_type_node)
+    if key_type.is_cast and value_type.is_cast:
+        typeddict_ctor = typeddict.compile_typeddict(key_type.dst_type,
+                                                     value_type.dst_type)
+
+        # Inject the typeddict directly to avoid runtime implementation lookup
+        args = [node or nodes.const(None, object_)
+                    for node in (keys_node, values_node)]
+        result = nodes.call_pyfunc(typeddict_ctor, args)
+        return nodes.CoercionNode(result, typeddict_ctor.exttype)
+
+    return object_
+
+register_inferer(typeddict, 'typeddict', infer_tdict, pass_in_types=False)
+
+#-----------------------------------------------------------------------
+# Register type function for soa construction
+#-----------------------------------------------------------------------
+
+def infer_soa(type_node, records_node):
+    return orderedcontainer.typedcontainer_infer(
+        soa.compile_soa, type_node, records_node)
+
+register_inferer(soa, 'soa', infer_soa, pass_in_types=False)
+
+#-----------------------------------------------------------------------
+# Register type functions for typedset and typedheap construction
+#-----------------------------------------------------------------------
+
+def infer_tset(type_node, iterable_node):
+    return orderedcontainer.typedcontainer_infer(
+        typedset.compile_typedset, type_node, iterable_node)
+
+register_inferer(typedset, 'typedset', infer_tset, pass_in_types=False)
+
+def known_function(type):
+    "The function of a function type, or None if it is not known"
+    if type.is_jit_function:
+        return type.jit_func
+    elif type.is_autojit_function:
+        return type.autojit_func
+    elif type.is_known_value:
+        return type.value
+    return None
+
+def infer_theap(type_node, iterable_node, key_node):
+    key = None
+    if key_node is not None:
+        key = known_function(get_type(key_node))
+        if key is None:
+            return object_
+
+    compile_typedheap = partial(typedheap.compile_typedheap, key=key)
+    return orderedcontainer.typedcontainer_infer(
+        compile_typedheap, type_node, iterable_node)
+
+register_inferer(typedheap, 'typedheap', infer_theap, pass_in_types=False)
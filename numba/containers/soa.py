@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Struct-of-arrays container for records of a struct type. Each field is
+stored in its own contiguous buffer, so that loops over a single field
+only touch the memory of that field.
+"""
+from __future__ import print_function, division, absolute_import
+import linecache
+import itertools
+
+import numba as nb
+from numba import *
+from numba.containers.orderedcontainer import GROW
+
+import numpy as np
+
+INITIAL_BUFSIZE = 10
+
+# Attributes and methods of the container, which fields may not shadow
+reserved_names = frozenset(['size', 'append', 'extend', 'to_records'])
+
+_soa_cache = {}
+_source_counter = itertools.count()
+
+#-----------------------------------------------------------------------
+# Runtime Constructor
+#-----------------------------------------------------------------------
+
+def soa(record_type, records=None):
+    """
+    >>> point = struct_([('x', double), ('y', int32)])
+    >>> points = soa(point)
+    >>> points.append(1.5, 2)
+    >>> points.extend(np.array([(2.5, 3)], dtype=point.get_dtype()))
+    >>> points
+    soa([(1.5, 2) (2.5, 3)])
+    >>> len(points), points.x[1], points.y[0]
+    (2, 2.5, 2)
+    >>> points.to_records()['y'].tolist()
+    [2, 3]
+    """
+    soa_ctor = compile_soa(record_type)
+    return soa_ctor(records)
+
+def as_records(records, dtype):
+    "The records of a structured array, typed container or iterable of tuples"
+    if hasattr(records, 'to_records'):
+        records = records.to_records()
+    elif not isinstance(records, np.ndarray):
+        records = [tuple(record) for record in records]
+    return np.asarray(records, dtype=dtype)
+
+#-----------------------------------------------------------------------
+# Soa implementation
+#-----------------------------------------------------------------------
+
+def soa_source(fieldnames):
+    """
+    Source of the container class for the given fields. Field i has type
+    'type_i' and dtype 'dtype_i' in the namespace of the class.
+    """
+    fields = list(enumerate(fieldnames))
+
+    def per_field(template, indent=8):
+        return "\n".join(" " * indent + template.format(i=i, name=name)
+                             for i, name in fields)
+
+    return '''\
+class soa(object):
+    @void(object_)
+    def __init__(self, records):
+        self.size = 0
+{init_buffers}
+        self._row = np.empty(1, dtype=record_dtype)
+        if records != None:
+            self.extend(records)
+
+    @void(Py_ssize_t)
+    def _resize(self, capacity):
+        # Move the fields to new buffers, like typedlist
+        size = self.size
+{resize_buffers}
+
+    @void(Py_ssize_t)
+    def _reserve(self, n):
+        "Make room for n more records"
+        needed = self.size + n
+        capacity = self.{first}.shape[0]
+        if needed > capacity:
+            capacity = capacity * GROW
+            if capacity < needed:
+                capacity = needed
+            self._resize(capacity)
+
+    @void({arg_types})
+    def append(self, {args}):
+        "Append a record, given the value of each field"
+        size = self.size
+        if size >= self.{first}.shape[0]:
+            self._reserve(1)
+{append_fields}
+        self.size = size + 1
+
+    @record_type(Py_ssize_t)
+    def __getitem__(self, index):
+        if not (0 <= index < self.size):
+            [][index] # raise IndexError
+
+        row = self._row
+{gather_fields}
+        return row[0]
+
+    @void(object_)
+    def extend(self, records):
+        self._extend_records(as_records(records, record_dtype))
+
+    @void(record_type[:])
+    def _extend_records(self, records):
+        "Scatter the fields of a structured array into the field buffers"
+        n = records.shape[0]
+        self._reserve(n)
+        size = self.size
+        for i in range(n):
+{scatter_records}
+        self.size = size + n
+
+    @records_type()
+    def to_records(self):
+        "A copy of the records as a structured array"
+        result = np.empty(self.size, dtype=record_dtype)
+        for i in range(self.size):
+{gather_records}
+        return result
+
+    @Py_ssize_t()
+    def __len__(self):
+        return self.size
+
+    @nb.c_string_type()
+    def __repr__(self):
+        return "soa(" + str(self.to_records()) + ")"
+'''.format(
+        first=fieldnames[0],
+        args=", ".join("field_%d" % i for i, name in fields),
+        arg_types=", ".join("type_%d" % i for i, name in fields),
+        init_buffers=per_field(
+            "self.{name} = np.empty(INITIAL_BUFSIZE, dtype=dtype_{i})"),
+        resize_buffers=per_field(
+            "buf_{i} = np.empty(capacity, dtype=dtype_{i})\n"
+            "        buf_{i}[:size] = self.{name}[:size]\n"
+            "        self.{name} = buf_{i}"),
+        append_fields=per_field("self.{name}[size] = field_{i}"),
+        gather_fields=per_field("row[0].{name} = self.{name}[index]"),
+        scatter_records=per_field(
+            "self.{name}[size + i] = records[i].{name}", indent=12),
+        gather_records=per_field(
+            "result[i].{name} = self.{name}[i]", indent=12))
+
+def exec_source(source, namespace):
+    """
+    Execute generated source. The source is registered in the linecache,
+    so that numba can find the source of the methods with inspect.
+    """
+    filename = "<numba.containers.soa-%d>" % next(_source_counter)
+    lines = source.splitlines(True)
+    linecache.cache[filename] = (len(source), None, lines, filename)
+    exec(compile(source, filename, 'exec'), namespace)
+
+def compile_soa(record_type, _soa_cache=_soa_cache):
+    """
+    Compile a struct-of-arrays container for records of the given struct
+    type. Field 'name' is a NumPy buffer attribute of the container, so
+    compiled code accesses it as container.name[i] for i < len(container).
+    """
+    if record_type in _soa_cache:
+        return _soa_cache[record_type]
+
+    if not record_type.is_struct:
+        raise TypeError("soa needs a struct type, got %s" % (record_type,))
+
+    fieldnames = [name for name, type in record_type.fields]
+    if not fieldnames:
+        raise TypeError("soa needs a struct type with fields")
+    for name in fieldnames:
+        if name.startswith('_') or name in reserved_names:
+            raise ValueError("soa field %r clashes with a container "
+                             "attribute" % (name,))
+
+    namespace = dict(nb=nb, np=np, void=void, object_=object_,
+                     Py_ssize_t=Py_ssize_t, GROW=GROW,
+                     INITIAL_BUFSIZE=INITIAL_BUFSIZE, as_records=as_records,
+                     record_type=record_type, records_type=record_type[:],
+                     record_dtype=record_type.get_dtype())
+    for i, (name, field_type) in enumerate(record_type.fields):
+        namespace['type_%d' % i] = field_type
+        namespace['dtype_%d' % i] = field_type.get_dtype()
+
+    exec_source(soa_source(fieldnames), namespace)
+    soa = nb.jit(warn=False)(namespace['soa'])
+
+    _soa_cache[record_type] = soa
+    return soa
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,78 @@
+from numba import *
+import numba as nb
+import numpy as np
+from numba.testing.test_support import autojit_py3doc
+
+particle = struct_([('x', double), ('v', double), ('id', int32)])
+particle_dtype = particle.get_dtype()
+
+@autojit_py3doc
+def append_index(n):
+    """
+    >>> append_index(100)
+    (100L, 49.5, 99.0, 50L)
+    """
+    particles = nb.soa(particle)
+    for i in range(n):
+        particles.append(i * 0.5, i * 1.0, i)
+    record = particles[n // 2]
+    return len(particles), particles.x[n - 1], particles.v[n - 1], record.id
+
+@autojit
+def index_error(n):
+    """
+    >>> index_error(3)
+    Traceback (most recent call last):
+        ...
+    IndexError: list index out of range
+    """
+    particles = nb.soa(particle, np.zeros(n, dtype=particle_dtype))
+    return particles[n].x
+
+@autojit
+def advance(particles, dt):
+    for i in range(len(particles)):
+        particles.x[i] += particles.v[i] * dt
+
+def test_records_roundtrip():
+    records = np.zeros(1000, dtype=particle_dtype)
+    records['x'] = np.arange(1000)
+    records['v'] = 2.0
+    records['id'] = np.arange(1000)[::-1]
+
+    particles = nb.soa(particle, records)
+    particles.extend(records[:10])
+    particles.extend([(1.0, 2.0, 3)])
+    assert len(particles) == 1011
+
+    advance(particles, 0.5)
+
+    result = particles.to_records()
+    assert result.dtype == particle_dtype
+    assert np.all(result['x'][:1000] == records['x'] + 1.0)
+    assert np.all(result['id'][1000:1010] == records['id'][:10])
+    assert result[-1]['id'] == 3
+
+    copy = nb.soa(particle, particles)
+    assert np.all(copy.to_records() == result)
+
+def test_reserved_fields():
+    try:
+        nb.soa(struct_([('size', int_)]))
+    except ValueError as e:
+        assert "clashes" in str(e)
+    else:
+        raise Exception("Expected a ValueError for field 'size'")
+
+def test(module):
+    test_records_roundtrip()
+    test_reserved_fields()
+    nb.testing.testmod(module)
+
+if __name__ == "__main__":
+    import __main__ as module
+else:
+    import test_soa as module
+
+test(module)
+__test__ = {}
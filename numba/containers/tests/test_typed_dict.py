@@ -0,0 +1,102 @@
+from numba import *
+import numba as nb
+import numpy as np
+from numba.testing.test_support import autojit_py3doc
+
+@autojit_py3doc
+def insert_lookup(key_type, value_type):
+    """
+    >>> insert_lookup(int_, float_)
+    (3L, 2.5, True, False, -1.0)
+    >>> insert_lookup(float_, int_)
+    (3L, 2L, True, False, -1L)
+    """
+    tdict = nb.typeddict(key_type, value_type)
+    tdict[1] = 1
+    tdict[2] = 2.5
+    tdict[3] = 3
+    tdict[2] = 2.5
+    return (len(tdict), tdict[2], 3 in tdict, 4 in tdict,
+            tdict.get(4, -1))
+
+@autojit_py3doc
+def key_error(key_type):
+    """
+    >>> key_error(int_)
+    Traceback (most recent call last):
+        ...
+    KeyError: 4L
+    """
+    tdict = nb.typeddict(key_type, key_type, [1, 2, 3], [1, 2, 3])
+    return tdict[4]
+
+@autojit_py3doc
+def delete_reinsert(n):
+    """
+    >>> delete_reinsert(1000)
+    (500L, 250000L, 1000L)
+    """
+    tdict = nb.typeddict(int_, int_)
+    for i in range(n):
+        tdict[i] = i
+    for i in range(0, n, 2):
+        tdict.pop(i)
+    size = len(tdict)
+
+    total = 0
+    for i in range(1, n, 2):
+        total += tdict[i]
+
+    # Reuse deleted slots
+    for i in range(0, n, 2):
+        tdict[i] = i
+    return size, total, len(tdict)
+
+@autojit
+def group_count(labels):
+    counts = nb.typeddict(int_, int_)
+    for i in range(labels.shape[0]):
+        counts[labels[i]] = counts.get(labels[i], 0) + 1
+    return counts
+
+def test_bulk_construction():
+    keys = np.arange(10000) * 7919
+    values = np.arange(10000, dtype=np.double)
+    tdict = nb.typeddict(int_, double, keys, values)
+    assert len(tdict) == 10000
+    assert all(tdict[key] == value for key, value in zip(keys, values))
+    assert sorted(tdict.keys()) == sorted(keys)
+    assert sorted(tdict.values()) == sorted(values)
+    assert sorted(tdict) == sorted(keys)
+
+    del tdict[keys[0]]
+    assert keys[0] not in tdict
+    assert len(tdict) == 9999
+
+def test_group_count():
+    labels = np.array([3, 1, 3, 2, 3, 1])
+    counts = group_count(labels)
+    assert dict(zip(counts.keys(), counts.values())) == {1: 2, 2: 1, 3: 3}
+
+def test_float_keys():
+    # Keys outside the int64 range, infinities and signed zeros
+    keys = [1e19, -1e300, 1.7976931348623157e308, float('inf'),
+            -float('inf'), 0.0, 2.5]
+    tdict = nb.typeddict(double, int_, keys, range(len(keys)))
+    assert all(tdict[key] == i for i, key in enumerate(keys))
+    assert tdict[-0.0] == tdict[0.0]
+    assert 1e20 not in tdict
+
+def test(module):
+    test_bulk_construction()
+    test_group_count()
+    test_float_keys()
+    nb.testing.testmod(module)
+
+if __name__ == "__main__":
+    import __main__ as module
+else:
+    import test_typed_dict as module
+
+test(module)
+__test__ = {}
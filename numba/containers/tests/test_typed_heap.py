@@ -0,0 +1,63 @@
+from numba import *
+import numba as nb
+import numpy as np
+from numba.testing.test_support import autojit_py3doc
+
+@autojit
+def negate(x):
+    return -x
+
+@autojit_py3doc
+def heapsort(type, items):
+    """
+    >>> heapsort(int_, [5, 3, 8, 1, 9, 2])
+    [1, 2, 3, 5, 8, 9]
+    >>> heapsort(float_, [0.5, -1.5, 0.25])
+    [-1.5, 0.25, 0.5]
+    """
+    theap = nb.typedheap(type)
+    for i in range(len(items)):
+        theap.push(items[i])
+    result = []
+    while len(theap) > 0:
+        result.append(theap.pop())
+    return result
+
+@autojit
+def pop_error(type):
+    """
+    >>> pop_error(int_)
+    Traceback (most recent call last):
+        ...
+    IndexError: pop from empty list
+    """
+    theap = nb.typedheap(type)
+    return theap.pop()
+
+@autojit_py3doc
+def max_heap(type, items):
+    """
+    >>> max_heap(int_, np.arange(100))
+    (99L, 98L)
+    """
+    theap = nb.typedheap(type, items, key=negate)
+    return theap.pop(), theap.peek()
+
+def test_bulk_heapify():
+    items = np.random.randint(0, 1000, 5000)
+    theap = nb.typedheap(int_, items)
+    theap.extend(items[:10])
+    result = [theap.pop() for i in range(len(theap))]
+    assert result == sorted(items.tolist() + items[:10].tolist())
+
+def test(module):
+    test_bulk_heapify()
+    nb.testing.testmod(module)
+
+if __name__ == "__main__":
+    import __main__ as module
+else:
+    import test_typed_heap as module
+
+test(module)
+__test__ = {}
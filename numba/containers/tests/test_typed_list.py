@@ -1,5 +1,6 @@
 from numba import *
 import numba as nb
+import numpy as np
 from numba.testing.test_support import autojit_py3doc
 @autojit
 def index(type):
@@ -211,6 +212,114 @@ def test_reverse(type, value):
     tlist.reverse()
     return tlist
 
+@autojit
+def test_extend_bulk(type, value):
+    """
+    >>> import array
+    >>> test_extend_bulk(int_, np.arange(5.0))
+    [0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1, 2, 3, 4]
+    >>> test_extend_bulk(float_, array.array('i', [1, 2]))
+    [1.0, 2.0, 1.0, 2.0, 1.0, 2.0, 1.0, 2.0]
+    """
+    tlist = nb.typedlist(type, value)
+    tlist.extend(nb.typedlist(type, value))
+    tlist.extend(tlist)
+    return tlist
+
+@autojit
+def test_to_array(type, n):
+    """
+    >>> test_to_array(float_, 1000)
+    (1000L, 499500.0)
+    """
+    tlist = nb.typedlist(type, np.arange(n))
+    items = tlist.to_array()
+    tlist.append(0)
+    return items.shape[0], items.sum()
+
+@autojit_py3doc
+def test_pop_index(type):
+    """
+    >>> test_pop_index(int_)
+    0
+    9
+    4
+    [1, 2, 3, 5, 6, 7, 8]
+    """
+    tlist = nb.typedlist(type, range(10))
+    print(tlist.pop_index(0))
+    print(tlist.pop_index(-1))
+    print(tlist.pop_index(3))
+    return tlist
+
+@autojit_py3doc
+def test_insert_remove_many(type, n):
+    """
+    >>> test_insert_remove_many(int_, 1000)
+    (1000L, 0L, 10L)
+    """
+    tlist = nb.typedlist(type)
+    for i in range(n):
+        tlist.insert(-1 - i, i)
+    size = len(tlist)
+    for i in range(n):
+        tlist.remove(i)
+    return size, len(tlist), tlist.buf.shape[0]
+
+@autojit_py3doc
+def test_iteration(type, value):
+    """
+    >>> test_iteration(int_, range(10))
+    (45L, 10L)
+    >>> test_iteration(float_, [0.5, 1.5])
+    (2.0, 2L)
+    """
+    tlist = nb.typedlist(type, value)
+    total = 0
+    count = 0
+    for item in tlist:
+        total += item
+        count += 1
+    return total, count
+
+@autojit_py3doc
+def test_iteration_resize(n):
+    """
+    >>> test_iteration_resize(4)
+    (15L, 6L)
+    >>> test_iteration_resize(0)
+    (0L, 0L)
+    """
+    tlist = nb.typedlist(int_, range(n))
+    total = 0
+    count = 0
+    for item in tlist:
+        # Items appended in the body are visited, and the loop stops at
+        # the current size after the list shrinks
+        if item < n:
+            tlist.append(item + n)
+        elif len(tlist) > n:
+            tlist.pop()
+        total += item
+        count += 1
+    return total, count
+
+def test_slices():
+    """
+    >>> tlist = nb.typedlist(int_, range(10))
+    >>> tlist[2:5].tolist()
+    [2, 3, 4]
+    >>> tlist[2:5] = [20, 30, 40, 50]
+    >>> tlist
+    [0, 1, 20, 30, 40, 50, 5, 6, 7, 8, 9]
+    >>> tlist[1:-1] = tlist[5:7]
+    >>> tlist
+    [0, 50, 5, 9]
+    >>> del tlist[:2]
+    >>> tlist
+    [5, 9]
+    """
+
 #@autojit
 #def test_sort(type, value):
 #    """
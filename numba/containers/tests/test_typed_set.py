@@ -0,0 +1,69 @@
+from numba import *
+import numba as nb
+import numpy as np
+from numba.testing.test_support import autojit_py3doc
+
+@autojit_py3doc
+def add_contains(type):
+    """
+    >>> add_contains(int_)
+    (3L, True, False, 2L)
+    >>> add_contains(float_)
+    (3L, True, False, 2L)
+    """
+    tset = nb.typedset(type)
+    tset.add(1)
+    tset.add(2)
+    tset.add(3)
+    tset.add(2)
+    size = len(tset)
+    tset.discard(3)
+    tset.discard(4)
+    return size, 2 in tset, 3 in tset, len(tset)
+
+@autojit
+def remove_error(type):
+    """
+    >>> remove_error(int_)
+    Traceback (most recent call last):
+        ...
+    KeyError: 4L
+    """
+    tset = nb.typedset(type, [1, 2, 3])
+    tset.remove(4)
+
+@autojit_py3doc
+def visit(edges, n):
+    """
+    >>> visit(np.array([1, 2, 0, 2, 3, 4]), 6)
+    (5L, 10L, 0L)
+    """
+    seen = nb.typedset(int_)
+    total = 0
+    for i in range(n):
+        if edges[i] not in seen:
+            seen.add(edges[i])
+            total += edges[i]
+    distinct = len(seen)
+    while len(seen) > 0:
+        seen.pop()
+    return distinct, total, len(seen)
+
+def test_bulk_update():
+    tset = nb.typedset(int_, np.arange(10000) % 5000)
+    assert len(tset) == 5000
+    tset.update(nb.typedlist(int_, range(4990, 5010)))
+    assert len(tset) == 5010
+    assert sorted(tset.to_array()) == list(range(5010))
+
+def test(module):
+    test_bulk_update()
+    nb.testing.testmod(module)
+
+if __name__ == "__main__":
+    import __main__ as module
+else:
+    import test_typed_set as module
+
+test(module)
+__test__ = {}
@@ -7,8 +7,18 @@ def test_count(type):
     ttuple = nb.typedtuple(type, [1, 2, 3, 4, 5, 1, 2])
     return ttuple.count(0), ttuple.count(3), ttuple.count(1)
 
+@autojit
+def test_iteration(type):
+    ttuple = nb.typedtuple(type, [1, 2, 3, 4])
+    total = 0
+    for item in ttuple:
+        total += item
+    return total
+
 def test(module):
     assert test_count(int_) == (0, 1, 2)
+    assert test_iteration(int_) == 10
+    assert test_iteration(double) == 10.0
 
 if __name__ == "__main__":
     import __main__ as module
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function, division, absolute_import
+import numba as nb
+from numba import *
+
+import numpy as np
+
+# The capacity is a power of two, so that slots are found by masking
+INITIAL_CAPACITY = 8
+
+# Slot states. Deleted slots keep probe sequences intact until a resize.
+EMPTY = 0
+FILLED = 1
+DELETED = 2
+
+# Multipliers of the hash finalizer (2**64 / golden ratio and the SplitMix64
+# mixing constant) as int64, so that all key bits reach the masked low bits
+HASH_MULTIPLIER = -7046029254386353131
+HASH_MIX = -4658895280553007687
+
+# Float keys of at least this magnitude (2**62) are scaled before hashing
+HASH_FLOAT_RANGE = 4611686018427387904.0
+
+_dict_cache = {}
+
+#-----------------------------------------------------------------------
+# Runtime Constructor
+#-----------------------------------------------------------------------
+
+def typeddict(key_type, value_type, keys=None, values=None):
+    """
+    >>> typeddict(int_, float_)
+    {}
+    >>> tdict = typeddict(int_, float_, range(3), [0.5, 1.5, 2.5])
+    >>> tdict
+    {0: 0.5, 1: 1.5, 2: 2.5}
+    >>> tdict[1]
+    1.5
+    >>> 3 in tdict
+    False
+    """
+    typeddict_ctor = compile_typeddict(key_type, value_type)
+    return typeddict_ctor(keys, values)
+
+#-----------------------------------------------------------------------
+# Key Hashing
+#-----------------------------------------------------------------------
+
+def hash_method(key_type):
+    "The method that hashes keys of the given type to int64"
+
+    if key_type.is_float:
+        @int64(key_type)
+        def hash_key(self, key):
+            # Combine the integral part and the fraction. The conversion to
+            # int64 is undefined for NaN, infinities and values outside the
+            # int64 range, so these hash to constants or are first scaled
+            # into the range by exact powers of two. -0.0 hashes like 0.0.
+            if key != key:
+                h = 0
+            elif key * 0.0 != 0.0:
+                if key > 0:
+                    h = 1
+                else:
+                    h = -1
+            else:
+                scale = 0
+                while (key >= HASH_FLOAT_RANGE or
+                           key <= -HASH_FLOAT_RANGE):
+                    key = key / HASH_FLOAT_RANGE
+                    scale += 1
+                whole = int64(key)
+                h = whole ^ int64((key - whole) * 4503599627370496.0)
+                h = h + scale
+            h = h * HASH_MULTIPLIER
+            h = (h ^ (h >> 29)) * HASH_MIX
+            return h ^ (h >> 32)
+    else:
+        @int64(key_type)
+        def hash_key(self, key):
+            h = int64(key) * HASH_MULTIPLIER
+            h = (h ^ (h >> 29)) * HASH_MIX
+            return h ^ (h >> 32)
+
+    return hash_key
+
+#-----------------------------------------------------------------------
+# Typeddict implementation
+#-----------------------------------------------------------------------
+
+def compile_typeddict(key_type, value_type, _dict_cache=_dict_cache):
+    """
+    Compile a hash map with keys and values of the given types. Keys are
+    stored in open addressing tables with linear probing, in NumPy buffers
+    of keys, values and slot states.
+    """
+    if (key_type, value_type) in _dict_cache:
+        return _dict_cache[key_type, value_type]
+
+    if not (key_type.is_int or key_type.is_float):
+        raise TypeError("typeddict keys must be integers or floats, got %s" %
+                                                                    key_type)
+
+    key_dtype = key_type.get_dtype()
+    value_dtype = value_type.get_dtype()
+    key_array_type = key_type[:]
+    value_array_type = value_type[:]
+
+    @nb.jit(warn=False)
+    class typeddict(object):
+        @void(object_, object_)
+        def __init__(self, keys, values):
+            self.size = 0
+            self.used = 0
+            self.mask = INITIAL_CAPACITY - 1
+            self.key_buf = np.empty(INITIAL_CAPACITY, dtype=key_dtype)
+            self.value_buf = np.empty(INITIAL_CAPACITY, dtype=value_dtype)
+            self.state = np.zeros(INITIAL_CAPACITY, dtype=np.uint8)
+
+            if keys != None:
+                self.update(keys, values)
+
+        __hash = hash_method(key_type)
+
+        @Py_ssize_t(key_type)
+        def __find(self, key):
+            "The slot of key, or -1"
+            state = self.state
+            mask = self.mask
+            i = self.__hash(key) & mask
+            while state[i] != EMPTY:
+                if state[i] == FILLED and self.key_buf[i] == key:
+                    return i
+                i = (i + 1) & mask
+            return -1
+
+        @void(key_type, value_type)
+        def __insert_new(self, key, value):
+            "Insert a key that is not in the table, without resizing"
+            state = self.state
+            mask = self.mask
+            i = self.__hash(key) & mask
+            while state[i] == FILLED:
+                i = (i + 1) & mask
+            if state[i] == EMPTY:
+                self.used += 1
+            state[i] = FILLED
+            self.key_buf[i] = key
+            self.value_buf[i] = value
+            self.size += 1
+
+        @void(Py_ssize_t)
+        def __resize(self, nitems):
+            "Rehash into a table for nitems items, dropping deleted slots"
+            capacity = INITIAL_CAPACITY
+            while capacity * 2 < nitems * 3:
+                capacity *= 2
+
+            key_buf = self.key_buf
+            value_buf = self.value_buf
+            state = self.state
+            self.key_buf = np.empty(capacity, dtype=key_dtype)
+            self.value_buf = np.empty(capacity, dtype=value_dtype)
+            self.state = np.zeros(capacity, dtype=np.uint8)
+            self.mask = capacity - 1
+            self.size = 0
+            self.used = 0
+
+            for i in range(state.shape[0]):
+                if state[i] == FILLED:
+                    self.__insert_new(key_buf[i], value_buf[i])
+
+        @value_type(key_type)
+        def __getitem__(self, key):
+            i = self.__find(key)
+            if i < 0:
+                {}[key] # raise KeyError
+
+            return self.value_buf[i]
+
+        @void(key_type, value_type)
+        def __setitem__(self, key, value):
+            i = self.__find(key)
+            if i >= 0:
+                self.value_buf[i] = value
+            else:
+                # Keep the load factor, including deleted slots, below 2/3
+                if (self.used + 1) * 3 > (self.mask + 1) * 2:
+                    self.__resize(2 * (self.size + 1))
+                self.__insert_new(key, value)
+
+        @void(key_type)
+        def __delitem__(self, key):
+            i = self.__find(key)
+            if i < 0:
+                {}[key] # raise KeyError
+
+            self.state[i] = DELETED
+            self.size -= 1
+
+        @bool_(key_type)
+        def __contains__(self, key):
+            return self.__find(key) >= 0
+
+        @value_type(key_type, value_type)
+        def get(self, key, default):
+            i = self.__find(key)
+            if i < 0:
+                return default
+            return self.value_buf[i]
+
+        @value_type(key_type)
+        def pop(self, key):
+            i = self.__find(key)
+            if i < 0:
+                {}[key] # raise KeyError
+
+            self.state[i] = DELETED
+            self.size -= 1
+            return self.value_buf[i]
+
+        @void(object_, object_)
+        def update(self, keys, values):
+            self.__update(np.asarray(keys, dtype=key_dtype),
+                          np.asarray(values, dtype=value_dtype))
+
+        @void(key_type[:], value_type[:])
+        def __update(self, keys, values):
+            "Insert the pairs of keys and values, like zip(keys, values)"
+            n = keys.shape[0]
+            if values.shape[0] < n:
+                n = values.shape[0]
+
+            # Size the table once for all keys
+            if (self.used + n) * 3 > (self.mask + 1) * 2:
+                self.__resize(self.size + n)
+
+            for i in range(n):
+                self.__setitem__(keys[i], values[i])
+
+        @void()
+        def clear(self):
+            self.state[:] = EMPTY
+            self.size = 0
+            self.used = 0
+
+        @key_array_type()
+        def keys(self):
+            "The keys in slot order, as an array"
+            result = np.empty(self.size, dtype=key_dtype)
+            state = self.state
+            k = 0
+            for i in range(state.shape[0]):
+                if state[i] == FILLED:
+                    result[k] = self.key_buf[i]
+                    k += 1
+            return result
+
+        @value_array_type()
+        def values(self):
+            "The values in the order of keys()"
+            result = np.empty(self.size, dtype=value_dtype)
+            state = self.state
+            k = 0
+            for i in range(state.shape[0]):
+                if state[i] == FILLED:
+                    result[k] = self.value_buf[i]
+                    k += 1
+            return result
+
+        @object_()
+        def __iter__(self):
+            "Iterate over the keys, like dict"
+            return iter(self.keys())
+
+        @Py_ssize_t()
+        def __len__(self):
+            return self.size
+
+        @nb.c_string_type()
+        def __repr__(self):
+            keys = self.keys()
+            values = self.values()
+            buf = ", ".join([str(keys[i]) + ": " + str(values[i])
+                                 for i in range(self.size)])
+            return "{" + buf + "}"
+
+    _dict_cache[key_type, value_type] = typeddict
+    return typeddict
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function, division, absolute_import
+import numba as nb
+from numba import *
+from numba.containers import orderedcontainer
+from numba.containers.orderedcontainer import as_array
+
+import numpy as np
+
+INITIAL_BUFSIZE = 10
+
+def notimplemented(msg):
+    raise NotImplementedError("'%s' method of type 'typedheap'" % msg)
+
+_heap_cache = {}
+
+#-----------------------------------------------------------------------
+# Runtime Constructor
+#-----------------------------------------------------------------------
+
+def typedheap(item_type, iterable=None, key=None):
+    """
+    >>> theap = typedheap(int_, [5, 1, 4])
+    >>> theap.push(2)
+    >>> [theap.pop() for i in range(len(theap) - 1)]
+    [1L, 2L, 4L]
+    >>> theap.peek()
+    5L
+    """
+    typedheap_ctor = compile_typedheap(item_type, key)
+    return typedheap_ctor(iterable)
+
+#-----------------------------------------------------------------------
+# Item Ordering
+#-----------------------------------------------------------------------
+
+def less_method(item_type, key):
+    """
+    The method that orders items of the given type, by the result of key if
+    it is given. Plain Python key functions are compiled with autojit.
+    """
+    if key is None:
+        @bool_(item_type, item_type)
+        def less(self, a, b):
+            return a < b
+    else:
+        if not hasattr(key, 'py_func'):
+            key = nb.autojit(key)
+
+        @bool_(item_type, item_type)
+        def less(self, a, b):
+            return key(a) < key(b)
+
+    return less
+
+#-----------------------------------------------------------------------
+# Typedheap implementation
+#-----------------------------------------------------------------------
+
+def compile_typedheap(item_type, key=None, _heap_cache=_heap_cache):
+    """
+    Compile a binary min-heap of items of the given type, ordered by key.
+    The heap is stored in a NumPy buffer that grows like typedlist.
+    """
+    if (item_type, key) in _heap_cache:
+        return _heap_cache[item_type, key]
+
+    dtype = item_type.get_dtype()
+    methods = orderedcontainer.container_methods(item_type, notimplemented)
+
+    @nb.jit(warn=False)
+    class typedheap(object):
+        @void(object_)
+        def __init__(self, iterable):
+            self.size = 0
+            self.buf = np.empty(INITIAL_BUFSIZE, dtype=dtype)
+
+            if iterable != None:
+                self.extend(iterable)
+
+        to_array = methods['to_array']
+        _resize = methods['_resize']
+        _reserve = methods['_reserve']
+        _less = less_method(item_type, key)
+
+        @void(Py_ssize_t)
+        def _sift_up(self, pos):
+            "Move the item at pos towards the root until its parent is smaller"
+            buf = self.buf
+            item = buf[pos]
+            while pos > 0 and self._less(item, buf[(pos - 1) // 2]):
+                buf[pos] = buf[(pos - 1) // 2]
+                pos = (pos - 1) // 2
+            buf[pos] = item
+
+        @void(Py_ssize_t)
+        def _sift_down(self, pos):
+            "Move the item at pos towards the leaves until its children are larger"
+            buf = self.buf
+            size = self.size
+            item = buf[pos]
+            child = 2 * pos + 1
+            while child < size:
+                if child + 1 < size and self._less(buf[child + 1], buf[child]):
+                    child += 1
+
+                if self._less(buf[child], item):
+                    buf[pos] = buf[child]
+                    pos = child
+                    child = 2 * pos + 1
+                else:
+                    child = size # stop
+            buf[pos] = item
+
+        @void(item_type)
+        def push(self, item):
+            size = self.size
+            if size >= self.buf.shape[0]:
+                self._reserve(1)
+
+            self.buf[size] = item
+            self.size = size + 1
+            self._sift_up(size)
+
+        @item_type()
+        def pop(self):
+            "Remove and return the smallest item"
+            if self.size == 0:
+                [].pop() # raise IndexError
+
+            buf = self.buf
+            top = buf[0]
+            size = self.size - 1
+            self.size = size
+            if size > 0:
+                buf[0] = buf[size]
+                self._sift_down(0)
+            return top
+
+        @item_type()
+        def peek(self):
+            "The smallest item"
+            if self.size == 0:
+                [][0] # raise IndexError
+
+            return self.buf[0]
+
+        @void(object_)
+        def extend(self, iterable):
+            self._extend_array(as_array(iterable, dtype))
+
+        @void(item_type[:])
+        def _extend_array(self, items):
+            n = items.shape[0]
+            self._reserve(n)
+            size = self.size
+            self.buf[size:size + n] = items
+            self.size = size + n
+
+            if n > size:
+                # Heapify in linear time instead of sifting up every item
+                pos = (size + n) // 2
+                while pos > 0:
+                    pos -= 1
+                    self._sift_down(pos)
+            else:
+                for i in range(size, size + n):
+                    self._sift_up(i)
+
+        @Py_ssize_t()
+        def __len__(self):
+            return self.size
+
+        @nb.c_string_type()
+        def __repr__(self):
+            buf = ", ".join([str(self.buf[i]) for i in range(self.size)])
+            return "typedheap([" + buf + "])"
+
+    _heap_cache[item_type, key] = typedheap
+    return typedheap
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
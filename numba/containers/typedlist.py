@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function, division, absolute_import
+from ctypes import memmove
+
 import numba as nb
 from numba import *
 from numba.containers import orderedcontainer
+from numba.containers.orderedcontainer import as_array
 
 import numpy as np
 
 INITIAL_BUFSIZE = 10
-SHRINK = 1.5
 GROW = 2
 
+# The buffer is halved when less than 1/SHRINK of it is used
+SHRINK = 4
+
 def notimplemented(msg):
     raise NotImplementedError("'%s' method of type 'typedlist'" % msg)
 
@@ -47,6 +52,8 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
         return _list_cache[item_type]
 
     dtype = item_type.get_dtype()
+    itemsize = dtype.itemsize
+    array_type = item_type[:]
     methods = orderedcontainer.container_methods(item_type, notimplemented)
 
     @nb.jit(warn=False)
@@ -55,72 +62,139 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
         def __init__(self, iterable):
             self.size = 0
 
-            # TODO: Use length hint of iterable for initial buffer size
+            # extend() sizes the buffer for the length of the iterable
             self.buf = np.empty(INITIAL_BUFSIZE, dtype=dtype)
 
             # TODO: implement 'is'/'is not'
             if iterable != None:
                 self.extend(iterable)
 
-        # TODO: Jit __getitem__/__setitem__ of numba extension types
-
         __getitem__ = methods['getitem']
         __setitem__ = methods['setitem']
         append = methods['append']
         extend = methods['extend']
+        to_array = methods['to_array']
+        _resize = methods['_resize']
+        _reserve = methods['_reserve']
+        _extend_array = methods['_extend_array']
         index = methods['index']
         count = methods['count']
 
+        @void(Py_ssize_t, Py_ssize_t, Py_ssize_t)
+        def _move(self, dst, src, count):
+            "Move count items from index src to dst, the ranges may overlap"
+            if count > 0:
+                data = self.buf.data
+                memmove(data + dst * itemsize, data + src * itemsize,
+                        count * itemsize)
+
+        @void()
+        def _shrink(self):
+            # Halve the buffer when less than a quarter is used. A halved
+            # buffer is at most half full, so alternating appends and pops
+            # never resize on every call.
+            capacity = self.buf.shape[0]
+            if capacity > INITIAL_BUFSIZE and self.size * SHRINK < capacity:
+                capacity = capacity // 2
+                if capacity < INITIAL_BUFSIZE:
+                    capacity = INITIAL_BUFSIZE
+                self._resize(capacity)
+
+        @Py_ssize_t(Py_ssize_t, Py_ssize_t)
+        def _clip(self, index, size):
+            if index < 0:
+                index += size
+                if index < 0:
+                    index = 0
+            elif index > size:
+                index = size
+            return index
+
         @item_type()
         def pop(self):
-            # TODO: Optional argument 'index'
+            if self.size == 0:
+                [].pop() # raise IndexError
+
             size = self.size - 1
             item = self.buf[size]
             self.size = size
+            self._shrink()
+            return item
 
-            if INITIAL_BUFSIZE < size < self.buf.shape[0] / 2:
-                self.buf.resize(int(SHRINK * size), refcheck=False)
-
+        @item_type(Py_ssize_t)
+        def pop_index(self, index):
+            "pop() of the item at the given index"
+            size = self.size
+            if index < 0:
+                index += size
+            if not (0 <= index < size):
+                [].pop() # raise IndexError
+
+            item = self.buf[index]
+            self._move(index, index + 1, size - index - 1)
+            self.size = size - 1
+            self._shrink()
             return item
 
         @void(Py_ssize_t, item_type)
         def insert(self, index, value):
             size = self.size
-
-            if size >= self.buf.shape[0]:
-                self.buf.resize(int(size * GROW), refcheck=False)
-
-            if index > size:
-                self.append(value)
-            else:
-                current = self.buf[index]
-                self.buf[index] = value
-                for i in range(index+1, size+1):
-                    next = self.buf[i]
-                    self.buf[i] = current
-                    current = next
+            index = self._clip(index, size)
+            self._reserve(1)
+            self._move(index + 1, index, size - index)
+            self.buf[index] = value
             self.size = size + 1
 
         @void(item_type)
         def remove(self, value):
             size = self.size
             position = 0
-            found = False
-           
-            if INITIAL_BUFSIZE < size < self.buf.shape[0]/2:
-                self.buf.resize(int(SHRINK * size), refcheck=False)
-
-            while position < size and not found:
-                if self.buf[position] == value:
-                    found = True
-                else:
-                    position += 1
-                    
-            if found:
-                for i in range(position, size):
-                    self.buf[i] = self.buf[i+1]
-                self.size = size -1
-                # raise ValueError 'not in list'
+            while position < size and self.buf[position] != value:
+                position += 1
+
+            if position == size:
+                [].remove(value) # raise ValueError
+
+            self._move(position, position + 1, size - position - 1)
+            self.size = size - 1
+            self._shrink()
+
+        @array_type(Py_ssize_t, Py_ssize_t)
+        def __getslice__(self, start, stop):
+            "A copy of the items in [start:stop], as an array"
+            start = self._clip(start, self.size)
+            stop = self._clip(stop, self.size)
+            if stop < start:
+                stop = start
+
+            result = np.empty(stop - start, dtype=dtype)
+            result[:] = self.buf[start:stop]
+            return result
+
+        @void(Py_ssize_t, Py_ssize_t, object_)
+        def __setslice__(self, start, stop, items):
+            self._replace(start, stop, as_array(items, dtype, copy=True))
+
+        @void(Py_ssize_t, Py_ssize_t)
+        def __delslice__(self, start, stop):
+            self._replace(start, stop, np.empty(0, dtype=dtype))
+
+        @void(Py_ssize_t, Py_ssize_t, item_type[:])
+        def _replace(self, start, stop, items):
+            "Replace the items in [start:stop] by the items of an array"
+            size = self.size
+            start = self._clip(start, size)
+            stop = self._clip(stop, size)
+            if stop < start:
+                stop = start
+
+            n = items.shape[0]
+            delta = n - (stop - start)
+            self._reserve(delta)
+            self._move(stop + delta, stop, size - stop)
+            self.buf[start:start + n] = items
+            self.size = size + delta
+            self._shrink()
 
         @void()
         def reverse(self):
@@ -146,6 +220,7 @@ def compile_typedlist(item_type, _list_cache=_list_cache):
             return "[" + buf + "]"
 
     _list_cache[item_type] = typedlist
+    orderedcontainer.container_types.add(typedlist.exttype)
     return typedlist
 
 
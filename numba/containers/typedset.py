@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function, division, absolute_import
+import numba as nb
+from numba import *
+from numba.containers.orderedcontainer import as_array
+from numba.containers.typeddict import (INITIAL_CAPACITY, EMPTY, FILLED,
+                                        DELETED, hash_method)
+
+import numpy as np
+
+_set_cache = {}
+
+#-----------------------------------------------------------------------
+# Runtime Constructor
+#-----------------------------------------------------------------------
+
+def typedset(item_type, iterable=None):
+    """
+    >>> typedset(int_)
+    {}
+    >>> tset = typedset(int_, [3, 1, 3, 2])
+    >>> len(tset)
+    3
+    >>> 2 in tset, 4 in tset
+    (True, False)
+    >>> sorted(tset.to_array())
+    [1, 2, 3]
+    """
+    typedset_ctor = compile_typedset(item_type)
+    return typedset_ctor(iterable)
+
+#-----------------------------------------------------------------------
+# Typedset implementation
+#-----------------------------------------------------------------------
+
+def compile_typedset(item_type, _set_cache=_set_cache):
+    """
+    Compile a hash set of items of the given type, with the open addressing
+    tables of typeddict without the values.
+    """
+    if item_type in _set_cache:
+        return _set_cache[item_type]
+
+    if not (item_type.is_int or item_type.is_float):
+        raise TypeError("typedset items must be integers or floats, got %s" %
+                                                                    item_type)
+
+    dtype = item_type.get_dtype()
+    array_type = item_type[:]
+
+    @nb.jit(warn=False)
+    class typedset(object):
+        @void(object_)
+        def __init__(self, iterable):
+            self.size = 0
+            self.used = 0
+            self.mask = INITIAL_CAPACITY - 1
+            self.buf = np.empty(INITIAL_CAPACITY, dtype=dtype)
+            self.state = np.zeros(INITIAL_CAPACITY, dtype=np.uint8)
+
+            if iterable != None:
+                self.update(iterable)
+
+        __hash = hash_method(item_type)
+
+        @Py_ssize_t(item_type)
+        def __find(self, item):
+            "The slot of item, or -1"
+            state = self.state
+            mask = self.mask
+            i = self.__hash(item) & mask
+            while state[i] != EMPTY:
+                if state[i] == FILLED and self.buf[i] == item:
+                    return i
+                i = (i + 1) & mask
+            return -1
+
+        @void(item_type)
+        def __insert_new(self, item):
+            "Insert an item that is not in the table, without resizing"
+            state = self.state
+            mask = self.mask
+            i = self.__hash(item) & mask
+            while state[i] == FILLED:
+                i = (i + 1) & mask
+            if state[i] == EMPTY:
+                self.used += 1
+            state[i] = FILLED
+            self.buf[i] = item
+            self.size += 1
+
+        @void(Py_ssize_t)
+        def __resize(self, nitems):
+            "Rehash into a table for nitems items, dropping deleted slots"
+            capacity = INITIAL_CAPACITY
+            while capacity * 2 < nitems * 3:
+                capacity *= 2
+
+            buf = self.buf
+            state = self.state
+            self.buf = np.empty(capacity, dtype=dtype)
+            self.state = np.zeros(capacity, dtype=np.uint8)
+            self.mask = capacity - 1
+            self.size = 0
+            self.used = 0
+
+            for i in range(state.shape[0]):
+                if state[i] == FILLED:
+                    self.__insert_new(buf[i])
+
+        @void(item_type)
+        def add(self, item):
+            if self.__find(item) < 0:
+                # Keep the load factor, including deleted slots, below 2/3
+                if (self.used + 1) * 3 > (self.mask + 1) * 2:
+                    self.__resize(2 * (self.size + 1))
+                self.__insert_new(item)
+
+        @bool_(item_type)
+        def __contains__(self, item):
+            return self.__find(item) >= 0
+
+        @void(item_type)
+        def discard(self, item):
+            i = self.__find(item)
+            if i >= 0:
+                self.state[i] = DELETED
+                self.size -= 1
+
+        @void(item_type)
+        def remove(self, item):
+            i = self.__find(item)
+            if i < 0:
+                {}[item] # raise KeyError
+
+            self.state[i] = DELETED
+            self.size -= 1
+
+        @item_type()
+        def pop(self):
+            "Remove and return an arbitrary item"
+            if self.size == 0:
+                {}.popitem() # raise KeyError
+
+            state = self.state
+            i = 0
+            while state[i] != FILLED:
+                i += 1
+            state[i] = DELETED
+            self.size -= 1
+            return self.buf[i]
+
+        @void(object_)
+        def update(self, iterable):
+            self.__update(as_array(iterable, dtype))
+
+        @void(item_type[:])
+        def __update(self, items):
+            n = items.shape[0]
+
+            # Size the table once for all items
+            if (self.used + n) * 3 > (self.mask + 1) * 2:
+                self.__resize(self.size + n)
+
+            for i in range(n):
+                self.add(items[i])
+
+        @void()
+        def clear(self):
+            self.state[:] = EMPTY
+            self.size = 0
+            self.used = 0
+
+        @array_type()
+        def to_array(self):
+            "The items in slot order, as an array"
+            result = np.empty(self.size, dtype=dtype)
+            state = self.state
+            k = 0
+            for i in range(state.shape[0]):
+                if state[i] == FILLED:
+                    result[k] = self.buf[i]
+                    k += 1
+            return result
+
+        @Py_ssize_t()
+        def __len__(self):
+            return self.size
+
+        @nb.c_string_type()
+        def __repr__(self):
+            items = self.to_array()
+            buf = ", ".join([str(items[i]) for i in range(self.size)])
+            return "{" + buf + "}"
+
+    _set_cache[item_type] = typedset
+    return typedset
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
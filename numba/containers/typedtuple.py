@@ -5,6 +5,7 @@ from functools import partial
 
 import numba as nb
 from numba.containers import orderedcontainer
+from numba.containers.orderedcontainer import is_bulk, as_array, length_hint
 
 import numpy as np
 
@@ -53,8 +54,6 @@ def compile_typedtuple(item_type, _tuple_cache=_tuple_cache):
         def __init__(self, iterable):
 
             self.size = 0
-
-            # TODO: Use length hint of iterable for initial buffer size
             self.buf = np.empty(INITIAL_BUFSIZE, dtype=dtype)
 
             if iterable != None:
@@ -64,11 +63,25 @@ def compile_typedtuple(item_type, _tuple_cache=_tuple_cache):
         __append = methods['append']
         index = methods['index']
         count = methods['count']
+        to_array = methods['to_array']
+        _resize = methods['_resize']
+        _reserve = methods['_reserve']
 
         @nb.void(nb.object_)
         def __extend(self, iterable):
-            for obj in iterable:
-                self.__append(obj)
+            if is_bulk(iterable):
+                self.__extend_array(as_array(iterable, dtype))
+            else:
+                self._reserve(length_hint(iterable))
+                for obj in iterable:
+                    self.__append(obj)
+
+        @nb.void(item_type[:])
+        def __extend_array(self, items):
+            n = items.shape[0]
+            self._reserve(n)
+            self.buf[self.size:self.size + n] = items
+            self.size += n
 
         @nb.Py_ssize_t()
         def __len__(self):
@@ -80,6 +93,7 @@ def compile_typedtuple(item_type, _tuple_cache=_tuple_cache):
             return "(" + buf + ")"
 
     _tuple_cache[item_type] = typedtuple
+    orderedcontainer.container_types.add(typedtuple.exttype)
     return typedtuple
 
 
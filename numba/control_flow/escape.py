@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Escape analysis for array temporaries in nopython context.
+
+Finds arrays allocated in the function (np.empty/np.zeros/np.ones calls and
+array expressions) that are bound to a local variable and never escape
+the function: they are not returned, passed to functions, aliased by other
+variables or views, iterated over, captured by closures or live across
+loop iterations (i.e. referenced by a phi). This uses the def-use chains
+(Variable.cf_references) built during control flow analysis.
+
+The storage chosen for such a temporary is recorded as 'array_storage'
+metadata on the allocating expression:
+
+    'stack':    small allocations with a constant shape are placed in the
+                stack frame of the function, which also hoists them out of
+                any loop
+    'reuse':    allocations in loops reuse the memory of the previous
+                iteration if the shape did not change
+
+See LateSpecializer.visit_ArrayNewEmptyNode for the native lowering.
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+
+from numba import visitors, nodes
+from numba.support.numpy_support import allocation
+
+# Maximum size of arrays allocated on the stack
+max_stack_nbytes = 1024
+
+# Array attributes which do not expose the array
+safe_attributes = ('shape', 'strides', 'ndim', 'size', 'itemsize', 'nbytes')
+
+def unwrap(node):
+    while isinstance(node, nodes.CoercionNode):
+        node = node.node
+    return node
+
+def is_array_name(node):
+    node = unwrap(node)
+    return isinstance(node, ast.Name) and node.type.is_array
+
+class ArrayEscapeAnalysis(visitors.NumbaVisitor):
+
+    def __init__(self, *args, **kwargs):
+        super(ArrayEscapeAnalysis, self).__init__(*args, **kwargs)
+        self.loop_depth = 0
+        # [(variable, allocating expression, loop depth)]
+        self.temporaries = []
+        # Variables that escape
+        self.escaping = set()
+
+    def analyze(self):
+        self.visit(self.ast)
+
+        for variable, value, loop_depth in self.temporaries:
+            if not self.escapes(variable):
+                storage = self.get_storage(value, loop_depth)
+                if storage is not None:
+                    nodes.annotate(self.env, value, array_storage=storage)
+
+    def escapes(self, variable):
+        return (variable in self.escaping or
+                variable.is_cellvar or variable.is_freevar or
+                not all(isinstance(ref, ast.Name)
+                            for ref in variable.cf_references))
+
+    def get_storage(self, value, loop_depth):
+        if allocation.get_allocator(value) is not None:
+            nbytes = allocation.constant_nbytes(value)
+            if nbytes is not None and nbytes <= max_stack_nbytes:
+                return 'stack'
+
+        if loop_depth:
+            return 'reuse'
+
+        return None
+
+    def is_temporary(self, node):
+        "Whether the expression allocates a new array"
+        if not node.type.is_array:
+            return False
+        elif isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            return True
+        elif isinstance(node, ast.Call):
+            return (allocation.get_allocator(node) is not None or
+                    bool(self.query(node, 'is_math')) or
+                    bool(self.query(node, 'is_where')))
+
+        return False
+
+    def visit_operands(self, operands):
+        "Visit the operands of an expression producing a new array"
+        for operand in operands:
+            if not is_array_name(operand):
+                self.visit(operand)
+
+    #------------------------------------------------------------------------
+    # Definitions
+    #------------------------------------------------------------------------
+
+    def visit_Assign(self, node):
+        target = node.targets[0]
+        if len(node.targets) == 1:
+            if (isinstance(target, ast.Name) and target.variable.renameable and
+                    self.is_temporary(node.value)):
+                self.temporaries.append(
+                    (target.variable, node.value, self.loop_depth))
+
+            elif (isinstance(target, ast.Subscript) and target.type.is_array
+                      and is_array_name(node.value)):
+                # Copy into a slice: a[:] = tmp
+                self.visit(target)
+                return
+
+        self.generic_visit(node)
+
+    #------------------------------------------------------------------------
+    # Loops
+    #------------------------------------------------------------------------
+
+    def visit_For(self, node):
+        self.visit(node.target)
+        self.visit(node.iter)
+        self.loop_depth += 1
+        self.visitlist(node.body)
+        self.loop_depth -= 1
+        self.visitlist(node.orelse)
+
+    def visit_While(self, node):
+        self.loop_depth += 1
+        self.visit(node.test)
+        self.visitlist(node.body)
+        self.loop_depth -= 1
+        self.visitlist(node.orelse)
+
+    #------------------------------------------------------------------------
+    # Uses that do not let the array escape
+    #------------------------------------------------------------------------
+
+    def visit_Subscript(self, node):
+        if (isinstance(node.value, ast.Name) and
+                (isinstance(node.ctx, ast.Store) or not node.type.is_array)):
+            # Element access or assignment to a slice
+            self.visit(node.slice)
+        else:
+            self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if not (isinstance(node.value, ast.Name) and
+                    node.attr in safe_attributes):
+            self.generic_visit(node)
+
+    def visit_ArrayAttributeNode(self, node):
+        if not isinstance(node.array, ast.Name):
+            self.generic_visit(node)
+
+    def visit_BinOp(self, node):
+        if node.type.is_array:
+            self.visit_operands([node.left, node.right])
+        else:
+            self.generic_visit(node)
+
+    def visit_UnaryOp(self, node):
+        if node.type.is_array:
+            self.visit_operands([node.operand])
+        else:
+            self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        if node.type.is_array:
+            self.visit_operands([node.left] + node.comparators)
+        else:
+            self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if node.type.is_array and self.is_temporary(node):
+            self.visit(node.func)
+            self.visit_operands(node.args)
+            self.visitlist(node.keywords)
+        else:
+            self.generic_visit(node)
+
+    #------------------------------------------------------------------------
+    # Any other use of an array lets it escape
+    #------------------------------------------------------------------------
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load) and node.type.is_array:
+            self.escaping.add(node.variable)
+
+    def visit_FunctionDef(self, node):
+        if node is self.ast:
+            self.generic_visit(node)
+
+    def visit_ClosureNode(self, node):
+        pass
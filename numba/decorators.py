@@ -15,7 +15,7 @@ from numba import *
 from numba import typesystem, numbawrapper
 from numba import  functions
 from numba.utils import  process_signature
-from numba.codegen import llvmwrapper
+from numba.codegen import llvmwrapper, multiversion
 from numba import environment
 import llvm.core as _lc
 from numba.wrapping import compiler
@@ -33,7 +33,11 @@ else:
 # PyCC decorators
 #------------------------------------------------------------------------
 
-def _internal_export(env, function_signature, backend='ast', **kws):
+def _internal_export(env, function_signature, backend='ast', targets=None,
+                     **kws):
+    if targets is not None:
+        targets = multiversion.check_targets(targets)
+
     def _iexport(func):
         if backend == 'bytecode':
             raise NotImplementedError(
@@ -60,6 +64,8 @@ def _internal_export(env, function_signature, backend='ast', **kws):
                 exports_env = env.exports
                 exports_env.function_signature_map[name] = function_signature
                 exports_env.function_module_map[name] = llvm_module
+                if targets is not None:
+                    exports_env.function_targets_map[name] = targets
                 if not exports_env.wrap_exports:
                     exports_env.function_wrapper_map[name] = None
                 else:
@@ -75,6 +81,10 @@ def export(signature, env_name=None, env=None, **kws):
     A signature is a string with
 
     name ret_type(arg_type, argtype, ...)
+
+    Pass targets=['sse2', 'avx2', ...] to emit a version of the function
+    for each CPU target level, selected at runtime by a dispatch stub (see
+    numba.codegen.multiversion).
     """
     if env is None:
         env = environment.NumbaEnvironment.get_environment(env_name)
@@ -216,6 +226,11 @@ def _jit(restype=None, argtypes=None, nopython=False,
         assert argtys is not None
         env.specializations.register(func)
 
+        if kwargs.get('targets') is not None:
+            # Jit code is generated for the host, the targets only apply
+            # to exported code
+            kwargs['targets'] = multiversion.check_targets(kwargs['targets'])
+
         assert kwargs.get('llvm_module') is None # TODO link to user module
         assert kwargs.get('llvm_ee') is None, "Engine should never be provided"
         sig, lfunc, wrapper = compile_function(
@@ -257,6 +272,17 @@ def jit(restype=None, argtypes=None, backend='ast', target='cpu', nopython=False
     * As above, but using a string instead of a constructed function
       type.  Example: ``jit("f8(f8)")``.
 
+    Pass targets=['sse2', 'avx2', ...] to list the CPU target levels for
+    which exported versions of the function are emitted (see
+    numba.codegen.multiversion). Code compiled at runtime always targets
+    the features of the host CPU.
+
+    Pass boundscheck=True to check the indices of array accesses against
+    the shape of the array, and raise an IndexError (or trap in nopython
+    mode) for indices that are out of bounds. Accesses that index an array
+    with the variable of a loop over range(array.shape[i]) are known to be
+    in bounds and are not checked.
+
     If backend='bytecode' the bytecode translator is used, if
     backend='ast' the AST translator is used.  By default, the AST
     translator is used.  *Note that the bytecode translator is
@@ -57,6 +57,7 @@ default_pipeline_order = default_normalize_order + [
     'TypeSet',
     'ClosureTypeInference',
     'create_lfunc3',
+    'EscapeAnalysis',
     'TransformFor',
     'Specialize',
     'RewriteArrayExpressions',
@@ -367,6 +368,12 @@ class FunctionEnvironment(object):
         default='fancy'
     )
 
+    boundscheck = TypedProperty(
+        bool,
+        'Whether to check array indices against the array extents, and '
+        'raise an IndexError for indices that are out of bounds.',
+        False)
+
     postpasses = TypedProperty(
         dict,
         "List of passes that should run on the final llvm ir before linking",
@@ -393,7 +400,7 @@ class FunctionEnvironment(object):
              closures=None, closure_scope=None,
              refcount_args=True,
              ast_metadata=None, warn=True, warnstyle='fancy',
-             typesystem=None, postpasses=None,
+             typesystem=None, postpasses=None, boundscheck=False,
              **kws):
 
         self.parent = parent
@@ -462,6 +469,7 @@ class FunctionEnvironment(object):
 
         self.warn = warn
         self.warnstyle = warnstyle
+        self.boundscheck = boundscheck
         self.kwargs = kws
 
     def getstate(self):
@@ -486,6 +494,7 @@ class FunctionEnvironment(object):
             warn=self.warn,
             warnstyle=self.warnstyle,
             postpasses=self.postpasses,
+            boundscheck=self.boundscheck,
         )
         return state
 
@@ -695,6 +704,11 @@ class PyccEnvironment(object):
         'Map from function names to tuples containing LLVM wrapper functions '
         'and LLVM modules that define the wrapper function.')
 
+    function_targets_map = TypedProperty(
+        dict,
+        'Map from function names to the list of CPU target levels to emit '
+        'versions of the function for (see codegen/multiversion.py).')
+
     # ____________________________________________________________
     # Methods
 
@@ -707,6 +721,7 @@ class PyccEnvironment(object):
         self.function_signature_map = {}
         self.function_module_map = {}
         self.function_wrapper_map = {}
+        self.function_targets_map = {}
 
 # ______________________________________________________________________
 
@@ -0,0 +1,344 @@
+/*
+    Native array runtime.
+
+    Arrays allocated from nopython code do not go through the NumPy C-API.
+    Instead they are allocated as a single block holding a PyArrayObject
+    compatible header, followed by the shape and strides and the (aligned)
+    data:
+
+        [ header | shape[nd] | strides[nd] | padding | data ]
+
+    The header has the exact layout of a PyArrayObject, so compiled code
+    can access data, shape and strides the same way it does for NumPy
+    arrays. A native array is recognized by having a NULL ob_type, and its
+    ob_refcnt is managed by compiled code through Numba_NativeArray_XIncref
+    and Numba_NativeArray_XDecref, which ignore any real Python objects
+    (those are borrowed for the duration of a nopython call). None of this
+    requires the GIL.
+
+    Only at the boundary with Python (the function wrapper) is a native
+    array turned into an ndarray, using Numba_NativeArray_ToNumPy. The
+    ndarray then owns the native array through its base object.
+*/
+
+#include <numpy/arrayobject.h>
+
+/* Alignment of the data in a native array */
+#define NATIVE_ARRAY_ALIGN 32
+
+/* The array holds a reference to a real Python base object */
+#define NATIVE_ARRAY_OWNS_BASE 0x80000000
+
+#define NATIVE_ARRAY_CAPSULE_NAME "numba.nativearray"
+
+typedef struct {
+    PyObject_HEAD
+    char *data;
+    int nd;
+    npy_intp *dimensions;
+    npy_intp *strides;
+    PyObject *base;
+    PyArray_Descr *descr;
+    int flags;
+    PyObject *weakreflist;
+} NativeArrayObject;
+
+#define NATIVE_REFCNT(obj) (((PyObject *) (obj))->ob_refcnt)
+#define IS_NATIVE_ARRAY(obj) \
+    ((obj) != NULL && ((PyObject *) (obj))->ob_type == NULL)
+
+/*
+    Allocate the header, shape and strides, with extra room for data.
+    Returns NULL if the array is too big or cannot be allocated.
+*/
+static NativeArrayObject *
+native_array_alloc(int nd, npy_intp *shape, npy_intp databytes,
+                   npy_intp *data_offset)
+{
+    NativeArrayObject *arr;
+    npy_intp offset = sizeof(NativeArrayObject) + 2 * nd * sizeof(npy_intp);
+
+    offset = (offset + NATIVE_ARRAY_ALIGN - 1) & ~(NATIVE_ARRAY_ALIGN - 1);
+    if (databytes > NPY_MAX_INTP - offset - NATIVE_ARRAY_ALIGN)
+        return NULL;
+
+    /* Over-allocate so we can align the data */
+    arr = (NativeArrayObject *) malloc(offset + databytes + NATIVE_ARRAY_ALIGN);
+    if (arr == NULL)
+        return NULL;
+
+    NATIVE_REFCNT(arr) = 1;
+    ((PyObject *) arr)->ob_type = NULL;
+    arr->nd = nd;
+    arr->dimensions = (npy_intp *) (arr + 1);
+    arr->strides = arr->dimensions + nd;
+    arr->base = NULL;
+    arr->descr = NULL;
+    arr->flags = NPY_ARRAY_ALIGNED | NPY_ARRAY_WRITEABLE;
+    arr->weakreflist = NULL;
+
+    memcpy(arr->dimensions, shape, nd * sizeof(npy_intp));
+
+    *data_offset = offset;
+    return arr;
+}
+
+/*
+    Check the shape of a new array. Returns -1 if a dimension is negative.
+*/
+static int
+Numba_NativeArray_CheckShape(int nd, npy_intp *shape)
+{
+    int i;
+
+    for (i = 0; i < nd; i++) {
+        if (shape[i] < 0)
+            return -1;
+    }
+    return 0;
+}
+
+/*
+    Allocate a new uninitialized native array. Returns a new reference, or
+    NULL if the array is too big or cannot be allocated. Compiled code
+    raises the error, since the GIL may not be held here.
+*/
+static PyObject *
+Numba_NativeArray_New(int nd, npy_intp *shape, npy_intp itemsize,
+                      int fortran)
+{
+    NativeArrayObject *arr;
+    npy_intp stride = itemsize, offset;
+    npy_uintp misalign;
+    int i, dim;
+
+    for (i = 0; i < nd; i++) {
+        if (shape[i] < 0)
+            return NULL;
+        if (shape[i] && stride > NPY_MAX_INTP / shape[i])
+            return NULL;
+        stride *= shape[i] ? shape[i] : 1;
+    }
+
+    /* stride is now the size of the data in bytes */
+    arr = native_array_alloc(nd, shape, stride, &offset);
+    if (arr == NULL)
+        return NULL;
+
+    stride = itemsize;
+    for (i = 0; i < nd; i++) {
+        dim = fortran ? i : nd - i - 1;
+        arr->strides[dim] = stride;
+        stride *= shape[dim] ? shape[dim] : 1;
+    }
+
+    arr->data = ((char *) arr) + offset;
+    misalign = ((npy_uintp) arr->data) & (NATIVE_ARRAY_ALIGN - 1);
+    if (misalign)
+        arr->data += NATIVE_ARRAY_ALIGN - misalign;
+
+    arr->flags |= NPY_ARRAY_OWNDATA;
+    if (nd <= 1)
+        arr->flags |= NPY_ARRAY_C_CONTIGUOUS | NPY_ARRAY_F_CONTIGUOUS;
+    else
+        arr->flags |= fortran ? NPY_ARRAY_F_CONTIGUOUS : NPY_ARRAY_C_CONTIGUOUS;
+
+    return (PyObject *) arr;
+}
+
+/*
+    Allocate a native array for a temporary in a loop, reusing the array
+    allocated by the previous iteration (*prev) if it has the same shape
+    and layout. Escape analysis guarantees that the previous array is dead
+    at this point. Returns a new reference.
+*/
+static PyObject *
+Numba_NativeArray_Reuse(PyObject **prev, int nd, npy_intp *shape,
+                        npy_intp itemsize, int fortran)
+{
+    NativeArrayObject *arr = (NativeArrayObject *) *prev;
+    int i, dim;
+
+    if (!IS_NATIVE_ARRAY(arr) || arr->nd != nd ||
+            !(arr->flags & NPY_ARRAY_OWNDATA))
+        goto new_array;
+
+    for (i = 0; i < nd; i++) {
+        if (arr->dimensions[i] != shape[i])
+            goto new_array;
+    }
+
+    if (nd > 0) {
+        dim = fortran ? 0 : nd - 1;
+        if (arr->strides[dim] != itemsize)
+            goto new_array;
+        if (nd > 1 && !(arr->flags & (fortran ? NPY_ARRAY_F_CONTIGUOUS :
+                                                NPY_ARRAY_C_CONTIGUOUS)))
+            goto new_array;
+    }
+
+    NATIVE_REFCNT(arr)++;
+    return (PyObject *) arr;
+
+new_array:
+    return Numba_NativeArray_New(nd, shape, itemsize, fortran);
+}
+
+/*
+    Fill a contiguous native array with the item pointed to by value
+    (np.zeros and np.ones).
+*/
+static void
+Numba_NativeArray_Fill(PyObject *obj, char *value, npy_intp itemsize)
+{
+    NativeArrayObject *arr = (NativeArrayObject *) obj;
+    npy_intp i, size = 1;
+    char *data = arr->data;
+    int zero = 1;
+
+    for (i = 0; i < arr->nd; i++)
+        size *= arr->dimensions[i];
+
+    for (i = 0; i < itemsize; i++)
+        zero = zero && value[i] == 0;
+
+    if (zero) {
+        memset(data, 0, size * itemsize);
+    } else {
+        for (i = 0; i < size; i++, data += itemsize)
+            memcpy(data, value, itemsize);
+    }
+}
+
+/*
+    Create a native view on the data of another (native or NumPy) array.
+    A reference to a native base is owned, a NumPy base is borrowed.
+    Returns NULL if the view cannot be allocated.
+*/
+static PyObject *
+Numba_NativeArray_View(int nd, npy_intp *shape, npy_intp *strides,
+                       char *data, PyObject *base)
+{
+    NativeArrayObject *arr;
+    npy_intp offset;
+
+    arr = native_array_alloc(nd, shape, 0, &offset);
+    if (arr == NULL)
+        return NULL;
+
+    memcpy(arr->strides, strides, nd * sizeof(npy_intp));
+    arr->data = data;
+    arr->base = base;
+
+    if (IS_NATIVE_ARRAY(base))
+        NATIVE_REFCNT(base)++;
+
+    return (PyObject *) arr;
+}
+
+static void
+Numba_NativeArray_XIncref(PyObject *obj)
+{
+    if (IS_NATIVE_ARRAY(obj))
+        NATIVE_REFCNT(obj)++;
+}
+
+static void
+Numba_NativeArray_XDecref(PyObject *obj)
+{
+    NativeArrayObject *arr = (NativeArrayObject *) obj;
+
+    if (!IS_NATIVE_ARRAY(obj) || --NATIVE_REFCNT(obj) > 0)
+        return;
+
+    if (arr->flags & NATIVE_ARRAY_OWNS_BASE) {
+        /* Only set by Numba_NativeArray_ToNumPy, we hold the GIL */
+        Py_DECREF(arr->base);
+    } else {
+        Numba_NativeArray_XDecref(arr->base);
+    }
+
+    free(arr);
+}
+
+static void
+native_array_capsule_destructor(PyObject *capsule)
+{
+    Numba_NativeArray_XDecref(
+        (PyObject *) PyCapsule_GetPointer(capsule, NATIVE_ARRAY_CAPSULE_NAME));
+}
+
+/*
+    Convert an array returned from nopython code to a NumPy array. Steals
+    the reference to a native array, and returns a new reference.
+    NumPy arrays are returned as-is (with a new reference).
+*/
+static PyObject *
+Numba_NativeArray_ToNumPy(PyObject *obj, PyArray_Descr *descr)
+{
+    NativeArrayObject *arr = (NativeArrayObject *) obj, *view;
+    PyObject *result, *capsule;
+
+    if (obj == NULL)
+        return NULL;
+
+    if (!IS_NATIVE_ARRAY(obj)) {
+        Py_INCREF(obj);
+        return obj;
+    }
+
+    /* Keep borrowed NumPy bases of views alive */
+    for (view = arr; view != NULL && !(view->flags & NATIVE_ARRAY_OWNS_BASE);
+         view = (NativeArrayObject *) view->base) {
+        if (view->base != NULL && !IS_NATIVE_ARRAY(view->base)) {
+            Py_INCREF(view->base);
+            view->flags |= NATIVE_ARRAY_OWNS_BASE;
+            break;
+        }
+    }
+
+    capsule = PyCapsule_New(obj, NATIVE_ARRAY_CAPSULE_NAME,
+                            native_array_capsule_destructor);
+    if (capsule == NULL) {
+        Numba_NativeArray_XDecref(obj);
+        return NULL;
+    }
+
+    Py_INCREF(descr);
+    result = PyArray_NewFromDescr(&PyArray_Type, descr, arr->nd,
+                                  arr->dimensions, arr->strides, arr->data,
+                                  NPY_ARRAY_WRITEABLE, NULL);
+    if (result == NULL) {
+        Py_DECREF(capsule);
+        return NULL;
+    }
+
+    /* Steals the reference to the capsule */
+    if (PyArray_SetBaseObject((PyArrayObject *) result, capsule) < 0) {
+        Py_DECREF(result);
+        return NULL;
+    }
+
+    PyArray_UpdateFlags((PyArrayObject *) result, NPY_ARRAY_UPDATE_ALL);
+    return result;
+}
+
+static int
+export_nativearray(PyObject *module)
+{
+    if (_import_array() < 0)
+        goto error;
+
+    EXPORT_FUNCTION(Numba_NativeArray_CheckShape, module, error)
+    EXPORT_FUNCTION(Numba_NativeArray_New, module, error)
+    EXPORT_FUNCTION(Numba_NativeArray_Reuse, module, error)
+    EXPORT_FUNCTION(Numba_NativeArray_Fill, module, error)
+    EXPORT_FUNCTION(Numba_NativeArray_View, module, error)
+    EXPORT_FUNCTION(Numba_NativeArray_XIncref, module, error)
+    EXPORT_FUNCTION(Numba_NativeArray_XDecref, module, error)
+    EXPORT_FUNCTION(Numba_NativeArray_ToNumPy, module, error)
+
+    return 0;
+error:
+    return -1;
+}
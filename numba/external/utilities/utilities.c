@@ -15,6 +15,7 @@
 
 #include "type_conversion.c"
 #include "virtuallookup.c"
+#include "nativearray.c"
 
 #if PY_MAJOR_VERSION >= 3
 static struct PyModuleDef moduledef = {
@@ -53,6 +54,8 @@ PyMODINIT_FUNC PyInit_utilities(void)
         goto error;
     if (export_virtuallookup(module) < 0)
         goto error;
+    if (export_nativearray(module) < 0)
+        goto error;
 
     goto success; /* done */
 
@@ -28,10 +28,64 @@ lookup_method(PyCustomSlots_Table **table_pp,
     }
 }
 
+/*
+    Look up a method through the inline cache of a call site:
+
+        void *cache[2] = { vtable, method }
+
+    The cache is filled once, with the first vtable seen at the call site.
+    Filling is claimed with a compare-and-swap, so concurrent callers never
+    see a vtable paired with the method of another vtable. The vtable is
+    published with release semantics and read with acquire semantics, so
+    a reader that sees it also sees the method, also on weakly ordered
+    CPUs. Compiled code may run without the GIL.
+*/
+
+#define INLINE_CACHE_BUSY ((void *) 1)
+
+#if defined(_MSC_VER)
+#include <windows.h>
+#define claim_inline_cache(cache) \
+    (InterlockedCompareExchangePointer(&(cache)[0], INLINE_CACHE_BUSY, \
+                                       NULL) == NULL)
+#define publish_inline_cache(cache, table) \
+    InterlockedExchangePointer(&(cache)[0], (void *) (table))
+#define load_inline_cache(cache) \
+    InterlockedCompareExchangePointer(&(cache)[0], NULL, NULL)
+#else
+#define claim_inline_cache(cache) \
+    __sync_bool_compare_and_swap(&(cache)[0], NULL, INLINE_CACHE_BUSY)
+#define publish_inline_cache(cache, table) \
+    __atomic_store_n(&(cache)[0], (void *) (table), __ATOMIC_RELEASE)
+#define load_inline_cache(cache) \
+    __atomic_load_n(&(cache)[0], __ATOMIC_ACQUIRE)
+#endif
+
+static void *
+lookup_method_cached(PyCustomSlots_Table **table_pp,
+                     uint64_t prehash, char *method_name, void **cache)
+{
+    PyCustomSlots_Table *table = *table_pp;
+    void *cached_table = load_inline_cache(cache);
+    void *method;
+
+    if (cached_table == (void *) table)
+        return cache[1];
+
+    method = lookup_method(table_pp, prehash, method_name);
+    if (cached_table == NULL && claim_inline_cache(cache)) {
+        cache[1] = method;
+        publish_inline_cache(cache, table);
+    }
+
+    return method;
+}
+
 static int
 export_virtuallookup(PyObject *module)
 {
     EXPORT_FUNCTION(lookup_method, module, error)
+    EXPORT_FUNCTION(lookup_method_cached, module, error)
 
     return 0;
 error:
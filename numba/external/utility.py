@@ -57,9 +57,28 @@ object_to_numeric = {
 void_p = void.pointer()
 void_pp = void_p.pointer()
 
-utility_funcs = list(object_to_numeric.itervalues()) + [
+npy_intp_p = npy_intp.pointer()
+
+# Native array runtime (see utilities/nativearray.c)
+native_array_funcs = [
+    load("Numba_NativeArray_CheckShape", int_(int_, npy_intp_p)),
+    load("Numba_NativeArray_New", object_(int_, npy_intp_p, npy_intp, int_)),
+    load("Numba_NativeArray_Reuse",
+         object_(object_.pointer(), int_, npy_intp_p, npy_intp, int_)),
+    load("Numba_NativeArray_Fill", void(object_, void_p, npy_intp)),
+    load("Numba_NativeArray_View",
+         object_(int_, npy_intp_p, npy_intp_p, void_p, object_)),
+    load("Numba_NativeArray_XIncref", void(object_)),
+    load("Numba_NativeArray_XDecref", void(object_)),
+    load("Numba_NativeArray_ToNumPy", object_(void_p, object_)),
+]
+
+utility_funcs = list(object_to_numeric.itervalues()) + native_array_funcs + [
     UtilityFunction.load(
         "lookup_method", void_p(void_pp, uint64, char.pointer())),
+    UtilityFunction.load(
+        "lookup_method_cached",
+        void_p(void_pp, uint64, char.pointer(), void_pp)),
 ]
 
 def default_utility_library(context):
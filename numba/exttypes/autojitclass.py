@@ -291,25 +291,6 @@ class AutojitExtensionCompiler(compileclass.ExtensionCompiler):
 # Unbound Methods from Python
 #------------------------------------------------------------------------
 
-class UnboundDelegatingMethod(object):
-    """
-    Function in the unspecialized class that is used for delegation to
-    a method in a specialized class, i.e.
-
-        A.method(A(10.0)) -> A(10.0).method()
-
-    This method can never be bound, since __new__ always returns specialized
-    instances (so the unspecialized class cannot be instantiated!).
-    """
-
-    def __init__(self, py_class, name):
-        self.py_class = py_class
-        self.name = name
-
-    def __call__(self, obj, *args, **kwargs):
-        numbawrapper.unbound_method_type_check(self.py_class, obj)
-        return getattr(obj, self.name)(*args, **kwargs)
-
 def make_delegations(py_class):
     """
     Make delegation unbound methods that delegate from the unspecialized
@@ -330,7 +311,7 @@ def make_delegations(py_class):
             else:
                 # Regular unbound method. Create dispatcher to bound method
                 # when called
-                new_func = UnboundDelegatingMethod(py_class, name)
+                new_func = numbawrapper.UnboundDelegatingMethod(py_class, name)
 
             setattr(py_class, name, new_func)
 
@@ -6,6 +6,8 @@ Autojit meta class.
 
 from __future__ import print_function, division, absolute_import
 
+from numba import numbawrapper
+
 class _AutojitMeta(type):
     """
     Metaclass base for autojit classes.
@@ -26,8 +28,10 @@ def create_unspecialized_cls(py_class, class_specializer):
             AutojitMeta -> UnspecializedClass -> SpecializedInstance
         """
 
-        def __call__(cls, *args, **kwargs):
-            return class_specializer(*args, **kwargs)
+        # Instantiate cached specializations without a Python-level call
+        # (ClassSpecializingWrapper is not a descriptor, so it is not
+        # passed the unspecialized class)
+        __call__ = numbawrapper.ClassSpecializingWrapper(class_specializer)
 
         def __getitem__(cls, key):
             assert isinstance(key, dict)
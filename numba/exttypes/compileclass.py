@@ -65,6 +65,9 @@ class ExtensionCompiler(object):
         """
         self.class_dict['__numba_py_class'] = self.py_class
 
+        # Subclasses don't inherit finality, so don't use getattr()
+        self.ext_type.is_final = bool(self.class_dict.get('__numba_final__'))
+
         self.inheriter.inherit(self.ext_type)
         process_class_attribute_types(self.ext_type, self.class_dict)
 
@@ -371,12 +374,27 @@ class AttributeBuilder(object):
         Create a descriptor that accesses the attribute from Python space.
         """
 
+    def create_compact_descr(self, attr_name):
+        """
+        Create a descriptor that accesses the attribute of a compact object,
+        which has no __dict__ to hold a ctypes struct.
+        """
+        def _get(self):
+            return getattr(extension_types.get_attributes(self), attr_name)
+        def _set(self, value):
+            return setattr(extension_types.get_attributes(self), attr_name,
+                           value)
+        return property(_get, _set)
+
     def build_descriptors(self, ext_type, extension_class):
         "Cram descriptors into the class dict"
         table = ext_type.attribute_table
 
         for attr_name, attr_type in table.attributedict.iteritems():
-            descriptor = self.create_descr(attr_name)
+            if ext_type.is_compact:
+                descriptor = self.create_compact_descr(attr_name)
+            else:
+                descriptor = self.create_descr(attr_name)
             setattr(extension_class, attr_name, descriptor)
 
 #------------------------------------------------------------------------
@@ -390,11 +408,88 @@ class MethodWrapperBuilder(object):
         Update the extension class with the function wrappers.
         """
         self.process_typed_methods(env, extclass, ext_type)
+        self.build_native_slots(extclass, ext_type)
 
     def process_typed_methods(self, env, extclass, ext_type):
         for method in ext_type.methoddict.itervalues():
             setattr(extclass, method.name, method.get_wrapper())
 
+    def build_native_slots(self, extclass, ext_type):
+        """
+        Fill the sequence and number slots of special methods with wrappers
+        that call the native methods, instead of the Python-level method
+        wrappers. This must happen after process_typed_methods(), which
+        resets the slots.
+        """
+        for method in ext_type.methoddict.itervalues():
+            kinds = native_slot_kinds(extclass, method)
+            if kinds is not None and method.lfunc_pointer:
+                arg_kind, result_kind = kinds
+                extension_types.set_native_slot(
+                    extclass, method.name, method.lfunc_pointer,
+                    arg_kind, result_kind)
+
+#------------------------------------------------------------------------
+# Native Slots
+#------------------------------------------------------------------------
+
+binop_slot_methods = ('__add__', '__sub__', '__mul__', '__mod__',
+                      '__floordiv__', '__truediv__')
+
+def native_kind(type):
+    """
+    The kind of native value that the slot wrappers in extension_types
+    convert, or None.
+    """
+    if type.is_array:
+        return None
+    elif type.is_object:
+        return 'object'
+    elif type.is_int and type.signed and not type.is_bool:
+        return {4: 'int32', 8: 'int64'}.get(type.itemsize)
+    elif type.is_float and type.itemsize == 8:
+        return 'double'
+
+    return None
+
+def is_index_type(type):
+    return (type.is_int and type.signed and
+            type.itemsize == typesystem.Py_ssize_t.itemsize)
+
+def native_slot_kinds(extclass, method):
+    """
+    Return the kinds of the last argument and the result of a special
+    method with a native slot wrapper, or None if the method keeps its
+    Python slot (because the wrappers can't convert its signature).
+    """
+    signature = method.signature
+    if signature is None or not signature.is_bound_method:
+        return None
+
+    args = signature.args[1:]
+    result_kind = native_kind(signature.return_type)
+
+    if method.name == '__len__':
+        if not args and result_kind in ('int32', 'int64'):
+            return None, result_kind
+    elif method.name == '__getitem__':
+        if len(args) == 1 and is_index_type(args[0]) and result_kind:
+            return 'int64', result_kind
+    elif method.name == '__setitem__':
+        if (len(args) == 2 and is_index_type(args[0]) and
+                signature.return_type.is_void and native_kind(args[1])):
+            return native_kind(args[1]), None
+    elif method.name in binop_slot_methods:
+        # The wrapper gives NotImplemented for operands that don't convert,
+        # it doesn't try reflected methods
+        reflected_name = '__r%s' % method.name[2:]
+        if (len(args) == 1 and not hasattr(extclass, reflected_name) and
+                native_kind(args[0]) in ('object', 'int64', 'double') and
+                result_kind in ('object', 'int64', 'double')):
+            return native_kind(args[0]), result_kind
+
+    return None
+
 #------------------------------------------------------------------------
 # Filters
 #------------------------------------------------------------------------
@@ -5,6 +5,8 @@ See also numba.extension_type_inference
 """
 
 cimport cython
+from libc.stdint cimport int32_t, int64_t
+from libc.string cimport memcpy
 from numba._numba cimport *
 
 import sys
@@ -13,21 +15,63 @@ import ctypes
 import numba
 
 ctypedef object (*tp_new_func)(PyObject *, PyObject *, PyObject *)
+
+cdef extern from *:
+    # The object header, for initializing objects in an InstanceArena
+    ctypedef struct ObjectHeader "PyObject":
+        Py_ssize_t ob_refcnt
+        void *ob_type
 ctypedef void (*destructor)(PyObject *)
 ctypedef int (*visitproc)(PyObject *, void *)
 
 cdef extern from *:
+    ctypedef Py_ssize_t (*lenfunc)(PyObject *) except -1
+    ctypedef PyObject *(*binaryfunc)(PyObject *, PyObject *) except NULL
+    ctypedef PyObject *(*ssizeargfunc)(PyObject *, Py_ssize_t) except NULL
+    ctypedef int (*ssizeobjargproc)(PyObject *, Py_ssize_t,
+                                    PyObject *) except -1
+    ctypedef int (*objobjargproc)(PyObject *, PyObject *,
+                                  PyObject *) except -1
+
+    ctypedef struct PyNumberMethods:
+        binaryfunc nb_add
+        binaryfunc nb_subtract
+        binaryfunc nb_multiply
+        binaryfunc nb_remainder
+        binaryfunc nb_floor_divide
+        binaryfunc nb_true_divide
+
+    ctypedef struct PySequenceMethods:
+        lenfunc sq_length
+        ssizeargfunc sq_item
+        ssizeobjargproc sq_ass_item
+
+    ctypedef struct PyMappingMethods:
+        lenfunc mp_length
+        binaryfunc mp_subscript
+        objobjargproc mp_ass_subscript
+
     ctypedef struct PyTypeObject:
         tp_new_func tp_new
         destructor tp_dealloc
         int (*tp_traverse)(PyObject *o, visitproc v, void *a)
         int (*tp_clear)(PyObject *o)
 
+        PyNumberMethods *tp_as_number
+        PySequenceMethods *tp_as_sequence
+        PyMappingMethods *tp_as_mapping
+
+        long tp_flags
         long tp_dictoffset
         Py_ssize_t tp_itemsize
         Py_ssize_t tp_basicsize
         PyTypeObject *tp_base
 
+    object PyType_GenericAlloc(PyTypeObject *type, Py_ssize_t nitems)
+
+    long Py_TPFLAGS_HAVE_GC
+    void PyObject_GC_UnTrack(object obj)
+
 #------------------------------------------------------------------------
 # Code to compute table offsets in the objects
 #------------------------------------------------------------------------
@@ -65,6 +109,14 @@ def compute_attrs_offset(py_class):
 
     return align(compute_vtab_offset(py_class) + sizeof(void *), 8)
 
+def compact_layout_class(py_class):
+    """
+    Returns a class with the bases of py_class and the object layout of
+    compact instances (without __dict__ and __weakref__ slots), to compute
+    the table offsets of compact extension types.
+    """
+    return type(py_class.__name__, py_class.__bases__, {'__slots__': ()})
+
 #------------------------------------------------------------------------
 # Code to handle tp_dealloc, tp_traverse and tp_clear
 #------------------------------------------------------------------------
@@ -293,15 +345,20 @@ def create_new_extension_type(metacls, name, bases, classdict,
         vtab_location = <void **> ((<char *> obj_p) + vtab_offset)
         vtab_location[0] = <void *> <Py_uintptr_t> cls.__numba_vtab_p
 
-        attrs_pointer = (<Py_uintptr_t> obj_p) + attrs_offset
-        obj._numba_attrs = ctypes.cast(attrs_pointer,
-                                       cls.__numba_attributes_ctype)[0]
+        if not is_compact:
+            # Compact objects have no __dict__, their attribute descriptors
+            # use get_attributes()
+            obj._numba_attrs = get_attributes(obj)
 
         return obj
 
     # __________________________________________________________________
     # Create extension type
 
+    cdef bint is_compact = exttype.is_compact
+    if is_compact:
+        classdict['__slots__'] = ()
+
     classdict['__new__'] = staticmethod(new)
     extclass = metacls(name, bases, classdict)
     assert isinstance(extclass, type)
@@ -310,6 +367,9 @@ def create_new_extension_type(metacls, name, bases, classdict,
     cdef bint base_is_object = superclass_new.__self__ is object
 
     extclass_p = <PyTypeObject *> extclass
+    if is_compact and extclass_p.tp_dictoffset:
+        raise TypeError("Compact class '%s' has a base class with a "
+                        "__dict__" % name)
 
     # __________________________________________________________________
     # Update extension type
@@ -372,3 +432,522 @@ def create_new_extension_type(metacls, name, bases, classdict,
 
     return extclass
 
+
+def get_attributes(obj):
+    "Returns the ctypes struct of the native attributes of an extension object"
+    cls = type(obj)
+    attrs_pointer = (<Py_uintptr_t> <PyObject *> obj) + cls.__numba_attr_offset
+    return ctypes.cast(attrs_pointer, cls.__numba_attributes_ctype)[0]
+
+#------------------------------------------------------------------------
+# Closure scopes
+#------------------------------------------------------------------------
+
+cdef object new_closure_scope(object scope_class):
+    """
+    Allocate a closure scope from compiled code. Closure scopes are compact
+    and have no vtable, so unlike __new__ this only needs to allocate the
+    object, with all attributes zero/NULL.
+    """
+    return PyType_GenericAlloc(<PyTypeObject *> scope_class, 0)
+
+new_closure_scope_pointer = <Py_uintptr_t> &new_closure_scope
+
+#------------------------------------------------------------------------
+# Bulk allocation of compact objects
+#------------------------------------------------------------------------
+
+# Buffers of arenas that were deallocated while their objects were still
+# referenced. The objects stay valid for the rest of the process.
+leaked_arena_buffers = []
+
+cdef class InstanceArena(object):
+    """
+    N instances of a compact extension class, allocated at once in a
+    single contiguous buffer:
+
+        {
+            object 0: { [GC header], PyObject_HEAD, vtable *, attributes }
+            object 1: { [GC header], PyObject_HEAD, vtable *, attributes }
+            ...
+        }
+
+    Objects of garbage collected classes are preceded by the GC header of
+    an object that is not tracked by the collector.
+
+    The instances are not initialized by __init__, their native attributes
+    are zero. The arena owns the objects: when it is deallocated while
+    objects are still referenced elsewhere, the buffer is kept alive.
+    """
+
+    cdef readonly object extclass
+    cdef readonly object buffer
+    cdef readonly Py_ssize_t itemsize
+    cdef Py_ssize_t n
+    cdef char *data
+
+    def __init__(self, extclass, Py_ssize_t n):
+        import numpy as np
+
+        cdef PyTypeObject *type_p = <PyTypeObject *> extclass
+        cdef ObjectHeader *header
+        cdef Py_ssize_t i, vtab_offset, gc_size
+        cdef Py_uintptr_t vtab_p
+        cdef char *gc_header
+
+        exttype = getattr(extclass, '__numba_ext_type', None)
+        if exttype is None or not exttype.is_compact:
+            raise TypeError("Expected a compact extension class, got %r" %
+                                                                (extclass,))
+        if n < 0:
+            raise ValueError("Negative number of instances: %d" % n)
+
+        if type_p.tp_flags & Py_TPFLAGS_HAVE_GC:
+            # Copy the GC header of an untracked object of the class. Its
+            # size is what sys.getsizeof() adds to the basic size.
+            untracked = PyType_GenericAlloc(type_p, 0)
+            PyObject_GC_UnTrack(untracked)
+            gc_size = sys.getsizeof(untracked) - type_p.tp_basicsize
+            gc_header = (<char *> <PyObject *> untracked) - gc_size
+        else:
+            gc_size = 0
+
+        self.extclass = extclass
+        self.itemsize = align(gc_size + type_p.tp_basicsize, 8)
+        self.n = n
+
+        # Over-allocate by 8 bytes, to align the objects
+        self.buffer = np.zeros(n * self.itemsize + 8, dtype=np.uint8)
+        self.data = <char *> align_pointer(
+            <void *> <Py_uintptr_t> self.buffer.ctypes.data, 8) + gc_size
+
+        vtab_offset = compute_vtab_offset(extclass)
+        vtab_p = getattr(extclass, '__numba_vtab_p')
+        for i in range(n):
+            header = <ObjectHeader *> (self.data + i * self.itemsize)
+            if gc_size:
+                memcpy((<char *> header) - gc_size, gc_header, gc_size)
+            header.ob_refcnt = 1
+            header.ob_type = <void *> type_p
+            Py_INCREF(<PyObject *> extclass)
+
+            (<void **> ((<char *> header) + vtab_offset))[0] = <void *> vtab_p
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, Py_ssize_t index):
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError(index)
+
+        return <object> <PyObject *> (self.data + index * self.itemsize)
+
+    property attributes:
+        """
+        The native attributes of the instances, as a strided structured
+        array. Compiled code accesses attribute 'x' of instance i as
+        arena.attributes[i].x. Only supported for classes with numeric
+        attributes.
+        """
+
+        def __get__(self):
+            import numpy as np
+
+            exttype = getattr(self.extclass, '__numba_ext_type')
+            attr_struct = exttype.attribute_table.to_struct()
+            for field_name, field_type in attr_struct.fields:
+                if field_type.is_object or field_type.is_array:
+                    raise TypeError("Attribute '%s' is not numeric" %
+                                                                field_name)
+
+            offset = (<Py_uintptr_t> self.data -
+                      <Py_uintptr_t> self.buffer.ctypes.data +
+                      compute_attrs_offset(self.extclass))
+            return np.ndarray((self.n,), attr_struct.get_dtype(),
+                              buffer=self.buffer, offset=offset,
+                              strides=(self.itemsize,))
+
+    def __dealloc__(self):
+        cdef Py_ssize_t i, offset
+        cdef PyObject *obj_p
+
+        if self.data == NULL:
+            return
+
+        for i in range(self.n):
+            if (<ObjectHeader *> (self.data + i * self.itemsize)).ob_refcnt > 1:
+                leaked_arena_buffers.append(self.buffer)
+                return
+
+        for i in range(self.n):
+            obj_p = <PyObject *> (self.data + i * self.itemsize)
+            for offset in getoffsets(self.extclass):
+                Py_CLEAR((<PyObject **> ((<char *> obj_p) + offset))[0])
+            Py_XDECREF(<PyObject *> self.extclass)
+
+#------------------------------------------------------------------------
+# Native special method slots
+#------------------------------------------------------------------------
+# CPython fills the slots of special methods of heap types with wrappers
+# that look up the method in the type dict and call it, which for numba
+# methods means calling the Python wrapper of the native method. Instead,
+# the slot functions below call the native methods directly and convert
+# their arguments and results.
+
+cdef extern from *:
+    PyObject *PyErr_Occurred()
+    void PyErr_Clear()
+    PyObject *PyDict_GetItem(object, object)
+
+    PyObject *PyLong_FromLongLong(long long)
+    PyObject *PyFloat_FromDouble(double)
+    long PyLong_AsLong(PyObject *)
+    long long PyLong_AsLongLong(PyObject *)
+    double PyFloat_AsDouble(PyObject *)
+    Py_ssize_t PyNumber_AsSsize_t(PyObject *, PyObject *exc)
+
+cdef enum:
+    # Kinds of native arguments and results of special methods
+    KIND_NONE
+    KIND_OBJECT
+    KIND_INT32
+    KIND_INT64
+    KIND_DOUBLE
+
+cdef enum:
+    # Slots with native wrappers
+    SLOT_LENGTH
+    SLOT_ITEM
+    SLOT_ASS_ITEM
+    SLOT_ADD
+    SLOT_SUBTRACT
+    SLOT_MULTIPLY
+    SLOT_REMAINDER
+    SLOT_FLOOR_DIVIDE
+    SLOT_TRUE_DIVIDE
+    NUM_SLOTS
+
+native_kinds = {
+    'object': KIND_OBJECT,
+    'int32': KIND_INT32,
+    'int64': KIND_INT64,
+    'double': KIND_DOUBLE,
+}
+
+native_slot_numbers = {
+    '__len__': SLOT_LENGTH,
+    '__getitem__': SLOT_ITEM,
+    '__setitem__': SLOT_ASS_ITEM,
+    '__add__': SLOT_ADD,
+    '__sub__': SLOT_SUBTRACT,
+    '__mul__': SLOT_MULTIPLY,
+    '__mod__': SLOT_REMAINDER,
+    '__floordiv__': SLOT_FLOOR_DIVIDE,
+    '__truediv__': SLOT_TRUE_DIVIDE,
+}
+
+# Native methods, by the kind of their last argument and result
+ctypedef int32_t (*int32_method)(PyObject *)
+ctypedef int64_t (*int64_method)(PyObject *)
+
+ctypedef PyObject *(*object_item_method)(PyObject *, Py_ssize_t)
+ctypedef int32_t (*int32_item_method)(PyObject *, Py_ssize_t)
+ctypedef int64_t (*int64_item_method)(PyObject *, Py_ssize_t)
+ctypedef double (*double_item_method)(PyObject *, Py_ssize_t)
+
+ctypedef void (*object_ass_item_method)(PyObject *, Py_ssize_t, PyObject *)
+ctypedef void (*int32_ass_item_method)(PyObject *, Py_ssize_t, int32_t)
+ctypedef void (*int64_ass_item_method)(PyObject *, Py_ssize_t, int64_t)
+ctypedef void (*double_ass_item_method)(PyObject *, Py_ssize_t, double)
+
+ctypedef PyObject *(*object_object_method)(PyObject *, PyObject *)
+ctypedef int64_t (*int64_object_method)(PyObject *, PyObject *)
+ctypedef double (*double_object_method)(PyObject *, PyObject *)
+ctypedef PyObject *(*object_int64_method)(PyObject *, int64_t)
+ctypedef int64_t (*int64_int64_method)(PyObject *, int64_t)
+ctypedef double (*double_int64_method)(PyObject *, int64_t)
+ctypedef PyObject *(*object_double_method)(PyObject *, double)
+ctypedef int64_t (*int64_double_method)(PyObject *, double)
+ctypedef double (*double_double_method)(PyObject *, double)
+
+cdef struct NativeMethod:
+    void *func
+    int arg_kind
+    int result_kind
+
+cdef class NativeSlots(object):
+    "The native special methods that an extension class defines"
+
+    cdef NativeMethod methods[NUM_SLOTS]
+
+# { extension class : NativeSlots }
+cdef dict native_slots = {}
+
+cdef NativeMethod *lookup_native_method(PyObject *obj, int slot):
+    """
+    Find the native special method of the class of obj, or of the nearest
+    base class that defines it. Returns NULL if there is none.
+    """
+    cdef PyTypeObject *type_p = <PyTypeObject *> obj.ob_type
+    cdef PyObject *slots_p
+    cdef NativeSlots slots
+
+    while type_p != NULL:
+        slots_p = PyDict_GetItem(native_slots, <object> <PyObject *> type_p)
+        if slots_p != NULL:
+            slots = <NativeSlots> slots_p
+            if slots.methods[slot].func != NULL:
+                return &slots.methods[slot]
+        type_p = type_p.tp_base
+
+    return NULL
+
+cdef NativeMethod *get_native_method(PyObject *obj, int slot) except NULL:
+    cdef NativeMethod *method = lookup_native_method(obj, slot)
+    if method == NULL:
+        raise SystemError("No native special method for %s" %
+                                                (type(<object> obj),))
+    return method
+
+# ______________________________________________________________________
+# Result conversion
+
+cdef inline PyObject *box_int(int64_t value) except NULL:
+    if PyErr_Occurred() != NULL:
+        # The native method raised an exception
+        return NULL
+    return PyLong_FromLongLong(value)
+
+cdef inline PyObject *box_double(double value) except NULL:
+    if PyErr_Occurred() != NULL:
+        return NULL
+    return PyFloat_FromDouble(value)
+
+cdef inline PyObject *not_implemented():
+    Py_INCREF(<PyObject *> NotImplemented)
+    return <PyObject *> NotImplemented
+
+# ______________________________________________________________________
+# Sequence slots
+
+cdef Py_ssize_t native_length(PyObject *self) except -1:
+    cdef NativeMethod *method = get_native_method(self, SLOT_LENGTH)
+    cdef Py_ssize_t result
+
+    if method.result_kind == KIND_INT32:
+        result = (<int32_method> method.func)(self)
+    else:
+        result = (<int64_method> method.func)(self)
+
+    if PyErr_Occurred() != NULL:
+        return -1
+    return result
+
+cdef PyObject *native_item(PyObject *self, Py_ssize_t i) except NULL:
+    cdef NativeMethod *method = get_native_method(self, SLOT_ITEM)
+
+    if method.result_kind == KIND_OBJECT:
+        return (<object_item_method> method.func)(self, i)
+    elif method.result_kind == KIND_INT32:
+        return box_int((<int32_item_method> method.func)(self, i))
+    elif method.result_kind == KIND_INT64:
+        return box_int((<int64_item_method> method.func)(self, i))
+    else:
+        return box_double((<double_item_method> method.func)(self, i))
+
+cdef int native_ass_item(PyObject *self, Py_ssize_t i,
+                         PyObject *value) except -1:
+    cdef NativeMethod *method = get_native_method(self, SLOT_ASS_ITEM)
+    cdef long int_value
+    cdef int64_t int64_value
+    cdef double double_value
+
+    if value == NULL:
+        raise TypeError("'%s' object doesn't support item deletion" %
+                                            (type(<object> self).__name__,))
+
+    if method.arg_kind == KIND_OBJECT:
+        (<object_ass_item_method> method.func)(self, i, value)
+    elif method.arg_kind == KIND_INT32:
+        int_value = PyLong_AsLong(value)
+        if PyErr_Occurred() != NULL:
+            return -1
+        if int_value != <int32_t> int_value:
+            raise OverflowError("value too large to convert to int32")
+        (<int32_ass_item_method> method.func)(self, i, <int32_t> int_value)
+    elif method.arg_kind == KIND_INT64:
+        int64_value = PyLong_AsLongLong(value)
+        if PyErr_Occurred() != NULL:
+            return -1
+        (<int64_ass_item_method> method.func)(self, i, int64_value)
+    else:
+        double_value = PyFloat_AsDouble(value)
+        if PyErr_Occurred() != NULL:
+            return -1
+        (<double_ass_item_method> method.func)(self, i, double_value)
+
+    if PyErr_Occurred() != NULL:
+        return -1
+    return 0
+
+# ______________________________________________________________________
+# Mapping slots. obj[i] passes negative indices to the method unchanged,
+# like for Python classes and like calls of the method in compiled code.
+
+cdef Py_ssize_t as_index(PyObject *key) except? -1:
+    return PyNumber_AsSsize_t(key, <PyObject *> IndexError)
+
+cdef PyObject *native_subscript(PyObject *self, PyObject *key) except NULL:
+    return native_item(self, as_index(key))
+
+cdef int native_ass_subscript(PyObject *self, PyObject *key,
+                              PyObject *value) except -1:
+    return native_ass_item(self, as_index(key), value)
+
+# ______________________________________________________________________
+# Number slots
+
+cdef PyObject *native_binop(PyObject *a, PyObject *b, int slot,
+                            bint is_native) except NULL:
+    """
+    Call the native special method of the left operand. The method
+    signature determines the type of the right operand, operands that don't
+    convert give NotImplemented. is_native tells whether the slot of the
+    class of the left operand is the native wrapper (and not a Python
+    override of the method in a subclass).
+    """
+    cdef NativeMethod *method = NULL
+    cdef int64_t int_arg
+    cdef double double_arg
+
+    if is_native:
+        method = lookup_native_method(a, slot)
+    if method == NULL:
+        return not_implemented()
+
+    if method.arg_kind == KIND_OBJECT:
+        if method.result_kind == KIND_OBJECT:
+            return (<object_object_method> method.func)(a, b)
+        elif method.result_kind == KIND_INT64:
+            return box_int((<int64_object_method> method.func)(a, b))
+        else:
+            return box_double((<double_object_method> method.func)(a, b))
+
+    elif method.arg_kind == KIND_INT64:
+        int_arg = PyLong_AsLongLong(b)
+        if int_arg == -1 and PyErr_Occurred() != NULL:
+            PyErr_Clear()
+            return not_implemented()
+
+        if method.result_kind == KIND_OBJECT:
+            return (<object_int64_method> method.func)(a, int_arg)
+        elif method.result_kind == KIND_INT64:
+            return box_int((<int64_int64_method> method.func)(a, int_arg))
+        else:
+            return box_double((<double_int64_method> method.func)(a, int_arg))
+
+    else:
+        double_arg = PyFloat_AsDouble(b)
+        if double_arg == -1.0 and PyErr_Occurred() != NULL:
+            PyErr_Clear()
+            return not_implemented()
+
+        if method.result_kind == KIND_OBJECT:
+            return (<object_double_method> method.func)(a, double_arg)
+        elif method.result_kind == KIND_INT64:
+            return box_int((<int64_double_method> method.func)(a, double_arg))
+        else:
+            return box_double(
+                (<double_double_method> method.func)(a, double_arg))
+
+# All slots NULL, for classes without number methods
+cdef PyNumberMethods no_number_methods
+
+cdef inline PyNumberMethods *number_methods(PyObject *obj):
+    """
+    The number methods of the class of obj. The left operand of a reflected
+    operation (e.g. (1,) + obj) may be of a class that has none.
+    """
+    cdef PyNumberMethods *methods = (
+        <PyTypeObject *> obj.ob_type).tp_as_number
+    if methods == NULL:
+        return &no_number_methods
+    return methods
+
+cdef PyObject *native_add(PyObject *a, PyObject *b) except NULL:
+    return native_binop(a, b, SLOT_ADD,
+                        number_methods(a).nb_add == native_add)
+
+cdef PyObject *native_subtract(PyObject *a, PyObject *b) except NULL:
+    return native_binop(a, b, SLOT_SUBTRACT,
+                        number_methods(a).nb_subtract == native_subtract)
+
+cdef PyObject *native_multiply(PyObject *a, PyObject *b) except NULL:
+    return native_binop(a, b, SLOT_MULTIPLY,
+                        number_methods(a).nb_multiply == native_multiply)
+
+cdef PyObject *native_remainder(PyObject *a, PyObject *b) except NULL:
+    return native_binop(a, b, SLOT_REMAINDER,
+                        number_methods(a).nb_remainder == native_remainder)
+
+cdef PyObject *native_floor_divide(PyObject *a, PyObject *b) except NULL:
+    return native_binop(
+        a, b, SLOT_FLOOR_DIVIDE,
+        number_methods(a).nb_floor_divide == native_floor_divide)
+
+cdef PyObject *native_true_divide(PyObject *a, PyObject *b) except NULL:
+    return native_binop(
+        a, b, SLOT_TRUE_DIVIDE,
+        number_methods(a).nb_true_divide == native_true_divide)
+
+# ______________________________________________________________________
+# Install slots
+
+def set_native_slot(extclass, method_name, Py_uintptr_t func_pointer,
+                    arg_kind, result_kind):
+    """
+    Fill the slot of the special method with a wrapper that calls the
+    native method at func_pointer. The kinds ('object', 'int32', 'int64',
+    'double' or None) give the type of the last argument (the index of
+    __getitem__, the value of __setitem__ and the right operand of binary
+    operators) and of the result.
+
+    Set this after the method wrappers, setting the method on the class
+    resets the slot.
+    """
+    cdef PyTypeObject *extclass_p = <PyTypeObject *> extclass
+    cdef NativeSlots slots
+    cdef int slot = native_slot_numbers[method_name]
+
+    slots = native_slots.get(extclass)
+    if slots is None:
+        slots = NativeSlots()
+        native_slots[extclass] = slots
+
+    slots.methods[slot].func = <void *> func_pointer
+    slots.methods[slot].arg_kind = native_kinds.get(arg_kind, KIND_NONE)
+    slots.methods[slot].result_kind = native_kinds.get(result_kind, KIND_NONE)
+
+    if slot == SLOT_LENGTH:
+        extclass_p.tp_as_sequence.sq_length = native_length
+        extclass_p.tp_as_mapping.mp_length = native_length
+    elif slot == SLOT_ITEM:
+        extclass_p.tp_as_sequence.sq_item = native_item
+        extclass_p.tp_as_mapping.mp_subscript = native_subscript
+    elif slot == SLOT_ASS_ITEM:
+        extclass_p.tp_as_sequence.sq_ass_item = native_ass_item
+        extclass_p.tp_as_mapping.mp_ass_subscript = native_ass_subscript
+    elif slot == SLOT_ADD:
+        extclass_p.tp_as_number.nb_add = native_add
+    elif slot == SLOT_SUBTRACT:
+        extclass_p.tp_as_number.nb_subtract = native_subtract
+    elif slot == SLOT_MULTIPLY:
+        extclass_p.tp_as_number.nb_multiply = native_multiply
+    elif slot == SLOT_REMAINDER:
+        extclass_p.tp_as_number.nb_remainder = native_remainder
+    elif slot == SLOT_FLOOR_DIVIDE:
+        extclass_p.tp_as_number.nb_floor_divide = native_floor_divide
+    elif slot == SLOT_TRUE_DIVIDE:
+        extclass_p.tp_as_number.nb_true_divide = native_true_divide
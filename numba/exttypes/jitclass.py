@@ -40,11 +40,16 @@ Compiling @jit extension classes works as follows:
     The virtual function table (vtab) is a ctypes structure set as
     attribute of the extension types. Objects have a direct pointer
     for efficiency.
+
+    With @jit(compact=True) objects have no __dict__ or __weakref__ slots,
+    the vtab pointer follows PyObject_HEAD directly. Compact instances
+    can be allocated in bulk with numba.allocate_instances().
 """
 
 from numba import typesystem
 
 from numba.exttypes import virtual
+from numba.exttypes import extension_types
 from numba.exttypes import signatures
 from numba.exttypes import validators
 from numba.exttypes import compileclass
@@ -93,9 +98,15 @@ def create_extension(env, py_class, flags):
     class that contains the functions that are to be compiled.
     """
     flags.pop('llvm_module', None)
+    compact = flags.pop('compact', False)
 
     # ext_type = etypes.jit_exttype(py_class)
     ext_type = typesystem.jit_exttype(py_class)
+    if compact:
+        # Compact objects start their tables right after the object header
+        ext_type.is_compact = True
+        ext_type.compute_offsets(
+            extension_types.compact_layout_class(py_class))
 
     extension_compiler = JitExtensionCompiler(
         env, py_class, dict(vars(py_class)), ext_type, flags,
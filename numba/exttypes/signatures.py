@@ -23,7 +23,7 @@ class Method(object):
     """
 
     def __init__(self, py_func, name, signature, is_class, is_static,
-                 nopython=False):
+                 nopython=False, is_final=False):
         self.py_func = py_func
         # py_func.live_objects = []
 
@@ -37,6 +37,9 @@ class Method(object):
         self.nopython = nopython
         self.template_signature = None
 
+        # Final methods cannot be overridden (see numba.final)
+        self.is_final = is_final
+
         # Filled out after extension method is compiled
         # (ExtensionCompiler.compile_methods())
         self.wrapper_func = None
@@ -58,7 +61,8 @@ class Method(object):
 
     def clone(self):
         return type(self)(self.py_func, self.name, self.signature,
-                          self.is_class, self.is_static, self.nopython)
+                          self.is_class, self.is_static, self.nopython,
+                          self.is_final)
 
 
 #------------------------------------------------------------------------
@@ -181,15 +185,19 @@ def process_signature(method, method_name, method_maker=MethodMaker()):
 
     is_static=False
     is_class=False
+    is_final=False
 
     while True:
+        # @final may be applied at any level of decoration
+        is_final = is_final or getattr(method, '__numba_final__', False)
+
         if isinstance(method, types.FunctionType):
             # Process function
             if signature is None:
                 method_maker.no_signature(method)
 
             method = Method(method, method_name, signature,
-                            is_class, is_static)
+                            is_class, is_static, is_final=is_final)
             return method
 
         elif isinstance(method, typesystem.Function):
@@ -13,6 +13,9 @@ class C(object):
     def __init__(self, value):
         self.value = value
 
+    def getvalue(self):
+        return self.value
+
 obj = C(10.0)
 print(type(obj).exttype)
 
@@ -28,3 +31,18 @@ except KeyError as e:
     assert e.args[0] == {'value': int_}
 else:
     raise Exception
+
+# Instantiate the cached specialization
+obj2 = C(11.0)
+assert type(obj2) is specialized_cls
+assert obj2.value == 11.0
+
+# Delegate unbound methods to the specialization
+assert C.getvalue(obj2) == 11.0
+
+try:
+    C.getvalue(object())
+except TypeError:
+    pass
+else:
+    raise Exception
@@ -0,0 +1,68 @@
+"""
+Test compact extension classes and bulk allocation of their instances.
+"""
+
+import numpy as np
+
+import numba
+from numba import *
+from numba.testing.test_support import main
+
+@jit(compact=True)
+class Particle(object):
+
+    @void(double, double)
+    def __init__(self, x, v):
+        self.x = x
+        self.v = v
+
+    @void(double)
+    def advance(self, dt):
+        self.x += self.v * dt
+
+@autojit
+def advance_all(attributes, dt):
+    for i in range(attributes.shape[0]):
+        attributes[i].x += attributes[i].v * dt
+
+def test_compact_instances():
+    particle = Particle(1.0, 2.0)
+    assert not hasattr(particle, '__dict__')
+    particle.advance(0.5)
+    assert particle.x == 2.0
+    particle.v = 4.0
+    assert particle.v == 4.0
+
+def test_allocate_instances():
+    arena = numba.allocate_instances(Particle, 1000)
+    assert len(arena) == 1000
+
+    attributes = arena.attributes
+    assert attributes['x'].tolist() == [0.0] * 1000
+    attributes['v'] = np.arange(1000)
+    advance_all(attributes, 0.5)
+
+    particle = arena[10]
+    assert isinstance(particle, Particle)
+    assert particle.x == 5.0
+    particle.advance(2.0)
+    assert attributes[10]['x'] == 25.0
+    assert arena[-1].v == 999.0
+
+def test_allocate_noncompact():
+    @jit
+    class Dense(object):
+        @void(double)
+        def __init__(self, x):
+            self.x = x
+
+    try:
+        numba.allocate_instances(Dense, 10)
+    except TypeError as e:
+        assert "compact" in str(e), e
+    else:
+        raise Exception("Expected a TypeError")
+
+
+if __name__ == '__main__':
+    main()
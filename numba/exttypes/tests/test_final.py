@@ -0,0 +1,104 @@
+"""
+Test final extension classes and methods, whose calls are devirtualized.
+"""
+
+import numba
+from numba import *
+from numba import error
+from numba.testing.test_support import parametrize, main
+
+def make_classes(compiler):
+    @compiler
+    @final
+    class Vector(object):
+
+        @void(double, double)
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+        @double()
+        def norm2(self):
+            return self.x * self.x + self.y * self.y
+
+    @compiler
+    class Shape(object):
+
+        @void(double)
+        def __init__(self, size):
+            self.size = size
+
+        @final
+        @double()
+        def area(self):
+            return self.size * self.size
+
+        @double()
+        def scale(self):
+            return 2.0
+
+    return Vector, Shape
+
+@autojit
+def sum_norms(vector, n):
+    total = 0.0
+    for i in range(n):
+        total += vector.norm2()
+    return total
+
+@autojit
+def scaled_area(shape):
+    return shape.area() * shape.scale()
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+@parametrize(jit, autojit)
+def test_final_calls(compiler):
+    Vector, Shape = make_classes(compiler)
+
+    assert sum_norms(Vector(3.0, 4.0), 10) == 250.0
+    assert scaled_area(Shape(3.0)) == 18.0
+
+@parametrize(jit)
+def test_final_class(compiler):
+    Vector, Shape = make_classes(compiler)
+
+    try:
+        @compiler
+        class Vector3(Vector):
+            @double()
+            def norm2(self):
+                return 0.0
+    except error.NumbaError as e:
+        assert "final class" in str(e), e
+    else:
+        raise Exception("Expected an error for subclassing a final class")
+
+@parametrize(jit)
+def test_final_method(compiler):
+    Vector, Shape = make_classes(compiler)
+
+    @compiler
+    class Square(Shape):
+        @double()
+        def scale(self):
+            return 3.0
+
+    assert scaled_area(Square(2.0)) == 12.0
+
+    try:
+        @compiler
+        class Circle(Shape):
+            @double()
+            def area(self):
+                return 3.14 * self.size * self.size
+    except error.NumbaError as e:
+        assert "final method 'area'" in str(e), e
+    else:
+        raise Exception("Expected an error for overriding a final method")
+
+
+if __name__ == '__main__':
+    main()
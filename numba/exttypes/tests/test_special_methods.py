@@ -0,0 +1,112 @@
+"""
+Test special methods of extension types, which compiled code calls
+natively and which fill the sequence and number slots of the class.
+"""
+
+from numba import *
+from numba.testing.test_support import parametrize, main
+
+def make_vector(compiler):
+    @compiler
+    class Vector(object):
+
+        @void(double, double)
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+        @Py_ssize_t()
+        def __len__(self):
+            return 2
+
+        @double(Py_ssize_t)
+        def __getitem__(self, i):
+            if i == 0:
+                return self.x
+            return self.y
+
+        @void(Py_ssize_t, double)
+        def __setitem__(self, i, value):
+            if i == 0:
+                self.x = value
+            else:
+                self.y = value
+
+        @double(double)
+        def __mul__(self, factor):
+            return (self.x + self.y) * factor
+
+    return Vector
+
+@autojit
+def sum_items(vector):
+    total = 0.0
+    for i in range(len(vector)):
+        total += vector[i]
+    return total
+
+@autojit
+def get_item(vector, i):
+    return vector[i]
+
+@autojit
+def scale_items(vector, factor):
+    for i in range(len(vector)):
+        vector[i] = vector[i] * factor
+    return vector * 2.0
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+@parametrize(jit)
+def test_native_calls(compiler):
+    Vector = make_vector(compiler)
+    vector = Vector(1.0, 2.0)
+
+    assert sum_items(vector) == 3.0
+    assert scale_items(vector, 2.0) == 12.0
+    assert (vector.x, vector.y) == (2.0, 4.0)
+
+@parametrize(jit)
+def test_native_slots(compiler):
+    Vector = make_vector(compiler)
+    vector = Vector(1.0, 2.0)
+
+    assert len(vector) == 2
+    assert vector[1] == 2.0
+    # Negative indices are passed unchanged, like in compiled code
+    assert vector[-2] == 2.0
+    assert get_item(vector, -2) == vector[-2]
+
+    vector[0] = 5
+    assert vector.x == 5.0
+    assert vector * 2 == 14.0
+
+    try:
+        vector * "spam"
+    except TypeError:
+        pass
+    else:
+        raise Exception("Expected a TypeError for an unconvertible operand")
+
+    # Reflected operations with a left operand without number methods
+    for other in [(1,), [1], {}]:
+        try:
+            other * vector
+        except TypeError:
+            pass
+        else:
+            raise Exception("Expected a TypeError for %r * vector" % (other,))
+
+    try:
+        vector[2] = 1.0
+        del vector[0]
+    except TypeError as e:
+        assert "deletion" in str(e), e
+    else:
+        raise Exception("Expected a TypeError for item deletion")
+
+
+if __name__ == '__main__':
+    main()
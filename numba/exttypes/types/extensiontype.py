@@ -23,6 +23,9 @@ class ExtensionType(NumbaType):
     flags = ["object"]
     is_final = False
 
+    # Compact instances have no __dict__ or __weakref__ slots
+    is_compact = False
+
     methoddict = Delegate('vtab_type')
     untyped_methods = Delegate('vtab_type')
     specialized_methods = Delegate('vtab_type')
@@ -12,6 +12,7 @@ import inspect
 from numba import error
 
 from numba.exttypes import ordering
+from numba.exttypes import utils
 from numba.exttypes.types import methods
 
 
@@ -155,6 +156,31 @@ class MethodTypeValidator(ExtTypeValidator):
         validate_type_table(abstract_table, comparer)
 
 
+# ______________________________________________________________________
+# Validate final classes and methods
+
+class FinalValidator(ExtTypeValidator):
+    """
+    Validate that the extension type doesn't subclass a final class or
+    override a final method. Calls of final methods are devirtualized, so
+    overriding them would not take effect in compiled code.
+    """
+
+    def validate(self, ext_type):
+        for base in utils.get_numba_bases(ext_type.py_class):
+            if base.exttype.is_final:
+                raise error.NumbaError(
+                    "Cannot subclass final class '%s'" % base.__name__)
+
+        methoddict = ext_type.vtab_type.methoddict
+        for parent in ext_type.vtab_type.parents:
+            for method_name, method in parent.methoddict.iteritems():
+                if (method.is_final and
+                        methoddict[method_name].py_func is not method.py_func):
+                    raise error.NumbaError(
+                        "Cannot override final method '%s'" % method_name)
+
+
 # Validators that validate the vtab/attribute struct order
 extending_order_validators = [
     AttributeTableOrderValidator(),
@@ -164,6 +190,7 @@ extending_order_validators = [
 type_validators = [
     AttributeTypeValidator(),
     MethodTypeValidator(),
+    FinalValidator(),
 ]
 
 jit_type_validators = extending_order_validators + type_validators
@@ -162,6 +162,22 @@ def build_hashing_vtab(vtable):
     # print(vtab)
     return vtab
 
+# ______________________________________________________________________
+# Inline caches
+
+# Inline caches of compiled call sites. Compiled code refers to them by
+# address, so they are never freed.
+inline_caches = []
+
+def allocate_inline_cache():
+    """
+    Allocate a zeroed inline cache of a call site, holding a vtable pointer
+    and the method found in that vtable. Returns the address of the cache.
+    """
+    cache = (ctypes.c_void_p * 2)()
+    inline_caches.append(cache)
+    return ctypes.addressof(cache)
+
 # ______________________________________________________________________
 # Build Hash-based Virtual Method Table
 
@@ -5,7 +5,8 @@ from .intrinsic import Intrinsic
 from llpython.byte_translator import LLVMTranslator
 
 __all__ = ['CStringSlice2',
-           'CStringSlice2Len']
+           'CStringSlice2Len',
+           'CStringSliceStart']
 
 class CStringSlice2 (Intrinsic):
     arg_types = [string_, string_, size_t, Py_ssize_t, Py_ssize_t]
@@ -52,3 +53,21 @@ class CStringSlice2Len(Intrinsic):
         LLVMTranslator(module).translate(_py_c_string_slice_len,
                                          llvm_function = lfunc)
         return lfunc
+
+class CStringSliceStart(Intrinsic):
+    arg_types = [size_t, Py_ssize_t]
+    return_type = size_t
+
+    def implementation(self, module, lfunc):
+        def _py_c_string_slice_start(in_str_len, lower):
+            zero = lc_size_t(0)
+            if lower < zero:
+                lower += in_str_len
+                if lower < zero:
+                    lower = zero
+            elif lower > in_str_len:
+                lower = in_str_len
+            return lower
+        LLVMTranslator(module).translate(_py_c_string_slice_start,
+                                         llvm_function = lfunc)
+        return lfunc
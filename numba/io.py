@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+"""
+Parsing of delimited (CSV) and fixed-width text into typed NumPy columns:
+
+    buf = np.memmap("trades.csv", dtype=np.uint8, mode='r')
+    columns = numba.io.read_csv(buf, [('time', np.int64),
+                                      ('price', np.float64),
+                                      ('symbol', 'S8')], skip_rows=1)
+    columns['price'].mean()
+
+The buffer is a byte buffer as in numba.strings: a 1D array of bytes such
+as a memory-mapped file, or a bytes-like object. The schema is a list of
+(name, dtype) pairs or a structured dtype, with integer, boolean, floating
+point and fixed-size byte string ('S<n>') fields. The result is an
+OrderedDict that maps the field names to columns.
+
+For every schema (and delimiter or field widths) a tokenizer is generated
+that parses the rows in a single pass over the buffer, storing every field
+directly in its column, and is compiled in nopython mode. The compiled
+kernels are cached per schema in _kernel_cache. Fields are parsed with the
+native numba.strings functions, which work on (start, stop) offsets into
+the buffer: fields of a memory-mapped file are not NUL-terminated, so the
+libc conversions (atoi, atof) cannot be used without copying every field.
+
+Rows are separated by newlines (LF or CRLF). Empty lines are skipped,
+missing fields parse as 0 (or an empty string) and extra fields are
+ignored. Delimited fields are not unquoted.
+
+Large inputs can be processed in chunks of rows with iter_csv() and
+iter_fixed_width(), or in parallel with parallel=True, which splits the
+buffer at line boundaries over a number of threads
+(numba.stencils.num_threads) that call the compiled kernels without
+the GIL.
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+import threading
+import collections
+
+import numpy as np
+
+import numba
+from numba import strings, stencils
+from numba.typesystem import npy_intp
+
+# Compiled kernels by schema and argument types
+_kernel_cache = {}
+
+# Size of the windows in which line boundaries are searched from Python
+search_window = 1 << 16
+
+# Locals of the generated kernels, which are all offsets
+kernel_locals = ['n', 'hi', 'nrows', 'row', 'i', 'end', 'field', 'eol', 'j',
+                 'count']
+
+#------------------------------------------------------------------------
+# Schemas and Buffers
+#------------------------------------------------------------------------
+
+def _schema(dtype):
+    """
+    Normalize a schema to a tuple of (name, dtype) pairs with supported
+    dtypes.
+    """
+    if not isinstance(dtype, np.dtype):
+        dtype = np.dtype(list(dtype))
+    if dtype.names is None:
+        raise TypeError("Expected a structured dtype or a list of "
+                        "(name, dtype) pairs, got %s" % (dtype,))
+
+    fields = []
+    for name in dtype.names:
+        field_dtype = dtype.fields[name][0]
+        if field_dtype.kind not in 'iubfS':
+            raise TypeError("Unsupported dtype %s of field %r, expected an "
+                            "integer, boolean, floating point or byte "
+                            "string dtype" % (field_dtype, name))
+        if field_dtype.kind == 'S' and field_dtype.itemsize == 0:
+            raise TypeError("Byte string field %r has no size" % (name,))
+        fields.append((name, field_dtype))
+    return tuple(fields)
+
+def _buffer(buf):
+    "A contiguous uint8 array of the buffer, without copying"
+    buf = np.asarray(strings._array(buf))
+    if buf.ndim != 1:
+        raise ValueError("Expected a 1D buffer, got %d dimensions" % buf.ndim)
+    return np.ascontiguousarray(buf)
+
+def _delimiter(delimiter):
+    if isinstance(delimiter, type(u'')):
+        delimiter = delimiter.encode('ascii')
+    if isinstance(delimiter, bytes):
+        if len(delimiter) != 1:
+            raise ValueError("Expected a single byte delimiter, got %r" %
+                                                            (delimiter,))
+        delimiter = bytearray(delimiter)[0]
+    if delimiter in (10, 13):
+        raise ValueError("Newlines cannot be used as delimiter")
+    return int(delimiter)
+
+def _widths(fields, widths):
+    widths = tuple(int(width) for width in widths)
+    if len(widths) != len(fields):
+        raise ValueError("Got %d field widths for %d fields" % (len(widths),
+                                                                len(fields)))
+    if any(width < 0 for width in widths):
+        raise ValueError("Negative field width in %s" % (widths,))
+    return widths
+
+def _line_start(buf, offset, stop):
+    "The first offset >= offset at which a line starts, at most stop"
+    if offset <= 0 or buf[offset - 1] == 10:
+        return offset
+    while offset < stop:
+        window = buf[offset:min(offset + search_window, stop)]
+        newlines = np.flatnonzero(window == 10)
+        if len(newlines):
+            return offset + newlines[0] + 1
+        offset += len(window)
+    return stop
+
+def _skip_rows(buf, nrows):
+    "The offset after the first nrows lines"
+    offset = 0
+    for i in range(nrows):
+        if offset >= len(buf):
+            break
+        offset = _line_start(buf, offset + 1, len(buf))
+    return offset
+
+#------------------------------------------------------------------------
+# Columns
+#------------------------------------------------------------------------
+
+def _allocate(fields, nrows):
+    return [np.empty(nrows, dtype=dtype) for name, dtype in fields]
+
+def _grow(columns, nrows, capacity):
+    result = []
+    for column in columns:
+        new_column = np.empty(capacity, dtype=column.dtype)
+        new_column[:nrows] = column[:nrows]
+        result.append(new_column)
+    return result
+
+def _kernel_args(columns, lo, hi):
+    """
+    The arguments of the kernel for rows [lo:hi] of the columns. Byte
+    string columns are passed as 2D byte arrays.
+    """
+    args = []
+    for column in columns:
+        column = column[lo:hi]
+        if column.dtype.kind == 'S':
+            column = column.view(np.uint8).reshape(len(column),
+                                                   column.dtype.itemsize)
+        args.append(column)
+    return args
+
+def _result(fields, columns, nrows):
+    """
+    The columns as an OrderedDict, trimmed to nrows. Columns with much
+    unused capacity are copied so that the memory is released.
+    """
+    result = collections.OrderedDict()
+    for (name, dtype), column in zip(fields, columns):
+        column = column[:nrows]
+        if column.base is not None and len(column.base) > nrows + nrows // 8:
+            column = column.copy()
+        result[name] = column
+    return result
+
+#------------------------------------------------------------------------
+# Kernel Generation
+#------------------------------------------------------------------------
+
+def _store_field(k, dtype):
+    "Source lines that store buf[field:end] in row 'row' of column k"
+    if dtype.kind == 'S':
+        return [
+            "j = 0",
+            "while j < %d and field + j < end:" % dtype.itemsize,
+            "    col%d[row, j] = buf[field + j]" % k,
+            "    j += 1",
+            "while j < %d:" % dtype.itemsize,
+            "    col%d[row, j] = 0" % k,
+            "    j += 1",
+        ]
+    elif dtype.kind == 'f':
+        return ["col%d[row] = strings.parse_float(buf, field, end)" % k]
+    elif dtype.kind == 'b':
+        return ["col%d[row] = strings.parse_int(buf, field, end) != 0" % k]
+    else:
+        return ["col%d[row] = strings.parse_int(buf, field, end)" % k]
+
+def _indent(lines, level):
+    return ["    " * level + line for line in lines]
+
+def _kernel_source(name, fields, row_lines):
+    """
+    Source of a kernel that parses rows from buf[pos[0]:stop] into the
+    columns until the columns are full. It stores the offset after the
+    last parsed row in pos[0] and returns the number of parsed rows.
+    """
+    columns = ", ".join("col%d" % k for k in range(len(fields)))
+    lines = [
+        "def %s(buf, pos, stop, %s):" % (name, columns),
+        "    n = buf.shape[0]",
+        "    hi = stop",
+        "    if hi > n:",
+        "        hi = n",
+        "    nrows = col0.shape[0]",
+        "    row = 0",
+        "    i = pos[0]",
+        "    while row < nrows and i < hi:",
+    ]
+    lines.extend(_indent(row_lines, 2))
+    lines.extend([
+        "    pos[0] = i",
+        "    return row",
+    ])
+    return "\n".join(lines) + "\n"
+
+# Source of the test whether the line at offset i is empty (LF or CRLF)
+empty_line = "buf[i] == 10 or (buf[i] == 13 and (i + 1 >= hi or " \
+             "buf[i + 1] == 10))"
+
+def csv_kernel_source(fields, delimiter):
+    "Source of the tokenizer of delimited rows with the given fields"
+    row_lines = [
+        "if %s:" % empty_line,
+        "    i += 1",
+        "else:",
+    ]
+    for k, (name, dtype) in enumerate(fields):
+        field_lines = [
+            "field = i",
+            "end = i",
+            "while end < hi and buf[end] != %d and buf[end] != 10 and "
+                "buf[end] != 13:" % delimiter,
+            "    end += 1",
+        ]
+        field_lines.extend(_store_field(k, dtype))
+        field_lines.extend([
+            "if end < hi and buf[end] == %d:" % delimiter,
+            "    i = end + 1",
+            "else:",
+            "    i = end",
+        ])
+        row_lines.extend(_indent(field_lines, 1))
+
+    # Skip extra fields and the newline
+    row_lines.extend(_indent([
+        "while i < hi and buf[i] != 10:",
+        "    i += 1",
+        "i += 1",
+        "row += 1",
+    ], 1))
+    return _kernel_source("parse_csv", fields, row_lines)
+
+def fixed_width_kernel_source(fields, widths):
+    "Source of the tokenizer of fixed-width rows with the given fields"
+    row_lines = [
+        "eol = i",
+        "while eol < hi and buf[eol] != 10:",
+        "    eol += 1",
+        "if eol > i and not (eol == i + 1 and buf[i] == 13):",
+    ]
+    offset = 0
+    for k, ((name, dtype), width) in enumerate(zip(fields, widths)):
+        field_lines = [
+            "field = i + %d" % offset,
+            "if field > eol:",
+            "    field = eol",
+            "end = i + %d" % (offset + width),
+            "if end > eol:",
+            "    end = eol",
+        ]
+        field_lines.extend(_store_field(k, dtype))
+        row_lines.extend(_indent(field_lines, 1))
+        offset += width
+
+    row_lines.extend(_indent(["row += 1"], 1))
+    row_lines.append("i = eol + 1")
+    return _kernel_source("parse_fixed_width", fields, row_lines)
+
+count_rows_source = """
+def count_rows(buf, start, stop):
+    n = buf.shape[0]
+    hi = stop
+    if hi > n:
+        hi = n
+    count = 0
+    i = start
+    while i < hi:
+        if not (%s):
+            count += 1
+            while i < hi and buf[i] != 10:
+                i += 1
+        i += 1
+    return count
+""" % empty_line
+
+def compile_kernel(source, signature):
+    "Compile the function in source in nopython mode"
+    from numba import pipeline, environment
+
+    func_def = ast.parse(source.lstrip()).body[0]
+    varnames = set(node.id for node in ast.walk(func_def)
+                               if isinstance(node, ast.Name))
+    locals = dict((name, npy_intp) for name in kernel_locals
+                                       if name in varnames)
+
+    env = environment.NumbaEnvironment.get_environment()
+    func_env, _ = pipeline.run_pipeline2(
+        env, None, func_def, signature,
+        function_globals=dict(strings=strings), locals=locals,
+        nopython=True)
+
+    return func_env.numba_wrapper_func
+
+def get_kernel(key, source, buf, columns):
+    "The compiled kernel for the schema key and the argument types"
+    args = [buf, np.empty(1, dtype=np.intp), 0] + _kernel_args(columns, 0, 0)
+    argtypes = tuple(numba.typeof(arg) for arg in args)
+    argtypes = argtypes[:2] + (npy_intp,) + argtypes[3:]
+    if (key, argtypes) not in _kernel_cache:
+        _kernel_cache[key, argtypes] = compile_kernel(
+            source, npy_intp(*argtypes))
+    return _kernel_cache[key, argtypes]
+
+def get_count_rows(buf):
+    argtypes = (numba.typeof(buf), npy_intp, npy_intp)
+    key = ('count_rows', argtypes)
+    if key not in _kernel_cache:
+        _kernel_cache[key] = compile_kernel(count_rows_source,
+                                            npy_intp(*argtypes))
+    return _kernel_cache[key]
+
+#------------------------------------------------------------------------
+# Drivers
+#------------------------------------------------------------------------
+
+def _estimate_rows(buf, start, stop):
+    "Estimate the number of rows from the line length at the start"
+    window = buf[start:min(start + search_window, stop)]
+    if len(window) == 0:
+        return 0
+    lines = np.count_nonzero(window == 10) + 1
+    return (stop - start) * lines // len(window) + 1
+
+def _parse(kernel, fields, buf, start, stop):
+    """
+    Parse the rows in buf[start:stop] in a single pass, growing the columns
+    when the estimated number of rows is exceeded.
+    """
+    capacity = _estimate_rows(buf, start, stop)
+    columns = _allocate(fields, capacity)
+    pos = np.array([start], dtype=np.intp)
+    nrows = 0
+    while True:
+        nrows += kernel(buf, pos, stop,
+                        *_kernel_args(columns, nrows, capacity))
+        if pos[0] >= stop:
+            break
+        # Estimate the remaining rows from the rows parsed so far
+        parsed = pos[0] - start
+        remaining = (stop - pos[0]) * nrows // parsed + 1
+        capacity = nrows + remaining + remaining // 8
+        columns = _grow(columns, nrows, capacity)
+
+    return _result(fields, columns, nrows)
+
+def _run_threads(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def _parse_parallel(kernel, fields, buf, start, stop):
+    """
+    Parse the rows in buf[start:stop] in parallel. The buffer is split at
+    line boundaries, the rows of every range are counted in parallel, and
+    every range is then parsed into its part of the columns.
+    """
+    nthreads = max(1, min(stencils.num_threads,
+                          (stop - start) // search_window))
+    if nthreads == 1:
+        return _parse(kernel, fields, buf, start, stop)
+
+    bounds = [start]
+    for k in range(1, nthreads):
+        offset = start + (stop - start) * k // nthreads
+        bounds.append(max(bounds[-1], _line_start(buf, offset, stop)))
+    bounds.append(stop)
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+
+    # Calls through ctypes release the GIL
+    count_rows = numba.addressof(get_count_rows(buf))
+    counts = [0] * nthreads
+
+    def counter(k, lo, hi):
+        def count():
+            counts[k] = count_rows(buf, lo, hi)
+        return count
+
+    _run_threads([counter(k, lo, hi) for k, (lo, hi) in enumerate(ranges)])
+
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    columns = _allocate(fields, int(offsets[-1]))
+    cfunc = numba.addressof(kernel)
+
+    def parser(k, lo, hi):
+        pos = np.array([lo], dtype=np.intp)
+        args = _kernel_args(columns, offsets[k], offsets[k + 1])
+        def parse():
+            cfunc(buf, pos, hi, *args)
+        return parse
+
+    _run_threads([parser(k, lo, hi) for k, (lo, hi) in enumerate(ranges)
+                                        if counts[k]])
+    return _result(fields, columns, int(offsets[-1]))
+
+def _iter_chunks(kernel, fields, buf, start, stop, chunksize):
+    if chunksize <= 0:
+        raise ValueError("Expected a positive chunk size, got %d" % chunksize)
+
+    pos = np.array([start], dtype=np.intp)
+    while pos[0] < stop:
+        columns = _allocate(fields, chunksize)
+        nrows = kernel(buf, pos, stop, *_kernel_args(columns, 0, chunksize))
+        if nrows:
+            yield _result(fields, columns, nrows)
+
+#------------------------------------------------------------------------
+# Readers
+#------------------------------------------------------------------------
+
+def _csv_kernel(buf, fields, delimiter):
+    key = ('csv', fields, delimiter)
+    source = csv_kernel_source(fields, delimiter)
+    return get_kernel(key, source, buf, _allocate(fields, 0))
+
+def _fixed_width_kernel(buf, fields, widths):
+    key = ('fixed_width', fields, widths)
+    source = fixed_width_kernel_source(fields, widths)
+    return get_kernel(key, source, buf, _allocate(fields, 0))
+
+def read_csv(buf, dtype, delimiter=',', skip_rows=0, parallel=False):
+    """
+    Parse delimited rows into columns.
+
+    :param buf: byte buffer, e.g. an np.memmap of uint8
+    :param dtype: list of (name, dtype) pairs or a structured dtype
+    :param delimiter: the single byte that separates fields
+    :param skip_rows: number of lines to skip, e.g. a header
+    :param parallel: whether to parse with multiple threads
+    :return: OrderedDict of the columns
+    """
+    buf = _buffer(buf)
+    fields = _schema(dtype)
+    kernel = _csv_kernel(buf, fields, _delimiter(delimiter))
+    parse = _parse_parallel if parallel else _parse
+    return parse(kernel, fields, buf, _skip_rows(buf, skip_rows), len(buf))
+
+def read_fixed_width(buf, dtype, widths, skip_rows=0, parallel=False):
+    """
+    Parse rows of fixed-width fields into columns. Field k has widths[k]
+    bytes, and fields that extend beyond the end of a line are truncated.
+    See read_csv() for the other parameters.
+    """
+    buf = _buffer(buf)
+    fields = _schema(dtype)
+    kernel = _fixed_width_kernel(buf, fields, _widths(fields, widths))
+    parse = _parse_parallel if parallel else _parse
+    return parse(kernel, fields, buf, _skip_rows(buf, skip_rows), len(buf))
+
+def iter_csv(buf, dtype, chunksize, delimiter=',', skip_rows=0):
+    """
+    Parse delimited rows into chunks of columns of at most chunksize rows,
+    which are generated as OrderedDicts. See read_csv() for the parameters.
+    """
+    buf = _buffer(buf)
+    fields = _schema(dtype)
+    kernel = _csv_kernel(buf, fields, _delimiter(delimiter))
+    return _iter_chunks(kernel, fields, buf, _skip_rows(buf, skip_rows),
+                        len(buf), chunksize)
+
+def iter_fixed_width(buf, dtype, widths, chunksize, skip_rows=0):
+    """
+    Parse rows of fixed-width fields into chunks of columns of at most
+    chunksize rows. See read_fixed_width() for the parameters.
+    """
+    buf = _buffer(buf)
+    fields = _schema(dtype)
+    kernel = _fixed_width_kernel(buf, fields, _widths(fields, widths))
+    return _iter_chunks(kernel, fields, buf, _skip_rows(buf, skip_rows),
+                        len(buf), chunksize)
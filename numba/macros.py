@@ -32,7 +32,15 @@ c_string_slice_2.__signature__ = typesystem.function(
     args = (char.pointer(), Py_ssize_t, Py_ssize_t))
 
 def c_string_slice_1 (context, builder, c_string, lb):
-    return c_string_slice_2(context, builder, c_string, lb)
+    # A suffix of a C string is NUL-terminated, so point into the string
+    # instead of copying it
+    module = builder.basic_block.function.module
+    _, CStringSliceStart = context.intrinsic_library.declare(
+        module, 'CStringSliceStart')
+    _, strlen = context.external_library.declare(module, 'strlen')
+    c_str_len = builder.call(strlen, [c_string])
+    start = builder.call(CStringSliceStart, [c_str_len, lb])
+    return builder.gep(c_string, [start])
 
 c_string_slice_1.__signature__ = typesystem.function(
     return_type = char.pointer(),
@@ -99,7 +99,7 @@ class LLVMCodeGen(codegen.CodeGen):
         llvm_fpm.run(self.lfunc)
 
     def optimize2(self, opt=3, cg=3, inline=1000):
-        features = '-avx'
+        features = self.context.llvm_features
         tm = self.__machine = llvm.ee.TargetMachine.new(
             opt=cg, cm=llvm.ee.CM_JITDEFAULT, features=features)
         has_loop_vectorizer = llvm.version >= (3, 2)
@@ -148,7 +148,8 @@ class LLVMCodeGen(codegen.CodeGen):
                 for var in arg.variables:
                     llvm_arg = self.lfunc.args[i]
                     self.symtab[var.name] = llvm_arg
-                    if var.type.is_pointer:
+                    if (var.type.is_pointer and
+                            self.context.noalias_arguments(self.specializer)):
                         llvm_arg.add_attribute(llvm.core.ATTR_NO_ALIAS)
                         llvm_arg.add_attribute(llvm.core.ATTR_NO_CAPTURE)
                     i += 1
@@ -407,7 +408,16 @@ class LLVMCodeGen(codegen.CodeGen):
         lhs = self.visit(node.lhs)
         self.in_lhs_expr -= 1
         rhs = self.visit(node.rhs)
-        return self.builder.store(rhs, lhs)
+        result = self.builder.store(rhs, lhs)
+        if node.lhs.is_index:
+            self.set_tbaa(result, node.lhs.lhs)
+        return result
+
+    def set_tbaa(self, instr, pointer):
+        "Annotate a load or store through the pointer node with TBAA metadata"
+        metadata = self.context.tbaa_metadata(self.llvm_module, pointer)
+        if metadata is not None:
+            instr.set_metadata("tbaa", metadata)
 
     def visit_SingleIndexNode(self, node):
         in_lhs_expr = self.in_lhs_expr
@@ -423,7 +433,9 @@ class LLVMCodeGen(codegen.CodeGen):
         if self.in_lhs_expr:
             return result
         else:
-            return self.builder.load(result)
+            result = self.builder.load(result)
+            self.set_tbaa(result, node.lhs)
+            return result
 
     def visit_DereferenceNode(self, node):
         node = self.astbuilder.index(node.operand, self.astbuilder.constant(0))
@@ -112,6 +112,8 @@ class Context(object):
 
     use_llvm = False
     optimize_llvm = True
+    # Feature string of the LLVM target machine used to optimize kernels
+    llvm_features = '-avx'
     optimize_broadcasting = True
 
     shape_type = minitypes.Py_ssize_t.pointer()
@@ -271,6 +273,20 @@ class Context(object):
             llvm.passes.PASS_CODE_GEN_PREPARE,
         ]
 
+    def noalias_arguments(self, specializer):
+        """
+        Whether the pointer arguments of functions specialized by the given
+        specializer may be marked noalias (for LLVM code generation).
+        """
+        return True
+
+    def tbaa_metadata(self, llvm_module, pointer):
+        """
+        Return the Type Based Alias Analysis metadata for loads and stores
+        through the given pointer node, or None (for LLVM code generation).
+        """
+        return None
+
     def mangle_function_name(self, name):
         name = "%s_%d" % (name, self.func_counter)
         self.func_counter += 1
@@ -989,6 +1005,7 @@ class Node(miniutils.ComparableObjectMixin):
     is_assignment = False
     is_unop = False
     is_binop = False
+    is_index = False
 
     is_node_wrapper = False
     is_data_pointer = False
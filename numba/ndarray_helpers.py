@@ -18,6 +18,12 @@ import llvm.core as lc
 
 const_int = lambda X: lc.Constant.int(_int32, X)
 
+# NumPy array flags
+NPY_C_CONTIGUOUS = 0x0001
+NPY_F_CONTIGUOUS = 0x0002
+NPY_ALIGNED      = 0x0100
+NPY_WRITEABLE    = 0x0400
+
 def set_metadata(tbaa, instr, type):
     if type is not None:
         metadata = tbaa.get_metadata(type)
@@ -143,5 +143,7 @@ from numba.nodes.objectnodes import *
 from numba.nodes.llvmnodes import *
 
 from numba.nodes.bitwise import *
+from numba.nodes.vectornodes import *
+from numba.nodes.stringnodes import *
 
 from numba.nodes.metadata import annotate, query
\ No newline at end of file
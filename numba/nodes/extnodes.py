@@ -71,6 +71,25 @@ class AutojitExtensionMethod(ExtensionMethod):
     def initialize_type(self, method):
         self.type = methods.AutojitMethodType()
 
+def call_special_method(obj, attr, args):
+    """
+    Call the typed special method of an extension object directly, e.g.
+    obj.__len__() for len(obj). Returns None if the extension type has no
+    typed method 'attr' that takes the arguments.
+    """
+    method = obj.variable.type.methoddict.get(attr)
+    if method is None or method.signature is None:
+        return None
+
+    signature = method.signature
+    if (not signature.is_bound_method or
+            len(signature.args) != len(args) + 1):
+        return None
+
+    method_node = ExtensionMethod(obj, attr, method)
+    return NativeFunctionCallNode(signature, method_node, args,
+                                  skip_self=True)
+
 
 #class ExtensionMethodCall(Node):
 #    """
@@ -7,6 +7,7 @@ import llvm.core
 from numba import typesystem
 from numba.typesystem import tbaa
 from numba.nodes import *
+from numba.nodes.excnodes import RaiseNode
 from numba.ndarray_helpers import PyArrayAccessor
 
 #----------------------------------------------------------------------------
@@ -35,7 +36,7 @@ def _const_int(X):
 
 def get_shape(builder, tbaa_metadata, shape_pointer, ndim):
     "Load the shape values from an ndarray"
-    shape_metadata = tbaa_metadata.get_metadata(tbaa_metadata.numpy_shape)
+    shape_metadata = tbaa_metadata.get_metadata(tbaa.numpy_shape)
 
     for i in range(ndim):
         shape_ptr = builder.gep(shape_pointer, [_const_int(i)])
@@ -112,7 +113,12 @@ def update_preloaded_phi(phi_var, incoming_var, llvm_incoming_block):
 
 class DataPointerNode(ExprNode):
 
-    _fields = ['node', 'slice']
+    _fields = ['node', 'slice', 'raise_node']
+
+    # Dimensions of which the index is checked against the extent, and the
+    # RaiseNode for out of bounds indices (see check_bounds())
+    checked_dims = ()
+    raise_node = None
 
     def __init__(self, node, slice, ctx):
         self.node = node
@@ -121,6 +127,16 @@ class DataPointerNode(ExprNode):
         self.variable = Variable(self.type)
         self.ctx = ctx
 
+    def check_bounds(self, inbounds=frozenset()):
+        """
+        Raise an IndexError for indices that are out of bounds, for all
+        dimensions except the ones in 'inbounds'.
+        """
+        self.checked_dims = [dim for dim in range(self.ndim)
+                                     if dim not in inbounds]
+        if self.checked_dims:
+            self.raise_node = RaiseNode(IndexError, "index out of bounds")
+
     def data_descriptors(self, builder, tbaa, llvm_value):
         '''
         Returns a tuple of (dptr, strides)
@@ -152,6 +168,37 @@ class DataPointerNode(ExprNode):
 
         return dptr, strides
 
+    def check_indices(self, translator, tbaa, llvm_value, indices):
+        "Branch to the raise_node if an index is out of bounds"
+        builder = translator.builder
+
+        # Use the preloaded shape if available
+        var = self.node.variable
+        if var.preload_shape and var.preloaded_shape is not None:
+            shape = var.preloaded_shape
+        else:
+            acc = PyArrayAccessor(builder, llvm_value, tbaa, self.type)
+            shape = list(get_shape(builder, tbaa, acc.dimensions, self.ndim))
+
+        # Negative indices compare as large unsigned values
+        out_of_bounds = None
+        for dim in self.checked_dims:
+            extent = translator.caster.cast(shape[dim], indices[dim].type,
+                                            unsigned=False)
+            is_out = builder.icmp(llvm.core.ICMP_UGE, indices[dim], extent)
+            if out_of_bounds is None:
+                out_of_bounds = is_out
+            else:
+                out_of_bounds = builder.or_(out_of_bounds, is_out)
+
+        bb_error = translator.append_basic_block('index_error')
+        bb_ok = translator.append_basic_block('index_ok')
+        builder.cbranch(out_of_bounds, bb_error, bb_ok)
+
+        builder.position_at_end(bb_error)
+        translator.visit(self.raise_node)
+        builder.position_at_end(bb_ok)
+
     def subscript(self, translator, tbaa, llvm_value, indices):
         builder = translator.builder
         caster = translator.caster
@@ -163,9 +210,14 @@ class DataPointerNode(ExprNode):
             indices = (indices,)
 
         dptr, strides = self.data_descriptors(builder, tbaa, llvm_value)
+        strides = list(strides)
+        indices = [caster.cast(index, stride.type, unsigned=False)
+                       for stride, index in zip(strides, indices)]
+
+        if self.raise_node is not None:
+            self.check_indices(translator, tbaa, llvm_value, indices)
 
-        for i, (stride, index) in enumerate(zip(strides, indices)):
-            index = caster.cast(index, stride.type, unsigned=False)
+        for stride, index in zip(strides, indices):
             offset = caster.cast(offset, stride.type, unsigned=False)
             offset = builder.add(offset, builder.mul(index, stride))
 
@@ -184,6 +236,23 @@ class DataPointerNode(ExprNode):
     def __repr__(self):
         return "%s.data" % self.node
 
+class ElementPointerNode(ExprNode):
+    """
+    Pointer to an element of an array, &array[indices]. Used for strength
+    reduction of strided accesses in loops (see specialize/loops.py).
+    """
+
+    _fields = ['array', 'indices']
+
+    def __init__(self, array, indices, **kwargs):
+        super(ElementPointerNode, self).__init__(**kwargs)
+        self.array = array
+        self.indices = indices
+        self.type = array.type.dtype.pointer()
+
+    def __repr__(self):
+        return "&%s[%s]" % (self.array, ", ".join(map(str, self.indices)))
+
 class ArrayAttributeNode(ExprNode):
     is_read_only = True
 
@@ -243,15 +312,65 @@ class ArrayNewNode(ExprNode):
 class ArrayNewEmptyNode(ExprNode):
     """
     Allocate a new array with data.
+
+        storage: 'heap', or 'reuse' to reuse the previous allocation made
+                 by this node if the shape is the same (nopython context
+                 only, see control_flow/escape.py)
     """
 
     _fields = ['shape']
 
-    def __init__(self, type, shape, is_fortran=False, **kwargs):
+    def __init__(self, type, shape, is_fortran=False, storage='heap',
+                 **kwargs):
         super(ArrayNewEmptyNode, self).__init__(**kwargs)
         self.type = type
         self.shape = shape
         self.is_fortran = is_fortran
+        self.storage = storage
+
+class ExtentsNode(ExprNode):
+    """
+    Build a C array of extents (npy_intp *) from a list of expressions.
+    """
+
+    _fields = ['extents']
+
+    def __init__(self, extents, **kwargs):
+        super(ExtentsNode, self).__init__(**kwargs)
+        self.extents = [CoercionNode(extent, npy_intp) for extent in extents]
+        self.type = npy_intp.pointer()
+
+class StackArrayNode(ExprNode):
+    """
+    Allocate a native array with a constant shape in the stack frame of the
+    function. The array must not escape (see control_flow/escape.py).
+
+        extents: list of integers
+        fill: None or a scalar to fill the array with at each evaluation
+    """
+
+    _fields = []
+
+    def __init__(self, type, extents, is_fortran=False, fill=None, **kwargs):
+        super(StackArrayNode, self).__init__(**kwargs)
+        self.type = type
+        self.extents = extents
+        self.is_fortran = is_fortran
+        self.fill = fill
+
+class ArrayFillNode(ExprNode):
+    """
+    Fill a new contiguous native array with a constant, evaluating to the
+    array (np.zeros/np.ones).
+    """
+
+    _fields = ['array']
+
+    def __init__(self, array, fill, **kwargs):
+        super(ArrayFillNode, self).__init__(**kwargs)
+        self.array = array
+        self.fill = fill
+        self.type = array.type
 
 
 #----------------------------------------------------------------------------
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+Calls of the byte string operations in numba.strings.
+"""
+from __future__ import print_function, division, absolute_import
+
+from numba.nodes import *
+
+class StringCallNode(ExprNode):
+    """
+    Call of numba.strings.<name> with all arguments given, which the
+    LateSpecializer rewrites to a call of the native implementation (see
+    numba/utility/string_utilities.py).
+    """
+
+    _fields = ['args']
+
+    def __init__(self, name, args, type, **kwargs):
+        super(StringCallNode, self).__init__(**kwargs)
+        self.name = name
+        self.args = args
+        self.type = type
+
+    def __repr__(self):
+        return "strings.%s(%s)" % (self.name, ", ".join(map(str, self.args)))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Operations on SIMD vector types (see numba/simd.py).
+"""
+from __future__ import print_function, division, absolute_import
+
+from numba.nodes import *
+
+class VectorLoadNode(ExprNode):
+    """
+    Load a vector of consecutive elements of an array or pointer, starting
+    at the element at the given indices.
+    """
+
+    _fields = ['base', 'indices']
+
+    def __init__(self, type, base, indices, **kwargs):
+        super(VectorLoadNode, self).__init__(**kwargs)
+        self.type = type
+        self.base = base
+        self.indices = indices
+
+    def __repr__(self):
+        return "vload(%s, %s[%s])" % (self.type, self.base,
+                                      ", ".join(map(str, self.indices)))
+
+class VectorStoreNode(ExprNode):
+    """
+    Store a vector to consecutive elements of an array or pointer.
+    """
+
+    _fields = ['value', 'base', 'indices']
+
+    type = void
+
+    def __init__(self, value, base, indices, **kwargs):
+        super(VectorStoreNode, self).__init__(**kwargs)
+        self.value = value
+        self.base = base
+        self.indices = indices
+
+    def __repr__(self):
+        return "vstore(%s, %s[%s])" % (self.value, self.base,
+                                       ", ".join(map(str, self.indices)))
+
+class VectorShuffleNode(ExprNode):
+    """
+    Select elements from the concatenation of two vectors with a constant
+    mask: result[i] = (a + b)[mask[i]]
+    """
+
+    _fields = ['left', 'right']
+
+    def __init__(self, left, right, mask, **kwargs):
+        super(VectorShuffleNode, self).__init__(**kwargs)
+        self.left = left
+        self.right = right
+        self.mask = mask
+        self.type = typesystem.vector(left.type.base_type, len(mask))
+
+    def __repr__(self):
+        return "shuffle(%s, %s, %s)" % (self.left, self.right, self.mask)
+
+class VectorExtractNode(ExprNode):
+    "Extract an element from a vector"
+
+    _fields = ['vector', 'index']
+
+    def __init__(self, vector, index, **kwargs):
+        super(VectorExtractNode, self).__init__(**kwargs)
+        self.vector = vector
+        self.index = index
+        self.type = vector.type.base_type
+
+    def __repr__(self):
+        return "%s[%s]" % (self.vector, self.index)
+
+class VectorInsertNode(ExprNode):
+    "Build a new vector with the element at the given index replaced"
+
+    _fields = ['vector', 'index', 'value']
+
+    def __init__(self, vector, index, value, **kwargs):
+        super(VectorInsertNode, self).__init__(**kwargs)
+        self.vector = vector
+        self.index = index
+        self.value = value
+        self.type = vector.type
+
+    def __repr__(self):
+        return "insert(%s, %s, %s)" % (self.vector, self.index, self.value)
+
+class VectorReduceNode(ExprNode):
+    "Horizontal sum of the elements of a vector"
+
+    _fields = ['vector']
+
+    def __init__(self, vector, **kwargs):
+        super(VectorReduceNode, self).__init__(**kwargs)
+        self.vector = vector
+        self.type = vector.type.base_type
+
+    def __repr__(self):
+        return "sum(%s)" % (self.vector,)
@@ -52,6 +52,7 @@ typedef struct {
     void *native_func;
     PyObject *native_signature;
     PyObject *keep_alive;
+    PyObject **cache; /* See NumbaFunction_NewCached */
 
     /* Dynamic default args*/
     void *defaults;
@@ -288,13 +289,11 @@ static PyMethodDef NumbaFunction_methods[] = {
 };
 
 
-static NumbaFunctionObject *NumbaFunction_New(
-            PyTypeObject *type, PyMethodDef *ml, int flags, PyObject *closure,
-            PyObject *module, PyObject *code, PyObject *keep_alive)
+static void NumbaFunction_Init(
+            NumbaFunctionObject *op, PyMethodDef *ml, int flags,
+            PyObject *closure, PyObject *module, PyObject *code,
+            PyObject *keep_alive)
 {
-    NumbaFunctionObject *op = PyObject_GC_New(NumbaFunctionObject, type);
-    if (op == NULL)
-        return NULL;
     op->flags = flags;
     op->func_weakreflist = NULL;
     op->func.m_ml = ml;
@@ -321,8 +320,19 @@ static NumbaFunctionObject *NumbaFunction_New(
     op->keep_alive = keep_alive;
     op->native_func = NULL;
     op->native_signature = NULL;
+    op->cache = NULL;
 
     PyObject_GC_Track((PyObject *)op);
+}
+
+static NumbaFunctionObject *NumbaFunction_New(
+            PyTypeObject *type, PyMethodDef *ml, int flags, PyObject *closure,
+            PyObject *module, PyObject *code, PyObject *keep_alive)
+{
+    NumbaFunctionObject *op = PyObject_GC_New(NumbaFunctionObject, type);
+    if (op == NULL)
+        return NULL;
+    NumbaFunction_Init(op, ml, flags, closure, module, code, keep_alive);
     return op;
 }
 
@@ -343,6 +353,36 @@ NumbaFunction_NewEx(PyMethodDef *ml, PyObject *module, PyObject *code,
     return (PyObject *)result;
 }
 
+/* Like NumbaFunction_NewEx, but reuse the memory of the last function
+   created through the cache, if it was deallocated. A deallocated function
+   has released its closure scope and everything else it referred to, only
+   its memory is kept in *cache. keep_alive must own the cache, so that
+   the cache outlives the functions. */
+PyObject *
+NumbaFunction_NewCached(PyObject **cache, PyMethodDef *ml, PyObject *module,
+                        PyObject *code, PyObject *closure, void *native_func,
+                        PyObject *native_signature, PyObject *keep_alive)
+{
+    NumbaFunctionObject *result = (NumbaFunctionObject *) *cache;
+
+    if (result != NULL) {
+        *cache = NULL;
+        PyObject_Init((PyObject *) result, NumbaFunctionType);
+        NumbaFunction_Init(result, ml, 0, closure, module, code, keep_alive);
+    } else {
+        result = NumbaFunction_New(NumbaFunctionType, ml, 0, closure, module,
+                                   code, keep_alive);
+        if (result == NULL)
+            return NULL;
+    }
+
+    result->native_func = native_func;
+    Py_XINCREF(native_signature);
+    result->native_signature = native_signature;
+    result->cache = cache;
+    return (PyObject *) result;
+}
+
 static int
 NumbaFunction_clear(NumbaFunctionObject *m)
 {
@@ -372,11 +412,21 @@ NumbaFunction_clear(NumbaFunctionObject *m)
 
 static void NumbaFunction_dealloc(NumbaFunctionObject *m)
 {
+    /* keep_alive owns the cache, release it last */
+    PyObject *keep_alive = m->keep_alive;
+    m->keep_alive = NULL;
+
     PyObject_GC_UnTrack(m);
     if (m->func_weakreflist != NULL)
         PyObject_ClearWeakRefs((PyObject *) m);
     NumbaFunction_clear(m);
-    PyObject_GC_Del(m);
+
+    if (m->cache != NULL && keep_alive != NULL && *m->cache == NULL)
+        *m->cache = (PyObject *) m;
+    else
+        PyObject_GC_Del(m);
+
+    Py_XDECREF(keep_alive);
 }
 
 static int NumbaFunction_traverse(NumbaFunctionObject *m, visitproc visit, void *arg)
@@ -5,3 +5,7 @@ extern PyObject *NumbaFunction_NewEx(
                 PyMethodDef *ml, PyObject *module, PyObject *code,
                 PyObject *closure, void *native_func,
                 PyObject *native_signature, PyObject *keep_alive);
+extern PyObject *NumbaFunction_NewCached(
+                PyObject **cache, PyMethodDef *ml, PyObject *module,
+                PyObject *code, PyObject *closure, void *native_func,
+                PyObject *native_signature, PyObject *keep_alive);
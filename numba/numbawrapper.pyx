@@ -14,12 +14,19 @@ import numpy as np
 
 
 cdef extern from *:
+    ctypedef object (*ternaryfunc)(PyObject *, PyObject *, PyObject *)
+
     ctypedef struct PyTypeObject:
         PyObject *tp_dict
+        ternaryfunc tp_call
+
+    PyTypeObject PyType_Type
 
     ctypedef struct PyMethodDef:
         pass
 
+    void PyObject_GC_Del(void *op)
+
 cdef extern from "numbafunction.h":
     cdef size_t closure_field_offset
     cdef PyTypeObject *NumbaFunctionType
@@ -27,6 +34,10 @@ cdef extern from "numbafunction.h":
     cdef object NumbaFunction_NewEx(
             PyMethodDef *ml, module, code, PyObject *closure,
             void *native_func, native_signature, keep_alive)
+    cdef object NumbaFunction_NewCached(
+            PyObject **cache, PyMethodDef *ml, module, code,
+            PyObject *closure, void *native_func, native_signature,
+            keep_alive)
 
 #------------------------------------------------------------------------
 # Numba Function Wrappers
@@ -55,10 +66,30 @@ cdef class NumbaWrapper(object):
 
 NumbaFunction_init()
 NumbaFunction_NewEx_pointer = <Py_uintptr_t> &NumbaFunction_NewEx
+NumbaFunction_NewCached_pointer = <Py_uintptr_t> &NumbaFunction_NewCached
 
 numbafunction_type = <object> NumbaFunctionType
 numbafunc_closure_field_offset = closure_field_offset
 
+cdef class NumbaFunctionCache(object):
+    """
+    The memory of the last deallocated function created by a 'def' in
+    compiled code, which NumbaFunction_NewCached reuses for the next one.
+    The functions own the cache through keep_alive, and the cache frees
+    the memory when it is deallocated.
+    """
+
+    cdef PyObject *memory
+
+    property address:
+        "The address of the PyObject * of the cached memory"
+        def __get__(self):
+            return <Py_uintptr_t> &self.memory
+
+    def __dealloc__(self):
+        if self.memory != NULL:
+            PyObject_GC_Del(self.memory)
+
 def create_function(methoddef, py_func, lfunc_pointer, signature, modname):
     cdef Py_uintptr_t methoddef_p = ctypes.cast(ctypes.byref(methoddef),
                                                 ctypes.c_void_p).value
@@ -221,6 +252,60 @@ class NumbaSpecializingWrapper(_NumbaSpecializingWrapper):
         return self.module
 
 
+#------------------------------------------------------------------------
+# Autojit Class Wrappers
+#------------------------------------------------------------------------
+
+cdef class ClassSpecializingWrapper(object):
+    """
+    The __call__ of the metaclass of @autojit classes. Instantiates the
+    specialization for the runtime constructor arguments.
+
+    Specializations found in the fast function cache of the class
+    specializer are instantiated through type.__call__ directly, instead
+    of through NumbaSpecializingWrapper and the __call__ of the specialized
+    metaclass. This is not a descriptor, so the metaclass calls it with the
+    constructor arguments only.
+
+        specializer: NumbaSpecializingWrapper for the unspecialized class
+    """
+
+    cdef public _NumbaSpecializingWrapper specializer
+
+    def __init__(self, specializer):
+        self.specializer = specializer
+
+    def __call__(self, *args, **kwargs):
+        if not kwargs:
+            specialized_cls = self.specializer.funccache.lookup(args)
+            if specialized_cls is not None:
+                return PyType_Type.tp_call(<PyObject *> specialized_cls,
+                                           <PyObject *> args, NULL)
+
+        return self.specializer(*args, **kwargs)
+
+
+cdef class UnboundDelegatingMethod(object):
+    """
+    Function in the unspecialized class that is used for delegation to
+    a method in a specialized class, i.e.
+
+        A.method(A(10.0)) -> A(10.0).method()
+
+    This method can never be bound, since __new__ always returns specialized
+    instances (so the unspecialized class cannot be instantiated!).
+    """
+
+    cdef public object py_class, name
+
+    def __init__(self, py_class, name):
+        self.py_class = py_class
+        self.name = name
+
+    def __call__(self, obj, *args, **kwargs):
+        unbound_method_type_check(self.py_class, obj)
+        return getattr(obj, self.name)(*args, **kwargs)
+
 #------------------------------------------------------------------------
 # Unbound Methods
 #------------------------------------------------------------------------
@@ -10,6 +10,75 @@ import ast
 
 from numba import typesystem
 from numba import visitors
+from numba import nodes
+
+#----------------------------------------------------------------------------
+# Array Modification Analysis
+#----------------------------------------------------------------------------
+
+# Names of the LLVM functions of compiled functions that do not resize or
+# rebind the arrays they are passed. Compiled code can only change the shape
+# or data pointer of an array through Python calls, so every function that
+# does not pass arrays to Python is registered here by the Preloader.
+array_preserving_functions = set()
+
+def is_array(node):
+    type = getattr(node, 'type', None)
+    return type is not None and type.is_array
+
+class ArrayModificationFinder(ast.NodeVisitor):
+    """
+    Find operations that may resize or rebind arrays behind the back of
+    compiled code, which invalidates their data pointer, shape and strides:
+
+        - passing an array to a Python call, or converting it to an object
+        - attribute access on an array that is not a known array attribute,
+          e.g. a.resize(...) or a.shape = ...
+        - passing an array to a native function that is not registered in
+          array_preserving_functions
+    """
+
+    def __init__(self):
+        self.modifies_arrays = False
+
+    def visit_ObjectCallNode(self, node):
+        args = list(node.args_tuple.elts)
+        if isinstance(node.kwargs_dict, ast.Dict):
+            args.extend(node.kwargs_dict.values)
+
+        function = node.function
+        if (any(is_array(arg) for arg in args) or
+                (isinstance(function, ast.Attribute) and
+                     is_array(function.value))):
+            self.modifies_arrays = True
+
+        self.generic_visit(node)
+
+    def visit_NativeCallNode(self, node):
+        if (node.llvm_func_name not in array_preserving_functions and
+                any(is_array(arg) for arg in node.original_args)):
+            self.modifies_arrays = True
+
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if is_array(node.value):
+            self.modifies_arrays = True
+
+        self.generic_visit(node)
+
+    def visit_CoercionNode(self, node):
+        if (is_array(node.node) and node.type.is_object and
+                not node.type.is_array):
+            self.modifies_arrays = True
+
+        self.generic_visit(node)
+
+def modifies_arrays(node):
+    "Whether the code of the AST node may resize or rebind arrays"
+    finder = ArrayModificationFinder()
+    finder.visit(node)
+    return finder.modifies_arrays
 
 #----------------------------------------------------------------------------
 # NumPy Array Attribute Preloading
@@ -52,6 +121,25 @@ def propagate_properties(flow):
                 changed |= update(phi_node.variable)
 
 
+def constant_index(node):
+    "The value of a constant integer index, or None"
+    if isinstance(node, ast.Index):
+        node = node.value
+    if isinstance(node, nodes.ConstNode) and node.type.is_int:
+        return node.pyval
+    return None
+
+def is_extent(node):
+    "Whether the subscript is array.shape[i] for an array variable"
+    shape = node.value
+    return (isinstance(shape, nodes.ArrayAttributeNode) and
+            shape.attr_name == 'shape' and
+            isinstance(shape.array, ast.Name) and
+            not shape.array.cf_maybe_null and
+            not shape.array.variable.uninitialized and
+            isinstance(node.ctx, ast.Load) and
+            constant_index(node.slice) is not None)
+
 class Preloader(visitors.NumbaTransformer):
     """
     Pre-load things in order to avoid a potential runtime load instruction.
@@ -59,7 +147,7 @@ class Preloader(visitors.NumbaTransformer):
 
     For each definition of an array variable, which is either a name assignment
     or a phi, we determine whether to pre-load the data pointer, the strides,
-    and the shape information:
+    and the shape information (for array.shape[i] with constant i):
 
         array = np.array(...)
         for i in range(...):
@@ -75,9 +163,22 @@ class Preloader(visitors.NumbaTransformer):
 
         for i in range(...):
             array[i]            # use pre-loaded temporaries
+
+    Pre-loaded values remain valid across calls to compiled functions. If
+    the function may resize or rebind arrays through Python code (see
+    ArrayModificationFinder), nothing is pre-loaded. Otherwise the function
+    is registered as preserving its array arguments, which makes calls to
+    it from other functions safe.
     """
 
     def visit_FunctionDef(self, node):
+        if modifies_arrays(node):
+            return node
+
+        func_env = self.env.translation.crnt
+        if func_env.lfunc is not None:
+            array_preserving_functions.add(func_env.lfunc.name)
+
         # Set the initial preload conditions
         self.visitchildren(node)
 
@@ -104,6 +205,14 @@ class Preloader(visitors.NumbaTransformer):
             array_variable.preload_data = True
             array_variable.preload_strides = True
 
+            # Bounds checks compare the indices to the shape
+            inbounds = getattr(node, 'inbounds', ())
+            if (self.env.translation.crnt.boundscheck and
+                    len(inbounds) < node.value.type.ndim):
+                array_variable.preload_shape = True
+        elif is_extent(node):
+            node.value.array.variable.preload_shape = True
+
         self.visitchildren(node)
         return node
 
@@ -29,6 +29,7 @@ from numba import typesystem
 from numba.codegen import llvmwrapper
 from numba import ast_constant_folding as constant_folding
 from numba.control_flow import ssa
+from numba.control_flow import escape
 from numba.codegen import translate
 from numba import utils
 from numba.missing import FixMissingLocations
@@ -410,6 +411,15 @@ class ClosureTypeInference(PipelineStage):
         return type_inferer.visit(ast)
 
 
+class EscapeAnalysis(PipelineStage):
+    def transform(self, ast, env):
+        if env.translation.nopython:
+            analysis = self.make_specializer(escape.ArrayEscapeAnalysis,
+                                             ast, env)
+            analysis.analyze()
+        return ast
+
+
 class TransformFor(PipelineStage):
     def transform(self, ast, env):
         transform = self.make_specializer(loops.TransformForIterable, ast,
@@ -43,6 +43,10 @@ def main(args=None):
                         'extension module code in output')
     parser.add_argument('-d', '--debug', action='store_true',
                         help='Print extra debug information')
+    parser.add_argument('--targets',
+                        help='Comma-separated CPU target levels (e.g. '
+                        'sse2,avx2,avx512) to emit versions of the exported '
+                        'functions for, selected at runtime')
 
     args = parser.parse_args(args)
 
@@ -61,7 +65,8 @@ def main(args=None):
     logger.debug('args.output --> %s', args.output)
 
     logger.debug('inputs --> %s', args.inputs)
-    compiler = Compiler(args.inputs, module_name=module_name)
+    targets = args.targets and args.targets.split(',')
+    compiler = Compiler(args.inputs, module_name=module_name, targets=targets)
     if args.llvm:
         logger.debug('emit llvm')
         compiler.write_llvm_bitcode(args.output, wrap=args.python)
@@ -73,10 +78,11 @@ def main(args=None):
         logger.debug('write to temporary object file %s', tempfile.gettempdir())
         temp_obj = (tempfile.gettempdir() + os.sep +
                     os.path.basename(args.output) + '.o')
-        compiler.write_native_object(temp_obj, wrap=args.python)
-        cmdargs = (find_linker(),) + find_args() + ('-o', args.output, temp_obj)
-        subprocess.check_call(cmdargs)
-        os.remove(temp_obj)
+        temp_objs = compiler.write_native_object(temp_obj, wrap=args.python)
+        cmdargs = (find_linker(),) + find_args() + ('-o', args.output)
+        subprocess.check_call(cmdargs + tuple(temp_objs))
+        for temp_obj in temp_objs:
+            os.remove(temp_obj)
 
     if args.header:
         compiler.emit_header(args.output)
@@ -11,6 +11,7 @@ import llvm.ee as le
 
 from numba import environment, PY3
 from numba import llvm_types as lt
+from numba.codegen import multiversion
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,9 @@ class _Compiler(object):
     :param inputs: input file(s).
     :type inputs: iterable
     :param module_name: the name of the exported module.
+    :param targets: CPU target levels to emit versions of the exported
+                    functions for, unless given in @export (see
+                    numba.codegen.multiversion).
     """
 
     #: Structure used to describe a method of an extension type.
@@ -76,9 +80,15 @@ class _Compiler(object):
 
     method_def_ptr = lc.Type.pointer(method_def_ty)
 
-    def __init__(self, inputs, module_name='numba_exported'):
+    def __init__(self, inputs, module_name='numba_exported', targets=None):
         self.inputs = inputs
         self.module_name = module_name
+        self.targets = targets and multiversion.check_targets(targets)
+
+        #: Target level of the main module, and (target, module) pairs
+        #: of the versions for the higher target levels.
+        self.base_target = None
+        self.target_modules = []
 
         self.env = environment.NumbaEnvironment.get_environment()
 
@@ -111,32 +121,96 @@ class _Compiler(object):
         self.env.context.cbuilder_library.link(llvm_module)
         self.env.constants_manager.link(llvm_module)
 
+        self._emit_versions(llvm_module, exports_env.function_targets_map)
+
         if exports_env.wrap_exports:
             self._emit_python_wrapper(llvm_module)
 
         exports_env.reset()
         return llvm_module
 
+    def _emit_versions(self, llvm_module, function_targets):
+        """Emit the versions of the exported functions for their target
+        levels, and replace the functions by dispatch stubs. The versions
+        for the lowest level remain in llvm_module.
+        """
+        self.base_target = None
+        self.target_modules = []
+
+        function_targets = dict(
+            (name, function_targets.get(name, self.targets))
+                for name in self.exported_signatures)
+        function_targets = dict((name, targets)
+                                for name, targets in function_targets.items()
+                                    if targets)
+        if not function_targets:
+            return
+
+        all_targets = multiversion.check_targets(
+            [target for targets in function_targets.values()
+                        for target in targets])
+        self.base_target = all_targets[0]
+
+        for target in all_targets[1:]:
+            names = [name for name, targets in function_targets.items()
+                              if target in targets]
+            clone = multiversion.clone_for_target(llvm_module, names, target)
+            self.target_modules.append((target, clone))
+
+        for name, targets in function_targets.items():
+            ftype = llvm_module.get_function_named(name).type.pointee
+            multiversion.rename_versions(llvm_module, [name], self.base_target)
+            versions = [self.base_target] + [target for target in targets
+                                                 if target != self.base_target]
+            multiversion.build_dispatcher(llvm_module, name, ftype, versions)
+
     def _process_inputs(self, wrap=False, **kws):
         self.env.exports.wrap_exports = wrap
         for ifile in self.inputs:
             exec(compile(open(ifile).read(), ifile, 'exec'))
 
+    def _target_outputs(self, output):
+        "Output files of the versions for the higher target levels"
+        fname, ext = os.path.splitext(output)
+        return [("%s.%s%s" % (fname, target, ext), target, module)
+                    for target, module in self.target_modules]
+
     def write_llvm_bitcode(self, output, **kws):
         self._process_inputs(**kws)
         lmod = self._cull_exports()
         with open(output, 'wb') as fout:
             lmod.to_bitcode(fout)
 
+        for path, target, module in self._target_outputs(output):
+            with open(path, 'wb') as fout:
+                module.to_bitcode(fout)
+
     def write_native_object(self, output, **kws):
+        """Write the native object file. With several target levels, the
+        versions for the higher levels are written to separate object files
+        next to the output (e.g. out.avx2.o), which must be linked as well.
+
+        :returns: the list of written object files.
+        """
         self._process_inputs(**kws)
         lmod = self._cull_exports()
-        tm = le.TargetMachine.new(reloc=le.RELOC_PIC, features='-avx')
-        if not kws.get('wrap'):
-            _hack_strip_python_ref(lmod)
-        with open(output, 'wb') as fout:
-            objfile = tm.emit_object(lmod)
-            fout.write(objfile)
+        if self.base_target is None:
+            tm = le.TargetMachine.new(reloc=le.RELOC_PIC, features='-avx')
+        else:
+            tm = multiversion.target_machine(self.base_target)
+
+        modules = [(output, tm, lmod)]
+        for path, target, module in self._target_outputs(output):
+            modules.append((path, multiversion.target_machine(target), module))
+
+        for path, tm, module in modules:
+            if not kws.get('wrap'):
+                _hack_strip_python_ref(module)
+            with open(path, 'wb') as fout:
+                objfile = tm.emit_object(module)
+                fout.write(objfile)
+
+        return [path for path, tm, module in modules]
 
     def emit_header(self, output):
         from numba.minivect import minitypes
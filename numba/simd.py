@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Explicit SIMD programming with vector types:
+
+    float32x8 = numba.vector(float32, 8)
+
+    @jit(void(float32[:], float32[:], float32))
+    def saxpy(x, y, a):
+        for i in range(0, x.shape[0], 8):
+            v = simd.load(float32x8, x, i) * a + simd.load(float32x8, y, i)
+            simd.store(v, y, i)
+
+Vectors support element-wise arithmetic (+, -, * and /), where scalar
+operands are broadcast. In
+compiled code vectors are LLVM vector values, and loads and stores access
+'size' consecutive elements, which must be contiguous in memory. Vector
+types must be declared outside of the compiled function.
+
+The functions below implement the same operations in Python on NumPy
+arrays of length 'size', and are used outside of compiled code.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+
+def load(type, array, index):
+    """
+    Load a vector of type 'type' from array[index:index + type.size].
+    For multi-dimensional arrays, index is a tuple and the elements are
+    loaded along the last dimension.
+    """
+    if not isinstance(index, tuple):
+        index = (index,)
+
+    elements = array[index[:-1]][index[-1]:index[-1] + type.size]
+    if len(elements) != type.size:
+        raise IndexError("vector load out of bounds")
+    return np.array(elements, dtype=type.base_type.get_dtype())
+
+def store(value, array, index):
+    "Store a vector to array[index:index + len(value)]"
+    if not isinstance(index, tuple):
+        index = (index,)
+
+    elements = array[index[:-1]][index[-1]:index[-1] + len(value)]
+    if len(elements) != len(value):
+        raise IndexError("vector store out of bounds")
+    elements[...] = value
+
+def splat(type, value):
+    "Create a vector with all elements set to value"
+    result = np.empty(type.size, dtype=type.base_type.get_dtype())
+    result.fill(value)
+    return result
+
+def shuffle(a, b, mask):
+    """
+    Select elements from the concatenation of the vectors a and b, where
+    mask is a constant tuple of indices.
+    """
+    return np.concatenate([a, b])[list(mask)]
+
+def extract(value, index):
+    "Extract the element at the given index"
+    return value[index]
+
+def insert(value, index, element):
+    "Return a copy of the vector with the element at index replaced"
+    result = value.copy()
+    result[index] = element
+    return result
+
+def sum(value):
+    "Sum the elements of a vector"
+    return value.sum()
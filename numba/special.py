@@ -6,7 +6,8 @@ Special compiler-recognized numba functions and attributes.
 
 from __future__ import print_function, division, absolute_import
 
-__all__ = ['NULL', 'typeof', 'python', 'nopython', 'addressof']
+__all__ = ['NULL', 'typeof', 'python', 'nopython', 'addressof', 'final',
+           'allocate_instances']
 
 import ctypes
 
@@ -60,6 +61,43 @@ def typeof(value):
     from numba import typesystem
     return typesystem.numba_typesystem.typeof(value)
 
+#------------------------------------------------------------------------
+# Extension types
+#------------------------------------------------------------------------
+
+def final(obj):
+    """
+    Declare a @jit or @autojit class or method final:
+
+        @jit
+        @final
+        class Particle(object):
+            ...
+
+    Final classes cannot be subclassed and final methods cannot be
+    overridden, so compiled code calls their methods directly instead of
+    through the virtual method table.
+    """
+    if isinstance(obj, (staticmethod, classmethod)):
+        from numba.exttypes.signatures import get_classmethod_func
+        get_classmethod_func(obj).__numba_final__ = True
+    else:
+        obj.__numba_final__ = True
+    return obj
+
+def allocate_instances(extclass, n):
+    """
+    Allocate n instances of a @jit(compact=True) class in a single
+    contiguous buffer. The instances are not initialized by __init__, their
+    attributes are zero.
+
+    :return: an InstanceArena, a sequence of the instances. Its 'attributes'
+             property is a structured array view of the native attributes.
+    """
+    from numba.exttypes import extension_types
+
+    return extension_types.InstanceArena(extclass, n)
+
 #------------------------------------------------------------------------
 # python/nopython context managers
 #------------------------------------------------------------------------
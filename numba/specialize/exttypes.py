@@ -8,6 +8,7 @@ from numba import visitors
 from numba import nodes
 from numba import function_util
 from numba.exttypes import virtual
+from numba.exttypes.types import methods
 from numba.traits import traits, Delegate
 
 class ExtensionTypeLowerer(visitors.NumbaTransformer):
@@ -55,9 +56,45 @@ class ExtensionTypeLowerer(visitors.NumbaTransformer):
             raise error.NumbaError(node, "Referenced extension method '%s' "
                                          "must be called" % node.attr)
 
+        method = devirtualize(node)
+        if method is not None:
+            return direct_method_call(node, call_node, method)
+
         handler = self.get_handler(node.ext_type)
         return handler.handle_method_call(self.env, node, call_node)
 
+#------------------------------------------------------------------------
+# Devirtualization
+#------------------------------------------------------------------------
+
+def devirtualize(node):
+    """
+    Return the Method an extension method call always dispatches to, or None.
+
+    This is the case for methods of final classes and for final methods,
+    which subclasses cannot override. The method must be compiled already,
+    calls of methods of the class that is being compiled use the vtable.
+    """
+    ext_type = node.ext_type
+    method = ext_type.vtab_type.methoddict.get(node.attr)
+    if method is None or method.lfunc is None:
+        return None
+    elif not methods.equal_signatures(method.signature, node.type):
+        return None
+    elif ext_type.is_final or method.is_final:
+        return method
+
+    return None
+
+def direct_method_call(node, call_node, method):
+    """
+    Call a method directly instead of through the vtable, which allows
+    LLVM to inline it.
+    """
+    args = call_node.args
+    args.insert(0, node.value)
+    return nodes.NativeCallNode(node.type, args, method.lfunc)
+
 #------------------------------------------------------------------------
 # Handle Static VTable Attributes and Methods
 #------------------------------------------------------------------------
@@ -188,7 +225,8 @@ class DynamicExtensionHandler(object):
         args = [vtab_struct_pp, prehash_node]
 
         # lookup_impl = NumbaVirtualLookup()
-        lookup_impl = DebugVirtualLookup()
+        # lookup_impl = DebugVirtualLookup()
+        lookup_impl = InlineCacheVirtualLookup()
         ptr = lookup_impl.lookup(env, always_present, node, args)
         vmethod = ptr.coerce(func_signature.pointer())
         vmethod = vmethod.cloneable
@@ -267,3 +305,22 @@ class DebugVirtualLookup(object):
             env.context, env.crnt.llvm_module,
             "lookup_method", args)
         return vmethod
+
+class InlineCacheVirtualLookup(object):
+    """
+    Look up virtual methods through an inline cache of the call site, using
+    a C utility function from numba/external/utilities/virtuallookup.c.
+
+    The cache remembers the method found in the first vtable seen at the
+    call site. Calls on objects with that vtable skip the hash table lookup.
+    """
+
+    def lookup(self, env, always_present, node, args):
+        cache = virtual.allocate_inline_cache()
+        args.append(nodes.const(node.attr, c_string_type))
+        args.append(nodes.const(cache, Py_uintptr_t).coerce(
+            void.pointer().pointer()))
+        vmethod = function_util.utility_call(
+            env.context, env.crnt.llvm_module,
+            "lookup_method_cached", args)
+        return vmethod
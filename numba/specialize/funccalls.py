@@ -15,8 +15,10 @@ class FunctionCallSpecializer(visitors.NumbaTransformer,
                               ):
 
     def visit_NativeCallNode(self, node):
-        if is_obj(node.signature.return_type):
-            if self.nopython:
+        return_type = node.signature.return_type
+        if is_obj(return_type):
+            # Arrays returned in nopython context are natively allocated
+            if self.nopython and not return_type.is_array:
                 raise error.NumbaError(
                     node, "Cannot call function returning object in "
                           "nopython context")
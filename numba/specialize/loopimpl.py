@@ -9,7 +9,7 @@ import ast
 import numba
 from numba import *
 from numba import function_util
-from numba import visitors, nodes, error, functions
+from numba import visitors, nodes, error, functions, typesystem
 from numba.typesystem.typematch import typematch
 
 logger = logging.getLogger(__name__)
@@ -17,18 +17,41 @@ logger = logging.getLogger(__name__)
 iterator_impls = []
 
 def register_iterator_implementation(iterator_pattern, iterator_impl):
+    """
+    Register an iterator implementation for the types matching a type
+    pattern (see typesystem.typematch) or a predicate on types. Later
+    registrations take precedence, so that implementations for specific
+    types override the implementation for objects.
+    """
     iterator_impls.append((iterator_pattern, iterator_impl))
 
+def lookup_iterator_impl(type):
+    "The iterator implementation for the type, or None"
+    for pattern, impl in reversed(iterator_impls):
+        if callable(pattern):
+            if pattern(type):
+                return impl
+        elif typematch(pattern, type):
+            return impl
+
+    return None
+
 def find_iterator_impl(node):
     "Find a suitable iterator type for which we have an implementation"
     type = node.iter.type
 
-    for pattern, impl in iterator_impls:
-        if typematch(pattern, type):
-            return impl
+    impl = lookup_iterator_impl(type)
+    if impl is None:
+        raise error.NumbaError(node, "Unsupported iterator "
+                                     "type: %s" % (type,))
+    return impl
 
-    raise error.NumbaError(node, "Unsupported iterator "
-                                 "type: %s" % (type,))
+def element_type(type):
+    "Type of the elements of an iteration over a value of the given type"
+    impl = lookup_iterator_impl(type)
+    if impl is not None:
+        return impl.element_type(type)
+    return typesystem.element_type(type)
 
 
 #------------------------------------------------------------------------
@@ -38,6 +61,10 @@ def find_iterator_impl(node):
 class IteratorImpl(object):
     "Implementation of an iterator over a value of a certain type"
 
+    def element_type(self, type):
+        "Type of the elements of the iteration"
+        return typesystem.element_type(type)
+
     def getiter(self, context, for_node, llvm_module):
         "Set up an iterator (statement or None)"
         raise NotImplementedError
@@ -111,10 +138,52 @@ class IndexingIteratorImpl(IteratorImpl):
         "Length of the iterable"
         raise NotImplementedError
 
+    def item(self, context, iterable, index):
+        """
+        Element of the iterable at the index (typed ExprNode). Loops over
+        values with an item() implementation are rewritten to range loops
+        by TransformForIterable, see specialize/loops.py
+        """
+        raise NotImplementedError
+
+#------------------------------------------------------------------------
+# Typed Container Iterator
+#------------------------------------------------------------------------
+
+def is_typed_container(type):
+    from numba.containers import orderedcontainer
+    return type.is_extension and type in orderedcontainer.container_types
+
+class TypedContainerIteratorImpl(IndexingIteratorImpl):
+    """
+    Iterate over typedlist and typedtuple by indexing their buffer, without
+    boxing the items. The size is compared against the index on every
+    iteration, like the iterators of Python lists.
+    """
+
+    def element_type(self, type):
+        return type.attributedict['buf'].dtype
+
+    def attribute(self, iterable, attr):
+        return nodes.ExtTypeAttribute.from_known_attribute(
+            iterable, attr, ast.Load(), iterable.type)
+
+    def length(self, context, for_node, llvm_module):
+        return self.attribute(for_node.iter, 'size')
+
+    def item(self, context, iterable, index):
+        buf = self.attribute(iterable, 'buf')
+        index = ast.Index(value=index)
+        index.type = Py_ssize_t
+        subscript = ast.Subscript(value=buf, slice=index, ctx=ast.Load())
+        return nodes.typednode(subscript, buf.type.dtype)
+
 #------------------------------------------------------------------------
 # Register Loop Implementations
 #------------------------------------------------------------------------
 
 register_iterator_implementation("object", NativeIteratorImpl("PyObject_GetIter",
                                                               "PyIter_Next"))
+register_iterator_implementation(is_typed_container,
+                                 TypedContainerIteratorImpl())
 
@@ -1,18 +1,22 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function, division, absolute_import
 import ast
+import copy
 import textwrap
 
 import numba
 from numba import *
 from numba import error
 from numba import typesystem
-from numba import visitors, nodes
+from numba import visitors, nodes, optimize
 from numba.typesystem import get_type
 from numba.specialize import loopimpl
 
 logger = logging.getLogger(__name__)
 
+# Whether to strength reduce strided array accesses in range loops
+strength_reduction = True
+
 #------------------------------------------------------------------------
 # Utilities
 #------------------------------------------------------------------------
@@ -57,6 +61,289 @@ def make_while_from_for(for_node):
     return while_node
 
 
+#------------------------------------------------------------------------
+# Strength reduction of strided array accesses
+#------------------------------------------------------------------------
+
+def assigned_names(stmts):
+    "The names of the variables assigned to in a list of statements"
+    names = set()
+    for stmt in stmts:
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Name) and not isinstance(node.ctx,
+                                                             ast.Load):
+                names.add(node.id)
+    return names
+
+def subscript_indices(node):
+    index = node.slice
+    if isinstance(index, ast.Index):
+        index = index.value
+    if isinstance(index, ast.Tuple):
+        return index.elts
+    return [index]
+
+class StridedAccessReducer(ast.NodeTransformer):
+    """
+    Strength reduce array accesses in the body of a range loop that index
+    one dimension with the loop variable and the other dimensions with
+    loop invariant values:
+
+        for j in range(start, stop, step):
+            A[i, j]
+
+    becomes
+
+        p = &A[i, start]
+        delta = A.strides[1] * step
+        for j in range(start, stop, step):
+            p[0]
+            p = (char *) p + delta
+
+    which replaces the multiplication of the index by the stride in every
+    iteration by a pointer increment. Accesses with equal invariant indices
+    share a pointer.
+    """
+
+    def __init__(self, target, assigned, start, step, have_step):
+        self.target = target
+        self.assigned = assigned
+        self.start = start
+        self.step = step
+        self.have_step = have_step
+
+        # (array name, invariant indices) -> pointer temp
+        self.pointers = {}
+        # Statements to execute before the loop and at every increment
+        self.init = []
+        self.increment = []
+
+    def is_invariant(self, name):
+        return name not in self.assigned and name != self.target
+
+    def match(self, node):
+        """
+        Return (key, dim, indices) for an access that can be strength
+        reduced, or None
+        """
+        array = node.value
+        if not (isinstance(array, ast.Name) and array.type.is_array and
+                not node.type.is_array and self.is_invariant(array.id) and
+                not array.cf_maybe_null and
+                not array.variable.uninitialized):
+            return None
+
+        indices = subscript_indices(node)
+        if len(indices) != array.type.ndim:
+            return None
+
+        dim = None
+        key = []
+        for i, index in enumerate(indices):
+            if isinstance(index, ast.Name) and index.id == self.target:
+                if dim is not None:
+                    return None
+                dim = i
+                key.append(None)
+            elif isinstance(index, nodes.ConstNode) and index.type.is_int:
+                key.append(index.pyval)
+            elif (isinstance(index, ast.Name) and index.type.is_int and
+                      self.is_invariant(index.id)):
+                key.append(index.id)
+            else:
+                return None
+
+        if dim is None:
+            return None
+
+        return (array.id, tuple(key)), dim, indices
+
+    def make_pointer(self, array, dim, indices):
+        "Initialize and increment a pointer for an access"
+        pointer_type = array.type.dtype.pointer()
+        pointer = nodes.TempNode(pointer_type, 'strided')
+        delta = nodes.TempNode(npy_intp, 'delta')
+
+        indices = [self.start.clone if i == dim else copy.copy(index)
+                       for i, index in enumerate(indices)]
+        element = nodes.ElementPointerNode(copy.copy(array), indices)
+        self.init.append(ast.Assign(targets=[pointer.store()],
+                                    value=element))
+
+        strides = nodes.ArrayAttributeNode('strides', copy.copy(array))
+        stride = ast.Subscript(value=strides,
+                               slice=nodes.ConstNode(dim, Py_ssize_t),
+                               ctx=ast.Load())
+        stride = nodes.typednode(stride, npy_intp)
+        if self.have_step:
+            step = nodes.CoercionNode(self.step.clone, npy_intp)
+            stride = nodes.typednode(ast.BinOp(stride, ast.Mult(), step),
+                                     npy_intp)
+        self.init.append(ast.Assign(targets=[delta.store()], value=stride))
+
+        byte_pointer = nodes.CoercionNode(pointer.load(), char.pointer())
+        advanced = nodes.typednode(
+            ast.BinOp(byte_pointer, ast.Add(), delta.load(invariant=True)),
+            char.pointer())
+        self.increment.append(
+            ast.Assign(targets=[pointer.store()],
+                       value=nodes.CoercionNode(advanced, pointer_type)))
+
+        return pointer
+
+    def visit_Subscript(self, node):
+        self.generic_visit(node)
+
+        match = self.match(node)
+        if match is None:
+            return node
+
+        key, dim, indices = match
+        if key not in self.pointers:
+            self.pointers[key] = self.make_pointer(node.value, dim, indices)
+
+        pointer = self.pointers[key]
+        access = ast.Subscript(value=pointer.load(),
+                               slice=nodes.ConstNode(0, Py_ssize_t),
+                               ctx=node.ctx)
+        return nodes.typednode(access, node.type)
+
+def reduce_strided_accesses(node, start, step, have_step):
+    """
+    Strength reduce the array accesses in the body of a range loop. Returns
+    the statements to insert before the loop and at the loop increment.
+    """
+    if not isinstance(node.target, ast.Name):
+        return [], []
+
+    # Pointers into arrays that may be resized would be invalidated
+    body = ast.Suite(body=node.body)
+    if optimize.modifies_arrays(body):
+        return [], []
+
+    # The pointers are advanced by the step, not recomputed from the target
+    assigned = assigned_names(node.body)
+    if node.target.id in assigned:
+        return [], []
+
+    reducer = StridedAccessReducer(node.target.id, assigned,
+                                   start, step, have_step)
+    node.body = [reducer.visit(stmt) for stmt in node.body]
+    return reducer.init, reducer.increment
+
+#------------------------------------------------------------------------
+# Range analysis for bounds checking
+#------------------------------------------------------------------------
+
+def strip_coercions(node):
+    while isinstance(node, nodes.CoercionNode) and node.type.is_int:
+        node = node.node
+    return node
+
+def constant_int(node):
+    "The value of a constant integer, or None"
+    node = strip_coercions(node)
+    if isinstance(node, nodes.ConstNode) and node.type.is_int:
+        return node.pyval
+    return None
+
+def range_extent(stop):
+    """
+    Match the stop value of a range: array.shape[dim] - k for a constant
+    k >= 0 (or array.shape[dim]). Returns (array name, dim, k) or None.
+    """
+    stop = strip_coercions(stop)
+    k = 0
+    if isinstance(stop, ast.BinOp) and isinstance(stop.op, ast.Sub):
+        k = constant_int(stop.right)
+        stop = strip_coercions(stop.left)
+        if k is None or k < 0:
+            return None
+
+    if not (isinstance(stop, ast.Subscript) and optimize.is_extent(stop)):
+        return None
+
+    array = stop.value.array
+    return array.id, optimize.constant_index(stop.slice), k
+
+def index_offset(index, target):
+    "Match an index target + c or target - c, returns c or None"
+    index = strip_coercions(index)
+    if isinstance(index, ast.Name):
+        return 0 if index.id == target else None
+    elif (isinstance(index, ast.BinOp) and
+              isinstance(index.op, (ast.Add, ast.Sub)) and
+              isinstance(strip_coercions(index.left), ast.Name) and
+              strip_coercions(index.left).id == target):
+        offset = constant_int(index.right)
+        if offset is not None and isinstance(index.op, ast.Sub):
+            offset = -offset
+        return offset
+    return None
+
+class InBoundsMarker(ast.NodeVisitor):
+    """
+    Mark the dimensions of array accesses in the body of a range loop that
+    are known to be in bounds:
+
+        for i in range(start, A.shape[dim] - k):
+            A[..., i + c, ...]
+
+    is in bounds in dimension 'dim' if start + c >= 0 and c <= k, for
+    constants start, k and c and a positive constant step. The marked
+    dimensions are stored in the 'inbounds' attribute of the subscript,
+    and are not checked with boundscheck=True.
+    """
+
+    def __init__(self, target, array, dim, lower, upper):
+        self.target = target
+        self.array = array
+        self.dim = dim
+        self.lower = lower
+        self.upper = upper
+
+    def visit_Subscript(self, node):
+        self.generic_visit(node)
+
+        array = node.value
+        if not (isinstance(array, ast.Name) and array.id == self.array and
+                array.type.is_array and not node.type.is_array):
+            return
+
+        indices = subscript_indices(node)
+        if len(indices) != array.type.ndim:
+            return
+
+        offset = index_offset(indices[self.dim], self.target)
+        if offset is not None and self.lower + offset >= 0 and \
+                offset <= self.upper:
+            node.inbounds = getattr(node, 'inbounds', frozenset()) | \
+                                                    frozenset([self.dim])
+
+def mark_inbounds_accesses(node, start, stop, step):
+    "Run the InBoundsMarker on the body of a range loop, if it applies"
+    if not isinstance(node.target, ast.Name):
+        return
+
+    start, step = constant_int(start), constant_int(step)
+    extent = range_extent(stop)
+    if start is None or start < 0 or step is None or step < 1 or \
+            extent is None:
+        return
+
+    array, dim, k = extent
+    assigned = assigned_names(node.body)
+    if node.target.id in assigned or array in assigned:
+        return
+
+    # Arrays may be resized through Python code
+    if optimize.modifies_arrays(ast.Suite(body=node.body)):
+        return
+
+    marker = InBoundsMarker(node.target.id, array, dim, start, k)
+    for stmt in node.body:
+        marker.visit(stmt)
+
 #------------------------------------------------------------------------
 # Transform for loops
 #------------------------------------------------------------------------
@@ -97,7 +384,24 @@ class TransformForIterable(visitors.NumbaTransformer):
         start, stop, step = [nodes.CloneableNode(n)
                              for n in (start, stop, step)]
 
-        if have_step:
+        # Strength reduced accesses are not bounds checked
+        boundscheck = self.env.translation.crnt.boundscheck
+        if boundscheck:
+            mark_inbounds_accesses(node, start, stop, step)
+
+        if strength_reduction and not boundscheck:
+            init, increment = reduce_strided_accesses(node, start, step,
+                                                      have_step)
+        else:
+            init, increment = [], []
+
+        test = "{{temp_load}} < {{nsteps_load}}"
+        if getattr(node, 'recheck_stop', False):
+            # The stop may change in the body, e.g. the size of a container
+            # (start is 0 and the step is 1, see rewrite_indexing_iteration)
+            compute_nsteps = ""
+            test = "{{temp_load}} < {{stop}}"
+        elif have_step:
             compute_nsteps = """
                     $length = {{stop}} - {{start}}
                     {{nsteps}} = $length / {{step}}
@@ -117,12 +421,12 @@ class TransformForIterable(visitors.NumbaTransformer):
         templ = textwrap.dedent("""
                 %s
                 {{temp}} = 0
-                while {{temp_load}} < {{nsteps_load}}:
+                while %s:
                     {{target}} = {{start}} + {{temp_load}} * {{step}}
                     {{body}}
                     {{temp}} = {{temp_load}} + 1
                 %s
-            """) % (textwrap.dedent(compute_nsteps), else_clause)
+            """) % (textwrap.dedent(compute_nsteps), test, else_clause)
 
         # Leave the bodies empty, they are already analyzed
         body = ast.Suite(body=[])
@@ -154,7 +458,7 @@ class TransformForIterable(visitors.NumbaTransformer):
         assert isinstance(target_increment, ast.Assign)
 
         # Add target variable increment basic block
-        node.incr_block.body = [target_increment]
+        node.incr_block.body = [target_increment] + increment
         while_node.body[-1] = node.incr_block
 
         #--------------------------------------------------------------------
@@ -168,8 +472,9 @@ class TransformForIterable(visitors.NumbaTransformer):
         # Create the place to jump to for 'continue'
         while_node.continue_block = node.incr_block
 
-        # Set the new while loop in the templated Suite
-        result.body[-1] = while_node
+        # Set the new while loop in the templated Suite, after the
+        # initialization of strength reduced pointers
+        result.body[-1:] = init + [while_node]
 
         return result
 
@@ -237,6 +542,12 @@ class TransformForIterable(visitors.NumbaTransformer):
                                   slice=index, ctx=ast.Load())
         nodes.typednode(subscript, get_type(orig_iter).dtype)
 
+        if (isinstance(orig_iter, ast.Name) and
+                orig_iter.id not in assigned_names(node.body) and
+                not optimize.modifies_arrays(ast.Suite(body=node.body))):
+            # The index ranges over the extent of the array
+            subscript.inbounds = frozenset([0])
+
         #--------------------------------------------------------------------
         # Add assignment to new target variable at the start of the body
         #--------------------------------------------------------------------
@@ -250,11 +561,61 @@ class TransformForIterable(visitors.NumbaTransformer):
 
         return self.visit(node)
 
+    def rewrite_indexing_iteration(self, node, impl):
+        """
+        Convert iteration over a value with an indexing iterator
+        implementation (see loopimpl.IndexingIteratorImpl) to for-range:
+
+            for value in container:
+                ...
+
+        becomes
+
+            temp = container
+            i = 0
+            while i < length(temp):
+                value = item(temp, i)
+                ...
+                i += 1
+
+        The length is evaluated on every iteration, since the body may
+        add or remove items.
+        """
+        iterable = nodes.TempNode(node.iter.type, 'iterable')
+        init = ast.Assign(targets=[iterable.store()], value=node.iter)
+
+        orig_target = node.target
+        target_temp = nodes.TempNode(Py_ssize_t)
+        node.target = target_temp.store()
+
+        node.iter = iterable.load(invariant=True)
+        stop = impl.length(self.context, node, self.llvm_module)
+
+        call_func = ast.Name(id='range', ctx=ast.Load())
+        nodes.typednode(call_func, typesystem.range_)
+        call_args = [nodes.ConstNode(0, Py_ssize_t),
+                     nodes.CoercionNode(stop, Py_ssize_t),
+                     nodes.ConstNode(1, Py_ssize_t)]
+        node.iter = ast.Call(func=call_func, args=call_args)
+        nodes.typednode(node.iter, call_func.type)
+        node.recheck_stop = True
+
+        node.index = target_temp.load(invariant=True)
+        item = impl.item(self.context, iterable.load(invariant=True),
+                         node.index)
+        assign = ast.Assign(targets=[orig_target], value=item)
+        node.body = [assign] + node.body
+
+        return ast.Suite(body=[init, self.visit(node)])
+
     def visit_For(self, node):
+        impl = loopimpl.lookup_iterator_impl(node.iter.type)
         if node.iter.type.is_range:
             return self.rewrite_range_iteration(node)
         elif node.iter.type.is_array and node.iter.type.ndim == 1:
             return self.rewrite_array_iteration(node)
+        elif isinstance(impl, loopimpl.IndexingIteratorImpl):
+            return self.rewrite_indexing_iteration(node, impl)
         else:
             self.visitchildren(node)
             return node
@@ -0,0 +1,571 @@
+# -*- coding: utf-8 -*-
+"""
+Stencil computations with relative indices:
+
+    @numba.stencil(mode='nearest')
+    def laplace(a):
+        return a[-1, 0] + a[1, 0] + a[0, -1] + a[0, 1] - 4 * a[0, 0]
+
+    out = laplace(a)
+
+Array arguments of the kernel are indexed relative to the element that
+is computed, with constant integer offsets. Calling the stencil computes
+the kernel for every element of the output, which has the shape of the
+array arguments and the dtype of the first array argument, unless an
+output array is given with out=.
+
+For every specialization on the argument types a loop nest is generated
+and compiled in nopython mode:
+
+    - the interior, where all relative indices are in bounds, is computed
+      without any boundary tests. For two or more dimensions the last
+      dimension is tiled so that the rows of the neighbourhood stay in
+      cache, and the inner loop is left to the LLVM loop vectorizer
+    - the borders are computed with the boundary handling of 'mode':
+
+        constant:   elements outside of the array have the value cval
+        wrap:       indices wrap around to the opposite border
+        nearest:    indices are clamped to the nearest border element
+
+The loop nest is computed for a range of the outermost dimension, which
+is how the targets divide the work. The 'cpu' target computes the whole
+range in the calling thread, the 'parallel' target splits the range over
+a number of threads (numba.stencils.num_threads) which call the compiled
+loop nest without the GIL. Other targets can be installed with
+install_stencil_target().
+"""
+from __future__ import print_function, division, absolute_import
+
+import os
+import ast
+import copy
+import threading
+import warnings
+import multiprocessing
+
+import numpy as np
+
+import numba
+from numba import error, functions
+from numba.typesystem import void, npy_intp
+
+modes = ('constant', 'wrap', 'nearest')
+
+# Default tile size of the last dimension of the interior, 0 disables tiling
+tile_size = 256
+
+num_threads = int(os.environ.get('NUMBA_NUM_THREADS', 0) or
+                  multiprocessing.cpu_count())
+
+#------------------------------------------------------------------------
+# Kernel Analysis
+#------------------------------------------------------------------------
+
+def constant_offset(node):
+    "Return the integer value of an offset expression, or None"
+    sign = 1
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub,
+                                                              ast.UAdd)):
+        if isinstance(node.op, ast.USub):
+            sign = -1
+        node = node.operand
+
+    if isinstance(node, ast.Num) and isinstance(node.n, (int, long)):
+        return sign * node.n
+
+    return None
+
+def relative_offsets(node, ndim):
+    "Return the constant offsets of a relative index into an array argument"
+    index = node.slice
+    if isinstance(index, ast.Index):
+        index = index.value
+
+    if isinstance(index, ast.Tuple):
+        elts = index.elts
+    else:
+        elts = [index]
+
+    offsets = [constant_offset(elt) for elt in elts]
+    if None in offsets:
+        raise error.NumbaError(
+            node, "Stencil indices must be constant integer offsets")
+    if len(offsets) != ndim:
+        raise error.NumbaError(
+            node, "Expected %d relative indices, got %d" % (ndim,
+                                                            len(offsets)))
+    return offsets
+
+def neighbourhood(func_def, arrays, ndim):
+    """
+    Return the extents of the neighbourhood of the kernel per dimension,
+    as two lists (lo, hi) of the largest negative and positive offsets.
+    """
+    lo = [0] * ndim
+    hi = [0] * ndim
+    for node in ast.walk(func_def):
+        if (isinstance(node, ast.Subscript) and
+                isinstance(node.value, ast.Name) and node.value.id in arrays):
+            if not isinstance(node.ctx, ast.Load):
+                raise error.NumbaError(
+                    node, "Cannot assign to stencil input %s" % node.value.id)
+            for dim, offset in enumerate(relative_offsets(node, ndim)):
+                lo[dim] = max(lo[dim], -offset)
+                hi[dim] = max(hi[dim], offset)
+
+    return lo, hi
+
+#------------------------------------------------------------------------
+# Index Expressions
+#------------------------------------------------------------------------
+
+def loopvar(dim):
+    return "_stencil_i%d" % dim
+
+def extent(dim):
+    return "_stencil_n%d" % dim
+
+def shifted(dim, offset):
+    if offset == 0:
+        return loopvar(dim)
+    return "(%s + %d)" % (loopvar(dim), offset)
+
+def interior_index(dim, offset, mode):
+    return shifted(dim, offset)
+
+def border_index(dim, offset, mode):
+    "The index expression for a relative index in a border region"
+    index = shifted(dim, offset)
+    if offset == 0 or mode == 'constant':
+        return index
+
+    if offset < 0:
+        outside = "%s < 0" % index
+        if mode == 'wrap':
+            replacement = "%s + %s" % (index, extent(dim))
+        else:
+            replacement = "0"
+    else:
+        outside = "%s >= %s" % (index, extent(dim))
+        if mode == 'wrap':
+            replacement = "%s - %s" % (index, extent(dim))
+        else:
+            replacement = "%s - 1" % extent(dim)
+
+    return "(%s if %s else %s)" % (replacement, outside, index)
+
+def in_bounds(offsets):
+    "The bounds test of a relative index in constant mode, or None"
+    tests = []
+    for dim, offset in enumerate(offsets):
+        if offset < 0:
+            tests.append("%s >= 0" % shifted(dim, offset))
+        elif offset > 0:
+            tests.append("%s < %s" % (shifted(dim, offset), extent(dim)))
+
+    if tests:
+        return " and ".join(tests)
+    return None
+
+class KernelRewriter(ast.NodeTransformer):
+    """
+    Rewrite the body of the kernel for a region of the loop nest: relative
+    indices become absolute indices and the returned value is stored in
+    the output.
+    """
+
+    def __init__(self, arrays, ndim, make_index, mode, cval):
+        self.arrays = arrays
+        self.ndim = ndim
+        self.make_index = make_index
+        self.mode = mode
+        self.cval = cval
+
+    def expr(self, source):
+        return ast.parse(source, mode='eval').body
+
+    def visit_Subscript(self, node):
+        if not (isinstance(node.value, ast.Name) and
+                node.value.id in self.arrays):
+            return self.generic_visit(node)
+
+        offsets = relative_offsets(node, self.ndim)
+        indices = [self.make_index(dim, offset, self.mode)
+                       for dim, offset in enumerate(offsets)]
+        access = "%s[%s]" % (node.value.id, ", ".join(indices))
+
+        test = None
+        if self.make_index is border_index and self.mode == 'constant':
+            test = in_bounds(offsets)
+        if test is not None:
+            access = "(%s if %s else %r)" % (access, test, self.cval)
+
+        return self.expr(access)
+
+    def visit_Return(self, node):
+        if node.value is None:
+            raise error.NumbaError(node, "Stencil kernel must return a value")
+
+        indices = [loopvar(dim) for dim in range(self.ndim)]
+        target = self.expr("_stencil_out[%s]" % ", ".join(indices))
+        target.ctx = ast.Store()
+        return ast.Assign(targets=[target], value=self.visit(node.value))
+
+    def visit_FunctionDef(self, node):
+        raise error.NumbaError(node, "Stencil kernels cannot define functions")
+
+def check_kernel_body(func_def):
+    "The kernel must consist of straight-line code ending in a return"
+    body = func_def.body
+    if not body or not isinstance(body[-1], ast.Return):
+        raise error.NumbaError(
+            func_def, "Stencil kernel must end with a return statement")
+
+    for stmt in body[:-1]:
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Return):
+                raise error.NumbaError(
+                    node, "Stencil kernel must have a single return "
+                          "statement at the end")
+
+#------------------------------------------------------------------------
+# Loop Nest Generation
+#------------------------------------------------------------------------
+
+class LoopNestBuilder(object):
+    """
+    Build the source of the loop nest of a stencil, which is
+
+        def name(args..., _stencil_out, _stencil_start, _stencil_stop)
+
+    and computes the kernel for the outermost indices in the range
+    [_stencil_start, _stencil_stop). The kernel body is spliced in for
+    every region after parsing.
+    """
+
+    def __init__(self, name, argnames, ndim, lo, hi, tile):
+        self.name = name
+        self.argnames = argnames
+        self.ndim = ndim
+        self.lo = lo
+        self.hi = hi
+        self.tile = tile
+
+        self.lines = []
+        self.indent = 1
+        self.ntemps = 0
+        # Index variables of the loop nest, which are of type npy_intp
+        self.variables = [loopvar(dim) for dim in range(ndim)]
+        self.variables.extend(extent(dim) for dim in range(ndim))
+        # [(placeholder name, index function)]
+        self.regions = []
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def temp(self):
+        self.ntemps += 1
+        name = "_stencil_t%d" % self.ntemps
+        self.variables.append(name)
+        return name
+
+    def bound(self, expr, clamps=()):
+        """
+        Assign expr to a temporary and clamp it, clamps is a list of
+        (op, limit) where 'op' is '<' to raise the bound to the limit and
+        '>' to lower it.
+        """
+        name = self.temp()
+        self.emit("%s = %s" % (name, expr))
+        for op, limit in clamps:
+            self.emit("if %s %s %s: %s = %s" % (name, op, limit, name, limit))
+        return name
+
+    def clip(self, dim, begin_clamps, end_clamps):
+        "Clamps of the outermost dimension to the range of the call"
+        if dim == 0:
+            begin_clamps = begin_clamps + [('<', "_stencil_start")]
+            end_clamps = end_clamps + [('>', "_stencil_stop")]
+        return begin_clamps, end_clamps
+
+    def loop(self, dim, begin, end, begin_clamps=(), end_clamps=()):
+        begin_clamps, end_clamps = self.clip(dim, list(begin_clamps),
+                                             list(end_clamps))
+        begin = self.bound(begin, begin_clamps)
+        end = self.bound(end, end_clamps)
+        self.emit("for %s in range(%s, %s):" % (loopvar(dim), begin, end))
+        self.indent += 1
+
+    def interior_range(self, dim):
+        return str(self.lo[dim]), "%s - %d" % (extent(dim), self.hi[dim])
+
+    def body(self, make_index):
+        placeholder = "_stencil_region%d" % len(self.regions)
+        self.regions.append((placeholder, make_index))
+        self.emit(placeholder)
+
+    def build_interior(self):
+        start_indent = self.indent
+        last = self.ndim - 1
+        tiled = self.tile and self.ndim >= 2
+        if tiled:
+            begin, end = self.interior_range(last)
+            end = self.bound(end)
+            self.variables.append("_stencil_tile")
+            self.emit("for _stencil_tile in range(%s, %s, %d):" % (
+                                                    begin, end, self.tile))
+            self.indent += 1
+            tile_end = self.bound("_stencil_tile + %d" % self.tile,
+                                  [('>', end)])
+
+        for dim in range(self.ndim):
+            if tiled and dim == last:
+                self.loop(dim, "_stencil_tile", tile_end)
+            else:
+                self.loop(dim, *self.interior_range(dim))
+
+        self.body(interior_index)
+        self.indent = start_indent
+
+    def build_border(self, dim, first):
+        """
+        Build the slab of the border of dimension 'dim' at the start (first)
+        or end of the dimension. Dimensions before 'dim' iterate over their
+        interior and dimensions after 'dim' over their entire extent, so
+        that the slabs and the interior partition the iteration space.
+        """
+        start_indent = self.indent
+        for d in range(self.ndim):
+            if d < dim:
+                self.loop(d, *self.interior_range(d))
+            elif d > dim:
+                self.loop(d, "0", extent(d))
+            elif first:
+                self.loop(d, "0", str(self.lo[d]),
+                          end_clamps=[('>', extent(d))])
+            else:
+                self.loop(d, "%s - %d" % (extent(d), self.hi[d]), extent(d),
+                          begin_clamps=[('<', str(self.lo[d])),
+                                        ('>', extent(d))])
+
+        self.body(border_index)
+        self.indent = start_indent
+
+    def build(self):
+        params = list(self.argnames) + ["_stencil_out", "_stencil_start",
+                                        "_stencil_stop"]
+        self.lines.append("def %s(%s):" % (self.name, ", ".join(params)))
+        for dim in range(self.ndim):
+            self.emit("%s = _stencil_out.shape[%d]" % (extent(dim), dim))
+
+        self.build_interior()
+        for dim in range(self.ndim):
+            if self.lo[dim]:
+                self.build_border(dim, first=True)
+            if self.hi[dim]:
+                self.build_border(dim, first=False)
+
+        return "\n".join(self.lines) + "\n"
+
+class BodySplicer(ast.NodeTransformer):
+    "Replace the region placeholders by the rewritten kernel bodies"
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def visit_Expr(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id in self.bodies:
+            return self.bodies[node.value.id]
+        return node
+
+def build_loop_nest(kernel_def, argnames, arrays, ndim, mode, cval, tile):
+    """
+    Build the AST of the loop nest function of a stencil kernel. Returns
+    (func_def, index variables, lo, hi).
+    """
+    check_kernel_body(kernel_def)
+    lo, hi = neighbourhood(kernel_def, arrays, ndim)
+
+    builder = LoopNestBuilder("stencil_" + kernel_def.name, argnames, ndim,
+                              lo, hi, tile)
+    source = builder.build()
+    func_def = ast.parse(source).body[0]
+
+    bodies = {}
+    for placeholder, make_index in builder.regions:
+        rewriter = KernelRewriter(arrays, ndim, make_index, mode, cval)
+        bodies[placeholder] = [rewriter.visit(stmt)
+                                   for stmt in copy.deepcopy(kernel_def.body)]
+
+    func_def = BodySplicer(bodies).visit(func_def)
+    functions.fix_ast_lineno(func_def)
+    return func_def, builder.variables, lo, hi
+
+#------------------------------------------------------------------------
+# Targets
+#------------------------------------------------------------------------
+
+def run_cpu(loop_nest, args, out):
+    loop_nest(*(args + (out, 0, out.shape[0])))
+
+def run_parallel(loop_nest, args, out):
+    n = out.shape[0]
+    nthreads = max(1, min(num_threads, n))
+    if nthreads == 1:
+        return run_cpu(loop_nest, args, out)
+
+    # Calls through ctypes release the GIL
+    cfunc = numba.addressof(loop_nest)
+    chunk = (n + nthreads - 1) // nthreads
+    threads = []
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        threads.append(threading.Thread(target=cfunc,
+                                        args=args + (out, start, stop)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+_stencil_targets = {
+    'cpu': run_cpu,
+    'parallel': run_parallel,
+}
+
+def install_stencil_target(target, runner):
+    """
+    Install a target for stencils. The runner is called with the compiled
+    loop nest, the argument tuple and the output array, and executes the
+    loop nest for ranges of the outermost dimension of the output.
+    """
+    if target in _stencil_targets:
+        warnings.warn("overriding stencil target %s:%s" % (target, runner),
+                      UserWarning)
+    _stencil_targets[target] = runner
+
+#------------------------------------------------------------------------
+# Stencil Decorator
+#------------------------------------------------------------------------
+
+class Stencil(object):
+    "A stencil kernel, specialized on the types of its arguments"
+
+    def __init__(self, py_func, mode='constant', cval=0, target='cpu',
+                 tile=None):
+        if mode not in modes:
+            raise error.NumbaError(
+                "Unknown stencil mode '%s', expected one of %s" % (
+                                                mode, ", ".join(modes)))
+        if target not in _stencil_targets:
+            raise error.NumbaError(
+                "Unknown stencil target '%s', expected one of %s" % (
+                                target, ", ".join(sorted(_stencil_targets))))
+
+        self.py_func = py_func
+        self.mode = mode
+        self.cval = cval
+        self.target = target
+        self.tile = tile_size if tile is None else tile
+
+        code = py_func.__code__
+        self.argnames = code.co_varnames[:code.co_argcount]
+        # argument types -> (loop nest, lo, hi)
+        self.specializations = {}
+        self._kernel_def = None
+
+        self.__name__ = py_func.__name__
+        self.__doc__ = py_func.__doc__
+
+    @property
+    def kernel_def(self):
+        if self._kernel_def is None:
+            self._kernel_def = functions._get_ast(self.py_func)
+        return self._kernel_def
+
+    def compile(self, argtypes, out_type):
+        from numba import pipeline, environment
+
+        arrays = set(name for name, type in zip(self.argnames, argtypes)
+                              if type.is_array)
+        ndim = out_type.ndim
+        for name, type in zip(self.argnames, argtypes):
+            if type.is_array and type.ndim != ndim:
+                raise error.NumbaError(
+                    "Stencil argument %s has %d dimensions, expected %d" % (
+                                                    name, type.ndim, ndim))
+
+        func_def, variables, lo, hi = build_loop_nest(
+            self.kernel_def, self.argnames, arrays, ndim, self.mode,
+            self.cval, self.tile)
+
+        signature = void(*(list(argtypes) + [out_type, npy_intp, npy_intp]))
+        locals = dict((name, npy_intp) for name in variables)
+
+        env = environment.NumbaEnvironment.get_environment()
+        func_env, _ = pipeline.run_pipeline2(
+            env, None, func_def, signature,
+            function_globals=self.py_func.__globals__,
+            locals=locals, nopython=True)
+
+        return func_env.numba_wrapper_func, lo, hi
+
+    def __call__(self, *args, **kwargs):
+        out = kwargs.pop('out', None)
+        if kwargs:
+            raise TypeError("Unexpected keyword arguments: %s" %
+                                                ", ".join(sorted(kwargs)))
+        if len(args) != len(self.argnames):
+            raise TypeError("%s() takes %d arguments (%d given)" % (
+                            self.__name__, len(self.argnames), len(args)))
+
+        arrays = [arg for arg in args if isinstance(arg, np.ndarray)]
+        if not arrays:
+            raise TypeError("Stencil requires at least one array argument")
+
+        shape = arrays[0].shape
+        for array in arrays:
+            if array.shape != shape:
+                raise ValueError("Stencil arguments have different shapes: "
+                                 "%s and %s" % (shape, array.shape))
+        if out is None:
+            out = np.empty_like(arrays[0])
+        elif out.shape != shape:
+            raise ValueError("Output has shape %s, expected %s" % (out.shape,
+                                                                   shape))
+        if out.size == 0:
+            return out
+
+        argtypes = tuple(numba.typeof(arg) for arg in args)
+        key = argtypes + (numba.typeof(out),)
+        if key not in self.specializations:
+            self.specializations[key] = self.compile(argtypes, key[-1])
+
+        loop_nest, lo, hi = self.specializations[key]
+        if self.mode == 'wrap':
+            for n, l, h in zip(shape, lo, hi):
+                if n < max(l, h):
+                    raise ValueError(
+                        "Array of shape %s is smaller than the neighbourhood "
+                        "of the stencil in wrap mode" % (shape,))
+
+        _stencil_targets[self.target](loop_nest, tuple(args), out)
+        return out
+
+def stencil(func=None, mode='constant', cval=0, target='cpu', tile=None):
+    """
+    Compile a kernel with relative indices into a stencil, see the module
+    docstring of numba.stencils.
+
+    :param mode: border handling, one of 'constant', 'wrap' or 'nearest'
+    :param cval: the value of elements outside of the array in constant mode
+    :param target: 'cpu' or 'parallel', or a target installed with
+                   install_stencil_target()
+    :param tile: tile size of the last dimension of the interior, 0 disables
+                 tiling
+    """
+    def decorator(func):
+        return Stencil(func, mode=mode, cval=cval, target=target, tile=tile)
+
+    if func is not None:
+        return decorator(func)
+    return decorator
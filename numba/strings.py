@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Byte string operations that compile to native code, also in nopython mode:
+
+    @jit(int64(uint8[:]), nopython=True)
+    def count_errors(log):
+        count = 0
+        pos = strings.find(log, "ERROR")
+        while pos >= 0:
+            count += 1
+            pos = strings.find(log, "ERROR", pos + 5)
+        return count
+
+Strings are byte buffers: 1D arrays of bytes (e.g. np.frombuffer() of a
+bytes object or a memory-mapped file) or C strings (string constants and
+char * values). Instead of slicing, the functions take (start, stop)
+offsets into the buffer, so no data is copied. Offsets are clamped to
+[0, len(buf)]: unlike slice bounds, negative offsets are not counted from
+the end of the buffer.
+
+The functions below implement the operations in Python on bytes-like
+objects, and are used outside of compiled code. In compiled code they call
+the native implementations in numba.utility.string_utilities.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+
+from numba.utility import string_utilities as impl
+
+def _array(value):
+    "View a bytes-like object, string or byte array as a uint8 array"
+    if isinstance(value, np.ndarray):
+        return value.view(np.uint8)
+    if isinstance(value, type(u'')):
+        value = value.encode('utf-8')
+    return np.frombuffer(value, dtype=np.uint8)
+
+def _buffer(value):
+    "The bytes of a buffer, which are indexed as integers"
+    return bytearray(np.ascontiguousarray(_array(value)))
+
+def _stop(buf, stop):
+    if stop is None:
+        return len(buf)
+    return stop
+
+def _check_separator(result):
+    if result == impl.EMPTY_SEPARATOR:
+        raise ValueError("empty separator")
+    return result
+
+#------------------------------------------------------------------------
+# Searching
+#------------------------------------------------------------------------
+
+def find(buf, sub, start=0, stop=None):
+    "Lowest offset of sub in buf[start:stop], or -1"
+    buf, sub = _buffer(buf), _buffer(sub)
+    return impl._find(buf, len(buf), sub, len(sub), start, _stop(buf, stop))
+
+def startswith(buf, prefix, start=0):
+    "Whether buf[start:] starts with prefix"
+    buf, prefix = _buffer(buf), _buffer(prefix)
+    return impl._startswith(buf, len(buf), prefix, len(prefix), start)
+
+def endswith(buf, suffix, stop=None):
+    "Whether buf[:stop] ends with suffix"
+    buf, suffix = _buffer(buf), _buffer(suffix)
+    return impl._endswith(buf, len(buf), suffix, len(suffix),
+                          _stop(buf, stop))
+
+def split(buf, sep, out, start=0, stop=None):
+    """
+    Split buf[start:stop] on sep into at most len(out) fields, and store
+    the (start, stop) offsets of field i in out[i]. The last field holds
+    the remainder of the buffer, like maxsplit=len(out) - 1. Returns the
+    number of fields.
+    """
+    buf, sep = _buffer(buf), _buffer(sep)
+    return _check_separator(impl._split(buf, len(buf), sep, len(sep), out,
+                                        start, _stop(buf, stop)))
+
+#------------------------------------------------------------------------
+# Hashing and Copying
+#------------------------------------------------------------------------
+
+def hash(buf, start=0, stop=None):
+    "The 64-bit FNV-1a hash of buf[start:stop], as a signed integer"
+    buf = _buffer(buf)
+    h = impl.FNV_OFFSET_BASIS & 0xffffffffffffffff
+    for c in buf[start:_stop(buf, stop)]:
+        h = ((h ^ int(c)) * impl.FNV_PRIME) & 0xffffffffffffffff
+    if h >= 2 ** 63:
+        h -= 2 ** 64
+    return h
+
+def concat(dst, pos, src, start=0, stop=None):
+    """
+    Copy src[start:stop] to dst at offset pos, truncated to the size of
+    dst. Returns the offset after the copied bytes, from which further
+    strings can be appended.
+    """
+    dst, src = _array(dst), _buffer(src)
+    return impl._concat(dst, len(dst), pos, src, len(src), start,
+                        _stop(src, stop))
+
+#------------------------------------------------------------------------
+# Number Parsing
+#------------------------------------------------------------------------
+
+# Numbers are parsed like C's strtol and strtod: leading whitespace is
+# skipped, and parsing stops at the first character that is not part of
+# the number. A field without digits parses as 0.
+
+def parse_int(buf, start=0, stop=None):
+    "Parse a decimal integer from buf[start:stop]"
+    buf = _buffer(buf)
+    return int(impl._parse_int(buf, len(buf), start, _stop(buf, stop)))
+
+def parse_float(buf, start=0, stop=None):
+    """
+    Parse a floating point number with an optional fraction and exponent
+    from buf[start:stop]. The result is correctly rounded, like float() of
+    the number.
+    """
+    buf = _buffer(buf)
+    return float(impl._parse_float(buf, len(buf), start, _stop(buf, stop)))
+
+def parse_ints(buf, sep, out, start=0, stop=None):
+    """
+    Parse the integers separated by sep in buf[start:stop] into the array
+    out. Returns the number of parsed integers, at most len(out).
+    """
+    buf, sep = _buffer(buf), _buffer(sep)
+    return _check_separator(impl._parse_ints(buf, len(buf), sep, len(sep),
+                                             out, start, _stop(buf, stop)))
+
+def parse_floats(buf, sep, out, start=0, stop=None):
+    """
+    Parse the floating point numbers separated by sep in buf[start:stop]
+    into the array out. Returns the number of parsed numbers.
+    """
+    buf, sep = _buffer(buf), _buffer(sep)
+    return _check_separator(impl._parse_floats(buf, len(buf), sep, len(sep),
+                                               out, start, _stop(buf, stop)))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Recognize array allocations (np.empty, np.zeros and np.ones) that can be
+performed by the native array runtime in nopython context, see
+LateSpecializer.visit_Call and control_flow/escape.py.
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+import numbers
+from functools import reduce
+
+import numpy as np
+
+# Allocating functions and the value they fill the array with
+allocators = [
+    (np.empty, None),
+    (np.zeros, 0),
+    (np.ones,  1),
+]
+
+def get_allocator(node):
+    """
+    Return the (function, fill value) pair for a np.empty/np.zeros/np.ones
+    call that can be allocated natively, or None.
+    """
+    if not isinstance(node, ast.Call) or not node.type.is_array:
+        return None
+
+    func_type = node.func.type
+    if not func_type.is_known_value:
+        return None
+
+    dtype = node.type.dtype
+    if not (dtype.is_int or dtype.is_float):
+        return None
+
+    if (not 1 <= len(node.args) <= 2 or getattr(node, 'starargs', None) or
+            getattr(node, 'kwargs', None) or
+            any(keyword.arg != 'dtype' for keyword in node.keywords)):
+        return None
+
+    for func, fill in allocators:
+        if func_type.value is func and get_extents(node) is not None:
+            return func, fill
+
+    return None
+
+def get_extents(node):
+    "Return the list of extent nodes of an allocation, or None"
+    shape = node.args[0]
+    if shape.type.is_int:
+        return [shape]
+    elif (isinstance(shape, ast.Tuple) and
+              all(elt.type.is_int for elt in shape.elts)):
+        return list(shape.elts)
+
+    return None
+
+def constant_value(node):
+    "Return the value of a constant expression, or None"
+    if isinstance(node, ast.Num):
+        return node.n
+
+    variable = getattr(node, 'variable', None)
+    if variable is not None and variable.is_constant:
+        return variable.constant_value
+
+    return None
+
+def constant_extents(node):
+    "Return the list of extents of an allocation if they are constant"
+    extents = [constant_value(extent) for extent in get_extents(node)]
+    if all(isinstance(extent, numbers.Integral) and extent >= 0
+               for extent in extents):
+        return extents
+
+    return None
+
+def constant_nbytes(node):
+    "Return the size in bytes of an allocation with a constant shape, or None"
+    extents = constant_extents(node)
+    if extents is None:
+        return None
+
+    return reduce(lambda x, y: x * y, extents, node.type.dtype.itemsize)
@@ -75,6 +75,55 @@ class BroadcastNode(nodes.ExprNode):
                 self.broadcast_retvals[op] = return_value
                 self.check_errors.append(check_error)
 
+class FusionGuardNode(nodes.ExprNode):
+    """
+    Check whether the statements of a fused array expression can be
+    evaluated by one kernel (see array_expressions.py): the left hand sides
+    must have equal shapes, and each of them must be disjoint from or
+    identical to every other array operand. Views that partially overlap
+    (e.g. x[1:] and x[:-1]) would otherwise observe writes of another
+    statement too early.
+
+        operands:   the left hand sides, followed by the other operands
+        noutputs:   the number of left hand sides
+        exclusive:  for each left hand side, the indices of the operands
+                    it must be disjoint from
+    """
+
+    _fields = ['operands']
+
+    def __init__(self, operands, noutputs, exclusive, **kwargs):
+        super(FusionGuardNode, self).__init__(**kwargs)
+        self.operands = operands
+        self.noutputs = noutputs
+        self.exclusive = exclusive
+        self.ndim = operands[0].type.ndim
+        self.type = bool_
+
+class ContiguousNoAliasNode(nodes.ExprNode):
+    """
+    Check whether array operands of a minivect kernel all have the given
+    broadcast shape and are C contiguous, and whether the outputs do not
+    overlap any other operand. This selects the noalias contiguous version
+    of array expression kernels (see array_expressions.py).
+
+        outputs:            indices of the operands written to
+        allow_identical:    whether outputs may be identical to (instead of
+                            disjoint from) other operands, which is safe
+                            for a single element-wise assignment
+    """
+
+    _fields = ['shape', 'operands']
+
+    def __init__(self, shape, operands, outputs, allow_identical, **kwargs):
+        super(ContiguousNoAliasNode, self).__init__(**kwargs)
+        self.shape = shape
+        self.operands = operands
+        self.outputs = outputs
+        self.allow_identical = allow_identical
+        self.ndim = max(op.type.ndim for op in operands if op.type.is_array)
+        self.type = bool_
+
 def create_slice_dim_node(subslice, *args):
     if subslice.type.is_slice:
         return SliceSliceNode(subslice, *args)
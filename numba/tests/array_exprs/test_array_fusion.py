@@ -0,0 +1,144 @@
+"""
+Test fusion of consecutive array expression statements.
+"""
+
+import numpy as np
+
+from numba import *
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@autojit
+def fused_temporary(a, b, c, d, e):
+    # 't' is never materialized
+    t = a * b
+    c[:] = t + d
+    e[:] = t * 2
+
+@autojit
+def materialized_temporary(a, b, c, d):
+    # 't' is still needed after the fused statements
+    t = a * b
+    c[:] = t + d
+    d[:] = t * 2
+    return t
+
+@autojit
+def fused_outputs(a, b, c, d):
+    c[:] = a + b
+    d[:] = np.sqrt(a) * b
+
+@autojit
+def dependent_statements(a, b):
+    # The second statement reads a shifted view of a written array
+    a[1:] = b[1:] * 2
+    b[:-1] = a[1:] + 1
+
+@autojit
+def broadcast_outputs(a, b, c, d):
+    # The outputs have different shapes at runtime
+    c[:, :] = a + 1
+    d[:, :] = b * 2
+
+@autojit
+def aliased_statements(a, b, c, d):
+    # 'b' and 'c' may be overlapping views of the same array
+    b[:] = a * 2
+    d[:] = c + 1
+
+@autojit
+def aliased_temporary(a, b, c):
+    # 't' reads 'a' before 'b' is assigned to
+    t = a * 2
+    b[:] = 0
+    c[:] = t + 1
+
+@autojit(nopython=True)
+def fused_nopython(a, b, c):
+    t = a + b
+    u = t * t
+    c[:] = u - t
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+def operands(*shape):
+    size = np.prod(shape)
+    a = np.arange(1, size + 1, dtype=np.double).reshape(shape)
+    return a, a[::-1].copy(), np.empty_like(a), np.empty_like(a)
+
+def test_fused_temporary():
+    a, b, c, d = operands(10)
+    e = np.empty_like(a)
+    fused_temporary(a, b, c, d, e)
+    assert np.all(c == a * b + d)
+    assert np.all(e == a * b * 2)
+
+    a, b, c, d = operands(10)
+    expected_d = a * b * 2
+    assert np.all(materialized_temporary(a, b, c, d) == a * b)
+    assert np.all(d == expected_d)
+
+def test_fused_outputs():
+    a, b, c, d = operands(4, 5)
+    fused_outputs(a, b, c, d)
+    assert np.all(c == a + b)
+    assert np.all(d == np.sqrt(a) * b)
+
+    fused_outputs(a.T, b.T, c.T, d.T)
+    assert np.all(c.T == a.T + b.T)
+
+def test_dependent_statements():
+    a, b, _, _ = operands(10)
+    expected_a, expected_b = a.copy(), b.copy()
+    dependent_statements.py_func(expected_a, expected_b)
+    dependent_statements(a, b)
+    assert np.all(a == expected_a)
+    assert np.all(b == expected_b)
+
+def test_broadcast_outputs():
+    a, _, c, _ = operands(3, 4)
+    b = np.arange(4, dtype=np.double).reshape(1, 4)
+    d = np.empty_like(b)
+    broadcast_outputs(a, b, c, d)
+    assert np.all(c == a + 1)
+    assert np.all(d == b * 2)
+
+def test_aliased_statements():
+    a, _, _, d = operands(10)
+    x = np.arange(11, dtype=np.double)
+    expected_x, expected_d = x.copy(), d.copy()
+    aliased_statements.py_func(a, expected_x[:-1], expected_x[1:], expected_d)
+    aliased_statements(a, x[:-1], x[1:], d)
+    assert np.all(x == expected_x)
+    assert np.all(d == expected_d)
+
+    x = np.arange(10, dtype=np.double)
+    aliased_statements(a, x, x, d)
+    assert np.all(x == a * 2)
+    assert np.all(d == a * 2 + 1)
+
+def test_aliased_temporary():
+    x = np.arange(10, dtype=np.double)
+    c = np.empty_like(x)
+    aliased_temporary(x, x, c)
+    assert np.all(x == 0)
+    assert np.all(c == np.arange(10) * 2 + 1)
+
+def test_fused_nopython():
+    a, b, c, _ = operands(3, 4)
+    fused_nopython(a, b, c)
+    t = a + b
+    assert np.all(c == t * t - t)
+
+if __name__ == "__main__":
+    test_fused_temporary()
+    test_fused_outputs()
+    test_dependent_statements()
+    test_broadcast_outputs()
+    test_aliased_statements()
+    test_aliased_temporary()
+    test_fused_nopython()
@@ -0,0 +1,77 @@
+"""
+Test the runtime selection between the contiguous noalias version and the
+strided version of array expression kernels.
+"""
+
+import numpy as np
+
+from numba import *
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@autojit
+def assign(out, a, b):
+    out[:, :] = a * b + 1.0
+    return out
+
+@autojit
+def inplace(a):
+    a[:, :] = a * 2.0 + 1.0
+    return a
+
+@autojit
+def expr(a, b):
+    return a - b * 3
+
+@autojit(nopython=True)
+def expr_nopython(a, b):
+    return a * b - 2.0
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+a = np.arange(1, 31, dtype=np.double).reshape(5, 6)
+b = np.arange(30, dtype=np.double)[::-1].reshape(5, 6)
+
+def test_contiguous():
+    out = np.empty_like(a)
+    assert np.all(assign(out, a, b) == a * b + 1.0)
+    assert np.all(expr(a, b) == a - b * 3)
+    assert np.all(expr_nopython(a, b) == a * b - 2.0)
+
+    # Identical output and operand
+    x = a.copy()
+    assert np.all(inplace(x) == a * 2.0 + 1.0)
+
+def test_strided():
+    out = np.empty_like(a)
+    assert np.all(assign(out, a.T.copy().T, b) == a * b + 1.0)
+    assert np.all(assign(out.T.copy().T, a, b) == a * b + 1.0)
+
+    big = np.arange(120, dtype=np.double).reshape(10, 12)
+    assert np.all(expr(big[::2, ::2], a) == big[::2, ::2] - a * 3)
+
+    # Broadcasting
+    row = np.arange(6, dtype=np.double)
+    assert np.all(assign(out, a, row) == a * row + 1.0)
+
+    x = a.T.copy()
+    assert np.all(inplace(x.T) == a * 2.0 + 1.0)
+
+def test_overlap():
+    # Disjoint views of the same buffer
+    buf = np.arange(60, dtype=np.double).reshape(10, 6)
+    expected = buf[:5] * buf[5:] + 1.0
+    assert np.all(assign(buf[5:], buf[:5], buf[5:].copy()) == expected)
+
+    buf = np.arange(60, dtype=np.double).reshape(10, 6)
+    expected = buf[:5] * buf[5:] + 1.0
+    assert np.all(assign(buf[:5], buf[:5].copy(), buf[5:]) == expected)
+
+if __name__ == "__main__":
+    test_contiguous()
+    test_strided()
+    test_overlap()
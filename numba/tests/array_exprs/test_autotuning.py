@@ -0,0 +1,67 @@
+"""
+Test runtime autotuning of the tile size of array expressions.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+
+import numpy as np
+
+from numba import *
+from numba import tuning
+
+def transpose_add(a, b):
+    return a + b.T * 2
+
+def broadcast_assign(out, a, b):
+    out[:, :] = a * b[:, np.newaxis]
+    return out
+
+def test_autotuning():
+    tempdir = tempfile.mkdtemp()
+    database_path = tuning.database_path
+    tuning.database_path = os.path.join(tempdir, "tuning.json")
+    try:
+        autotune = tuning.autotune
+        tuning.autotune = True
+        try:
+            small = np.arange(12, dtype=np.double).reshape(3, 4)
+            a = np.arange(512 * 256, dtype=np.double).reshape(512, 256)
+            b = np.arange(512 * 256, dtype=np.double).reshape(256, 512)
+
+            func = autojit(transpose_add)
+            # Small inputs are not tuned on
+            assert np.all(func(small, small.T.copy()) ==
+                          transpose_add(small, small.T.copy()))
+            assert not os.path.exists(tuning.database_path)
+
+            assert np.all(func(a, b) == transpose_add(a, b))
+            assert np.all(func(a, b) == transpose_add(a, b))
+
+            out = np.empty((512, 256), dtype=np.float32)
+            c = np.arange(512, dtype=np.float32)
+            result = autojit(broadcast_assign)(out, a, c)
+            assert np.all(result == broadcast_assign(out.copy(), a, c))
+
+            # Operands with other layouts are tuned separately
+            base = np.arange(1024 * 512, dtype=np.double)
+            x = base.reshape(1024, 512)[::2, ::2]
+            y = base.reshape(512, 1024, order='F')[:, ::4]
+            for operand in (x, y, x):
+                assert np.all(func(operand, b) == transpose_add(operand, b))
+        finally:
+            tuning.autotune = autotune
+
+        entries = json.load(open(tuning.database_path))
+        assert len(entries) == 4, entries
+        names = [candidate.specialization_name
+                     for candidate in tuning.candidates]
+        assert all(name in names for name in entries.values())
+    finally:
+        tuning.database_path = database_path
+        shutil.rmtree(tempdir)
+
+if __name__ == "__main__":
+    test_autotuning()
@@ -0,0 +1,74 @@
+"""
+Test stack allocation and reuse of non-escaping array temporaries in
+nopython context.
+"""
+
+import numpy as np
+
+from numba import *
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@autojit(nopython=True)
+def stack_allocated(n):
+    # Small, constant shape: allocated on the stack
+    result = 0.0
+    for i in range(n):
+        tmp = np.zeros(4)
+        tmp[i % 4] = i
+        result += tmp[0] + tmp[3]
+    return result
+
+@autojit(nopython=True)
+def stack_ones():
+    tmp = np.ones((2, 3), dtype=np.int32)
+    return tmp[1, 2] + tmp.shape[0] + tmp.shape[1]
+
+@autojit(nopython=True)
+def reused_in_loop(a, n):
+    # Array expression temporary in a loop: memory is reused
+    result = 0.0
+    for i in range(n):
+        tmp = a * i + 1.0
+        result += tmp[a.shape[0] - 1]
+    return result
+
+@autojit(nopython=True)
+def reused_allocation(m, n):
+    result = 0
+    for i in range(n):
+        tmp = np.zeros(m + i % 2, dtype=np.int64)
+        tmp[0] = i
+        result += tmp[0] + tmp.shape[0]
+    return result
+
+@autojit(nopython=True)
+def escaping(n):
+    # tmp escapes through the return value
+    tmp = np.zeros(4)
+    for i in range(n):
+        tmp[i % 4] += i
+    return tmp
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+def test_stack_allocation():
+    assert stack_allocated(10) == stack_allocated.py_func(10)
+    assert stack_ones() == stack_ones.py_func()
+
+def test_reuse():
+    a = np.arange(10, dtype=np.double)
+    assert reused_in_loop(a, 10) == reused_in_loop.py_func(a, 10)
+    assert reused_allocation(5, 10) == reused_allocation.py_func(5, 10)
+
+def test_escaping():
+    assert np.all(escaping(10) == escaping.py_func(10))
+
+if __name__ == "__main__":
+    test_stack_allocation()
+    test_reuse()
+    test_escaping()
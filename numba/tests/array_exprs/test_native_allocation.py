@@ -0,0 +1,83 @@
+"""
+Test allocation of arrays in nopython context by the native array runtime.
+"""
+
+import numpy as np
+
+from numba import *
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@autojit(nopython=True)
+def new_array(a, b):
+    return a * b + 2
+
+@autojit(nopython=True)
+def temporaries(a, b):
+    # tmp never escapes and is freed natively
+    tmp = a + b
+    return tmp * tmp
+
+@autojit(nopython=True)
+def temporaries_in_loop(a, n):
+    result = 0.0
+    for i in range(n):
+        tmp = a * i
+        result += tmp[0]
+    return result
+
+@autojit(nopython=True)
+def return_argument(a):
+    return a
+
+@autojit(nopython=True)
+def empty(n):
+    return np.empty(n)
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+def test_native_allocation():
+    a = np.arange(12, dtype=np.double).reshape(3, 4)
+    b = np.arange(12, dtype=np.double)[::-1].reshape(3, 4)
+
+    result = new_array(a, b)
+    assert isinstance(result, np.ndarray)
+    assert result.dtype == np.double
+    assert np.all(result == new_array.py_func(a, b))
+
+    assert np.all(temporaries(a, b) == temporaries.py_func(a, b))
+    assert np.all(temporaries(a.T, b) == temporaries.py_func(a.T, b))
+
+    x = np.arange(1, 5, dtype=np.double)
+    assert temporaries_in_loop(x, 10) == temporaries_in_loop.py_func(x, 10)
+
+def test_lifetime():
+    a = np.arange(10, dtype=np.double)
+    result = new_array(a, a)
+    del a
+    # The returned array owns the natively allocated data
+    assert np.all(result == np.arange(10) ** 2 + 2)
+    assert result.flags.c_contiguous and result.flags.aligned
+
+    b = np.arange(5, dtype=np.double)
+    assert return_argument(b) is b
+
+def test_allocation_errors():
+    assert empty(3).shape == (3,)
+
+    for n, exc_type in [(-1, ValueError), (2 ** 62, MemoryError)]:
+        try:
+            empty(n)
+        except exc_type:
+            pass
+        else:
+            raise Exception("Expected a %s" % exc_type.__name__)
+
+if __name__ == "__main__":
+    test_native_allocation()
+    test_lifetime()
+    test_allocation_errors()
@@ -0,0 +1,83 @@
+"""
+Test native reductions fused with array expressions.
+"""
+
+import numpy as np
+
+from numba import *
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@autojit
+def sum_expr(a, b, c):
+    return np.sum(a * b + c)
+
+@autojit
+def prod_expr(a):
+    return np.prod(a / 2.0 + 1.0)
+
+@autojit
+def min_expr(a, b):
+    return np.min(np.sqrt(a) - b)
+
+@autojit
+def max_expr(a, b):
+    return np.max(np.where(a > 5, a, b))
+
+@autojit
+def sum_array(a):
+    return np.sum(a)
+
+@autojit
+def sum_slices(a):
+    return np.sum(a[1:] - a[:-1])
+
+@autojit(nopython=True)
+def sum_nopython(a, b):
+    return np.sum(a * b)
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+a = np.arange(1, 13, dtype=np.double).reshape(3, 4)
+b = a[::-1].copy()
+
+def test_fused_reductions():
+    assert np.allclose(sum_expr(a, b, 2.0), np.sum(a * b + 2.0))
+    assert np.allclose(sum_expr(a.T, b.T, b.T), np.sum(a.T * b.T + b.T))
+    assert np.allclose(prod_expr(a), np.prod(a / 2.0 + 1.0))
+    assert min_expr(a, b) == np.min(np.sqrt(a) - b)
+    assert max_expr(a, b) == np.max(np.where(a > 5, a, b))
+    assert np.allclose(sum_nopython(a, b), np.sum(a * b))
+
+def test_broadcasting():
+    row = np.arange(4, dtype=np.double)
+    assert np.allclose(sum_expr(a, row, 1.0), np.sum(a * row + 1.0))
+    column = np.arange(3, dtype=np.double).reshape(3, 1)
+    assert np.allclose(sum_expr(a, column, a), np.sum(a * column + a))
+
+def test_plain_reductions():
+    x = np.arange(11, dtype=np.int64)
+    assert sum_array(x) == np.sum(x)
+    assert sum_array(a) == np.sum(a)
+    assert np.allclose(sum_slices(x * 1.5), np.sum(np.diff(x * 1.5)))
+
+def test_nan_and_empty():
+    x = np.array([3.0, np.nan, 1.0, 2.0, 5.0])
+    assert np.isnan(min_expr(x, x))
+
+    try:
+        min_expr(np.empty(0), np.empty(0))
+    except ValueError:
+        pass
+    else:
+        raise Exception("Expected a ValueError")
+
+if __name__ == "__main__":
+    test_fused_reductions()
+    test_broadcasting()
+    test_plain_reductions()
+    test_nan_and_empty()
@@ -381,6 +381,75 @@ def test_closure_outer_locals():
 
     inner()
 
+@autojit
+def closure_no_escape(n):
+    """
+    >>> closure_no_escape(10)
+    90.0
+    """
+    scale = 2.0
+
+    @jit(double(double))
+    def inner(x):
+        return x * scale
+
+    total = 0.0
+    for i in range(n):
+        total += inner(i)
+
+    return total
+
+@autojit
+def make_identity():
+    @jit('object_(object_)')
+    def identity(x):
+        return x
+
+    return identity
+
+@autojit
+def make_adder(n):
+    @jit('object_(object_)')
+    def add(x):
+        return x + n
+
+    return add
+
+__doc__ += """
+>>> add1 = make_adder(1)
+>>> add2 = make_adder(2)
+>>> add1 is add2
+False
+>>> add1(10), add2(10)
+(11, 12)
+>>> make_adder(3)(10)
+13
+>>> make_adder(4)(10)
+14
+>>> add1(10), add2(10)
+(11, 12)
+
+The closure scope is released with the last function that refers to it
+
+>>> import sys
+>>> items = [1]
+>>> refcount = sys.getrefcount(items)
+>>> add_items = make_adder(items)
+>>> add_items([0])
+[0, 1]
+>>> del add_items
+>>> sys.getrefcount(items) == refcount
+True
+
+Every execution of 'def' gives a new function, also without a closure scope
+
+>>> identity = make_identity()
+>>> identity is make_identity()
+False
+>>> identity(5)
+5
+"""
+
 #__doc__ = rewrite_doc(__doc__)
 
 def try_(func, *args):
@@ -0,0 +1,98 @@
+"""
+Test native np.where, np.argmax, np.argmin and np.nonzero.
+"""
+
+import numpy as np
+
+from numba import *
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@autojit
+def where_expr(cond, a, b):
+    return np.where(cond, a * 2, b) + 1
+
+@autojit
+def where_assign(out, a, b):
+    out[:] = np.where(a > b, a, b - 1.0)
+    return out
+
+@autojit
+def where_scalar(x, y):
+    return np.where(x > y, x, y)
+
+@autojit
+def argmax(a):
+    return np.argmax(a)
+
+@autojit
+def argmin(a):
+    return np.argmin(a)
+
+@autojit
+def argmax_axis0(a):
+    return np.argmax(a, axis=0)
+
+@autojit
+def argmin_axis1(a):
+    return np.argmin(a, axis=1)
+
+@autojit
+def nonzero(a):
+    return np.nonzero(a)
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+a = np.arange(12, dtype=np.double).reshape(3, 4)
+b = np.arange(12, dtype=np.double)[::-1].reshape(3, 4)
+
+def test_where():
+    cond = a > b
+    assert np.all(where_expr(cond, a, b) == where_expr.py_func(cond, a, b))
+
+    out = np.empty_like(a)
+    assert np.all(where_assign(out, a, b) == where_assign.py_func(out, a, b))
+
+    assert where_scalar(1.0, 2.0) == 2.0
+    assert where_scalar(3, 2) == 3
+
+def test_argreduce():
+    x = np.array([[3, 1, 4], [1, 5, 9], [2, 6, 5]], dtype=np.int32)
+    assert argmax(x) == np.argmax(x)
+    assert argmin(x) == np.argmin(x)
+    assert argmax(x.T) == np.argmax(x.T)
+    assert np.all(argmax_axis0(x) == np.argmax(x, axis=0))
+    assert np.all(argmin_axis1(x) == np.argmin(x, axis=1))
+
+    y = np.array([1.0, np.nan, 3.0, np.nan])
+    assert argmax(y) == np.argmax(y) == 1
+    assert argmin(y) == np.argmin(y) == 1
+
+    # A leading NaN is selected along an axis
+    z = np.array([[np.nan, 1.0], [2.0, 3.0], [0.5, 4.0]])
+    assert np.all(argmin_axis1(z) == np.argmin(z, axis=1))
+    assert np.all(argmax_axis0(z) == np.argmax(z, axis=0))
+
+    try:
+        argmax(np.empty(0))
+    except ValueError:
+        pass
+    else:
+        raise Exception("Expected a ValueError")
+
+def test_nonzero():
+    x = np.array([[0, 1, 0], [2, 0, 3]])
+    for result, expected in zip(nonzero(x), np.nonzero(x)):
+        assert np.all(result == expected)
+
+    y = np.array([True, False, True])
+    assert np.all(nonzero(y)[0] == np.nonzero(y)[0])
+
+if __name__ == "__main__":
+    test_where()
+    test_argreduce()
+    test_nonzero()
@@ -11,6 +11,10 @@
 45.0
 >>> preload_phi_cycle2(a)
 45.0
+>>> preload_shape_across_call(a)
+45.0
+>>> preload_object_call(a)
+45.0
 """
 
 import numpy as np
@@ -62,6 +66,30 @@ def preload_phi_cycle2(A):
 
     return sum
 
+@jit(double(double[:], Py_ssize_t))
+def element(A, i):
+    return A[i]
+
+@autojit
+def preload_shape_across_call(A):
+    # A.shape[0] and A's strides stay preloaded across the call, since
+    # element() does not resize its array arguments
+    sum = 0.0
+    for i in range(A.shape[0]):
+        sum += element(A, i)
+    return sum
+
+def python_sum(A):
+    return A.sum()
+
+@autojit
+def preload_object_call(A):
+    # A is passed to Python, so nothing is preloaded
+    sum = 0.0
+    for i in range(A.shape[0]):
+        sum += A[i]
+    return python_sum(A) + sum - sum
+
 if __name__ == "__main__":
    a = np.arange(10, dtype=np.double)
    preload_arg(a)
@@ -0,0 +1,77 @@
+"""
+Test bounds checking of array accesses with @jit(boundscheck=True).
+"""
+
+import numpy as np
+
+from numba import *
+
+@jit(double(double[:], int_), boundscheck=True)
+def getitem(a, i):
+    return a[i]
+
+@jit(void(double[:, :], int_, int_, double), boundscheck=True)
+def setitem(a, i, j, value):
+    a[i, j] = value
+
+@jit(double(double[:]), boundscheck=True)
+def sum_range(a):
+    sum = 0.0
+    for i in range(a.shape[0]):
+        sum += a[i]
+    return sum
+
+@jit(void(double[:], double[:]), boundscheck=True)
+def smooth(a, out):
+    for i in range(1, a.shape[0] - 1):
+        out[i] = a[i - 1] + a[i] + a[i + 1]
+
+@jit(double(double[:]), boundscheck=True)
+def sum_shifted(a):
+    sum = 0.0
+    for i in range(a.shape[0]):
+        sum += a[i + 1]
+    return sum
+
+def raises_index_error(func, *args):
+    try:
+        func(*args)
+    except IndexError:
+        return True
+    else:
+        return False
+
+def test_getitem():
+    a = np.arange(10, dtype=np.double)
+    assert getitem(a, 9) == 9.0
+    assert raises_index_error(getitem, a, 10)
+    assert raises_index_error(getitem, a, -1)
+
+def test_setitem():
+    a = np.zeros((3, 4))
+    setitem(a, 2, 3, 1.0)
+    assert a[2, 3] == 1.0
+    assert raises_index_error(setitem, a, 3, 0, 1.0)
+    assert raises_index_error(setitem, a, 0, 4, 1.0)
+
+def test_range_loop():
+    a = np.arange(10, dtype=np.double)
+    assert sum_range(a) == a.sum()
+    assert 'index_error' not in str(sum_range.lfunc)
+
+def test_range_offsets():
+    a = np.arange(10, dtype=np.double)
+    out = np.zeros_like(a)
+    smooth(a, out)
+    assert np.all(out[1:-1] == a[:-2] + a[1:-1] + a[2:])
+
+def test_unproven_offset():
+    a = np.arange(10, dtype=np.double)
+    assert raises_index_error(sum_shifted, a)
+
+if __name__ == "__main__":
+    test_getitem()
+    test_setitem()
+    test_range_loop()
+    test_range_offsets()
+    test_unproven_offset()
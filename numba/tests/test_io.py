@@ -0,0 +1,118 @@
+"""
+Test the CSV and fixed-width readers of numba.io.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from numba import io
+
+schema = [('id', np.int32), ('price', np.float64), ('symbol', 'S4'),
+          ('flag', np.bool_)]
+
+csv_data = (b"id,price,symbol,flag\n"
+            b"1,2.5,AB,1\n"
+            b"-3, 1e3 ,LONGSYMBOL,0\n"
+            b"\n"
+            b"4,,C\r\n"
+            b"5,7.25,D,1,extra\n")
+
+fixed_width_data = (b"  12 3.5xy\n"
+                    b"   7-1.0zz\n"
+                    b"\n"
+                    b" 100 .25q\n")
+
+fixed_width_schema = [('a', np.int64), ('b', np.float32), ('c', 'S2')]
+
+def check_csv(columns):
+    assert list(columns) == ['id', 'price', 'symbol', 'flag']
+    assert columns['id'].dtype == np.int32
+    assert columns['id'].tolist() == [1, -3, 4, 5]
+    assert columns['price'].tolist() == [2.5, 1000.0, 0.0, 7.25]
+    assert columns['symbol'].tolist() == [b'AB', b'LONG', b'C', b'D']
+    assert columns['flag'].tolist() == [True, False, False, True]
+
+def test_read_csv():
+    check_csv(io.read_csv(csv_data, schema, skip_rows=1))
+    check_csv(io.read_csv(csv_data, np.dtype(schema), skip_rows=1,
+                          parallel=True))
+
+def test_memmap():
+    fd, filename = tempfile.mkstemp()
+    try:
+        os.write(fd, csv_data)
+        os.close(fd)
+        buf = np.memmap(filename, dtype=np.uint8, mode='r')
+        check_csv(io.read_csv(buf, schema, skip_rows=1))
+        del buf
+    finally:
+        os.remove(filename)
+
+def test_parallel():
+    data = b"".join(b"%d;%d.5\n" % (i, i) for i in range(20000))
+    columns = io.read_csv(data, [('i', np.int64), ('x', np.float64)],
+                          delimiter=';', parallel=True)
+    assert np.all(columns['i'] == np.arange(20000))
+    assert np.all(columns['x'] == np.arange(20000) + 0.5)
+
+def test_iter_csv():
+    chunks = list(io.iter_csv(csv_data, schema, 3, skip_rows=1))
+    assert [len(chunk['id']) for chunk in chunks] == [3, 1]
+    assert chunks[1]['id'].tolist() == [5]
+
+def test_skip_all_rows():
+    columns = io.read_csv(csv_data, schema, skip_rows=100)
+    assert all(len(column) == 0 for column in columns.values())
+    assert list(io.iter_csv(csv_data, schema, 3, skip_rows=100)) == []
+
+def test_crlf():
+    data = csv_data.replace(b"\n", b"\r\n")
+    for parallel in (False, True):
+        check_csv(io.read_csv(data, schema, skip_rows=1, parallel=parallel))
+
+def test_float_round_trip():
+    values = [2 / 3.0, 0.1, 1.7976931348623157e308, 1e-310, 1e23]
+    data = "".join("%r\n" % value for value in values).encode('ascii')
+    columns = io.read_csv(data, [('x', np.float64)])
+    assert columns['x'].tolist() == values
+
+def test_fixed_width():
+    for parallel in (False, True):
+        columns = io.read_fixed_width(fixed_width_data, fixed_width_schema,
+                                      [4, 4, 2], parallel=parallel)
+        assert columns['a'].tolist() == [12, 7, 100]
+        assert columns['b'].tolist() == [3.5, -1.0, 0.25]
+        assert columns['c'].tolist() == [b'xy', b'zz', b'q']
+
+    chunks = list(io.iter_fixed_width(fixed_width_data, fixed_width_schema,
+                                      [4, 4, 2], 2))
+    assert [chunk['a'].tolist() for chunk in chunks] == [[12, 7], [100]]
+
+def test_errors():
+    for dtype in ([('x', object)], np.float64):
+        try:
+            io.read_csv(csv_data, dtype)
+        except TypeError:
+            pass
+        else:
+            raise Exception("Expected a TypeError for dtype %s" % (dtype,))
+
+    try:
+        io.read_csv(csv_data, schema, delimiter=', ')
+    except ValueError as e:
+        assert "single byte" in str(e)
+    else:
+        raise Exception("Expected a ValueError for the delimiter")
+
+if __name__ == "__main__":
+    test_read_csv()
+    test_memmap()
+    test_parallel()
+    test_iter_csv()
+    test_skip_all_rows()
+    test_crlf()
+    test_float_round_trip()
+    test_fixed_width()
+    test_errors()
@@ -0,0 +1,114 @@
+"""
+Test the byte string operations in numba.strings.
+"""
+
+import numpy as np
+
+from numba import *
+from numba import strings
+
+log = np.frombuffer(b"INFO start\nERROR disk full\nINFO retry\n"
+                    b"ERROR disk full\n", dtype=np.uint8)
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@jit(int64(uint8[:]), nopython=True)
+def count_errors(log):
+    count = 0
+    pos = strings.find(log, "ERROR")
+    while pos >= 0:
+        count += 1
+        pos = strings.find(log, "ERROR", pos + 5)
+    return count
+
+@jit(int64(uint8[:], npy_intp[:, :]), nopython=True)
+def error_lines(log, lines):
+    "The hash of the last line that starts with ERROR"
+    nlines = strings.split(log, "\n", lines)
+    result = 0
+    for i in range(nlines):
+        if strings.startswith(log, "ERROR", lines[i, 0]):
+            result = strings.hash(log, lines[i, 0], lines[i, 1])
+    return result
+
+@jit(double(uint8[:], double[:]), nopython=True)
+def sum_row(row, values):
+    n = strings.parse_floats(row, ",", values)
+    total = 0.0
+    for i in range(n):
+        total += values[i]
+    return total
+
+@jit(double(uint8[:]), nopython=True)
+def parse_number(field):
+    return strings.parse_float(field)
+
+@jit(int64(uint8[:]), nopython=True)
+def parse_fields(row):
+    first = strings.find(row, ";")
+    return strings.parse_int(row, 0, first) * strings.parse_int(row,
+                                                                first + 1)
+
+@jit(npy_intp(uint8[:], uint8[:]), nopython=True)
+def join(dst, src):
+    pos = strings.concat(dst, 0, src, 0, 4)
+    pos = strings.concat(dst, pos, "--")
+    return strings.concat(dst, pos, src, 6)
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+def test_find():
+    assert count_errors(log) == 2
+    assert count_errors.py_func(log) == 2
+    assert strings.find(b"abcabc", b"c", 3) == 5
+    assert strings.find(b"abcabc", b"c", 0, 2) == -1
+
+def test_split_hash():
+    lines = np.empty((10, 2), dtype=np.intp)
+    expected = strings.hash(b"ERROR disk full")
+    assert error_lines(log, lines) == expected
+    assert error_lines.py_func(log, lines) == expected
+
+def test_parse():
+    row = np.frombuffer(b" 1.5, -2.25e1,3,0.125\n", dtype=np.uint8)
+    assert sum_row(row, np.empty(8)) == 1.5 - 22.5 + 3 + 0.125
+    assert parse_fields(np.frombuffer(b"-12;  7", dtype=np.uint8)) == -84
+    assert strings.parse_float(b"4.5e2") == 450.0
+    assert strings.parse_int(b"  +42x") == 42
+
+def test_parse_float_rounding():
+    # Outside the exact range of the fast path (17 significant digits,
+    # large exponents and subnormals)
+    for text in ["0.1", repr(2 / 3.0), "1.7976931348623157e308", "1e23",
+                 "2.2250738585072014e-308", "1e-310", "4.9e-324",
+                 "123456789012345678901234", "-8.589973e9", "1e400"]:
+        field = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        assert strings.parse_float(field) == float(text), text
+        assert parse_number(field) == float(text), text
+
+def test_concat():
+    dst = np.zeros(10, dtype=np.uint8)
+    src = np.frombuffer(b"abcd, efgh", dtype=np.uint8)
+    assert join(dst, src) == 10
+    assert dst.tostring() == b"abcd--efgh"
+
+def test_empty_separator():
+    lines = np.empty((10, 2), dtype=np.intp)
+    try:
+        strings.split(b"a,b", b"", lines)
+    except ValueError:
+        pass
+    else:
+        raise Exception("Expected a ValueError")
+
+if __name__ == "__main__":
+    test_find()
+    test_split_hash()
+    test_parse()
+    test_parse_float_rounding()
+    test_concat()
+    test_empty_separator()
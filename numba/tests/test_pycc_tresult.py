@@ -56,5 +56,40 @@ def test_pycc():
         if os.path.exists(out_modulename):
             os.unlink(out_modulename)
 
+def test_pycc_targets():
+    from numba.codegen import multiversion
+
+    modulename = os.path.join(base_path, 'compile_with_pycc')
+    out_modulename = (os.path.join(tempfile.gettempdir(),
+                                   'compiled_with_pycc_targets')
+                      + find_shared_ending())
+    main(args=['--targets', 'sse2,avx', '-o', out_modulename,
+               modulename + '.py'])
+    lib = CDLL(out_modulename)
+
+    try:
+        # The dispatch stub and the versions the host can run
+        names = ['mult', 'mult.sse2']
+        if multiversion.host_level() >= multiversion.level('avx'):
+            names.append('mult.avx')
+
+        for name in names:
+            func = getattr(lib, name)
+            func.argtypes = [c_double, c_double]
+            func.restype = c_double
+            assert func(123, 321) == 123 * 321
+
+        lib.multf.argtypes = [c_float, c_float]
+        lib.multf.restype = c_float
+        assert lib.multf(987, 321) == 987 * 321
+    finally:
+        del lib
+        if os.path.exists(out_modulename):
+            os.unlink(out_modulename)
+
+    assert multiversion.check_targets(['avx', 'sse2']) == ['sse2', 'avx']
+    assert multiversion.select_target(['sse2']) in ('sse2', None)
+
 if __name__ == "__main__":
     test_pycc()
+    test_pycc_targets()
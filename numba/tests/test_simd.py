@@ -0,0 +1,97 @@
+"""
+Test explicit SIMD vector types and the operations in numba.simd.
+"""
+
+import numpy as np
+
+from numba import *
+from numba import simd
+from numba.codegen import cpufeatures
+
+float32x8 = vector(float32, 8)
+float64x4 = vector(float64, 4)
+int32x4 = vector(int32, 4)
+
+#------------------------------------------------------------------------
+# Test functions
+#------------------------------------------------------------------------
+
+@jit(void(float32[:], float32[:], float32))
+def saxpy(x, y, a):
+    for i in range(0, x.shape[0], 8):
+        v = simd.load(float32x8, x, i) * a + simd.load(float32x8, y, i)
+        simd.store(v, y, i)
+
+@jit(float64(float64[:, :], float64[:, :]))
+def dot(a, b):
+    acc = simd.splat(float64x4, 0.0)
+    for i in range(a.shape[0]):
+        for j in range(0, a.shape[1], 4):
+            acc = acc + simd.load(float64x4, a, (i, j)) * \
+                        simd.load(float64x4, b, (i, j))
+    return simd.sum(acc)
+
+@jit(void(int32[:], int32[:]))
+def shuffle(a, out):
+    lo = simd.load(int32x4, a, 0)
+    hi = simd.load(int32x4, a, 4)
+    simd.store(simd.shuffle(lo, hi, (7, 0, 5, 2)), out, 0)
+    simd.store(-simd.shuffle(lo, hi, (1, 1, 1, 1)), out, 4)
+
+@jit(int32(int32[:], int32))
+def extract_insert(a, i):
+    v = simd.insert(simd.load(int32x4, a, 0), i, 100)
+    return simd.extract(v, i) + simd.extract(v, 3 - i)
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+def test_vector_type():
+    assert float32x8.itemsize == 32
+    assert str(float32x8) == "float32x8"
+    assert vector(float32, 8) is float32x8
+
+def test_arithmetic():
+    x = np.arange(32, dtype=np.float32)
+    y = np.ones(32, dtype=np.float32)
+    expected = x * 2 + y
+    saxpy(x, y, 2.0)
+    assert np.all(y == expected)
+
+def test_load_2d():
+    a = np.arange(24, dtype=np.double).reshape(3, 8)
+    b = np.arange(24, dtype=np.double)[::-1].reshape(3, 8)
+    assert dot(a, b) == np.sum(a * b)
+
+def test_shuffle():
+    a = np.arange(8, dtype=np.int32)
+    out = np.empty(8, dtype=np.int32)
+    shuffle(a, out)
+    assert list(out) == [7, 0, 5, 2, -1, -1, -1, -1]
+
+def test_extract_insert():
+    a = np.arange(4, dtype=np.int32)
+    assert extract_insert(a, 1) == 100 + 2
+
+def test_python_fallback():
+    x = np.arange(16, dtype=np.float32)
+    y = np.ones(16, dtype=np.float32)
+    expected = x * 2 + y
+    saxpy.py_func(x, y, 2.0)
+    assert np.all(y == expected)
+
+def test_feature_string():
+    features = cpufeatures.feature_string(['sse2'])
+    assert '+sse2' in features.split(',')
+    assert '+avx' not in features.split(',')
+    assert '-avx' in features.split(',')
+
+if __name__ == "__main__":
+    test_vector_type()
+    test_arithmetic()
+    test_load_2d()
+    test_shuffle()
+    test_extract_insert()
+    test_python_fallback()
+    test_feature_string()
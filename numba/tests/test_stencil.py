@@ -0,0 +1,116 @@
+"""
+Test numba.stencil against NumPy references for all border modes.
+"""
+
+import numpy as np
+
+import numba
+from numba import *
+from numba import stencils
+
+@stencil
+def laplace(a):
+    return a[-1, 0] + a[1, 0] + a[0, -1] + a[0, 1] - 4 * a[0, 0]
+
+@stencil(mode='constant', cval=1.0, tile=4)
+def laplace_cval(a):
+    return a[-1, 0] + a[1, 0] + a[0, -1] + a[0, 1] - 4 * a[0, 0]
+
+@stencil(mode='wrap')
+def laplace_wrap(a):
+    return a[-1, 0] + a[1, 0] + a[0, -1] + a[0, 1] - 4 * a[0, 0]
+
+@stencil(mode='nearest', target='parallel')
+def laplace_parallel(a):
+    return a[-1, 0] + a[1, 0] + a[0, -1] + a[0, 1] - 4 * a[0, 0]
+
+@stencil(mode='nearest')
+def smooth(a, b, weight):
+    x = a[-2] + a[2]
+    return weight * x + b[1]
+
+#------------------------------------------------------------------------
+# References
+#------------------------------------------------------------------------
+
+def laplace_reference(a, mode, cval=0.0):
+    if mode == 'constant':
+        padded = np.pad(a, 1, mode='constant', constant_values=cval)
+    elif mode == 'wrap':
+        padded = np.pad(a, 1, mode='wrap')
+    else:
+        padded = np.pad(a, 1, mode='edge')
+
+    return (padded[:-2, 1:-1] + padded[2:, 1:-1] +
+            padded[1:-1, :-2] + padded[1:-1, 2:] - 4 * a)
+
+def get_array(shape):
+    return np.arange(np.prod(shape), dtype=np.double).reshape(shape) ** 2
+
+shapes = [(1, 1), (2, 3), (7, 9), (40, 33)]
+
+#------------------------------------------------------------------------
+# Tests
+#------------------------------------------------------------------------
+
+def test_constant():
+    for shape in shapes:
+        a = get_array(shape)
+        assert np.allclose(laplace(a), laplace_reference(a, 'constant'))
+        assert np.allclose(laplace_cval(a),
+                           laplace_reference(a, 'constant', cval=1.0))
+
+def test_wrap():
+    for shape in shapes[1:]:
+        a = get_array(shape)
+        assert np.allclose(laplace_wrap(a), laplace_reference(a, 'wrap'))
+
+def test_nearest_parallel():
+    for shape in shapes:
+        a = get_array(shape)
+        assert np.allclose(laplace_parallel(a),
+                           laplace_reference(a, 'nearest'))
+
+def test_out():
+    a = get_array((10, 10))
+    out = np.empty_like(a)
+    assert laplace(a, out=out) is out
+    assert np.allclose(out, laplace_reference(a, 'constant'))
+
+def test_1d_scalar_args():
+    a = get_array((20,))
+    b = a[::-1].copy()
+    result = smooth(a, b, 0.5)
+
+    index = np.arange(20)
+    x = a[np.clip(index - 2, 0, 19)] + a[np.clip(index + 2, 0, 19)]
+    assert np.allclose(result, 0.5 * x + b[np.clip(index + 1, 0, 19)])
+
+def test_neighbourhood():
+    def kernel(a):
+        return a[-2, 0] + a[0, 3]
+
+    kernel_def = numba.functions._get_ast(kernel)
+    lo, hi = stencils.neighbourhood(kernel_def, set(['a']), 2)
+    assert lo == [2, 0]
+    assert hi == [0, 3]
+
+def test_errors():
+    def kernel(a, i):
+        return a[i, 0]
+
+    try:
+        stencil(kernel)(get_array((3, 3)), 1)
+    except NumbaError as e:
+        assert "constant integer offsets" in str(e)
+    else:
+        raise Exception("Expected an error for a non-constant index")
+
+if __name__ == "__main__":
+    test_constant()
+    test_wrap()
+    test_nearest_parallel()
+    test_out()
+    test_1d_scalar_args()
+    test_neighbourhood()
+    test_errors()
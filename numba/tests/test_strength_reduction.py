@@ -0,0 +1,103 @@
+"""
+Test strength reduction of strided array accesses in range loops.
+"""
+
+import numpy as np
+
+from numba import *
+from numba.specialize import loops
+
+@autojit
+def copy_rows(a, b):
+    for i in range(a.shape[0]):
+        for j in range(a.shape[1]):
+            b[i, j] = a[i, j] * 2
+
+@autojit
+def copy_columns(a, b):
+    for j in range(a.shape[1]):
+        for i in range(a.shape[0]):
+            b[i, j] = a[i, j] + a[i, 0]
+
+@autojit
+def stepped(a, start, stop, step):
+    sum = 0.0
+    for i in range(start, stop, step):
+        if i == 4:
+            continue
+        sum += a[i] * a[1]
+    return sum
+
+@autojit
+def modified_index(a):
+    sum = 0.0
+    k = 0
+    for i in range(a.shape[0]):
+        sum += a[k, i]
+        k = 1 - k
+    return sum
+
+@autojit
+def assigned_target(a):
+    sum = 0.0
+    for i in range(a.shape[0]):
+        sum += a[i]
+        i = i + 1
+        sum += a[i % a.shape[0]]
+    return sum
+
+def test_contiguous():
+    a = np.arange(24, dtype=np.double).reshape(4, 6)
+    b = np.zeros_like(a)
+    copy_rows(a, b)
+    assert np.all(b == a * 2)
+
+def test_strided():
+    a = np.arange(96, dtype=np.double).reshape(8, 12)[::2, ::3]
+    b = np.zeros((12, 8))[::3, ::2]
+    copy_rows(a, b)
+    assert np.all(b == a * 2)
+
+    b = np.zeros_like(a)
+    copy_columns(a, b)
+    assert np.all(b == a + a[:, :1])
+
+def test_step():
+    a = np.arange(10, dtype=np.double)
+    for start, stop, step in [(0, 10, 1), (1, 10, 3), (9, -1, -2), (5, 5, 1)]:
+        expected = sum(a[i] * a[1] for i in range(start, stop, step)
+                                       if i != 4)
+        assert stepped(a, start, stop, step) == expected
+
+def test_modified_index():
+    a = np.arange(8, dtype=np.double).reshape(2, 4)
+    assert modified_index(a) == a[0, 0] + a[1, 1] + a[0, 2] + a[1, 3]
+
+def test_assigned_target():
+    a = np.arange(5, dtype=np.double)
+    expected = sum(a[i] + a[(i + 1) % 5] for i in range(5))
+    assert assigned_target(a) == expected
+
+def test_disabled():
+    loops.strength_reduction = False
+    try:
+        @autojit
+        def copy_rows_unreduced(a, b):
+            for i in range(a.shape[0]):
+                for j in range(a.shape[1]):
+                    b[i, j] = a[i, j] * 2
+
+        a = np.arange(6, dtype=np.double).reshape(2, 3)
+        b = np.zeros_like(a)
+        copy_rows_unreduced(a, b)
+        assert np.all(b == a * 2)
+    finally:
+        loops.strength_reduction = True
+
+if __name__ == "__main__":
+    test_contiguous()
+    test_strided()
+    test_step()
+    test_modified_index()
+    test_assigned_target()
+    test_disabled()
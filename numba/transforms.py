@@ -96,6 +96,7 @@ from numba.typesystem import is_obj, promote_to_native
 from numba.type_inference.modules import mathmodule
 from numba.nodes import constnodes
 from numba.external import utility
+from numba.support.numpy_support import allocation
 from numba.utils import dump
 
 import llvm.core
@@ -611,11 +612,19 @@ class LateSpecializer(ResolveCoercions,
     def visit_Call(self, node):
         func_type = node.func.type
 
+        native = self.query(node, "numpy_native")
+
         if self.query(node, "is_math") and node.type.is_numeric:
             assert node.func.type.is_known_value
             name = get_funcname(node.func.type.value)
             result = math_call(name, node.args, node.type)
 
+        elif native is not None:
+            result = self.numpy_native_call(node, *native)
+
+        elif self.nopython and allocation.get_allocator(node) is not None:
+            result = self.native_allocation(node)
+
         elif func_type.is_builtin:
             result = self.builtin_resolver.resolve_builtin_call_or_object(
                 node, func_type.func)
@@ -625,6 +634,104 @@ class LateSpecializer(ResolveCoercions,
 
         return self.visit(result)
 
+    def numpy_native_call(self, node, kind, array_type, axis):
+        """
+        Call a native implementation of np.argmax/np.argmin/np.nonzero
+        (see numba.utility.numpy_utilities).
+        """
+        from numba.utility import numpy_utilities
+
+        if self.nopython and is_obj(node.type):
+            raise error.NumbaError(
+                node, "%s returning arrays is not yet supported in nopython "
+                      "context" % kind)
+
+        lfunc = numpy_utilities.compile_utility(self.env, kind, array_type,
+                                                axis)
+        lfunc = self.llvm_module.get_or_insert_function(lfunc.type.pointee,
+                                                        lfunc.name)
+        signature = node.type(array_type)
+
+        kwds = {}
+        if kind != 'nonzero' and not node.type.is_array:
+            # argmin/argmax on an empty array
+            badval = nodes.const(numpy_utilities.EMPTY, npy_intp)
+            exc_msg = "attempt to get %s of an empty sequence" % kind
+            kwds = dict(badval=badval, exc_type=ValueError, exc_msg=exc_msg)
+
+        return nodes.NativeCallNode(signature, node.args[:1], lfunc,
+                                    name=kind, **kwds)
+
+    def buffer_length(self, buf):
+        "The length of a byte buffer for numba.strings"
+        if buf.type.is_array:
+            shape = nodes.ArrayAttributeNode('shape', buf)
+            length = ast.Subscript(value=shape,
+                                   slice=nodes.ConstNode(0, Py_ssize_t),
+                                   ctx=ast.Load())
+            return nodes.typednode(length, npy_intp)
+
+        length = function_util.external_call(self.context, self.llvm_module,
+                                             'strlen', args=[buf])
+        return nodes.CoercionNode(length, npy_intp)
+
+    def visit_StringCallNode(self, node):
+        """
+        Call the native implementation of a numba.strings function (see
+        numba.utility.string_utilities), which takes every byte buffer
+        followed by its length.
+        """
+        from numba.utility import string_utilities
+
+        buffer_args = string_utilities.buffer_args[node.name]
+        args = []
+        for i, arg in enumerate(node.args):
+            if i in buffer_args:
+                arg = nodes.CloneableNode(arg)
+                args.extend([arg, self.buffer_length(arg.clone)])
+            else:
+                args.append(arg)
+
+        argtypes = [arg.type for arg in args]
+        lfunc = string_utilities.compile_utility(self.env, node.name,
+                                                 argtypes)
+        lfunc = self.llvm_module.get_or_insert_function(lfunc.type.pointee,
+                                                        lfunc.name)
+        signature = node.type(*argtypes)
+
+        kwds = {}
+        if node.name in ('split', 'parse_ints', 'parse_floats'):
+            badval = nodes.const(string_utilities.EMPTY_SEPARATOR, npy_intp)
+            kwds = dict(badval=badval, exc_type=ValueError,
+                        exc_msg="empty separator")
+
+        result = nodes.NativeCallNode(signature, args, lfunc,
+                                      name=node.name, **kwds)
+        return self.visit(result)
+
+    def native_allocation(self, node):
+        """
+        Allocate an array for np.empty/np.zeros/np.ones in nopython context
+        with the native array runtime. The storage is determined by escape
+        analysis (see control_flow/escape.py).
+        """
+        func, fill = allocation.get_allocator(node)
+        if fill is not None:
+            fill = nodes.const(fill, node.type.dtype)
+
+        storage = self.query(node, "array_storage") or 'heap'
+        if storage == 'stack':
+            return nodes.StackArrayNode(node.type,
+                                        allocation.constant_extents(node),
+                                        fill=fill)
+
+        shape = nodes.ExtentsNode(allocation.get_extents(node))
+        result = nodes.ArrayNewEmptyNode(node.type, shape, storage=storage)
+        if fill is not None:
+            result = nodes.ArrayFillNode(result, fill)
+
+        return result
+
     def _c_string_slice(self, node):
         ret_val = node
         logger.debug(node.slice)
@@ -690,7 +797,10 @@ class LateSpecializer(ResolveCoercions,
         elif (node.value.type.is_array and not node.type.is_array and
                   node.slice.type.is_int):
             # Array index with integer indices
+            inbounds = getattr(node, 'inbounds', frozenset())
             node = nodes.DataPointerNode(node.value, node.slice, node.ctx)
+            if self.env.translation.crnt.boundscheck:
+                node.check_bounds(inbounds)
         elif node.value.type.is_string and node.type.is_string:
             node.value = nodes.CoercionNode(node.value, dst_type = object_)
             node.type = object_
@@ -810,10 +920,38 @@ class LateSpecializer(ResolveCoercions,
         self.generic_visit(node)
         return node
 
+    def _native_array(self, name, args, type):
+        "Allocate an array with the native array runtime (no Python C-API)"
+        result = function_util.utility_call(self.context, self.llvm_module,
+                                            name, args=args)
+
+        # The runtime returns NULL if the array is too big or cannot be
+        # allocated
+        result = nodes.CloneableNode(result)
+        check_alloc = nodes.CheckErrorNode(
+            nodes.ptrtoint(result.clone), badval=nodes.const(0, Py_uintptr_t),
+            exc_type=MemoryError, exc_msg="could not allocate native array")
+        result = nodes.ExpressionNode(stmts=[result, check_alloc],
+                                      expr=result.clone)
+
+        return nodes.ObjectTempNode(nodes.CoercionNode(result, type))
+
+    def _check_native_shape(self, ndim, shape):
+        "Raise a ValueError for negative dimensions of a new native array"
+        check = function_util.utility_call(self.context, self.llvm_module,
+                                           "Numba_NativeArray_CheckShape",
+                                           args=[ndim, shape])
+        return nodes.CheckErrorNode(
+            check, badval=nodes.const(-1, int_), exc_type=ValueError,
+            exc_msg="negative dimensions are not allowed")
+
     def visit_ArrayNewNode(self, node):
         if self.nopython:
-            raise error.NumbaError(
-                node, "Cannot yet allocate new array in nopython context")
+            ndim = nodes.const(node.type.ndim, int_)
+            base = node.base if node.base is not None else nodes.NULL_obj
+            args = [ndim, node.shape, node.strides, node.data, base]
+            return self.visit(self._native_array("Numba_NativeArray_View",
+                                                 args, node.type))
 
         PyArray_Type = nodes.ObjectInjectNode(np.ndarray)
         descr = nodes.ObjectInjectNode(node.type.dtype.get_dtype()).cloneable
@@ -845,11 +983,27 @@ class LateSpecializer(ResolveCoercions,
         return self.visit(result)
 
     def visit_ArrayNewEmptyNode(self, node):
+        ndim = nodes.const(node.type.ndim, int_)
         if self.nopython:
-            raise error.NumbaError(
-                node, "Cannot yet allocate new empty array in nopython context")
+            itemsize = nodes.const(node.type.dtype.itemsize, npy_intp)
+            is_fortran = nodes.const(node.is_fortran, int_)
+            shape = nodes.CloneableNode(node.shape)
+            check_shape = self._check_native_shape(ndim, shape)
+            args = [ndim, shape.clone, itemsize, is_fortran]
+            if node.storage == 'reuse':
+                # Pass in the temporary holding the previous allocation
+                prev = nodes.ObjectTempRefNode(None)
+                prev.type = object_.pointer()
+                result = self._native_array("Numba_NativeArray_Reuse",
+                                            [prev] + args, node.type)
+                prev.obj_temp_node = result
+            else:
+                result = self._native_array("Numba_NativeArray_New", args,
+                                            node.type)
+
+            result = nodes.ExpressionNode(stmts=[check_shape], expr=result)
+            return self.visit(result)
 
-        ndim = nodes.const(node.type.ndim, int_)
         dtype = nodes.const(node.type.dtype.get_dtype(), object_).cloneable
         is_fortran = nodes.const(node.is_fortran, int_)
         result = nodes.PyArray_Empty([ndim, node.shape, dtype, is_fortran])
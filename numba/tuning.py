@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+Autotuning of the tile size of minivect kernels for array expressions.
+
+When autotuning is enabled (set NUMBA_AUTOTUNE=1 or numba.tuning.autotune),
+array expressions of two or more dimensions are compiled with several
+specializations: the untiled strided specialization and the tiled strided
+specialization for a number of candidate block sizes. A dispatcher with
+the signature of the minivect kernel selects between them:
+
+    if choice >= 0 and strides == tuned_strides:
+        call candidate[choice]
+    elif size(shape) >= min_tuning_size:
+        choice = tune(args)
+        call candidate[choice]
+    else:
+        call candidate[0]
+
+A call on large inputs with other strides than the last tuned call calls
+back into Python, which looks up the choice for the layout of the operands.
+The first call for a layout benchmarks all candidates on the actual
+operands (writing to scratch outputs) and records the winner per (kernel,
+dtypes, layout, CPU) in a persistent tuning database. The database is
+consulted first, so the benchmark runs only once per machine.
+"""
+from __future__ import print_function, division, absolute_import
+
+import os
+import json
+import time
+import ctypes
+import hashlib
+import logging
+import platform
+
+import numpy as np
+import llvm.core as lc
+
+from numba import llvm_types
+from numba.minivect import specializers
+
+logger = logging.getLogger(__name__)
+
+autotune = bool(int(os.environ.get('NUMBA_AUTOTUNE', 0)))
+
+# Path of the tuning database
+database_path = os.environ.get(
+    'NUMBA_TUNING_DB', os.path.join(os.path.expanduser("~"), ".numba",
+                                    "tuning.json"))
+
+# Minimum number of elements of the iteration space to tune on
+min_tuning_size = 1 << 16
+
+# Number of timed runs of each candidate
+repeat = 3
+
+blocksizes = (16, 32, 64, 128, 256)
+
+#------------------------------------------------------------------------
+# Candidate Specializations
+#------------------------------------------------------------------------
+
+class TiledSpecializer(specializers.CTiledStridedSpecializer):
+    "Tiled specializer with a fixed tile size"
+
+    blocksize = 64
+
+    def get_blocksize(self):
+        return self.astbuilder.constant(self.blocksize)
+
+def _make_tiled_specializer(blocksize):
+    name = "tiled%d" % blocksize
+    return type(str("TiledSpecializer%d" % blocksize), (TiledSpecializer,),
+                dict(specialization_name=name, blocksize=blocksize))
+
+# The untiled specialization comes first and is the default
+candidates = [specializers.StridedSpecializer]
+candidates.extend(_make_tiled_specializer(blocksize)
+                  for blocksize in blocksizes)
+
+def is_tunable(minikernel, operand_types):
+    "Whether to autotune the given minivect function"
+    return autotune and minikernel.ndim >= 2 and all(
+        not type.is_array or type.dtype.is_numeric for type in operand_types)
+
+#------------------------------------------------------------------------
+# Tuning Database
+#------------------------------------------------------------------------
+
+def cpu_name():
+    "Name of the host CPU, used to key the tuning database"
+    try:
+        import llvm.ee as le
+        return le.get_host_cpu_name()
+    except (ImportError, AttributeError):
+        return platform.processor() or platform.machine()
+
+class TuningDatabase(object):
+    """
+    Persistent map from tuning keys to the specialization name of the
+    winning candidate, stored as JSON.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = None
+
+    def load(self):
+        if self.entries is None:
+            self.entries = {}
+            try:
+                with open(self.path) as f:
+                    self.entries = json.load(f)
+            except (IOError, ValueError) as e:
+                logger.debug("Cannot load tuning database %s: %s",
+                             self.path, e)
+        return self.entries
+
+    def get(self, key):
+        return self.load().get(key)
+
+    def put(self, key, value):
+        self.load()[key] = value
+        try:
+            dirname = os.path.dirname(self.path)
+            if dirname and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+
+            # Write atomically, other processes may be tuning as well
+            tmp = "%s.%d" % (self.path, os.getpid())
+            with open(tmp, "w") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.rename(tmp, self.path)
+        except (IOError, OSError) as e:
+            logger.warning("Cannot write tuning database %s: %s",
+                           self.path, e)
+
+_database = None
+
+def get_database():
+    global _database
+    if _database is None or _database.path != database_path:
+        _database = TuningDatabase(database_path)
+    return _database
+
+#------------------------------------------------------------------------
+# Runtime Tuning
+#------------------------------------------------------------------------
+
+# Keep tuned kernels (and their callbacks) alive
+_kernels = []
+
+def kernel_key(llvm_module, kernel_names):
+    "A key identifying the scalar kernels, stable across processes"
+    digest = hashlib.sha1()
+    for i, name in enumerate(kernel_names):
+        ir = str(llvm_module.get_function_named(name))
+        digest.update(ir.replace(name, "kernel%d" % i).encode("utf-8"))
+    return digest.hexdigest()
+
+def layout(shape, strides, itemsize):
+    """
+    Describe the memory layout of an operand by its strides, e.g. 'C', 'F',
+    or the order of its dimensions (and '0' for broadcast dimensions).
+    """
+    dims = [i for i, extent in enumerate(shape) if extent > 1]
+    if all(strides[i] == 0 for i in dims) and dims:
+        return "0"
+
+    order = sorted((i for i in dims if strides[i]),
+                   key=lambda i: abs(strides[i]), reverse=True)
+    contig = bool(order) and abs(strides[order[-1]]) == itemsize
+    if order == sorted(order) and contig:
+        layout = "C"
+    elif order == sorted(order, reverse=True) and contig:
+        layout = "F"
+    else:
+        layout = "A" + "".join(map(str, order))
+
+    broadcast = [i for i in dims if strides[i] == 0]
+    if broadcast:
+        layout += "/" + "".join(map(str, broadcast))
+    return layout
+
+def ctypes_type(ltype):
+    "Map the LLVM type of a minivect kernel argument to a ctypes type"
+    if ltype.kind == lc.TYPE_POINTER:
+        return ctypes.c_void_p
+    elif ltype.kind == lc.TYPE_INTEGER:
+        return getattr(ctypes, "c_int%d" % ltype.width)
+    elif ltype.kind == lc.TYPE_FLOAT:
+        return ctypes.c_float
+    elif ltype.kind == lc.TYPE_DOUBLE:
+        return ctypes.c_double
+    raise NotImplementedError(ltype)
+
+class TunedKernel(object):
+    """
+    Runtime state of an autotuned minivect kernel:
+
+        operands:   [(dtype, ndim)] of the array operands (in argument order)
+        outputs:    indices of the array operands written by the kernel
+        names:      names of the LLVM functions of the candidates
+    """
+
+    def __init__(self, key, ndim, operands, outputs, names, fntype):
+        self.key = key
+        self.ndim = ndim
+        self.operands = operands
+        self.outputs = outputs
+        self.names = names
+
+        # The choice for the strides of the last tuned call, and the
+        # choices of this process by tuning key
+        self.choice = ctypes.c_int32(-1)
+        self.strides = (ctypes.c_ssize_t * sum(ndim for dtype, ndim
+                                                   in operands))()
+        self.choices = {}
+
+        argtypes = [ctypes_type(ltype) for ltype in fntype.args]
+        self.kernel_type = ctypes.CFUNCTYPE(None, *argtypes)
+        callback_type = ctypes.CFUNCTYPE(ctypes.c_int32, *argtypes)
+        self.callback = callback_type(self.tune)
+
+        _kernels.append(self)
+
+    @property
+    def choice_address(self):
+        return ctypes.addressof(self.choice)
+
+    @property
+    def strides_address(self):
+        return ctypes.addressof(self.strides)
+
+    @property
+    def callback_address(self):
+        return ctypes.cast(self.callback, ctypes.c_void_p).value
+
+    def tuning_key(self, shape, strides):
+        dtypes = ",".join(str(dtype) for dtype, ndim in self.operands)
+        layouts = ",".join(
+            layout(shape[self.ndim - ndim:], strides[i], dtype.itemsize)
+                for i, (dtype, ndim) in enumerate(self.operands))
+        return "%s|%s|%s|%s" % (self.key, dtypes, layouts, cpu_name())
+
+    def tune(self, shape_p, *args):
+        "Callback from the dispatcher, returns the index of the candidate"
+        shape = list((ctypes.c_ssize_t * self.ndim).from_address(shape_p))
+        strides = []
+        for i, (dtype, ndim) in enumerate(self.operands):
+            strides_p = args[2 * i + 1]
+            strides.append(list((ctypes.c_ssize_t * ndim).from_address(
+                                                                strides_p)))
+
+        key = self.tuning_key(shape, strides)
+        choice = self.choices.get(key)
+        if choice is None:
+            try:
+                choice = self._tune(key, shape, strides, shape_p, list(args))
+            except Exception:
+                logger.exception("Autotuning failed")
+                choice = 0
+            self.choices[key] = choice
+
+        # Candidates are all correct, so a racing call that sees the choice
+        # of other strides only runs slower
+        self.strides[:] = sum(strides, [])
+        self.choice.value = choice
+        return choice
+
+    def _tune(self, key, shape, strides, shape_p, args):
+        from numba.codegen.llvmcontext import LLVMContextManager
+
+        names = [candidate.specialization_name for candidate in candidates]
+        database = get_database()
+        if database.get(key) in names:
+            return names.index(database.get(key))
+
+        # Write outputs to scratch buffers with the same strides, as
+        # outputs may be read by the kernel (a[...] = a * 2)
+        scratch = []
+        for i in self.outputs:
+            dtype, ndim = self.operands[i]
+            extents = shape[self.ndim - ndim:]
+            lower = sum(min(0, (n - 1) * s) for n, s in zip(extents,
+                                                            strides[i]))
+            upper = sum(max(0, (n - 1) * s) for n, s in zip(extents,
+                                                            strides[i]))
+            buf = np.empty(upper - lower + dtype.itemsize, dtype=np.uint8)
+            scratch.append(buf)
+            args[2 * i] = buf.ctypes.data - lower
+
+        # The candidates are linked into the executable module
+        context = LLVMContextManager()
+        timings = []
+        for name in self.names:
+            lfunc = context.module.get_function_named(name)
+            kernel = self.kernel_type(context.get_pointer_to_function(lfunc))
+            best = None
+            for _ in range(repeat):
+                t = time.time()
+                kernel(shape_p, *args)
+                t = time.time() - t
+                best = t if best is None else min(best, t)
+            timings.append(best)
+
+        choice = timings.index(min(timings))
+        logger.debug("Tuned %s: %s (%s)", key, names[choice],
+                     ", ".join("%s=%.6f" % item
+                                   for item in zip(names, timings)))
+        database.put(key, names[choice])
+        return choice
+
+#------------------------------------------------------------------------
+# Dispatcher
+#------------------------------------------------------------------------
+
+def build_dispatcher(llvm_module, name, tuned_kernel, lfuncs):
+    """
+    Build a function with the signature of the candidate minivect kernels
+    that dispatches to the tuned candidate.
+    """
+    fntype = lfuncs[0].type.pointee
+    lfunc = llvm_module.add_function(fntype, name)
+    args = list(lfunc.args)
+
+    entry = lfunc.append_basic_block("entry")
+    untuned = lfunc.append_basic_block("untuned")
+    tune = lfunc.append_basic_block("tune")
+    dispatch = lfunc.append_basic_block("dispatch")
+    default = lfunc.append_basic_block("default")
+    blocks = [lfunc.append_basic_block("candidate%d" % i)
+                  for i in range(len(lfuncs))]
+
+    int32 = llvm_types._int32
+    intp = llvm_types._intp
+
+    def constant_pointer(address, type):
+        return lc.Constant.int(intp, address).inttoptr(lc.Type.pointer(type))
+
+    b = lc.Builder.new(entry)
+    choice_p = constant_pointer(tuned_kernel.choice_address, int32)
+    choice = b.load(choice_p)
+    is_tuned = b.icmp(lc.ICMP_SGE, choice, lc.Constant.int(int32, 0))
+
+    # The choice holds for the strides of the last tuned call
+    tuned_strides = constant_pointer(tuned_kernel.strides_address, intp)
+    k = 0
+    for i, (dtype, ndim) in enumerate(tuned_kernel.operands):
+        strides = args[2 * i + 2]
+        for dim in range(ndim):
+            stride = b.load(b.gep(strides, [lc.Constant.int(int32, dim)]))
+            tuned = b.load(b.gep(tuned_strides, [lc.Constant.int(int32, k)]))
+            is_tuned = b.and_(is_tuned, b.icmp(lc.ICMP_EQ, stride, tuned))
+            k += 1
+
+    b.cbranch(is_tuned, dispatch, untuned)
+
+    # Tune only on large inputs
+    b.position_at_end(untuned)
+    shape = args[0]
+    size = lc.Constant.int(intp, 1)
+    for i in range(tuned_kernel.ndim):
+        size = b.mul(size, b.load(b.gep(shape, [lc.Constant.int(int32, i)])))
+    b.cbranch(b.icmp(lc.ICMP_SGE, size,
+                     lc.Constant.int(intp, min_tuning_size)),
+              tune, default)
+
+    b.position_at_end(tune)
+    callback_type = lc.Type.function(int32, list(fntype.args))
+    callback = constant_pointer(tuned_kernel.callback_address, callback_type)
+    tuned_choice = b.call(callback, args)
+    b.branch(dispatch)
+
+    b.position_at_end(dispatch)
+    phi = b.phi(int32)
+    phi.add_incoming(choice, entry)
+    phi.add_incoming(tuned_choice, tune)
+    switch = b.switch(phi, default, len(lfuncs))
+    for i, block in enumerate(blocks):
+        switch.add_case(lc.Constant.int(int32, i), block)
+
+    b.position_at_end(default)
+    b.branch(blocks[0])
+
+    for block, candidate in zip(blocks, lfuncs):
+        b.position_at_end(block)
+        result = b.call(candidate, args)
+        if fntype.return_type.kind == lc.TYPE_VOID:
+            b.ret_void()
+        else:
+            b.ret(result)
+
+    return lfunc
+
+def build_tuned_kernel(context, llvm_module, minikernel, operand_types,
+                       kernel_names, outputs):
+    """
+    Specialize the minivect function with all candidates, and build a
+    dispatcher in the given LLVM module, which is returned.
+
+        operand_types: the types of the arguments of the minivect function
+        kernel_names:  the names of the scalar kernels it calls
+        outputs:       indices of the arguments which are written to
+    """
+    lfuncs = [context.run_simple(minikernel, candidate)[0]
+                  for candidate in candidates]
+
+    arrays = [i for i, type in enumerate(operand_types) if type.is_array]
+    operands = [(operand_types[i].dtype, operand_types[i].ndim)
+                    for i in arrays]
+    outputs = [arrays.index(i) for i in outputs]
+
+    key = kernel_key(llvm_module, kernel_names)
+    tuned_kernel = TunedKernel(key, minikernel.ndim, operands, outputs,
+                               [lfunc.name for lfunc in lfuncs],
+                               lfuncs[0].type.pointee)
+    return build_dispatcher(llvm_module, lfuncs[0].name + "_tuned",
+                            tuned_kernel, lfuncs)
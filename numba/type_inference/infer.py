@@ -19,6 +19,7 @@ from numba.type_inference.modules import mathmodule
 from numba.type_inference import module_type_inference, infer_call, deferred
 from numba import utils, typesystem
 from numba.control_flow import ssa
+from numba.specialize import loopimpl
 from numba.typesystem import ssatypes
 from numba.typesystem.ssatypes import kosaraju_strongly_connected
 from numba.symtab import Variable
@@ -40,6 +41,22 @@ logger = logging.getLogger(__name__)
 if debug:
     logger.setLevel(logging.DEBUG)
 
+# Special methods of extension types that implement binary operators
+binop_special_methods = {
+    ast.Add: '__add__',
+    ast.Sub: '__sub__',
+    ast.Mult: '__mul__',
+    ast.Div: '__truediv__' if PY3 else '__div__',
+    ast.FloorDiv: '__floordiv__',
+    ast.Mod: '__mod__',
+    ast.Pow: '__pow__',
+    ast.LShift: '__lshift__',
+    ast.RShift: '__rshift__',
+    ast.BitAnd: '__and__',
+    ast.BitOr: '__or__',
+    ast.BitXor: '__xor__',
+}
+
 def lookup_global(env, name, position_node):
     func_env = env.translation.crnt
 
@@ -544,7 +561,20 @@ class TypeInferer(visitors.NumbaTransformer):
                                                                   ast.Tuple)):
             return self._handle_unpacking(node)
 
-        target = node.targets[0] = self.visit(node.targets[0])
+        target = node.targets[0]
+        if isinstance(target, ast.Subscript):
+            target.value = self.visit(target.value)
+            target.slice = self.visit(target.slice)
+            value_type = target.value.variable.type
+            if value_type and value_type.is_extension:
+                new_node = self._resolve_extension_setitem(node, target)
+                if new_node is not None:
+                    return new_node
+            target = self.visit_Subscript(target, visitchildren=False)
+        else:
+            target = self.visit(target)
+
+        node.targets[0] = target
         self.assign(target, node.value)
 
         lhs_var = target.variable
@@ -617,7 +647,7 @@ class TypeInferer(visitors.NumbaTransformer):
 
         node.target = self.visit(node.target)
         node.iter = self.visit(node.iter)
-        base_type = typesystem.element_type(node.iter.variable.type)
+        base_type = loopimpl.element_type(node.iter.variable.type)
         self.assign(node.target, None, rhs_var=Variable(base_type))
 
         if self.analyse:
@@ -816,6 +846,12 @@ class TypeInferer(visitors.NumbaTransformer):
 
         return node
 
+    def _verify_vector_op(self, node, vector_type):
+        if not isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
+            raise error.NumbaError(
+                node, "Unsupported operation on vectors of type %s" %
+                                                            vector_type)
+
     def _verify_pointer_type(self, node, v1, v2):
         pointer_type = self.have_types(v1, v2, "is_pointer", "is_int")
 
@@ -833,10 +869,35 @@ class TypeInferer(visitors.NumbaTransformer):
             raise error.NumbaError(
                     node, "Cannot perform pointer arithmetic on void *")
 
+    def _resolve_extension_binop(self, node):
+        """
+        Call the typed special method of an extension type operand, i.e.
+        left.__add__(right), or right.__radd__(left) for numeric left
+        operands. Returns None if there is no such method.
+        """
+        attr = binop_special_methods.get(type(node.op))
+        left_type = node.left.variable.type
+        right_type = node.right.variable.type
+
+        if attr is None:
+            return None
+        elif left_type.is_extension:
+            return nodes.call_special_method(node.left, attr, [node.right])
+        elif right_type.is_extension and left_type.is_numeric:
+            reflected_attr = '__r%s' % attr[2:]
+            return nodes.call_special_method(node.right, reflected_attr,
+                                             [node.left])
+
+        return None
+
     def visit_BinOp(self, node):
         node.left = self.visit(node.left)
         node.right = self.visit(node.right)
 
+        new_node = self._resolve_extension_binop(node)
+        if new_node is not None:
+            return new_node
+
         if nodes.is_bitwise(node.op):
             # TODO: Do this better
             typesystem.require(
@@ -849,6 +910,8 @@ class TypeInferer(visitors.NumbaTransformer):
 
         if promoted_type.is_pointer:
             self._verify_pointer_type(node, v1, v2)
+        elif promoted_type.is_vector:
+            self._verify_vector_op(node, promoted_type)
         elif not ((v1.type.is_array and v2.type.is_array) or
                   (v1.type.is_unresolved or v2.type.is_unresolved)):
             # Don't coerce arrays to lesser or higher dimensionality
@@ -947,6 +1010,41 @@ class TypeInferer(visitors.NumbaTransformer):
         else:
             return type, None
 
+    def _extension_index(self, node):
+        "The index node of a subscript of an extension object, or None"
+        if (isinstance(node.slice, ast.Index) and
+                node.slice.variable.type.is_int):
+            return node.slice.value
+
+        return None
+
+    def _resolve_extension_getitem(self, node):
+        """
+        Call the typed __getitem__ of an extension object for obj[i], or
+        return None to index it through the object protocol.
+        """
+        index = self._extension_index(node)
+        if index is None or not isinstance(node.ctx, ast.Load):
+            return None
+
+        return nodes.call_special_method(node.value, '__getitem__', [index])
+
+    def _resolve_extension_setitem(self, assmnt_node, target):
+        """
+        Call the typed __setitem__ of an extension object for obj[i] = value,
+        or return None to assign through the object protocol.
+        """
+        index = self._extension_index(target)
+        if index is None:
+            return None
+
+        call = nodes.call_special_method(target.value, '__setitem__',
+                                         [index, assmnt_node.value])
+        if call is None:
+            return None
+
+        return ast.copy_location(ast.Expr(value=call), assmnt_node)
+
     def visit_Subscript(self, node, visitchildren=True):
         if visitchildren:
             node.value = self.visit(node.value)
@@ -954,6 +1052,14 @@ class TypeInferer(visitors.NumbaTransformer):
 
         value = node.value
         value_type = node.value.variable.type
+
+        # Don't replace the node when retrying a deferred index, the
+        # original node stays in the AST
+        if visitchildren and value_type and value_type.is_extension:
+            new_node = self._resolve_extension_getitem(node)
+            if new_node is not None:
+                return new_node
+
         deferred_type = deferred.create_deferred(self, node,
                                                  typesystem.DeferredIndexType)
         if value_type and value_type.is_unresolved:
@@ -358,4 +358,6 @@ from numba.type_inference.modules import (numbamodule,
                                           numpymodule,
                                           numpyufuncs,
                                           builtinmodule,
-                                          mathmodule)
+                                          mathmodule,
+                                          simdmodule,
+                                          stringsmodule)
@@ -53,6 +53,11 @@ def len_(typesystem, node, obj):
         shape_attr = nodes.ArrayAttributeNode('shape', node.args[0])
         new_node = nodes.index(shape_attr, 0)
         return new_node
+    elif argtype.is_extension:
+        # Call a typed __len__ natively
+        new_node = nodes.call_special_method(node.args[0], '__len__', [])
+        if new_node is not None:
+            return nodes.CoercionNode(new_node, Py_ssize_t)
 
     return Py_ssize_t
 
@@ -11,17 +11,21 @@ Infer types for NumPy functionality. This includes:
 """
 from __future__ import print_function, division, absolute_import
 
+import ast
+import numbers
 import warnings
 from functools import reduce
 
 import numpy as np
 
 from numba import *
-from numba import typesystem, error
+from numba import typesystem, error, nodes
+from numba.symtab import Variable
 from numba.type_inference.module_type_inference import (register,
                                                         register_inferer,
                                                         register_unbound)
-from numba.typesystem import get_type
+from numba.typesystem import get_type, tuple_
+from numba.utility import numpy_utilities
 
 
 #------------------------------------------------------------------------
@@ -107,6 +111,30 @@ def array_from_type(type):
 # Resolution of NumPy calls
 #------------------------------------------------------------------------
 
+def native_call(typesystem, call_node, result_type, native):
+    """
+    Mark a call to be replaced by a call to a native implementation
+    (see numba.utility.numpy_utilities and LateSpecializer.visit_Call).
+
+        native: (function kind, array type, axis)
+    """
+    nodes.annotate(typesystem.env, call_node, numpy_native=native)
+    call_node.variable = Variable(result_type)
+    return call_node
+
+def constant_axis(axis_node, ndim):
+    "Return the normalized value of a constant axis argument, or None"
+    if isinstance(axis_node, nodes.ConstNode):
+        axis = axis_node.pyval
+    elif axis_node.variable.is_constant:
+        axis = axis_node.variable.constant_value
+    else:
+        return None
+
+    if isinstance(axis, numbers.Integral) and -ndim <= axis < ndim:
+        return axis % ndim
+    return None
+
 @register(np)
 def dtype(obj, align):
     "Parse np.dtype(...) calls"
@@ -191,22 +219,81 @@ def array(object, dtype, order, subok):
     else:
         return type
 
-@register(np)
-def nonzero(a):
-    return _nonzero(array_from_type(a))
+@register(np, pass_in_callnode=True)
+def nonzero(typesystem, call_node, a):
+    return _nonzero(typesystem, call_node, array_from_type(a))
 
-def _nonzero(type):
+def _nonzero(typesystem, call_node, type):
     if type.is_array:
-        return typesystem.tuple_(index_array_t, type.ndim)
+        result_type = tuple_(index_array_t, type.ndim)
+        if (len(call_node.args) == 1 and not call_node.keywords and
+                numpy_utilities.is_supported('nonzero', type)):
+            return native_call(typesystem, call_node, result_type,
+                               ('nonzero', type, None))
+        return result_type
     else:
-        return typesystem.tuple_(index_array_t)
+        return tuple_(index_array_t)
 
-@register(np)
-def where(typesystem, condition, x, y):
+@register(np, pass_in_callnode=True)
+def where(typesystem, call_node, condition, x, y):
     if x is None and y is None:
-        return nonzero(condition)
+        return nonzero(typesystem, call_node, condition)
+
+    result_type = promote(typesystem, condition, x, y)
+    if result_type.is_object:
+        return result_type
+
+    dtype = typesystem.promote(demote_to_scalar(array_from_type(x)),
+                               demote_to_scalar(array_from_type(y)))
+    result_type = demote_to_scalar(result_type.add('dtype', dtype))
+    if len(call_node.args) != 3:
+        return result_type
+
+    if not result_type.is_array:
+        # Scalar select, no need to go through the array expression
+        # machinery
+        condition, x, y = call_node.args
+        result = ast.IfExp(test=nodes.CoercionNode(condition, bool_),
+                           body=nodes.CoercionNode(x, dtype),
+                           orelse=nodes.CoercionNode(y, dtype))
+        return nodes.typednode(result, dtype)
+
+    # Element-wise select, fused into the surrounding array expression
+    # (see array_expressions.py and ufunc_builder.py)
+    nodes.annotate(typesystem.env, call_node, is_where=True)
+    call_node.variable = Variable(result_type)
+    return call_node
+
+def argreduce(kind):
+    "Build a type function for np.argmin/np.argmax"
+    def infer(typesystem, call_node, a, axis, out):
+        a_type = get_type(a)
+        if out is not None or not a_type.is_array:
+            return object_ if out is None else get_type(out)
+
+        if axis is None:
+            native = (kind, a_type, None)
+            result_type = npy_intp
+        else:
+            axis = constant_axis(axis, a_type.ndim)
+            if axis is None:
+                # Axis only known at runtime
+                return object_
+            native = (kind, a_type, axis)
+            result_type = demote_to_scalar(typesystem.array(npy_intp,
+                                                            a_type.ndim - 1))
+
+        if not numpy_utilities.is_supported(kind, a_type):
+            return result_type
+
+        return native_call(typesystem, call_node, result_type, native)
+
+    return infer
 
-    return promote(typesystem, x, y)
+register_inferer(np, 'argmax', argreduce('argmax'),
+                 pass_in_types=False, pass_in_callnode=True)
+register_inferer(np, 'argmin', argreduce('argmin'),
+                 pass_in_types=False, pass_in_callnode=True)
 
 @register(np)
 def vdot(typesystem, a, b):
@@ -7,7 +7,8 @@ from __future__ import print_function, division, absolute_import
 import numpy as np
 
 from numba import *
-from numba import typesystem
+from numba import typesystem, nodes
+from numba.symtab import Variable
 from numba.typesystem import numpy_support
 from numba.type_inference.module_type_inference import (module_registry,
                                                         register,
@@ -19,6 +20,7 @@ from numba.type_inference.modules.numpymodule import (get_dtype,
                                                       promote,
                                                       promote_to_array,
                                                       demote_to_scalar)
+from numba.utility import reductions
 
 #----------------------------------------------------------------------------
 # Utilities
@@ -166,6 +168,37 @@ def reduce_(a, axis, dtype, out, static_dtype=None):
 def reduce_bool(a, axis, dtype, out):
     return reduce_(a, axis, dtype, out, bool_)
 
+def native_reduction(typesystem, call_node, kind, a, result_type):
+    """
+    Reduce an entire array natively, fused with any array expression
+    argument (see numba.utility.reductions and array_expressions.py).
+    """
+    if (len(call_node.args) != 1 or call_node.keywords or
+            not reductions.is_supported(get_type(a), result_type)):
+        return result_type
+
+    nodes.annotate(typesystem.env, call_node, reduction=kind)
+    call_node.variable = Variable(result_type)
+    return call_node
+
+def reduction(kind):
+    "Build a type function for np.sum/np.prod"
+    def infer(typesystem, call_node, a, axis, dtype, out):
+        types = [arg and get_type(arg) for arg in (a, axis, dtype, out)]
+        return native_reduction(typesystem, call_node, kind, a,
+                                reduce_(*types))
+
+    return infer
+
+def minmax(kind):
+    "Build a type function for np.amin/np.amax"
+    def infer(typesystem, call_node, a, axis, out):
+        types = [arg and get_type(arg) for arg in (a, axis, None, out)]
+        return native_reduction(typesystem, call_node, kind, a,
+                                reduce_(*types))
+
+    return infer
+
 def accumulate(a, axis, dtype, out, static_dtype=None):
     return demote_to_scalar(array_of_dtype(a, dtype, static_dtype, out))
 
@@ -233,8 +266,17 @@ if not PY3:
 # Register our type functions
 #------------------------------------------------------------------------
 
-register_inferer(np, 'sum', reduce_)
-register_inferer(np, 'prod', reduce_)
+def register_reduction(attr, infer):
+    register_inferer(np, attr, infer,
+                     pass_in_types=False, pass_in_callnode=True)
+
+register_reduction('sum', reduction('sum'))
+register_reduction('prod', reduction('prod'))
+register_reduction('amin', minmax('min'))
+register_reduction('amax', minmax('max'))
+if np.min is not np.amin:
+    register_reduction('min', minmax('min'))
+    register_reduction('max', minmax('max'))
 
 def register_arithmetic_ufunc(register_inferer, register_unbound, binary_ufunc):
     register_inferer(np, binary_ufunc, binary_map)
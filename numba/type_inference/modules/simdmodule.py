@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Type functions for numba.simd, which produce the nodes in
+nodes/vectornodes.py.
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+
+from numba import simd
+from numba import error, nodes, typesystem
+from numba.type_inference.module_type_inference import register
+
+#----------------------------------------------------------------------------
+# Utilities
+#----------------------------------------------------------------------------
+
+def get_vector_type(node):
+    "Get the vector type from a vector type argument, e.g. float32x8"
+    type = node.variable.type
+    if not (type.is_cast and type.dst_type.is_vector):
+        raise error.NumbaError(node, "Expected a vector type, got %s" % type)
+
+    vector_type = type.dst_type
+    if not (vector_type.base_type.is_int or vector_type.base_type.is_float):
+        raise error.NumbaError(
+            node, "Vectors must consist of integers or floats, got %s" %
+                                                    vector_type.base_type)
+    return vector_type
+
+def require_vector(node):
+    if not node.variable.type.is_vector:
+        raise error.NumbaError(node, "Expected a vector, got %s" % node.type)
+
+def require_int(node):
+    if not node.variable.type.is_int:
+        raise error.NumbaError(node, "Expected an integer index, got %s" %
+                                                        node.variable.type)
+
+def constant_value(node):
+    "Return the value of a constant expression, or None"
+    if isinstance(node, ast.Tuple):
+        values = [constant_value(elt) for elt in node.elts]
+        if None in values:
+            return None
+        return tuple(values)
+
+    variable = node.variable
+    if variable.is_constant:
+        return variable.constant_value
+
+    return None
+
+def get_indices(base, index, element_type):
+    """
+    Get the list of index nodes for a vector load or store of elements of
+    type 'element_type' from an array or pointer
+    """
+    base_type = base.variable.type
+    if base_type.is_array:
+        ndim = base_type.ndim
+        base_element_type = base_type.dtype
+    elif base_type.is_pointer:
+        ndim = 1
+        base_element_type = base_type.base_type
+    else:
+        raise error.NumbaError(
+            base, "Expected an array or pointer, got %s" % base_type)
+
+    if base_element_type != element_type:
+        raise error.NumbaError(
+            base, "Cannot access elements of type %s as %s vector" % (
+                                        base_element_type, element_type))
+
+    if isinstance(index, ast.Tuple):
+        indices = list(index.elts)
+    else:
+        indices = [index]
+
+    if len(indices) != ndim:
+        raise error.NumbaError(
+            index, "Expected %d indices, got %d" % (ndim, len(indices)))
+
+    for index in indices:
+        require_int(index)
+
+    return indices
+
+#----------------------------------------------------------------------------
+# Type Functions
+#----------------------------------------------------------------------------
+
+@register(simd, pass_in_types=False)
+def load(type, array, index):
+    vector_type = get_vector_type(type)
+    indices = get_indices(array, index, vector_type.base_type)
+    return nodes.VectorLoadNode(vector_type, array, indices)
+
+@register(simd, pass_in_types=False)
+def store(value, array, index):
+    require_vector(value)
+    indices = get_indices(array, index, value.variable.type.base_type)
+    return nodes.VectorStoreNode(value, array, indices)
+
+@register(simd, pass_in_types=False)
+def splat(type, value):
+    vector_type = get_vector_type(type)
+    if not value.variable.type.is_numeric:
+        raise error.NumbaError(value, "Cannot broadcast value of type %s" %
+                                                    value.variable.type)
+    return nodes.CoercionNode(value, vector_type)
+
+@register(simd, pass_in_types=False)
+def shuffle(a, b, mask):
+    require_vector(a)
+    if a.variable.type != b.variable.type:
+        raise error.NumbaError(
+            b, "Cannot shuffle vectors of different types %s and %s" % (
+                                    a.variable.type, b.variable.type))
+
+    mask_value = constant_value(mask)
+    nelements = 2 * a.variable.type.size
+    if (not isinstance(mask_value, tuple) or not mask_value or
+            not all(isinstance(i, (int, long)) and 0 <= i < nelements
+                        for i in mask_value)):
+        raise error.NumbaError(
+            mask, "Shuffle mask must be a constant tuple of indices "
+                  "smaller than %d" % nelements)
+
+    return nodes.VectorShuffleNode(a, b, list(mask_value))
+
+@register(simd, pass_in_types=False)
+def extract(value, index):
+    require_vector(value)
+    require_int(index)
+    return nodes.VectorExtractNode(value, index)
+
+@register(simd, pass_in_types=False)
+def insert(value, index, element):
+    require_vector(value)
+    require_int(index)
+    element_type = value.variable.type.base_type
+    return nodes.VectorInsertNode(value, index,
+                                  nodes.CoercionNode(element, element_type))
+
+@register(simd, pass_in_types=False)
+def sum(value):
+    require_vector(value)
+    return nodes.VectorReduceNode(value)
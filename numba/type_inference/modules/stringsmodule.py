@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Type functions for numba.strings, which produce StringCallNode nodes (see
+nodes/stringnodes.py).
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+
+from numba import strings
+from numba import error, nodes
+from numba.typesystem import npy_intp
+from numba.utility import string_utilities
+from numba.type_inference.module_type_inference import register
+
+# Default stop offset, which is clipped to the length of the buffer
+max_offset = np.iinfo(np.intp).max
+
+#----------------------------------------------------------------------------
+# Utilities
+#----------------------------------------------------------------------------
+
+def is_byte(type):
+    return type.is_int and type.itemsize == 1
+
+def is_buffer(type):
+    "Whether values of the type are byte buffers for numba.strings"
+    return (type.is_string or
+            (type.is_array and type.ndim == 1 and is_byte(type.dtype)) or
+            (type.is_pointer and is_byte(type.base_type)))
+
+def buffers_supported(*buffers):
+    """
+    Whether the arguments are native byte buffers. Otherwise (e.g. for
+    objects in object mode) the call is left to the Python functions.
+    """
+    return all(is_buffer(buf.variable.type) for buf in buffers)
+
+def require_int(node):
+    if not node.variable.type.is_int:
+        raise error.NumbaError(node, "Expected an integer offset, got %s" %
+                                                        node.variable.type)
+
+def offset(node, default):
+    "An offset argument, or the default offset if it is not given"
+    if node is None:
+        return nodes.const(default, npy_intp)
+    require_int(node)
+    return node
+
+def require_array(node, ndim, dtype_check, description):
+    type = node.variable.type
+    if not (type.is_array and type.ndim == ndim and dtype_check(type.dtype)):
+        raise error.NumbaError(
+            node, "Expected %s, got %s" % (description, type))
+
+def call(name, *args):
+    return nodes.StringCallNode(name, list(args),
+                                string_utilities.return_types[name])
+
+#----------------------------------------------------------------------------
+# Type Functions
+#----------------------------------------------------------------------------
+
+@register(strings, pass_in_types=False)
+def find(buf, sub, start, stop):
+    if buffers_supported(buf, sub):
+        return call('find', buf, sub, offset(start, 0),
+                    offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def startswith(buf, prefix, start):
+    if buffers_supported(buf, prefix):
+        return call('startswith', buf, prefix, offset(start, 0))
+
+@register(strings, pass_in_types=False)
+def endswith(buf, suffix, stop):
+    if buffers_supported(buf, suffix):
+        return call('endswith', buf, suffix, offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def split(buf, sep, out, start, stop):
+    if buffers_supported(buf, sep):
+        require_array(out, 2, lambda dtype: dtype.is_int,
+                      "a 2D integer array for the field offsets")
+        return call('split', buf, sep, out, offset(start, 0),
+                    offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def hash(buf, start, stop):
+    if buffers_supported(buf):
+        return call('hash', buf, offset(start, 0), offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def concat(dst, pos, src, start, stop):
+    if buffers_supported(dst, src):
+        require_array(dst, 1, is_byte, "a byte array as destination")
+        return call('concat', dst, offset(pos, 0), src, offset(start, 0),
+                    offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def parse_int(buf, start, stop):
+    if buffers_supported(buf):
+        return call('parse_int', buf, offset(start, 0),
+                    offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def parse_float(buf, start, stop):
+    if buffers_supported(buf):
+        return call('parse_float', buf, offset(start, 0),
+                    offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def parse_ints(buf, sep, out, start, stop):
+    if buffers_supported(buf, sep):
+        require_array(out, 1, lambda dtype: dtype.is_int,
+                      "a 1D integer array")
+        return call('parse_ints', buf, sep, out, offset(start, 0),
+                    offset(stop, max_offset))
+
+@register(strings, pass_in_types=False)
+def parse_floats(buf, sep, out, start, stop):
+    if buffers_supported(buf, sep):
+        require_array(out, 1, lambda dtype: dtype.is_float,
+                      "a 1D floating point array")
+        return call('parse_floats', buf, sep, out, offset(start, 0),
+                    offset(stop, max_offset))
@@ -60,4 +60,5 @@ def pointer(base_type):
         return string_
     return  ctypes.POINTER(base_type)
 
-carray  = consing(lambda base_type, size: base_type * size)
\ No newline at end of file
+carray  = consing(lambda base_type, size: base_type * size)
+vector  = carray
\ No newline at end of file
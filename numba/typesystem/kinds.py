@@ -21,6 +21,7 @@ KIND_ARRAY      = "array"
 KIND_POINTER    = "pointer"
 KIND_NULL       = "null"
 KIND_CARRAY     = "carray"
+KIND_VECTOR     = "vector"
 KIND_STRUCT     = "struct"
 
 # High-level Numba kinds
@@ -67,4 +67,5 @@ def pointer(base_type):
 def function(rettype, argtypes, name=None, is_vararg=False):
     return llvm.core.Type.function(rettype, argtypes, is_vararg)
 
-carray = llvm.core.Type.array
\ No newline at end of file
+carray = llvm.core.Type.array
+vector = llvm.core.Type.vector
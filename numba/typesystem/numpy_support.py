@@ -99,6 +99,8 @@ def to_dtype(type):
         return np.dtype(fields, align=not type.packed)
     elif type.is_array and type.ndim == 1:
         return to_dtype(type.dtype)
+    elif type.is_vector:
+        return np.dtype((to_dtype(type.base_type), type.size))
     elif type in typemap:
         return typemap[type]
     elif type.is_int:
@@ -105,6 +105,28 @@ def promote_array_and_other(u, promote, type1, type2):
     dtype = promote(array_type.dtype, other_type)
     return u.array(dtype, array_type.ndim)
 
+#------------------------------------------------------------------------
+# Vector promotion
+#------------------------------------------------------------------------
+
+def promote_vector_and_other(u, promote, type1, type2):
+    "Promote a vector and a scalar, which is broadcast to the vector type"
+    if type1.is_vector:
+        vector_type, other_type = type1, type2
+    else:
+        vector_type, other_type = type2, type1
+
+    if not (other_type.is_int or other_type.is_float):
+        raise error.UnpromotableTypeError((type1, type2))
+
+    # Scalars do not change the element type, e.g. (float32x8, double) ->
+    # float32x8, but we do not truncate floats to integer vectors
+    base_type = vector_type.base_type
+    if promote(base_type, other_type).kind != base_type.kind:
+        raise error.UnpromotableTypeError((type1, type2))
+
+    return vector_type
+
 #------------------------------------------------------------------------
 # Default type promotion
 #------------------------------------------------------------------------
@@ -126,6 +148,10 @@ class DefaultPromoter(object):
 
         if result is not None:
             return result
+        elif type1.is_vector and type2.is_vector:
+            raise error.UnpromotableTypeError((type1, type2))
+        elif type1.is_vector or type2.is_vector:
+            return promote_vector_and_other(*args)
         elif type1.is_numeric and type2.is_numeric:
             return promote_numeric(*args)
         elif type1.is_array and type2.is_array:
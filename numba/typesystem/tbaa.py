@@ -21,3 +21,6 @@ numpy_ndim = TBAAType("numpy flags", npy_intp.pointer())
 numpy_dtype = TBAAType("numpy dtype", object_)
 numpy_base = TBAAType("numpy base", object_)
 numpy_flags = TBAAType("numpy flags", npy_intp.pointer())
+
+# Shape and strides of the operands of minivect kernels (array_expressions.py)
+kernel_extents = TBAAType("kernel extents", npy_intp.pointer())
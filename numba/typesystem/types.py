@@ -388,6 +388,21 @@ class sized_pointer(NumbaType):
 class carray(NumbaType):
     argnames = ["base_type", "size"]
 
+@consing
+class vector(NumbaType):
+    """
+    SIMD vector of 'size' integers or floats, e.g. vector(float32, 8).
+    See numba/simd.py for the operations on vectors.
+    """
+    argnames = ["base_type", "size"]
+
+    @property
+    def itemsize(self):
+        return self.base_type.itemsize * self.size
+
+    def __repr__(self):
+        return "%sx%d" % (self.base_type, self.size)
+
 # ______________________________________________________________________
 # Structs
 
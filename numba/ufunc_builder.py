@@ -121,6 +121,12 @@ class UFuncConverter(ast.NodeTransformer):
         if nodes.query(self.env, node, "is_math") and node.type.is_array:
             self.demote_type(node)
             node.args = list(map(self.visit_scalar_or_array, node.args))
+        elif nodes.query(self.env, node, "is_where") and node.type.is_array:
+            # np.where(cond, x, y) -> x if cond else y
+            dtype = self.demote(node.type)
+            cond, x, y = map(self.visit_scalar_or_array, node.args)
+            node = nodes.typednode(ast.IfExp(test=cond, body=x, orelse=y),
+                                   dtype)
         else:
             node = self.generic_visit(node)
         return node
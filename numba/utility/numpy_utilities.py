@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Native implementations of NumPy functions that do not map onto an
+element-wise kernel: np.argmax, np.argmin and np.nonzero.
+
+The implementations are generated as Python source for a given array
+type (and reduction axis), compiled with numba and linked into the global
+module. Call sites are rewritten to NativeCallNode nodes by the
+LateSpecializer (see transforms.py).
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+
+import numpy as np
+
+from numba import *
+from numba import typesystem
+
+# Result returned by the argmin/argmax kernels for empty input. The call
+# site turns this into a ValueError.
+EMPTY = -1
+
+_cache = {}
+
+#------------------------------------------------------------------------
+# Source Generation
+#------------------------------------------------------------------------
+
+def _indent(lines, level):
+    return ["    " * level + line for line in lines]
+
+def _index(names):
+    return "a[%s]" % ", ".join(names)
+
+def _loop_nest(dims, body, level):
+    "Wrap the body lines in a loop nest over the given dimensions"
+    lines = []
+    for depth, dim in enumerate(dims):
+        lines.append("    " * (level + depth) +
+                     "for i%d in range(a.shape[%d]):" % (dim, dim))
+
+    lines.extend(_indent(body, level + len(dims)))
+    return lines
+
+def _better(kind, dtype):
+    "Comparison that selects a new candidate (NaNs win, like NumPy)"
+    if dtype.is_float:
+        if kind == 'argmax':
+            return "not value <= best"
+        return "not value >= best"
+
+    if kind == 'argmax':
+        return "value > best"
+    return "value < best"
+
+def argreduce_source(kind, dtype, ndim):
+    "Reduce the entire (C-ordered) array to a flat index"
+    idx = ["i%d" % i for i in range(ndim)]
+    first = _index(["0"] * ndim)
+
+    body = ["value = %s" % _index(idx),
+            "if %s:" % _better(kind, dtype),
+            "    best = value",
+            "    result = flat"]
+    if dtype.is_float:
+        body.append("    if best != best: return result")
+    body.append("flat += 1")
+
+    lines = ["def %s(a):" % kind]
+    lines.extend(_indent(["if %s: return %d" % (
+                             " or ".join("a.shape[%d] == 0" % i
+                                         for i in range(ndim)), EMPTY),
+                          "best = %s" % first,
+                          "result = 0",
+                          "flat = 0"], 1))
+    lines.extend(_loop_nest(range(ndim), body, 1))
+    lines.append("    return result")
+    return "\n".join(lines)
+
+def argreduce_axis_source(kind, dtype, ndim, axis):
+    "Reduce along a single axis, producing an array of indices"
+    outer = [dim for dim in range(ndim) if dim != axis]
+    idx = ["i%d" % i for i in range(ndim)]
+    first = list(idx)
+    first[axis] = "0"
+
+    inner = ["value = %s" % _index(idx),
+             "if %s:" % _better(kind, dtype),
+             "    best = value",
+             "    result = i%d" % axis]
+    if dtype.is_float:
+        inner.append("    if best != best: break")
+
+    # Start at 0, so that a leading NaN is selected like in NumPy
+    body = ["best = %s" % _index(first),
+            "result = 0",
+            "for i%d in range(a.shape[%d]):" % (axis, axis)]
+    body.extend(_indent(inner, 1))
+    body.append("out[%s] = result" % ", ".join(idx[dim] for dim in outer))
+
+    shape = "".join("a.shape[%d], " % dim for dim in outer)
+    lines = ["def %s(a):" % kind,
+             "    if a.shape[%d] == 0:" % axis,
+             "        raise ValueError('attempt to get %s of an "
+                                      "empty sequence')" % kind,
+             "    out = np.empty((%s), dtype=np.intp)" % shape]
+    lines.extend(_loop_nest(outer, body, 1))
+    lines.append("    return out")
+    return "\n".join(lines)
+
+def nonzero_source(dtype, ndim):
+    idx = ["i%d" % i for i in range(ndim)]
+    test = "if %s != 0:" % _index(idx)
+
+    lines = ["def nonzero(a):",
+             "    count = 0"]
+    lines.extend(_loop_nest(range(ndim), [test, "    count += 1"], 1))
+    lines.extend("    idx%d = np.empty(count, dtype=np.intp)" % i
+                     for i in range(ndim))
+    lines.append("    k = 0")
+    body = [test]
+    body.extend("    idx%d[k] = i%d" % (i, i) for i in range(ndim))
+    body.append("    k += 1")
+    lines.extend(_loop_nest(range(ndim), body, 1))
+    lines.append("    return (%s,)" % ", ".join("idx%d" % i
+                                                 for i in range(ndim)))
+    return "\n".join(lines)
+
+#------------------------------------------------------------------------
+# Compilation
+#------------------------------------------------------------------------
+
+def is_supported(kind, array_type):
+    "Whether we can generate a native implementation for the array type"
+    dtype = array_type.dtype
+    return (array_type.ndim >= 1 and
+            (dtype.is_int or dtype.is_float or
+             (kind == 'nonzero' and dtype.is_bool)))
+
+def get_signature(kind, array_type, axis):
+    if kind == 'nonzero':
+        return typesystem.tuple_(npy_intp[:], array_type.ndim)(array_type)
+    elif axis is None or array_type.ndim == 1:
+        return npy_intp(array_type)
+    else:
+        return typesystem.array(npy_intp, array_type.ndim - 1)(array_type)
+
+def get_source(kind, array_type, axis):
+    dtype, ndim = array_type.dtype, array_type.ndim
+    if kind == 'nonzero':
+        return nonzero_source(dtype, ndim)
+    elif axis is None or ndim == 1:
+        return argreduce_source(kind, dtype, ndim)
+    else:
+        return argreduce_axis_source(kind, dtype, ndim, axis)
+
+def compile_utility(env, kind, array_type, axis=None):
+    """
+    Compile a native implementation of np.argmin/np.argmax/np.nonzero for
+    the given array type. Returns the linked LLVM function.
+    """
+    from numba import pipeline
+
+    key = (kind, array_type, axis)
+    if key in _cache:
+        return _cache[key]
+
+    signature = get_signature(kind, array_type, axis)
+    func_def = ast.parse(get_source(kind, array_type, axis)).body[0]
+    if axis is not None:
+        func_def.name = "%s_axis%d" % (func_def.name, axis)
+
+    if kind == 'nonzero':
+        locals = dict(count=npy_intp, k=npy_intp)
+    elif axis is None or array_type.ndim == 1:
+        locals = dict(result=npy_intp, flat=npy_intp)
+    else:
+        locals = dict(result=npy_intp)
+
+    func_env, (_, _, _) = pipeline.run_pipeline2(
+        env, None, func_def, signature,
+        function_globals=dict(np=np), locals=locals, wrap=False)
+
+    _cache[key] = func_env.lfunc
+    return func_env.lfunc
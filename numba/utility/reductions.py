@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Native reductions (np.sum, np.prod, np.amin and np.amax) of entire arrays,
+fused with an element-wise array expression argument:
+
+    np.sum(a * b + c)
+
+is evaluated in a single loop over the operands a, b and c that reduces
+into register accumulators, without materializing 'a * b + c'. The inner
+loop is unrolled with several independent accumulators, which breaks the
+dependence chain on a single accumulator and allows LLVM to vectorize it.
+
+The reduction is generated as Python source from the scalar kernel of the
+array expression (see ufunc_builder.py), compiled with numba and linked
+into the global module, like the utilities in numpy_utilities.py. The
+call is rewritten by ArrayExpressionRewriteNative (see array_expressions.py).
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+
+import numpy as np
+
+from numba import *
+from numba import error
+
+# Number of independent accumulators in the unrolled inner loop
+naccumulators = 4
+
+_cache = {}
+
+#------------------------------------------------------------------------
+# Reduction Kinds
+#------------------------------------------------------------------------
+
+# kind -> (operator name in error messages, identity)
+reductions = {
+    'sum':  ('add', 0),
+    'prod': ('multiply', 1),
+    'min':  ('minimum', None),
+    'max':  ('maximum', None),
+}
+
+def is_supported(array_type, result_type):
+    "Whether we can reduce arrays of the given type natively"
+    return (array_type.is_array and array_type.ndim >= 1 and
+            (array_type.dtype.is_int or array_type.dtype.is_float) and
+            (result_type.is_int or result_type.is_float))
+
+def update_source(kind, acc, value, result_type):
+    "Source lines that combine value into the accumulator"
+    if kind == 'sum':
+        return ["%s = %s + %s" % (acc, acc, value)]
+    elif kind == 'prod':
+        return ["%s = %s * %s" % (acc, acc, value)]
+
+    op = '<' if kind == 'min' else '>'
+    if result_type.is_float:
+        # Propagate NaNs, like NumPy
+        cond = "v %s %s or v != v" % (op, acc)
+    else:
+        cond = "v %s %s" % (op, acc)
+
+    return ["v = %s" % value,
+            "if %s:" % cond,
+            "    %s = v" % acc]
+
+#------------------------------------------------------------------------
+# Expression Source Generation
+#------------------------------------------------------------------------
+
+binops = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/',
+    ast.FloorDiv: '//', ast.Mod: '%', ast.Pow: '**', ast.LShift: '<<',
+    ast.RShift: '>>', ast.BitOr: '|', ast.BitXor: '^', ast.BitAnd: '&',
+}
+
+unops = {
+    ast.UAdd: '+', ast.USub: '-', ast.Invert: '~', ast.Not: 'not ',
+}
+
+class ExpressionSource(object):
+    """
+    Generate source for the expression of a scalar kernel, which consists
+    of BinOp, UnaryOp, IfExp, math calls and operands 'op0', 'op1', etc.
+
+        operands: maps operand names to their source
+        scalar:   whether to generate a scalar expression, or an
+                  array expression
+    """
+
+    def __init__(self, operands, scalar, globals):
+        self.operands = operands
+        self.scalar = scalar
+        self.globals = globals
+
+    def visit(self, node):
+        visitor = getattr(self, 'visit_' + type(node).__name__, None)
+        if visitor is None:
+            raise error.NumbaError(
+                node, "Cannot generate a reduction over %s" % (node,))
+        return visitor(node)
+
+    def visit_Name(self, node):
+        return self.operands[node.id]
+
+    def visit_BinOp(self, node):
+        return "(%s %s %s)" % (self.visit(node.left), binops[type(node.op)],
+                               self.visit(node.right))
+
+    def visit_UnaryOp(self, node):
+        return "(%s%s)" % (unops[type(node.op)], self.visit(node.operand))
+
+    def visit_IfExp(self, node):
+        args = (self.visit(node.test), self.visit(node.body),
+                self.visit(node.orelse))
+        if self.scalar:
+            return "(%s if %s else %s)" % (args[1], args[0], args[2])
+        return "np.where(%s, %s, %s)" % args
+
+    def visit_Call(self, node):
+        func = node.func.type.value
+        names = [name for name, value in self.globals.items()
+                          if value is func]
+        name = names[0] if names else "func%d" % len(self.globals)
+        self.globals[name] = func
+        return "%s(%s)" % (name, ", ".join(map(self.visit, node.args)))
+
+def expression_source(expr, operands, scalar, globals):
+    return ExpressionSource(operands, scalar, globals).visit(expr)
+
+#------------------------------------------------------------------------
+# Reduction Source Generation
+#------------------------------------------------------------------------
+
+def _indent(lines, level):
+    return ["    " * level + line for line in lines]
+
+def _index(outer, inner):
+    return ", ".join(outer + [inner])
+
+def reduction_loop(kind, element, shape, ndim, result_type):
+    """
+    Generate the loop nest reducing all elements into accumulator 'acc0'.
+
+        element: function mapping an index expression to an element
+        shape:   the source of the shape of the iteration space
+    """
+    outer = ["i%d" % i for i in range(ndim - 1)]
+    accs = ["acc%d" % i for i in range(naccumulators)]
+    operator, identity = reductions[kind]
+
+    if identity is None:
+        lines = ["if %s:" % " or ".join("%s[%d] == 0" % (shape, i)
+                                        for i in range(ndim)),
+                 "    raise ValueError('zero-size array to reduction "
+                                       "operation %s which has no "
+                                       "identity')" % operator,
+                 "acc0 = %s" % element(_index(["0"] * (ndim - 1), "0"))]
+        lines.extend("%s = acc0" % acc for acc in accs[1:])
+    else:
+        lines = ["%s = %d" % (acc, identity) for acc in accs]
+
+    # Unrolled inner loop with independent accumulators
+    body = ["n = %s[%d]" % (shape, ndim - 1),
+            "for j in range(0, n - %d, %d):" % (naccumulators - 1,
+                                                 naccumulators)]
+    for i, acc in enumerate(accs):
+        value = element(_index(outer, "j + %d" % i if i else "j"))
+        body.extend(_indent(update_source(kind, acc, value, result_type), 1))
+
+    body.append("for j in range(n - n %% %d, n):" % naccumulators)
+    value = element(_index(outer, "j"))
+    body.extend(_indent(update_source(kind, "acc0", value, result_type), 1))
+
+    for depth, dim in enumerate(outer):
+        lines.append("    " * depth + "for %s in range(%s[%d]):" % (
+                                                        dim, shape, depth))
+    lines.extend(_indent(body, len(outer)))
+
+    for acc in accs[1:]:
+        lines.extend(update_source(kind, "acc0", acc, result_type))
+
+    lines.append("return acc0")
+    return lines
+
+def reduction_source(kind, expr, argtypes, ndim, result_type):
+    """
+    Generate a function reducing the element-wise expression over the
+    operands. If all array operands have the same shape, the expression is
+    evaluated in the reduction loop, otherwise it is broadcast and
+    evaluated as an array expression first.
+    """
+    names = ["op%d" % i for i in range(len(argtypes))]
+    arrays = [name for name, type in zip(names, argtypes) if type.is_array]
+    globals = dict(np=np)
+
+    def element(index):
+        operands = dict((name, "%s[%s]" % (name, index) if type.is_array
+                                   else name)
+                        for name, type in zip(names, argtypes))
+        return expression_source(expr, operands, True, globals)
+
+    lines = ["def %s_reduction(%s):" % (kind, ", ".join(names))]
+
+    fused = all(type.ndim == ndim for type in argtypes if type.is_array)
+    same_shape = ""
+    if fused:
+        shape = "%s.shape" % arrays[0]
+        same_shape = " and ".join("%s[%d] == %s.shape[%d]" % (shape, i,
+                                                               array, i)
+                                  for array in arrays[1:] for i in range(ndim))
+        loop = reduction_loop(kind, element, shape, ndim, result_type)
+        if same_shape:
+            lines.append("    if %s:" % same_shape)
+            lines.extend(_indent(loop, 2))
+        else:
+            lines.extend(_indent(loop, 1))
+
+    if not fused or same_shape:
+        # Broadcast the operands and evaluate the array expression
+        operands = dict((name, name) for name in names)
+        expr = expression_source(expr, operands, False, globals)
+        loop = reduction_loop(kind, lambda index: "tmp[%s]" % index,
+                              "tmp.shape", ndim, result_type)
+        lines.append("    tmp = %s" % expr)
+        lines.extend(_indent(loop, 1))
+
+    return "\n".join(lines), globals
+
+#------------------------------------------------------------------------
+# Compilation
+#------------------------------------------------------------------------
+
+def compile_reduction(env, kind, expr, argtypes, ndim, result_type,
+                      nopython):
+    """
+    Compile a native reduction of the scalar kernel expression 'expr' with
+    operand types 'argtypes'. Returns the linked LLVM function.
+    """
+    from numba import pipeline
+
+    source, globals = reduction_source(kind, expr, argtypes, ndim,
+                                       result_type)
+    key = (source, frozenset(globals.items()), tuple(argtypes), result_type,
+           nopython)
+    if key in _cache:
+        return _cache[key]
+
+    func_def = ast.parse(source).body[0]
+    signature = result_type(*argtypes)
+
+    locals = dict(n=npy_intp, j=npy_intp)
+    locals.update(("acc%d" % i, result_type) for i in range(naccumulators))
+    if reductions[kind][1] is None:
+        locals.update(v=result_type)
+
+    func_env, (_, _, _) = pipeline.run_pipeline2(
+        env, None, func_def, signature, function_globals=globals,
+        locals=locals, wrap=False, nopython=nopython)
+
+    _cache[key] = func_env.lfunc
+    return func_env.lfunc
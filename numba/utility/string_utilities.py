@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+Native implementations of the byte string operations in numba.strings.
+
+The functions below operate on a buffer and its length, where the buffer is
+a 1D array of bytes or a C string (char *). Offsets are clamped to
+[0, n], so slices are expressed as (start, stop) offsets without copying.
+The same functions run in Python on uint8 arrays for the Python versions
+in numba.strings, and are compiled with numba for the argument types of a
+call site, which the LateSpecializer rewrites to a NativeCallNode (see
+transforms.py).
+"""
+from __future__ import print_function, division, absolute_import
+
+import ast
+import ctypes.util
+import inspect
+import textwrap
+import types
+
+from numba import *
+
+# Result of split() and the bulk parsers for an empty separator. The call
+# site turns this into a ValueError.
+EMPTY_SEPARATOR = -1
+
+# FNV-1a parameters, the offset basis is 14695981039346656037 as int64
+FNV_OFFSET_BASIS = -3750763034362895579
+FNV_PRIME = 1099511628211
+
+_cache = {}
+
+char_p = char.pointer()
+
+#------------------------------------------------------------------------
+# Some libc functions
+#------------------------------------------------------------------------
+
+libc = ctypes.CDLL(ctypes.util.find_library('c'))
+
+malloc = libc.malloc
+malloc.restype = ctypes.c_void_p
+malloc.argtypes = [ctypes.c_size_t]
+
+free = libc.free
+free.restype = None
+free.argtypes = [ctypes.c_void_p]
+
+strtod = libc.strtod
+strtod.restype = ctypes.c_double
+strtod.argtypes = [ctypes.c_char_p, ctypes.c_void_p]
+
+#------------------------------------------------------------------------
+# Searching
+#------------------------------------------------------------------------
+
+def _clip(offset, n):
+    "Clamp an offset to [0, n], negative offsets are not from the end"
+    if offset < 0:
+        return 0
+    elif offset > n:
+        return n
+    return offset
+
+def _find(buf, n, sub, m, start, stop):
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    last = hi - m
+    i = lo
+    while i <= last:
+        j = 0
+        while j < m:
+            if (buf[i + j] & 255) != (sub[j] & 255):
+                break
+            j += 1
+        if j == m:
+            return i
+        i += 1
+    return -1
+
+def _startswith(buf, n, sub, m, start):
+    lo = _clip(start, n)
+    if n - lo < m:
+        return False
+    j = 0
+    while j < m:
+        if (buf[lo + j] & 255) != (sub[j] & 255):
+            return False
+        j += 1
+    return True
+
+def _endswith(buf, n, sub, m, stop):
+    hi = _clip(stop, n)
+    if hi < m:
+        return False
+    j = 0
+    while j < m:
+        if (buf[hi - m + j] & 255) != (sub[j] & 255):
+            return False
+        j += 1
+    return True
+
+def _split(buf, n, sep, m, out, start, stop):
+    if m == 0:
+        return EMPTY_SEPARATOR
+
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    nout = out.shape[0]
+    if nout == 0:
+        return 0
+
+    k = 0
+    field = lo
+    while k < nout - 1:
+        end = _find(buf, n, sep, m, field, hi)
+        if end < 0:
+            break
+        out[k, 0] = field
+        out[k, 1] = end
+        k += 1
+        field = end + m
+
+    out[k, 0] = field
+    out[k, 1] = hi
+    return k + 1
+
+#------------------------------------------------------------------------
+# Hashing and Copying
+#------------------------------------------------------------------------
+
+def _hash(buf, n, start, stop):
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    h = FNV_OFFSET_BASIS
+    i = lo
+    while i < hi:
+        h = (h ^ (buf[i] & 255)) * FNV_PRIME
+        i += 1
+    return h
+
+def _concat(dst, dn, pos, src, n, start, stop):
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    offset = _clip(pos, dn)
+    count = hi - lo
+    if count > dn - offset:
+        count = dn - offset
+    i = 0
+    while i < count:
+        dst[offset + i] = src[lo + i]
+        i += 1
+    return offset + i
+
+#------------------------------------------------------------------------
+# Number Parsing
+#------------------------------------------------------------------------
+
+def _parse_int(buf, n, start, stop):
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    i = lo
+    while i < hi:
+        c = buf[i] & 255
+        if c != 32 and (c < 9 or c > 13):
+            break
+        i += 1
+
+    negative = False
+    if i < hi:
+        c = buf[i] & 255
+        if c == 45:
+            negative = True
+            i += 1
+        elif c == 43:
+            i += 1
+
+    value = 0
+    while i < hi:
+        c = buf[i] & 255
+        if c < 48 or c > 57:
+            break
+        value = value * 10 + (c - 48)
+        i += 1
+
+    if negative:
+        return -value
+    return value
+
+def _parse_float(buf, n, start, stop):
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    i = lo
+    while i < hi:
+        c = buf[i] & 255
+        if c != 32 and (c < 9 or c > 13):
+            break
+        i += 1
+
+    begin = i
+    negative = False
+    if i < hi:
+        c = buf[i] & 255
+        if c == 45:
+            negative = True
+            i += 1
+        elif c == 43:
+            i += 1
+
+    # Accumulate up to 18 significant digits in the mantissa
+    mantissa = 0
+    digits = 0
+    exponent = 0
+    fraction = False
+    exact = True
+    while i < hi:
+        c = buf[i] & 255
+        if c == 46 and not fraction:
+            fraction = True
+        elif c < 48 or c > 57:
+            break
+        elif mantissa == 0 and c == 48:
+            if fraction:
+                exponent -= 1
+        elif digits < 18:
+            mantissa = mantissa * 10 + (c - 48)
+            digits += 1
+            if fraction:
+                exponent -= 1
+        else:
+            exact = False
+            if not fraction:
+                exponent += 1
+        i += 1
+
+    # An exponent without digits is not part of the number
+    end = i
+    if i < hi and ((buf[i] & 255) == 101 or (buf[i] & 255) == 69):
+        i += 1
+        exponent_sign = 1
+        if i < hi:
+            c = buf[i] & 255
+            if c == 45:
+                exponent_sign = -1
+                i += 1
+            elif c == 43:
+                i += 1
+        e = 0
+        count = 0
+        while i < hi:
+            c = buf[i] & 255
+            if c < 48 or c > 57:
+                break
+            if e < 10000:
+                e = e * 10 + (c - 48)
+            count += 1
+            i += 1
+        if count > 0:
+            exponent += exponent_sign * e
+            end = i
+
+    if mantissa == 0:
+        result = 0.0
+    elif (exact and mantissa <= 9007199254740992 and
+              exponent >= -22 and exponent <= 22):
+        # Clinger's fast path: the mantissa and the power of ten are exact
+        # doubles, so a single multiplication or division rounds correctly
+        result = mantissa * 1.0
+        scale = 1.0
+        j = 0
+        while j < exponent or j < -exponent:
+            scale *= 10.0
+            j += 1
+        if exponent > 0:
+            result = result * scale
+        else:
+            result = result / scale
+    else:
+        return _strtod(buf, n, begin, end)
+
+    if negative:
+        return -result
+    return result
+
+def _strtod(buf, n, start, stop):
+    "Correctly rounded value of the number in buf[start:stop]"
+    return float(bytes(bytearray(buf[start:stop])))
+
+def _native_strtod(buf, n, start, stop):
+    "_strtod in compiled code, strtod() of a NUL-terminated copy"
+    size = stop - start
+    copy = char_p(malloc(size + 1))
+    j = 0
+    while j < size:
+        copy[j] = buf[start + j]
+        j += 1
+    copy[size] = 0
+    result = strtod(copy, NULL)
+    free(copy)
+    return result
+
+def _parse_ints(buf, n, sep, m, out, start, stop):
+    if m == 0:
+        return EMPTY_SEPARATOR
+
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    k = 0
+    field = lo
+    while k < out.shape[0] and field < hi:
+        end = _find(buf, n, sep, m, field, hi)
+        if end < 0:
+            end = hi
+        out[k] = _parse_int(buf, n, field, end)
+        k += 1
+        field = end + m
+    return k
+
+def _parse_floats(buf, n, sep, m, out, start, stop):
+    if m == 0:
+        return EMPTY_SEPARATOR
+
+    lo = _clip(start, n)
+    hi = _clip(stop, n)
+    k = 0
+    field = lo
+    while k < out.shape[0] and field < hi:
+        end = _find(buf, n, sep, m, field, hi)
+        if end < 0:
+            end = hi
+        out[k] = _parse_float(buf, n, field, end)
+        k += 1
+        field = end + m
+    return k
+
+#------------------------------------------------------------------------
+# Compilation
+#------------------------------------------------------------------------
+
+implementations = dict(
+    find=_find,
+    startswith=_startswith,
+    endswith=_endswith,
+    split=_split,
+    hash=_hash,
+    concat=_concat,
+    parse_int=_parse_int,
+    parse_float=_parse_float,
+    parse_ints=_parse_ints,
+    parse_floats=_parse_floats,
+)
+
+return_types = dict(
+    find=npy_intp,
+    startswith=bool_,
+    endswith=bool_,
+    split=npy_intp,
+    hash=int64,
+    concat=npy_intp,
+    parse_int=int64,
+    parse_float=double,
+    parse_ints=npy_intp,
+    parse_floats=npy_intp,
+)
+
+# Positions of the byte buffer arguments of the functions in numba.strings,
+# which are passed to the implementations followed by their length
+buffer_args = dict(
+    find=(0, 1),
+    startswith=(0, 1),
+    endswith=(0, 1),
+    split=(0, 1),
+    hash=(0,),
+    concat=(0, 2),
+    parse_int=(0,),
+    parse_float=(0,),
+    parse_ints=(0, 1),
+    parse_floats=(0, 1),
+)
+
+# Functions called by the implementations, which are specialized on the
+# argument types at the call
+helpers = ['_clip', '_find', '_parse_int', '_parse_float', '_strtod']
+
+# Helpers with a different implementation in compiled code
+native_helpers = dict(_strtod='_native_strtod')
+
+local_types = dict(
+    lo=npy_intp, hi=npy_intp, last=npy_intp, i=npy_intp, j=npy_intp,
+    k=npy_intp, nout=npy_intp, field=npy_intp, end=npy_intp,
+    offset=npy_intp, count=npy_intp, c=npy_intp, digits=npy_intp,
+    exponent=npy_intp, exponent_sign=npy_intp, e=npy_intp, begin=npy_intp,
+    size=npy_intp,
+    h=int64, value=int64, mantissa=int64, scale=double, result=double,
+)
+
+def get_locals(func):
+    varnames = func.__code__.co_varnames
+    return dict((name, type) for name, type in local_types.iteritems()
+                    if name in varnames)
+
+def get_function_globals():
+    """
+    Globals of the compiled implementations, in which the helpers are
+    specializing native functions that refer to each other.
+    """
+    from numba import decorators
+
+    function_globals = dict(globals())
+    for name in helpers:
+        func = globals()[native_helpers.get(name, name)]
+        func = types.FunctionType(func.__code__, function_globals, name)
+        function_globals[name] = decorators.autojit(
+            nopython=True, locals=get_locals(func))(func)
+    return function_globals
+
+def compile_utility(env, name, argtypes):
+    """
+    Compile the native implementation of numba.strings.<name> for the given
+    argument types. Returns the linked LLVM function.
+    """
+    from numba import pipeline
+
+    key = (name, tuple(argtypes))
+    if key in _cache:
+        return _cache[key]
+
+    func = implementations[name]
+    if 'globals' not in _cache:
+        _cache['globals'] = get_function_globals()
+
+    source = textwrap.dedent(inspect.getsource(func))
+    func_def = ast.parse(source).body[0]
+    signature = return_types[name](*argtypes)
+
+    func_env, (_, _, _) = pipeline.run_pipeline2(
+        env, None, func_def, signature,
+        function_globals=_cache['globals'], locals=get_locals(func),
+        nopython=True, wrap=False)
+
+    _cache[key] = func_env.lfunc
+    return func_env.lfunc
@@ -90,6 +90,11 @@ class NumbaContext(miniast.LLVMContext):
         self.astbuilder = self.astbuilder_cls(self)
         self.typemapper = None
 
+    @property
+    def llvm_features(self):
+        from numba.codegen import cpufeatures
+        return cpufeatures.llvm_features()
+
     def is_object(self, type):
         return super(NumbaContext, self).is_object(type) or type.is_array
 
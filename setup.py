@@ -197,9 +197,11 @@ setup(
         Extension(
             name="numba.external.utilities.utilities",
             sources=["numba/external/utilities/utilities.c"],
-            include_dirs=[numba_include_dir, extensibletype_include],
+            include_dirs=[numba_include_dir, extensibletype_include,
+                          numpy.get_include()],
             depends=["numba/external/utilities/type_conversion.c",
                      "numba/external/utilities/virtuallookup.c",
+                     "numba/external/utilities/nativearray.c",
                      "numba/external/utilities/generated_conversions.c",
                      "numba/external/utilities/generated_conversions.h"]),
         CythonExtension(